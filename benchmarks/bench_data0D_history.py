@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the Viewer0D history: samples/s sustained when adding scalar samples to a Data0DWithHistory and getting
+the plotted arrays and the min/max values, versus the history length. The former implementation (concatenation of
+the history at each sample and min/max recomputed over the whole history) is given for comparison.
+
+Usage: python benchmarks/bench_data0D_history.py [--samples 20000] [--channels 2]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from pymodaq.utils.plotting.utils.plot_utils import Data0DWithHistory
+
+
+def run_legacy(samples: np.ndarray, history_length: int) -> float:
+    datas = dict([])
+    mins = dict([])
+    maxs = dict([])
+    start = time.perf_counter()
+    for ind, sample in enumerate(samples):
+        for ind_channel, value in enumerate(sample):
+            key = f'CH{ind_channel:02d}'
+            datas[key] = np.concatenate((datas[key], np.array([value]))) if key in datas else np.array([value])
+            if len(datas[key]) > history_length:
+                datas[key] = datas[key][1:]
+            mins[key] = min(mins.get(key, np.inf), float(np.min(datas[key])))
+            maxs[key] = max(maxs.get(key, -np.inf), float(np.max(datas[key])))
+    return len(samples) / (time.perf_counter() - start)
+
+
+def run_ring_buffer(samples: np.ndarray, history_length: int) -> float:
+    history = Data0DWithHistory(history_length)
+    start = time.perf_counter()
+    for sample in samples:
+        history.add_datas({f'CH{ind_channel:02d}': value for ind_channel, value in enumerate(sample)})
+        history.xaxis
+        for key in history.datas:
+            float(history.mins[key])
+            float(history.maxs[key])
+    return len(samples) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Data0DWithHistory benchmark')
+    parser.add_argument('--samples', type=int, default=20000)
+    parser.add_argument('--channels', type=int, default=2)
+    args = parser.parse_args()
+
+    samples = np.random.rand(args.samples, args.channels)
+    print(f'{"history":>10}{"legacy (samples/s)":>22}{"ring buffer (samples/s)":>27}')
+    for history_length in (200, 1000, 10000, 100000):
+        print(f'{history_length:>10}{run_legacy(samples, history_length):>22.0f}'
+              f'{run_ring_buffer(samples, history_length):>27.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the hdf5 array layout (chunk shape and compression filters) used when saving typical 0D, 1D and 2D
+scans point by point (as done by the DataExtendedSaver), reporting the write and read-back speeds.
+
+Usage: python benchmarks/bench_h5_chunking.py [--backend tables]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from pymodaq.utils.h5modules.backends import H5Backend, get_chunk_shape
+
+SCANS = {'0D': ((100, 100), ()),
+         '1D': ((500,), (2048,)),
+         '2D': ((100,), (512, 512))}
+
+COMPRESSIONS = [('none', 'zlib', 0), ('zlib', 'zlib', 5), ('blosc:lz4', 'blosc:lz4', 5),
+                ('blosc:zstd', 'blosc:zstd', 5)]
+
+
+def get_signal(data_shape: tuple, ind: int) -> np.ndarray:
+    """ some noisy signal, somewhat compressible like real detector data"""
+    if len(data_shape) == 0:
+        return np.array(np.sin(ind / 10) + 0.01 * np.random.rand())
+    signal = np.exp(-np.linspace(-3, 3, data_shape[-1]) ** 2) * np.sin(ind / 10)
+    return (np.broadcast_to(signal, data_shape) + 0.01 * np.random.rand(*data_shape)).astype(float)
+
+
+def run(backend: str, path: Path, scan_shape: tuple, data_shape: tuple, compression: str, level: int,
+        auto_chunks: bool):
+    bck = H5Backend(backend)
+    file_path = path.joinpath(f'bench_{time.perf_counter_ns()}.h5')
+    bck.open_file(file_path, 'w', 'benchmark')
+    shape = scan_shape + data_shape
+    chunk_shape = get_chunk_shape(shape, 8, nav_dims=len(scan_shape)) if auto_chunks else None
+    array = bck.create_carray(bck.root(), 'data', shape=shape, dtype=float, chunk_shape=chunk_shape,
+                              filters=bck.get_filters(compression, level))
+    indexes = list(np.ndindex(*scan_shape))
+
+    start = time.perf_counter()
+    for ind, index in enumerate(indexes):
+        array[index] = get_signal(data_shape, ind)
+    bck.flush()
+    write_time = time.perf_counter() - start
+    bck.close_file()
+
+    bck.open_file(file_path, 'r')
+    array = bck.get_node('/data')
+    start = time.perf_counter()
+    array.read()
+    read_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for index in indexes[::max(1, len(indexes) // 100)]:
+        array[index]
+    signal_time = (time.perf_counter() - start) / len(indexes[::max(1, len(indexes) // 100)])
+    bck.close_file()
+
+    nbytes = int(np.prod(shape)) * 8
+    return nbytes / write_time / 1e6, nbytes / read_time / 1e6, signal_time * 1e6, file_path.stat().st_size / nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='hdf5 chunking and compression benchmark')
+    parser.add_argument('--backend', default='tables', choices=['tables', 'h5py'])
+    args = parser.parse_args()
+
+    print(f'{"scan":<5}{"compression":<12}{"chunks":<8}{"write MB/s":>12}{"read MB/s":>12}'
+          f'{"signal read (us)":>18}{"ratio":>8}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for scan, (scan_shape, data_shape) in SCANS.items():
+            for label, compression, level in COMPRESSIONS:
+                for auto_chunks in (False, True):
+                    write, read, signal, ratio = run(args.backend, Path(tmp), scan_shape, data_shape, compression,
+                                                     level, auto_chunks)
+                    print(f'{scan:<5}{label:<12}{"auto" if auto_chunks else "default":<8}{write:>12.1f}{read:>12.1f}'
+                          f'{signal:>18.1f}{ratio:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
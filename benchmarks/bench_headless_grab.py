@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the scan step latency versus the number of detectors: time needed by ModulesManager.grab_datas to
+collect the data of N Mock 2D detectors (displayed in their viewers), either once displayed (data collected from the
+grab_done_signal of each DAQ_Viewer) or headless (data collected straight from the detector threads, the display
+being done asynchronously). As in DAQScan, the grabs are done from a dedicated thread.
+
+Usage: python benchmarks/bench_headless_grab.py [--detectors 4] [--steps 10] [--size 1024]
+"""
+import argparse
+import time
+
+from qtpy import QtWidgets
+from qtpy.QtCore import QObject, QThread, QEventLoop, Signal, Slot
+
+from pymodaq.control_modules.daq_viewer import DAQ_Viewer
+from pymodaq.utils.gui_utils import DockArea
+from pymodaq.utils.managers.modules_manager import ModulesManager
+
+
+def init_detectors(area: DockArea, ndetectors: int, size: int):
+    detectors = []
+    for ind in range(ndetectors):
+        viewer = DAQ_Viewer(area, title=f'Mock{ind:02d}', daq_type='DAQ2D')
+        viewer.detector = 'Mock'
+        viewer.settings.child('detector_settings', 'Nx').setValue(size)
+        viewer.settings.child('detector_settings', 'Ny').setValue(size)
+        viewer.init_hardware_ui(True)
+        detectors.append(viewer)
+    while not all(viewer.initialized_state for viewer in detectors):
+        QtWidgets.QApplication.processEvents()
+    return detectors
+
+
+class GrabWorker(QObject):
+    finished = Signal(float)
+
+    def __init__(self, manager: ModulesManager, steps: int, headless: bool):
+        super().__init__()
+        self.manager = manager
+        self.steps = steps
+        self.headless = headless
+
+    @Slot()
+    def run(self):
+        self.manager.grab_datas(headless=self.headless)  # warm up (viewers creation...)
+        start = time.perf_counter()
+        for ind in range(self.steps):
+            self.manager.grab_datas(headless=self.headless)
+        self.finished.emit((time.perf_counter() - start) / self.steps)
+
+
+def time_grab(manager: ModulesManager, steps: int, headless: bool) -> float:
+    durations = []
+    worker = GrabWorker(manager, steps, headless)
+    thread = QThread()
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    loop = QEventLoop()
+    worker.finished.connect(durations.append)
+    worker.finished.connect(loop.quit)
+    thread.start()
+    loop.exec()
+    thread.quit()
+    thread.wait()
+    for ind in range(10):  # let the pending displays be done
+        QtWidgets.QApplication.processEvents()
+    return durations[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless grab benchmark')
+    parser.add_argument('--detectors', type=int, default=4)
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--size', type=int, default=1024)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    area = DockArea()
+    win = QtWidgets.QMainWindow()
+    win.setCentralWidget(area)
+    detectors = init_detectors(area, args.detectors, args.size)
+    win.resize(1200, 800)
+    win.show()
+    manager = ModulesManager(detectors=detectors)
+
+    print(f'{"detectors":>10}{"displayed (ms)":>16}{"headless (ms)":>16}')
+    ndetectors = 1
+    while ndetectors <= args.detectors:
+        manager.connect_detectors(False)
+        manager.selected_detectors_name = manager.get_names(detectors[:ndetectors])
+        manager.connect_detectors()
+        displayed = time_grab(manager, args.steps, False)
+        headless = time_grab(manager, args.steps, True)
+        print(f'{ndetectors:>10}{displayed * 1000:>16.1f}{headless * 1000:>16.1f}')
+        ndetectors *= 2
+
+    manager.connect_detectors(False)
+    for viewer in detectors:
+        viewer.quit_fun()
+    QtWidgets.QApplication.processEvents()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the DAQScan live plot data path: time needed to get the data to be plotted after a scan step, at
+several steps of a 1D scan of 0D and 1D data, either reloading the temporary h5 file (former behaviour) or using the
+in memory LiveScanData.
+
+Usage: python benchmarks/bench_live_scan.py [--steps 20000] [--size 256]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from qtpy import QtWidgets
+
+from pymodaq.post_treatment.load_and_plot import LoaderPlotter, LiveScanData
+from pymodaq.utils.data import DataToExport, DataFromPlugins, Axis
+from pymodaq.utils.gui_utils.dock import DockArea
+from pymodaq.utils.h5modules.data_saving import DataToExportExtendedSaver
+from pymodaq.utils.h5modules.saving import H5Saver
+
+
+def get_step_data(size: int) -> DataToExport:
+    return DataToExport('Mock', data=[
+        DataFromPlugins('Det0D', data=[np.random.rand(1), np.random.rand(1)], origin='Mock'),
+        DataFromPlugins('Det1D', data=[np.random.rand(size)], origin='Mock')])
+
+
+def time_load(plotter: LoaderPlotter, repeat: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        plotter.load_data(group_0D=True)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DAQScan live plots benchmark')
+    parser.add_argument('--steps', type=int, default=20000)
+    parser.add_argument('--size', type=int, default=256)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    checkpoints = [int(step) for step in np.geomspace(10, args.steps, 5)]
+    nav_axes = [Axis('Position', data=np.linspace(0, 1, args.steps), index=0)]
+    dte = get_step_data(args.size)
+
+    temp_dir = tempfile.TemporaryDirectory(prefix='pymo')
+    h5temp = H5Saver()
+    h5temp.init_file(custom_naming=True, addhoc_file_path=Path(temp_dir.name).joinpath('temp_data.h5'))
+    saver = DataToExportExtendedSaver(h5temp, extended_shape=(args.steps,))
+    saver.add_nav_axes(h5temp.raw_group, nav_axes)
+    file_plotter = LoaderPlotter(DockArea())
+    file_plotter.h5saver = h5temp
+
+    live_plotter = LoaderPlotter(DockArea())
+    live_plotter.live_data = LiveScanData((args.steps,))
+    live_plotter.live_data.set_nav_axes(nav_axes)
+
+    print(f'{"step":>8}{"h5 reload (ms)":>18}{"live data (ms)":>18}')
+    for ind in range(args.steps):
+        saver.add_data(h5temp.raw_group, dte, (ind,))
+        live_plotter.live_data.add_data((ind,), dte)
+        if ind + 1 in checkpoints:
+            print(f'{ind + 1:>8}{time_load(file_plotter) * 1000:>18.2f}{time_load(live_plotter) * 1000:>18.2f}')
+
+    h5temp.close_file()
+    temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the instrument plugins discovery at startup: time needed to list the installed instrument plugins in a
+fresh interpreter, either importing all of them (former behaviour, where each plugin was imported to check it was
+importable), scanning the plugin packages without importing them, or reading the on-disk index.
+
+Usage: python benchmarks/bench_plugin_discovery.py [--repeat 5]
+"""
+import argparse
+import subprocess
+import sys
+
+SETUP = 'from pymodaq.utils import daq_utils; import time; start = time.perf_counter(); '
+
+CASES = dict([
+    ('import all plugins', 'plugins = daq_utils.discover_instrument_plugins(use_index=False)\n'
+                           'for plugin in plugins:\n'
+                           '    try:\n'
+                           '        plugin.load()\n'
+                           '    except Exception:\n'
+                           '        pass\n'),
+    ('scan without import', 'daq_utils.discover_instrument_plugins(use_index=False)\n'),
+    ('on-disk index', 'daq_utils.discover_instrument_plugins(use_index=True)\n'),
+])
+
+
+def time_case(code: str) -> float:
+    """Run the code in a fresh interpreter and return the time spent in the code (excluding pymodaq import)"""
+    script = SETUP + '\n' + code + 'print(time.perf_counter() - start)\n'
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Instrument plugins discovery benchmark')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    time_case(CASES['on-disk index'])  # make sure the index is up to date
+    print(f'{"discovery":>22}{"time (ms)":>12}')
+    for name, code in CASES.items():
+        durations = [time_case(code) for _ in range(args.repeat)]
+        print(f'{name:>22}{min(durations) * 1000:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the 2D ROI filtering of Viewer2D: time needed per frame to compute the lineouts and integrated values
+of several rectangular and elliptical ROIs on a camera frame, using the cached ROI regions or the interpolated
+regions of pyqtgraph (former behaviour, each ROI working on a deep copy of the data).
+
+Usage: python benchmarks/bench_roi_filter.py [--size 2048] [--rois 10] [--frames 20]
+"""
+import argparse
+import time
+
+import numpy as np
+from qtpy import QtWidgets
+
+from pymodaq.utils.data import DataRaw
+from pymodaq.utils.plotting.data_viewers.viewer2D import Viewer2D, IMAGE_TYPES
+from pymodaq.utils.plotting.utils.filter import Filter2DFromRois
+
+
+def filter_with_pyqtgraph(roi_filter: Filter2DFromRois, viewer: Viewer2D, data: DataRaw):
+    for roi_key, roi in viewer.roi_manager.ROIs.items():
+        sub_data = data.deepcopy()
+        xvals, yvals, data_array = roi_filter.get_xydata(sub_data[0], roi)
+        np.mean(data_array, axis=0), np.mean(data_array, axis=1), np.mean(data_array)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Filter2DFromRois benchmark')
+    parser.add_argument('--size', type=int, default=2048)
+    parser.add_argument('--rois', type=int, default=10)
+    parser.add_argument('--frames', type=int, default=20)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    viewer = Viewer2D(QtWidgets.QWidget())
+    frames = [DataRaw('raw', data=[np.random.rand(args.size, args.size)]) for _ in range(2)]
+    viewer.show_data(frames[0])
+    for ind in range(args.rois):
+        viewer.roi_manager.add_roi_programmatically('RectROI' if ind % 2 == 0 else 'EllipseROI')
+        roi = viewer.roi_manager.get_roi_from_index(ind)
+        roi.setPos((ind * args.size / (2 * args.rois), ind * args.size / (2 * args.rois)))
+        roi.setSize((args.size / 4, args.size / 3))
+    QtWidgets.QApplication.processEvents()
+    roi_filter = Filter2DFromRois(viewer.roi_manager, viewer.view.data_displayer.get_image('red'), IMAGE_TYPES)
+
+    start = time.perf_counter()
+    for ind in range(args.frames):
+        filter_with_pyqtgraph(roi_filter, viewer, frames[ind % 2])
+    old = (time.perf_counter() - start) / args.frames
+
+    start = time.perf_counter()
+    for ind in range(args.frames):
+        roi_filter._filter_data(frames[ind % 2])
+    new = (time.perf_counter() - start) / args.frames
+
+    print(f'{args.rois} ROIs on {args.size}x{args.size} frames')
+    print(f'pyqtgraph regions: {old * 1000:.1f} ms/frame')
+    print(f'cached regions:    {new * 1000:.1f} ms/frame')
+
+
+if __name__ == '__main__':
+    main()
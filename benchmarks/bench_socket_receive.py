@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the TCP/IP receive path: throughput of Socket.check_received_length for messages from 1 kB to 100 MB
+sent over a local socket pair, compared with the former implementation growing a bytes string by 4096 bytes reads,
+then deserialization time of a DataToExport made of many small DataWithAxes from a bytes string (SocketString),
+compared with the former implementation slicing the remaining bytes at each read field.
+
+Usage: python benchmarks/bench_socket_receive.py [--max-size 100] [--legacy-max-size 10] [--repeat 3]
+"""
+import argparse
+import threading
+import socket
+import time
+
+import numpy as np
+
+from pymodaq.utils.data import DataToExport, DataRaw
+from pymodaq.utils.tcp_ip.mysocket import Socket
+from pymodaq.utils.tcp_ip.serializer import Serializer, DeSerializer
+
+
+class LegacySocket(Socket):
+    def check_received_length(self, length) -> bytes:
+        mess_length = 0
+        data_bytes = b''
+        while mess_length < length:
+            if mess_length < length - 4096:
+                data_bytes_tmp = self.socket.recv(4096)
+            else:
+                data_bytes_tmp = self.socket.recv(length - mess_length)
+            mess_length += len(data_bytes_tmp)
+            data_bytes += data_bytes_tmp
+        return data_bytes
+
+
+class LegacySocketString:
+    def __init__(self, bytes_string: bytes):
+        self._bytes_string = bytes_string
+
+    def get_first_nbytes(self, length: int) -> bytes:
+        data = self._bytes_string[0:length]
+        self._bytes_string = self._bytes_string[length:]
+        return data
+
+
+def time_receive(socket_class, size: int, repeat: int) -> float:
+    """Best time to receive a message of size bytes through a socket pair"""
+    message = np.random.bytes(size)
+    durations = []
+    for ind in range(repeat):
+        sock_a, sock_b = socket.socketpair()
+        sender, receiver = Socket(sock_a), socket_class(sock_b)
+        thread = threading.Thread(target=sender.check_sended, args=(message,))
+        start = time.perf_counter()
+        thread.start()
+        data = receiver.check_received_length(size)
+        durations.append(time.perf_counter() - start)
+        thread.join()
+        sender.close()
+        receiver.close()
+        assert len(data) == size
+    return min(durations)
+
+
+def time_deserialize(bytes_string: bytes, legacy: bool, repeat: int) -> float:
+    durations = []
+    for ind in range(repeat):
+        start = time.perf_counter()
+        deserializer = DeSerializer(bytes_string)
+        if legacy:
+            deserializer._bytes_string = LegacySocketString(bytes_string)
+        deserializer.dte_deserialization()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Socket receive benchmark')
+    parser.add_argument('--max-size', type=float, default=100, help='largest message in MB')
+    parser.add_argument('--legacy-max-size', type=float, default=10,
+                        help='largest message in MB received with the former implementation')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"size (kB)":>12}{"legacy (MB/s)":>16}{"current (MB/s)":>16}')
+    size = 1000
+    while size <= args.max_size * 1e6:
+        legacy = f'{size / 1e6 / time_receive(LegacySocket, size, args.repeat):>16.1f}' \
+            if size <= args.legacy_max_size * 1e6 else f'{"-":>16}'
+        current = size / 1e6 / time_receive(Socket, size, args.repeat)
+        print(f'{size // 1000:>12}{legacy}{current:>16.1f}')
+        size *= 10
+
+    print()
+    print(f'{"DataWithAxes":>12}{"size (kB)":>12}{"legacy (ms)":>16}{"current (ms)":>16}')
+    for ndwa in [10, 100, 1000]:
+        dte = DataToExport('dte', data=[DataRaw(f'data{ind:04d}', data=[np.array([float(ind)])])
+                                        for ind in range(ndwa)])
+        bytes_string = Serializer(dte).to_bytes()
+        legacy = time_deserialize(bytes_string, True, args.repeat)
+        current = time_deserialize(bytes_string, False, args.repeat)
+        print(f'{ndwa:>12}{len(bytes_string) // 1000:>12}{legacy * 1000:>16.1f}{current * 1000:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
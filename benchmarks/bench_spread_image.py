@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the display of live spread 2D scans: time needed to render a SpreadImageItem each time a point is added
+to the scan, versus the number of points. The former behaviour (new triangulation and new polygons at each update) is
+given for comparison.
+
+Usage: python benchmarks/bench_spread_image.py [--points 20000] [--repeat 5]
+"""
+import argparse
+import time
+
+import numpy as np
+from qtpy import QtWidgets
+
+from pymodaq.utils.plotting.items.image import SpreadImageItem
+from pymodaq.utils.plotting.utils.plot_utils import makeAlphaTriangles, makePolygons
+
+
+def time_legacy(data: np.ndarray, repeat: int) -> float:
+    start = time.perf_counter()
+    for ind in range(repeat):
+        image = data[:len(data) - repeat + ind + 1]
+        tri, tri_data, rgba_values, alpha = makeAlphaTriangles(image, levels=[0, 1], useRGBA=True)
+        makePolygons(tri)
+    return (time.perf_counter() - start) / repeat
+
+
+def time_item(item: SpreadImageItem, data: np.ndarray, repeat: int) -> float:
+    item.setImage(data[:len(data) - repeat])
+    item.render()
+    start = time.perf_counter()
+    for ind in range(repeat):
+        item.setImage(data[:len(data) - repeat + ind + 1])
+        item.render()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SpreadImageItem live update benchmark')
+    parser.add_argument('--points', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    data = np.random.rand(args.points, 3)
+    print(f'{"points":>8}{"legacy (ms)":>14}{"cached (ms)":>14}')
+    for npoints in np.geomspace(100, args.points, 5).astype(int):
+        item = SpreadImageItem()
+        print(f'{npoints:>8}{time_legacy(data[:npoints], args.repeat) * 1000:>14.1f}'
+              f'{time_item(item, data[:npoints], args.repeat) * 1000:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
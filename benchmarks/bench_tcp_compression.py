@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the compression of the arrays sent with the version 2 of the TCP/IP protocol: for typical 0D, 1D and
+2D detector data and for each available codec, with and without downcast, size of the frame relative to the
+uncompressed one, encoding and decoding times, throughput of frames sent through a local socket pair and the frame
+rate a 1 Gb/s link could sustain (the slowest of the wire transfer, the encoding and the decoding).
+
+Usage: python benchmarks/bench_tcp_compression.py [--frames 20] [--repeat 3] [--size 1024]
+"""
+import argparse
+import socket
+import threading
+import time
+
+import numpy as np
+
+from pymodaq.utils.data import DataToExport, DataRaw
+from pymodaq.utils.tcp_ip.compression import available_codecs
+from pymodaq.utils.tcp_ip.mysocket import Socket
+from pymodaq.utils.tcp_ip.serializer import FrameSerializer, FrameString, DeSerializer
+
+GIGABIT_ETHERNET = 125e6  # bytes per second
+
+
+def make_payloads(size: int) -> dict:
+    rng = np.random.default_rng(0)
+    sparse = np.zeros((size, size))
+    sparse[rng.integers(0, size, 100), rng.integers(0, size, 100)] = rng.random(100)
+    return dict(
+        data0D=DataToExport('data0D', data=[DataRaw('det', data=[np.array([rng.random()]) for ind in range(4)])]),
+        spectrum=DataToExport('spectrum', data=[DataRaw('det', data=[rng.normal(1000, 30, 2048)])]),
+        camera=DataToExport('camera', data=[DataRaw('det', data=[rng.poisson(200, (size, size)).astype(float)])]),
+        sparse=DataToExport('sparse', data=[DataRaw('det', data=[sparse])]),
+    )
+
+
+def best_time(function, repeat: int) -> float:
+    durations = []
+    for ind in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def time_loopback(dte: DataToExport, codec: str, cast: bool, nframes: int) -> float:
+    """Throughput in MB/s (of uncompressed data) of frames sent, received and deserialized through a socket pair"""
+    sock_a, sock_b = socket.socketpair()
+    sender, receiver = Socket(sock_a), Socket(sock_b)
+    sender.sending_protocol = receiver.receiving_protocol = 2
+    sender.compression, sender.downcast = codec, cast
+
+    def send():
+        for ind in range(nframes):
+            sender.check_sended_with_serializer(dte)
+
+    thread = threading.Thread(target=send)
+    start = time.perf_counter()
+    thread.start()
+    for ind in range(nframes):
+        DeSerializer(receiver).dte_deserialization()
+    duration = time.perf_counter() - start
+    thread.join()
+    sender.close()
+    receiver.close()
+    return nframes * sum([sum([array.nbytes for array in dwa.data]) for dwa in dte]) / 1e6 / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TCP/IP arrays compression benchmark')
+    parser.add_argument('--frames', type=int, default=20, help='number of frames sent through the socket pair')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--size', type=int, default=1024, help='size of the square 2D data')
+    args = parser.parse_args()
+
+    print(f'{"data":>10}{"codec":>13}{"downcast":>10}{"size (kB)":>12}{"ratio":>8}{"encode (ms)":>13}'
+          f'{"decode (ms)":>13}{"loopback (MB/s)":>17}{"1GbE (fps)":>12}')
+    for name, dte in make_payloads(args.size).items():
+        reference = len(FrameSerializer(dte).to_bytes())
+        for codec in available_codecs():
+            for cast in [False, True]:
+                frame = bytearray(FrameSerializer(dte, codec, cast=cast).to_bytes())
+                encode = best_time(lambda: FrameSerializer(dte, codec, cast=cast).to_segments(), args.repeat)
+                decode = best_time(lambda: DeSerializer(FrameString.from_frame(frame)).dte_deserialization(),
+                                   args.repeat)
+                throughput = time_loopback(dte, codec, cast, args.frames)
+                fps = 1 / max(len(frame) / GIGABIT_ETHERNET, encode, decode)
+                print(f'{name:>10}{codec:>13}{str(cast):>10}{len(frame) / 1000:>12.1f}{reference / len(frame):>8.2f}'
+                      f'{encode * 1000:>13.3f}{decode * 1000:>13.3f}{throughput:>17.1f}{fps:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
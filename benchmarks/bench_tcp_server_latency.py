@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the TCPServer command latency: round trip time of a command sent by loopback clients and answered by
+the server, for the event driven server (QSocketNotifier) compared with the former polling one (100 ms timer and
+100 ms sleep before reading each readable socket). Each client runs in its own thread and sends its commands one
+after the other.
+
+Usage: python benchmarks/bench_tcp_server_latency.py [--clients 4] [--commands 20]
+"""
+import argparse
+import socket
+import statistics
+import threading
+import time
+
+from qtpy import QtCore
+from qtpy.QtCore import QThread
+
+from pymodaq.utils.tcp_ip.mysocket import Socket
+from pymodaq.utils.tcp_ip.serializer import DeSerializer
+from pymodaq.utils.tcp_ip.tcp_server_client import MockServer
+
+
+class PingServer(MockServer):
+    socket_types = ['GRABBER']
+    message_list = ['Quit', 'ping', 'pong']
+
+    def __init__(self):
+        super().__init__()
+        self.settings.child('socket_ip').setValue('127.0.0.1')
+        self.settings.child('port_id').setValue(0)
+
+    def process_cmds(self, command, command_sock=None):
+        if command == 'ping':
+            self.send_command(command_sock, 'pong')
+
+    def emit_status(self, status):
+        pass
+
+
+class LegacyPingServer(PingServer):
+    """Polling as done before: every 100 ms and sleeping 100 ms before reading each readable socket"""
+    def init_server(self):
+        super().init_server()
+        self.unwatch_socket(self.serversocket)
+        self.timer = self.startTimer(100)
+
+    def close_server(self):
+        self.killTimer(self.timer)
+        super().close_server()
+
+    def timerEvent(self, event):
+        if not self.processing:
+            self.listen_client()
+
+    def process_socket(self, sock: Socket):
+        QThread.msleep(100)
+        super().process_socket(sock)
+
+
+def run_client(port: int, ncommands: int, latencies: list):
+    client = Socket(socket.create_connection(('127.0.0.1', port)))
+    client.check_sended_with_serializer('GRABBER')
+    for ind in range(ncommands):
+        start = time.perf_counter()
+        client.check_sended_with_serializer('ping')
+        DeSerializer(client).string_deserialization()
+        latencies.append(time.perf_counter() - start)
+    client.check_sended_with_serializer('Quit')
+    client.close()
+
+
+def time_server(server_class, nclients: int, ncommands: int):
+    server = server_class()
+    server.init_server()
+    port = server.serversocket.getsockname()[1]
+    latencies = []
+    threads = [threading.Thread(target=run_client, args=(port, ncommands, latencies)) for ind in range(nclients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    while any([thread.is_alive() for thread in threads]):
+        QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 10)
+    duration = time.perf_counter() - start
+    server.close_server()
+    return statistics.median(latencies), max(latencies), nclients * ncommands / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TCP server latency benchmark')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--commands', type=int, default=20)
+    args = parser.parse_args()
+
+    app = QtCore.QCoreApplication([])
+    print(f'{"server":>10}{"clients":>10}{"median (ms)":>14}{"max (ms)":>12}{"commands/s":>12}')
+    for name, server_class in [('legacy', LegacyPingServer), ('current', PingServer)]:
+        nclients = 1
+        while nclients <= args.clients:
+            median, worst, rate = time_server(server_class, nclients, args.commands)
+            print(f'{name:>10}{nclients:>10}{median * 1000:>14.2f}{worst * 1000:>12.2f}{rate:>12.1f}')
+            nclients *= 2
+
+
+if __name__ == '__main__':
+    main()
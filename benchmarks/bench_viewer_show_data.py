@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Benchmark of the DAQ_Viewer.show_data hot path: frames/s reached when feeding 4 Mpixel camera frames, headless
+(data processing only) and with the 2D viewer, with and without live averaging.
+
+Usage: python benchmarks/bench_viewer_show_data.py [--frames 50] [--size 2048]
+"""
+import argparse
+import time
+
+import numpy as np
+from qtpy import QtWidgets
+
+from pymodaq.control_modules.daq_viewer import DAQ_Viewer
+from pymodaq.utils.data import DataToExport, DataFromPlugins
+from pymodaq.utils.gui_utils.dock import DockArea
+
+
+def get_frames(size: int, nframes: int = 4):
+    return [DataToExport('Mock', data=[DataFromPlugins('Camera', data=[np.random.rand(size, size)])])
+            for _ in range(nframes)]
+
+
+def run(viewer: DAQ_Viewer, frames, nframes: int, live_averaging: bool) -> float:
+    viewer.settings.child('main_settings', 'live_averaging').setValue(live_averaging)
+    viewer.show_data(frames[0])  # warm up
+    QtWidgets.QApplication.processEvents()
+    start = time.perf_counter()
+    for ind in range(nframes):
+        viewer.show_data(frames[ind % len(frames)])
+        QtWidgets.QApplication.processEvents()
+    return nframes / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DAQ_Viewer show_data benchmark')
+    parser.add_argument('--frames', type=int, default=50)
+    parser.add_argument('--size', type=int, default=2048)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    frames = get_frames(args.size)
+    area = DockArea()
+
+    print(f'{"viewer":<10}{"live averaging":<16}{"frames/s":>10}')
+    for label, parent in (('headless', None), ('Viewer2D', area)):
+        viewer = DAQ_Viewer(parent, title='bench', daq_type='DAQ2D')
+        for live_averaging in (False, True):
+            fps = run(viewer, frames, args.frames, live_averaging)
+            print(f'{label:<10}{str(live_averaging):<16}{fps:>10.1f}')
+        viewer.quit_fun()
+        QtWidgets.QApplication.processEvents()
+
+
+if __name__ == '__main__':
+    main()
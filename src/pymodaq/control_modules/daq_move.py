@@ -210,6 +210,18 @@ class DAQ_Move(ParameterManager, ControlModule):
         node = self.module_and_data_saver.get_set_node(where)
         self.module_and_data_saver.add_data(node, data, **kwargs)
 
+    def get_data_to_save(self, dte: DataToExport = None, init_step=False) -> Tuple[DataToExport, DataToExport]:
+        """Get a snapshot of the data to be saved (the current value if dte is None) and None as there is no
+        background (see DAQ_Viewer.get_data_to_save)"""
+        if dte is None:
+            dte = DataToExport(name=self.title, data=[self._current_value])
+        return DataToExport(name=dte.name, data=[dwa.view() for dwa in dte]), None
+
+    def write_data_to_saver(self, node: Node, dte: DataToExport, bkg: DataToExport = None, **kwargs):
+        """Write data obtained from get_data_to_save into the node of this actuator (see
+        DAQ_Viewer.write_data_to_saver)"""
+        self.module_and_data_saver.add_data(node, dte, **kwargs)
+
     def stop_motion(self):
         """Stop any motion
         """
@@ -559,7 +571,10 @@ class DAQ_Move(ParameterManager, ControlModule):
 
     def update_plugin_config(self):
         parent_module = utils.find_dict_in_list_from_key_val(DAQ_Move_Actuators, 'name', self.actuator)
-        mod = import_module(parent_module['module'].__package__.split('.')[0])
+        try:
+            mod = import_module(parent_module['module'].__package__.split('.')[0])
+        except Exception:  # the plugin is imported when selected, its import error has been logged
+            return
         if hasattr(mod, 'config'):
             self.plugin_config = mod.config
 
@@ -11,17 +11,16 @@ import copy
 import os
 from pathlib import Path
 import sys
-from typing import List, Tuple, Union
-import time
+from typing import Callable, List, Tuple, Union
 
 from easydict import EasyDict as edict
 import numpy as np
 from qtpy import QtWidgets
-from qtpy.QtCore import Qt, QObject, Slot, QThread, Signal
+from qtpy.QtCore import Qt, QObject, Slot, QThread, Signal, QTimer
 
-from pymodaq.utils.data import DataFromPlugins, DataToExport, Axis, DataDistribution
+from pymodaq.utils.data import DataFromPlugins, DataToExport, Axis, DataDistribution, DataAccumulator
 from pymodaq.utils.logger import set_logger, get_module_name
-from pymodaq.control_modules.utils import ControlModule
+from pymodaq.control_modules.utils import ControlModule, DataMailbox, DisplayGovernor
 from pymodaq.utils.gui_utils.file_io import select_file
 from pymodaq.utils.tcp_ip.tcp_server_client import TCPClient
 from pymodaq.utils.gui_utils.widgets.lcd import LCD
@@ -136,6 +135,7 @@ class DAQ_Viewer(ParameterManager, ControlModule):
                                           module_saving.DetectorExtendedSaver] = None
         self._h5saver_continuous: H5Saver = None
         self._ind_continuous_grab = 0
+        self._live_accumulator = DataAccumulator()
         self.setup_continuous_saving()
 
         self.settings.child('main_settings', 'DAQ_type').setValue(self.daq_type.name)
@@ -151,9 +151,21 @@ class DAQ_Viewer(ParameterManager, ControlModule):
         self._take_bkg: bool = False
 
         self._grab_done: bool = False
-        self._start_grab_time: float = 0.  # used for the refreshing rate
         self._received_data: int = 0
 
+        # data from the detector thread are posted into a mailbox and only the latest may be displayed
+        self._data_mailbox = DataMailbox()
+        self._data_mailbox.data_posted.connect(self._process_mailbox)
+        self._data_sink: Callable[[DataToExport], None] = None
+        self._display_governor = DisplayGovernor(self.settings['main_settings', 'refresh_time'])
+        self._display_timer = QTimer()
+        self._display_timer.setSingleShot(True)
+        self._display_timer.timeout.connect(self._show_pending_data)
+        self._pending_display: DataToExport = None
+        self._queued_data: List[DataToExport] = []  # not displayed data waiting for the displayed ones to be emitted
+        self._displayed_frames = 0
+        self._dropped_frames = 0
+
         self._lcd: LCD = None
 
         self._bkg: DataToExport = None  # buffer to store background
@@ -325,7 +337,10 @@ class DAQ_Viewer(ParameterManager, ControlModule):
 
     def update_plugin_config(self):
         parent_module = utils.find_dict_in_list_from_key_val(DET_TYPES[self.daq_type.name], 'name', self.detector)
-        mod = import_module(parent_module['module'].__package__.split('.')[0])
+        try:
+            mod = import_module(parent_module['module'].__package__.split('.')[0])
+        except Exception:  # the plugin is imported when selected, its import error has been logged
+            return
         if hasattr(mod, 'config'):
             self.plugin_config = mod.config
 
@@ -381,6 +396,7 @@ class DAQ_Viewer(ParameterManager, ControlModule):
         """ Quit the application, closing the hardware and other modules """
 
         # insert anything that needs to be closed before leaving
+        self._display_timer.stop()
 
         if self._initialized_state:  # means  initialized
             self.init_hardware(False)
@@ -433,7 +449,7 @@ class DAQ_Viewer(ParameterManager, ControlModule):
                     hardware.moveToThread(self._hardware_thread)
 
                 self.command_hardware[ThreadCommand].connect(hardware.queue_command)
-                hardware.data_detector_sig[DataToExport].connect(self.show_data)
+                hardware.data_detector_sig[DataToExport].connect(self._post_data, Qt.DirectConnection)
                 hardware.data_detector_temp_sig[DataToExport].connect(self.show_temp_data)
                 hardware.status_sig[ThreadCommand].connect(self.thread_status)
                 self._update_settings_signal[edict].connect(hardware.update_settings)
@@ -501,7 +517,8 @@ class DAQ_Viewer(ParameterManager, ControlModule):
         if self.ui is not None:
             self.ui.data_ready = False
 
-        self._start_grab_time = time.perf_counter()
+        if grab_state:
+            self._reset_frame_counters()
         if snap_state:
             self.update_status(f'{self._title}: Snap')
             self.command_hardware.emit(
@@ -540,6 +557,12 @@ class DAQ_Viewer(ParameterManager, ControlModule):
         self.update_status(f'{self._title}: Stop Grab')
         self.command_hardware.emit(ThreadCommand("stop_all", ))
         self._grabing = False
+        self._display_timer.stop()
+        if self._display_governor.busy:  # the pending data are displayed once the viewers sent back the current ones
+            self._display_timer.start(int(np.ceil(self._display_governor.get_delay())))
+        else:
+            self._show_pending_data()
+        self._update_frame_counters()
 
     @Slot()
     def _raise_timeout(self):
@@ -585,6 +608,7 @@ class DAQ_Viewer(ParameterManager, ControlModule):
             self.module_and_data_saver = module_saving.DetectorEnlargeableSaver(self)
             self.module_and_data_saver.h5saver = self._h5saver_continuous
             self.module_and_data_saver.get_set_node()
+            self._h5saver_continuous.start_write_behind()
 
             self.grab_done_signal.connect(self.append_data)
         else:
@@ -600,7 +624,9 @@ class DAQ_Viewer(ParameterManager, ControlModule):
     def append_data(self, dte: DataToExport = None, where: Union[Node, str] = None):
         """Appends current DataToExport to a DetectorEnlargeableSaver
 
-        Method to be used when performing continuous saving into a h5file (continuous mode or DAQ_Logger)
+        Method to be used when performing continuous saving into a h5file (continuous mode or DAQ_Logger). If the
+        asynchronous writing option of the H5Saver is set, the data to be saved and the node where to save them are
+        prepared here, then queued and written by its writer thread
 
         Parameters
         ----------
@@ -609,16 +635,20 @@ class DAQ_Viewer(ParameterManager, ControlModule):
         where: Node or str
         See Also
         --------
-        :class:`DetectorEnlargeableSaver`
+        :class:`DetectorEnlargeableSaver`, :class:`H5WriteBehind`
         """
-        if dte is None:
-            dte = self._data_to_save_export
-        self._add_data_to_saver(dte, init_step=self._h5saver_continuous.settings['N_saved'] == 0,
-                                where=where)
-        self._h5saver_continuous.settings.child('N_saved').setValue(self._h5saver_continuous.settings['N_saved'] + 1)
+        dte, bkg = self.get_data_to_save(dte, init_step=self._h5saver_continuous.settings['N_saved'] == 0)
+        if where is None and self._do_continuous_save:  # node created before the start of the writer thread
+            detector_node = self.module_and_data_saver.module_group
+        else:
+            detector_node = self.module_and_data_saver.get_set_node(where)
+        if self._h5saver_continuous.submit(self.write_data_to_saver, detector_node, dte, bkg):
+            self._h5saver_continuous.settings.child('N_saved').setValue(
+                self._h5saver_continuous.settings['N_saved'] + 1)
+        self._h5saver_continuous.update_write_behind_status()
 
     def insert_data(self, indexes: Tuple[int], where: Union[Node, str] = None,
-                    distribution=DataDistribution['uniform']):
+                    distribution=DataDistribution['uniform'], dte: DataToExport = None):
         """Insert DataToExport to a DetectorExtendedSaver at specified indexes
 
         Method to be used when saving into an already initialized array within a h5file (DAQ_Scan for instance)
@@ -629,12 +659,14 @@ class DAQ_Viewer(ParameterManager, ControlModule):
             The indexes within the extended array where to place these data
         where: Node or str
         distribution: DataDistribution enum
+        dte: DataToExport
+            The data to insert, if None the current data of this DAQ_Viewer are inserted
 
         See Also
         --------
         DAQ_Scan, DetectorExtendedSaver
         """
-        self._add_data_to_saver(self._data_to_save_export, init_step=np.all(np.array(indexes) == 0), where=where,
+        self._add_data_to_saver(dte, init_step=np.all(np.array(indexes) == 0), where=where,
                                 indexes=indexes, distribution=distribution)
 
     def _add_data_to_saver(self, dte: DataToExport, init_step=False, where=None, **kwargs):
@@ -653,22 +685,62 @@ class DAQ_Viewer(ParameterManager, ControlModule):
 
         See Also
         --------
-        DetectorSaver, DetectorEnlargeableSaver, DetectorExtendedSaver
+        DetectorSaver, DetectorEnlargeableSaver, DetectorExtendedSaver, get_data_to_save, write_data_to_saver
 
         """
         detector_node = self.module_and_data_saver.get_set_node(where)
+        dte, bkg = self.get_data_to_save(dte, init_step)
+        self.write_data_to_saver(detector_node, dte, bkg, **kwargs)
+
+    def get_data_to_save(self, dte: DataToExport = None, init_step=False) -> Tuple[DataToExport, DataToExport]:
+        """Get a snapshot of the data to be saved and of the background to be saved with them
+
+        The data are filtered by DataSource as specified in the current H5Saver and by their 'save' extra attribute.
+        As the settings are read, this should be called from the thread owning this module. The returned objects are
+        never modified afterwards so that they can be written from another thread using write_data_to_saver
+
+        Parameters
+        ----------
+        dte: DataToExport
+            The data to be saved, if None the current data of this DAQ_Viewer
+        init_step: bool
+            If True, means this is the first step of saving, the background (if any) is then to be saved too
+
+        Returns
+        -------
+        DataToExport: the data to be saved
+        DataToExport or None: the background to be saved
+        """
+        if dte is None:
+            dte = self._data_to_save_export
         dte = dte if not self.module_and_data_saver.h5saver.settings['save_raw_only'] else \
             dte.get_data_from_source('raw')  # filters depending on the source: raw or calculated
 
         dte = DataToExport(name=dte.name, data=  # filters depending on the extra argument 'save'
-                           [dwa for dwa in dte if ('save' not in dwa.extra_attributes) or
+                           [dwa.view() for dwa in dte if ('save' not in dwa.extra_attributes) or
                             ('save' in dwa.extra_attributes and dwa.save)])
+        bkg = self._bkg.view() if init_step and self._do_bkg and self._bkg is not None else None
+        return dte, bkg
 
-        self.module_and_data_saver.add_data(detector_node, dte, **kwargs)
+    def write_data_to_saver(self, detector_node: Node, dte: DataToExport, bkg: DataToExport = None, **kwargs):
+        """Write data obtained from get_data_to_save into the node of this detector
 
-        if init_step:
-            if self._do_bkg and self._bkg is not None:
-                self.module_and_data_saver.add_bkg(detector_node, self._bkg)
+        Only the h5 file is accessed, so this may be called from a saver thread
+
+        Parameters
+        ----------
+        detector_node: Node
+            the node of this detector
+        dte: DataToExport
+            The data to be saved
+        bkg: DataToExport or None
+            The background to be saved, if any
+        kwargs: dict
+            Other named parameters to be passed as is to the module_and_data_saver
+        """
+        self.module_and_data_saver.add_data(detector_node, dte, **kwargs)
+        if bkg is not None:
+            self.module_and_data_saver.add_bkg(detector_node, bkg)
 
     def _save_data(self, path=None, dte: DataToExport = None):
         """Private. Practical implementation to save data into a h5file altogether with metadata, axes, background...
@@ -741,7 +813,18 @@ class DAQ_Viewer(ParameterManager, ControlModule):
 
             if self._received_data == len(self.viewers):
                 self._grab_done = True
+                self._display_governor.display_done()
                 self.grab_done_signal.emit(self._data_to_save_export)
+                self._emit_queued_data()
+                if self._pending_display is not None:
+                    self._display_timer.start(int(np.ceil(self._display_governor.get_delay())))
+
+    def _emit_queued_data(self):
+        """Emit the data processed without being displayed while the viewers were processing the previous ones"""
+        queued_data = self._queued_data
+        self._queued_data = []
+        for dte in queued_data:
+            self.grab_done_signal.emit(dte)
 
     @property
     def current_data(self) -> DataToExport:
@@ -762,11 +845,58 @@ class DAQ_Viewer(ParameterManager, ControlModule):
         if self.ui is not None:
             self.set_data_to_viewers(data, temp=True)
 
+    @property
+    def displayed_frames(self) -> int:
+        """int: the number of data displayed since the start of the continuous grab"""
+        return self._displayed_frames
+
+    @property
+    def dropped_frames(self) -> int:
+        """int: the number of data processed (saved, exported) but not displayed since the start of the continuous
+        grab"""
+        return self._dropped_frames
+
+    @property
+    def _display_enabled(self) -> bool:
+        return self.ui is not None and self.settings['main_settings', 'show_data']
+
+    def _reset_frame_counters(self):
+        self._displayed_frames = 0
+        self._dropped_frames = 0
+        self._display_governor.reset()
+        self._update_frame_counters()
+
+    def _update_frame_counters(self):
+        self.settings.child('main_settings', 'displayed_frames').setValue(self._displayed_frames)
+        self.settings.child('main_settings', 'dropped_frames').setValue(self._dropped_frames)
+
+    @Slot()
+    def _process_mailbox(self):
+        """Process all the data posted by the detector since the last call, only the latest ones may be displayed
+
+        See Also
+        --------
+        show_data
+        """
+        dtes = self._data_mailbox.take()
+        for dte in dtes[:-1]:
+            self._process_data(dte, display=False)
+        if len(dtes) > 0:
+            self.show_data(dtes[-1])
+
+    @Slot()
+    def _show_pending_data(self):
+        """Display the latest data that were waiting for the display to be available"""
+        if self._pending_display is not None:
+            dte = self._pending_display
+            self._pending_display = None
+            self.show_data(dte)
+
     @Slot(DataToExport)
     def show_data(self, dte: DataToExport):
         """Send data to their dedicated viewers
 
-        Slot receiving data from plugins emitted with the `data_grabed_signal`
+        Slot receiving (through a mailbox) data from plugins emitted with the `data_grabed_signal`
         Process the data as specified in the settings, display them into the dedicated data viewers depending on the
         settings:
             * create a container (OrderedDict `_data_to_save_export`) with info from this DAQ_Viewer (title), a timestamp...
@@ -777,49 +907,112 @@ class DAQ_Viewer(ParameterManager, ControlModule):
             * either
                 * send grab_done_signal (to the slot _save_export_data ) to save the data
 
+        In continuous grab, the display is governed by a DisplayGovernor: data are displayed only if the previous
+        ones are displayed and if the display period (the largest of the refresh time and of a multiple of the
+        measured display duration) elapsed. Otherwise they wait to be displayed until then, unless newer data
+        replace them: they are then processed, saved and exported as usual but not displayed (and counted as
+        dropped), their export waiting for the data being displayed to be exported first, so that data are always
+        exported in their order of acquisition. With live averaging, dropped data are only accumulated, the average
+        being computed and exported with the next displayed data.
+
         Parameters
         ----------
         dte: DataToExport
 
         See Also
         --------
-        _init_show_data, _process_data
+        _init_show_data, _process_data, DisplayGovernor
+        """
+        if self._grabing and self._display_enabled:
+            if self._pending_display is not None:  # replaced by newer data
+                self._process_data(self._pending_display, display=False)
+                self._pending_display = None
+            delay = self._display_governor.get_delay()
+            if delay > 0:
+                self._pending_display = dte
+                self._display_timer.start(int(np.ceil(delay)))
+                return
+        self._process_data(dte, display=self._display_enabled)
+
+    def set_data_sink(self, sink: Callable[[DataToExport], None] = None):
+        """Set a callable receiving the data straight from the detector thread, before any processing or display
+
+        Used for headless acquisitions (see ModulesManager.grab_datas): the sink is called from the hardware thread
+        with the data formatted as the ones emitted by the grab_done_signal (but without the data computed by the
+        viewers, for instance from ROIs), while the display goes on asynchronously. Should the sink be slow, it should
+        only store the data and return.
+
+        Parameters
+        ----------
+        sink: Callable or None
+            the callable to be called with a DataToExport as argument. If None, the sink is removed
+        """
+        self._data_sink = sink
+
+    def _post_data(self, dte: DataToExport):
+        """Called from the detector thread for each grabbed data: feed the data sink (if any) then post the data
+        into the mailbox for processing and display in the main thread"""
+        sink = self._data_sink
+        if sink is not None:
+            try:
+                sink(self._format_data(dte.view()))
+            except Exception as e:
+                self.logger.exception(str(e))
+        self._data_mailbox.post(dte)
+
+    def _format_data(self, dte: DataToExport) -> DataToExport:
+        """Set this module as the origin of the data and return them as emitted by this module"""
+        for dwa in dte:
+            dwa.origin = self._title
+        return DataToExport(self._title, control_module='DAQ_Viewer', data=dte.data)
+
+    def _process_data(self, dte: DataToExport, display=True):
+        """Process the data from the detector and either send them to the viewers or emit them directly with the
+        grab_done_signal
+
+        Parameters
+        ----------
+        dte: DataToExport
+        display: bool
+            if True, the processed data are sent to the viewers and emitted once the viewers sent back their own
         """
         try:
-            dte = dte.deepcopy()
+            dte = dte.view()  # data arrays are shared as read-only views between viewers, saver and tcp client
             if self.settings.child('main_settings', 'tcpip', 'tcp_connected').value() and self._send_to_tcpip:
                 self._command_tcpip.emit(ThreadCommand('data_ready', dte))
             if self.ui is not None:
                 self.ui.data_ready = True
 
             if self.settings['main_settings', 'live_averaging']:
+                self._live_accumulator.add(dte)
+                self._ind_continuous_grab = self._live_accumulator.count
                 self.settings.child('main_settings', 'N_live_averaging').setValue(self._ind_continuous_grab)
-                _current_data = dte.deepcopy()
-
-                self._ind_continuous_grab += 1
-                if self._ind_continuous_grab > 1:
-                    self._data_to_save_export = \
-                        _current_data.average(self._data_to_save_export, self._ind_continuous_grab)
-            else:
-                for dwa in dte:
+                if not display and self._display_enabled:  # dropped frame, averaged into the next displayed one
+                    self._dropped_frames += 1
+                    return
+                averaged_data = self._live_accumulator.mean().data
+                if self._live_accumulator.compute_std and self._ind_continuous_grab > 1:
+                    averaged_data.extend(self._live_accumulator.sem().data)
+                for dwa in averaged_data:
                     dwa.origin = self._title
-                self._data_to_save_export = DataToExport(self._title, control_module='DAQ_Viewer', data=dte.data)
+                data_to_save_export = DataToExport(self._title, control_module='DAQ_Viewer', data=averaged_data)
+            else:
+                data_to_save_export = self._format_data(dte)
 
             if self._take_bkg:
-                self._bkg = self._data_to_save_export.deepcopy()
+                self._bkg = data_to_save_export.deepcopy()
                 self._take_bkg = False
 
-            if self._grabing:  # if live
-                refresh_time = self.settings['main_settings', 'refresh_time']
-                refresh = time.perf_counter() - self._start_grab_time > refresh_time / 1000
-                if refresh:
-                    self._start_grab_time = time.perf_counter()
-            else:
-                refresh = True  # if single
-            if self.ui is not None and self.settings.child('main_settings', 'show_data').value() and refresh:
+            if display:
+                self._emit_queued_data()  # if the previous display never completed
+                self._data_to_save_export = data_to_save_export
                 self._received_data = 0  # so that data send back from viewers can be properly counted
-                data_to_plot = self._data_to_save_export.get_data_from_attribute('plot', True, deepcopy=True)
-                data_to_plot.append(self._data_to_save_export.get_data_from_missing_attribute('plot', deepcopy=True))
+                self._display_governor.display_started()
+                self._displayed_frames += 1
+                if self._grabing:
+                    self._update_frame_counters()
+                data_to_plot = self._data_to_save_export.get_data_from_attribute('plot', True).view()
+                data_to_plot.append(self._data_to_save_export.get_data_from_missing_attribute('plot').view())
                 # process bkg if needed
                 if self.do_bkg and self._bkg is not None:
                     data_to_plot -= self._bkg
@@ -827,8 +1020,15 @@ class DAQ_Viewer(ParameterManager, ControlModule):
                 self._init_show_data(data_to_plot)
                 self.set_data_to_viewers(data_to_plot)
             else:
+                if not self._display_governor.busy:  # otherwise the viewers are still sending back their data
+                    self._data_to_save_export = data_to_save_export
+                if self._display_enabled:
+                    self._dropped_frames += 1
                 self._grab_done = True
-                self.grab_done_signal.emit(self._data_to_save_export)
+                if self._display_governor.busy or len(self._queued_data) != 0:
+                    self._queued_data.append(data_to_save_export)  # emitted after the data being displayed
+                else:
+                    self.grab_done_signal.emit(data_to_save_export)
 
         except Exception as e:
             self.logger.exception(str(e))
@@ -899,14 +1099,21 @@ class DAQ_Viewer(ParameterManager, ControlModule):
 
         elif param.name() == 'live_averaging':
             self.settings.child('main_settings', 'show_averaging').setValue(False)
+            self.settings.child('main_settings', 'live_averaging_sem').show(param.value())
             if param.value():
                 self.settings.child('main_settings', 'N_live_averaging').show()
                 self._ind_continuous_grab = 0
+                self._live_accumulator.reset()
                 self.settings.child('main_settings', 'N_live_averaging').setValue(0)
             else:
                 self.settings.child('main_settings', 'N_live_averaging').hide()
             #self._update_settings_signal.emit(edict(path=path, param=param, change='value'))
 
+        elif param.name() == 'live_averaging_sem':
+            self._ind_continuous_grab = 0
+            self._live_accumulator = DataAccumulator(compute_std=param.value())
+            self.settings.child('main_settings', 'N_live_averaging').setValue(0)
+
         elif param.name() in putils.iter_children(self.settings.child('main_settings', 'axes'), []):
             if self.daq_type.name == "DAQ2D":
                 if param.name() == 'use_calib':
@@ -924,6 +1131,9 @@ class DAQ_Viewer(ParameterManager, ControlModule):
         elif param.name() == 'continuous_saving_opt':
             self._h5saver_continuous.show_settings(param.value())
 
+        elif param.name() == 'refresh_time':
+            self._display_governor.refresh_time = param.value()
+
         elif param.name() == 'wait_time':
             self.command_hardware.emit(ThreadCommand('update_wait_time', [param.value()]))
 
@@ -1173,6 +1383,7 @@ class DAQ_Detector(QObject):
         self.grab_state = False
         self.single_grab = False
         self.datas: DataToExport = None
+        self._accumulator = DataAccumulator()
         self.ind_average = 0
         self.Naverage = 1
         self.average_done = False
@@ -1337,15 +1548,15 @@ class DAQ_Detector(QObject):
         if do_averaging:  # to execute if the averaging has to be done software wise
             self.ind_average += 1
             if self.ind_average == 1:
-                self.datas = data.deepcopy()
-            else:
-                self.datas = data.average(self.datas, self.ind_average)
+                self._accumulator.reset()
+            self._accumulator.add(data)
 
             if self.show_averaging:
-                self.emit_temp_data(self.datas)
+                self.emit_temp_data(self._accumulator.mean())
 
             if self.ind_average == self.Naverage:
                 self.average_done = True
+                self.datas = self._accumulator.mean()
                 self.data_detector_sig.emit(self.datas)
                 self.ind_average = 0
         else:
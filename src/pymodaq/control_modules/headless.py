@@ -0,0 +1,581 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Control modules without user interface: drive the instrument plugins (through DAQ_Detector and DAQ_Move_Hardware in
+their own thread) from scripts or from a headless DAQScan (see pymodaq.extensions.headless_scan), with the same
+programmatic API, settings and signals as DAQ_Viewer and DAQ_Move but without any widget (no settings tree, no data
+viewer)
+"""
+from __future__ import annotations
+
+from numbers import Number
+from pathlib import Path
+from typing import Callable, List, Tuple, Union
+
+from easydict import EasyDict as edict
+import numpy as np
+from qtpy.QtCore import Qt, QThread, Signal
+
+from pymodaq.utils.logger import set_logger, get_module_name
+from pymodaq.utils import daq_utils as utils
+from pymodaq.utils.daq_utils import ThreadCommand
+from pymodaq.utils.data import DataToExport, DataActuator, DataDistribution
+from pymodaq.utils.exceptions import DetectorError, ActuatorError
+from pymodaq.utils.h5modules import module_saving
+from pymodaq.utils.h5modules.backends import Node
+from pymodaq.utils.parameter import Parameter, ioxml
+from pymodaq.utils.parameter import utils as putils
+from pymodaq.utils.managers.modules_manager import (ModulesManager, DetectorsDataCollector, ModulesInitializer,
+                                                    get_preset_masters)
+import pymodaq.utils.managers.preset_manager_utils  # to register move and det types
+from pymodaq.control_modules.utils import ControlModule, DET_TYPES, get_viewer_plugins
+from pymodaq.control_modules.daq_viewer import DAQ_Detector
+from pymodaq.control_modules.daq_move import DAQ_Move_Hardware, DAQ_Move_Actuators, ACTUATOR_TYPES
+from pymodaq.control_modules.viewer_utility_classes import params as daq_viewer_params
+from pymodaq.control_modules.move_utility_classes import params as daq_move_params
+
+logger = set_logger(get_module_name(__file__))
+
+INIT_TIMEOUT = 60000  # ms, as when loading a preset in the DashBoard
+
+
+class HeadlessControlModule(ControlModule):
+    """Base class for the control modules without user interface
+
+    The settings are a plain Parameter (no ParameterTree is created), their changes outside the main_settings are
+    sent to the instrument plugin as in the DAQ_Viewer and DAQ_Move
+
+    Parameters
+    ----------
+    title: str
+        the unique name of the module
+    """
+    settings_name = 'custom_settings'
+    params = []
+    control_module_type = 'detector'
+
+    def __init__(self, title: str):
+        super().__init__()
+        self._title = title
+        self.logger = set_logger(f'{logger.name}.{title}')
+        self._init_pending = False
+        self.settings = Parameter.create(name=self.settings_name, type='group', children=self.params)
+        self.settings.child('main_settings', 'module_name').setValue(title)
+        self.settings.sigTreeStateChanged.connect(self.parameter_tree_changed)
+
+    def parameter_tree_changed(self, param, changes):
+        for param, change, data in changes:
+            path = self.settings.childPath(param)
+            if change == 'value' and path is not None:
+                self.value_changed(param)
+                if 'main_settings' not in path:
+                    self._update_settings_signal.emit(edict(path=path, param=param, change='value'))
+
+    def value_changed(self, param: Parameter):
+        """To be subclassed for actions to perform when one of the main_settings value is changed"""
+        ...
+
+    def set_settings(self, settings: Parameter):
+        """Apply the values of another Parameter having the same structure (from a preset for instance)"""
+        putils.set_param_from_param(self.settings, settings)
+
+    @property
+    def init_pending(self) -> bool:
+        """bool: True if the initialization of the hardware has been asked but has not completed yet"""
+        return self._init_pending
+
+    def init_hardware(self, do_init=True):
+        """Init (without waiting for the initialization to complete) or close the instrument plugin
+
+        See Also
+        --------
+        wait_initialized, init_modules
+        """
+        if not do_init:
+            if self._hardware_thread is not None:
+                self.command_hardware.emit(ThreadCommand(command="close"))
+        else:
+            self._init_pending = True
+            try:
+                hardware = self._create_hardware()
+                self._hardware_thread = QThread()
+                hardware.moveToThread(self._hardware_thread)
+
+                self.command_hardware[ThreadCommand].connect(hardware.queue_command)
+                hardware.status_sig[ThreadCommand].connect(self.thread_status)
+                self._update_settings_signal[edict].connect(hardware.update_settings)
+
+                self._hardware_thread.hardware = hardware
+                self._hardware_thread.start()
+                self.command_hardware.emit(ThreadCommand(
+                    self._init_command, attribute=[
+                        self.settings.child(f'{self.control_module_type}_settings').saveState(), self.controller]))
+            except Exception as e:
+                self._init_pending = False
+                self.logger.exception(str(e))
+
+    def _create_hardware(self):
+        raise NotImplementedError
+
+    @property
+    def _init_command(self) -> str:
+        raise NotImplementedError
+
+    def wait_initialized(self, timeout: int = INIT_TIMEOUT) -> bool:
+        """Block (processing the Qt events) until the initialization asked with init_hardware completes
+
+        Parameters
+        ----------
+        timeout: int
+            maximum duration to wait for, in milliseconds
+
+        Returns
+        -------
+        bool: the initialization state
+        """
+        ModulesManager.wait_for(self.init_signal, lambda: not self._init_pending, timeout)
+        return self._initialized_state
+
+    def _set_init_status(self, initialized: bool, controller=None):
+        self._init_pending = False
+        if initialized:
+            self.controller = controller
+        self._initialized_state = initialized
+        self.init_signal.emit(initialized)
+
+    def thread_status(self, status: ThreadCommand, control_module_type=None):
+        if status.command in ('show_splash', 'close_splash'):
+            if status.command == 'show_splash':
+                self.update_status(str(status.attribute))
+            self.custom_sig.emit(status)
+            return
+        if status.command == 'close':
+            self._init_pending = False
+        super().thread_status(status, self.control_module_type)
+
+    def _check_initialized(self) -> bool:
+        if not self._initialized_state:
+            self.logger.error(f'{self.title} is not initialized')
+        return self._initialized_state
+
+    def raise_timeout(self):
+        self.logger.warning(f'{self.title}: timeout occurred')
+
+    def quit_fun(self, timeout: int = INIT_TIMEOUT):
+        """Close the instrument plugin and wait for its thread to finish"""
+        if self._hardware_thread is not None and self._hardware_thread.isRunning():
+            self.init_hardware(False)
+            ModulesManager.wait_for(self.init_signal, lambda: not self._hardware_thread.isRunning(), timeout)
+        self.quit_signal.emit()
+
+    def stop(self):
+        ...
+
+    def _add_data_to_saver(self, dte: DataToExport, where=None, **kwargs):
+        node = self.module_and_data_saver.get_set_node(where)
+        self.module_and_data_saver.add_data(node, dte, **kwargs)
+
+    def get_data_to_save(self, dte: DataToExport, init_step=False) -> Tuple[DataToExport, DataToExport]:
+        """Get a snapshot of the data to be saved and None as there is no background (see
+        DAQ_Viewer.get_data_to_save)"""
+        return DataToExport(name=dte.name, data=[dwa.view() for dwa in dte]), None
+
+    def write_data_to_saver(self, node: Node, dte: DataToExport, bkg: DataToExport = None, **kwargs):
+        """Write data obtained from get_data_to_save into the node of this module (see
+        DAQ_Viewer.write_data_to_saver)"""
+        self.module_and_data_saver.add_data(node, dte, **kwargs)
+
+
+class HeadlessViewer(HeadlessControlModule):
+    """DAQ_Viewer without user interface
+
+    The data grabbed by the detector are not processed by any data viewer (so no ROI data), they are emitted as is with
+    the grab_done_signal from the detector thread.
+
+    Parameters
+    ----------
+    title: str
+        the unique name of the module
+    daq_type: str
+        one of DAQ0D, DAQ1D, DAQ2D or DAQND
+    detector: str
+        the name of the detector plugin to be used
+
+    Attributes
+    ----------
+    grab_done_signal: Signal[DataToExport]
+        emitted with the data of each grab
+    """
+    settings_name = 'daq_viewer_settings'
+    params = daq_viewer_params
+    control_module_type = 'detector'
+
+    grab_done_signal = Signal(DataToExport)
+
+    def __init__(self, title: str = 'Testing', daq_type: str = 'DAQ0D', detector: str = 'Mock'):
+        super().__init__(title)
+        if daq_type not in DET_TYPES:
+            raise DetectorError(f'{daq_type} is an invalid DAQ type, should be within {list(DET_TYPES.keys())}')
+        if detector not in [det['name'] for det in DET_TYPES[daq_type]]:
+            raise DetectorError(f'{detector} is an invalid detector for {daq_type}')
+        self._daq_type = daq_type
+        self._detector = detector
+        self._data_sink: Callable[[DataToExport], None] = None
+        self._data_to_save_export: DataToExport = None
+        self.viewers = []
+
+        self.settings.child('main_settings', 'DAQ_type').setValue(daq_type)
+        self.settings.child('main_settings', 'detector_type').setValue(detector)
+        det_params, _class = get_viewer_plugins(daq_type, detector)
+        self.settings.child('detector_settings').addChildren(det_params.children())
+
+        self.module_and_data_saver = module_saving.DetectorSaver(self)
+
+    @property
+    def daq_type(self) -> str:
+        return self._daq_type
+
+    @property
+    def detector(self) -> str:
+        return self._detector
+
+    @property
+    def Naverage(self):
+        return self.settings['main_settings', 'Naverage']
+
+    @Naverage.setter
+    def Naverage(self, ngrab: int):
+        if ngrab >= 1:
+            self.settings.child('main_settings', 'Naverage').setValue(ngrab)
+
+    @property
+    def current_data(self) -> DataToExport:
+        """ Get the data of the last grab"""
+        return self._data_to_save_export
+
+    def value_changed(self, param: Parameter):
+        if param.name() == 'wait_time':
+            self.command_hardware.emit(ThreadCommand('update_wait_time', [param.value()]))
+
+    def _create_hardware(self):
+        hardware = DAQ_Detector(self._title, self.settings, self._detector)
+        hardware.data_detector_sig[DataToExport].connect(self._post_data, Qt.DirectConnection)
+        return hardware
+
+    @property
+    def _init_command(self) -> str:
+        return 'ini_detector'
+
+    def set_data_sink(self, sink: Callable[[DataToExport], None] = None):
+        """Set a callable receiving the data of each grab from the detector thread (see DAQ_Viewer.set_data_sink)"""
+        self._data_sink = sink
+
+    def _post_data(self, dte: DataToExport):
+        """Called from the detector thread for each grabbed data"""
+        for dwa in dte:
+            dwa.origin = self._title
+        dte = DataToExport(self._title, control_module='DAQ_Viewer', data=dte.data)
+        self._data_to_save_export = dte
+        sink = self._data_sink
+        if sink is not None:
+            try:
+                sink(dte)
+            except Exception as e:
+                self.logger.exception(str(e))
+        self.grab_done_signal.emit(dte)
+
+    def snap(self):
+        """ Launch a single grab, the data will be emitted with the grab_done_signal"""
+        if not self._check_initialized():
+            return
+        self.command_hardware.emit(ThreadCommand("single", dict(Naverage=self.Naverage)))
+
+    def grab(self):
+        """ Launch a continuous grab"""
+        if not self._check_initialized():
+            return
+        self.command_hardware.emit(ThreadCommand("grab", dict(Naverage=self.Naverage)))
+
+    def stop_grab(self):
+        self.command_hardware.emit(ThreadCommand("stop_grab"))
+
+    def stop(self):
+        self.stop_grab()
+
+    def acquire(self, timeout: int = None) -> DataToExport:
+        """Do a single grab and wait for its data
+
+        Parameters
+        ----------
+        timeout: int
+            maximum duration to wait for the data, in milliseconds (default from the configuration)
+
+        Returns
+        -------
+        DataToExport: the grabbed data or None if the timeout fired
+        """
+        if timeout is None:
+            timeout = self.config('viewer', 'timeout')
+        if not self._check_initialized():
+            return None
+        collector = DetectorsDataCollector(1)
+        self.set_data_sink(collector.post)
+        try:
+            self.snap()
+            ModulesManager.wait_for(collector.all_received, lambda: collector.done, timeout)
+        finally:
+            self.set_data_sink(None)
+        return collector.received[0] if collector.done else None
+
+    def thread_status(self, status: ThreadCommand, control_module_type=None):
+        super().thread_status(status)
+        if status.command == "ini_detector":
+            self.update_status("detector initialized: " + str(status.attribute[0]['initialized']))
+            self._set_init_status(status.attribute[0]['initialized'], status.attribute[0]['controller'])
+
+    def insert_data(self, indexes: Tuple[int], where: Union[Node, str] = None,
+                    distribution=DataDistribution['uniform'], dte: DataToExport = None):
+        """Insert data into already initialized arrays within a h5file (see DAQ_Viewer.insert_data)"""
+        self._add_data_to_saver(self.get_data_to_save(dte)[0], where=where, indexes=indexes,
+                                distribution=distribution)
+
+    def get_data_to_save(self, dte: DataToExport = None, init_step=False) -> Tuple[DataToExport, DataToExport]:
+        """Get a snapshot of the data to be saved, filtered as specified by the H5Saver and by their 'save' extra
+        attribute, and None as there is no background (see DAQ_Viewer.get_data_to_save)"""
+        if dte is None:
+            dte = self._data_to_save_export
+        if self.module_and_data_saver.h5saver.settings['save_raw_only']:
+            dte = dte.get_data_from_source('raw')
+        dte = DataToExport(name=dte.name, data=[dwa.view() for dwa in dte if ('save' not in dwa.extra_attributes) or
+                                                ('save' in dwa.extra_attributes and dwa.save)])
+        return dte, None
+
+
+class HeadlessMove(HeadlessControlModule):
+    """DAQ_Move without user interface
+
+    Parameters
+    ----------
+    title: str
+        the unique name of the module
+    actuator: str
+        the name of the actuator plugin to be used
+
+    Attributes
+    ----------
+    move_done_signal: Signal[DataActuator]
+        emitted once a move is done with the reached value
+    current_value_signal: Signal[DataActuator]
+        emitted with the current value of the actuator when asked with get_actuator_value
+    """
+    settings_name = 'daq_move_settings'
+    params = daq_move_params
+    control_module_type = 'move'
+
+    move_done_signal = Signal(DataActuator)
+    current_value_signal = Signal(DataActuator)
+
+    def __init__(self, title: str = 'Testing', actuator: str = 'Mock'):
+        super().__init__(title)
+        if actuator not in ACTUATOR_TYPES:
+            raise ActuatorError(f'{actuator} is an invalid actuator, should be within {ACTUATOR_TYPES}')
+        self._actuator_type = actuator
+        self._current_value = DataActuator(title)
+        self._move_done_bool = True
+
+        self.settings.child('main_settings', 'move_type').setValue(actuator)
+        parent_module = utils.find_dict_in_list_from_key_val(DAQ_Move_Actuators, 'name', actuator)
+        class_ = getattr(getattr(parent_module['module'], 'daq_move_' + actuator), 'DAQ_Move_' + actuator)
+        move_params = Parameter.create(name='move_settings', type='group', children=getattr(class_, 'params'))
+        self.settings.child('move_settings').addChildren(move_params.children())
+
+        self.module_and_data_saver = module_saving.ActuatorSaver(self)
+
+    @property
+    def actuator(self) -> str:
+        return self._actuator_type
+
+    @property
+    def units(self):
+        return self.settings['move_settings', 'units']
+
+    @property
+    def move_done_bool(self) -> bool:
+        """bool: status of the actuator's status (done or not)"""
+        return self._move_done_bool
+
+    @property
+    def current_value(self) -> DataActuator:
+        return self._current_value
+
+    def _create_hardware(self):
+        return DAQ_Move_Hardware(self._actuator_type, self._current_value, self._title)
+
+    @property
+    def _init_command(self) -> str:
+        return 'ini_stage'
+
+    def move_abs(self, value: Union[DataActuator, Number]):
+        """Move the actuator to the absolute value, the move_done_signal will be emitted once done"""
+        if not self._check_initialized():
+            return
+        if isinstance(value, Number):
+            value = DataActuator(self.title, data=[np.array([value])])
+        self._move_done_bool = False
+        self.command_hardware.emit(ThreadCommand(command="reset_stop_motion"))
+        self.command_hardware.emit(ThreadCommand(command="move_abs", attribute=[value]))
+
+    def move_rel(self, rel_value: Union[DataActuator, Number]):
+        """Move the actuator by the relative value, the move_done_signal will be emitted once done"""
+        if not self._check_initialized():
+            return
+        if isinstance(rel_value, Number):
+            rel_value = DataActuator(self.title, data=[np.array([rel_value])])
+        self._move_done_bool = False
+        self.command_hardware.emit(ThreadCommand(command="reset_stop_motion"))
+        self.command_hardware.emit(ThreadCommand(command="move_rel", attribute=[rel_value]))
+
+    def move_home(self):
+        if not self._check_initialized():
+            return
+        self._move_done_bool = False
+        self.command_hardware.emit(ThreadCommand(command="reset_stop_motion"))
+        self.command_hardware.emit(ThreadCommand(command="move_home"))
+
+    def move_to(self, value: Union[DataActuator, Number], timeout: int = None) -> DataActuator:
+        """Move the actuator to the absolute value and wait for the move to be done
+
+        Parameters
+        ----------
+        value: DataActuator or Number
+        timeout: int
+            maximum duration to wait for, in milliseconds (default from the configuration)
+
+        Returns
+        -------
+        DataActuator: the reached value
+        """
+        if timeout is None:
+            timeout = self.config('actuator', 'timeout')
+        self.move_abs(value)
+        if not ModulesManager.wait_for(self.move_done_signal, lambda: self._move_done_bool, timeout):
+            self.logger.error(f'{self.title}: timeout while moving')
+        return self._current_value
+
+    def stop_motion(self):
+        self.command_hardware.emit(ThreadCommand(command="stop_motion"))
+
+    def stop(self):
+        self.stop_motion()
+
+    def get_actuator_value(self):
+        """Ask the current value, the current_value_signal will be emitted with it"""
+        self.command_hardware.emit(ThreadCommand(command="get_actuator_value"))
+
+    def thread_status(self, status: ThreadCommand, control_module_type=None):
+        super().thread_status(status)
+        if status.command == "ini_stage":
+            self.update_status(f"Stage initialized: {status.attribute[0]['initialized']} "
+                               f"info: {status.attribute[0]['info']}")
+            self._set_init_status(status.attribute[0]['initialized'], status.attribute[0]['controller'])
+            if self._initialized_state:
+                self.get_actuator_value()
+
+        elif status.command == "get_actuator_value" or status.command == 'check_position':
+            data_act: DataActuator = status.attribute[0]
+            data_act.name = self.title
+            self._current_value = data_act
+            self.current_value_signal.emit(self._current_value)
+
+        elif status.command == "move_done":
+            data_act: DataActuator = status.attribute[0]
+            data_act.name = self.title
+            self._current_value = data_act
+            self._move_done_bool = True
+            self.move_done_signal.emit(data_act)
+
+        elif status.command == 'outofbounds':
+            self.logger.warning(f'{self.title}: value out of bounds')
+
+    def append_data(self, dte: DataToExport = None, where: Union[Node, str] = None):
+        self._add_data_to_saver(self.get_data_to_save(dte)[0], where=where)
+
+    def get_data_to_save(self, dte: DataToExport = None, init_step=False) -> Tuple[DataToExport, DataToExport]:
+        """Get a snapshot of the data to be saved (the current value if dte is None) and None as there is no
+        background (see DAQ_Viewer.get_data_to_save)"""
+        if dte is None:
+            dte = DataToExport(name=self.title, data=[self._current_value])
+        return super().get_data_to_save(dte, init_step)
+
+
+def init_modules(modules: List[HeadlessControlModule], timeout: int = INIT_TIMEOUT) -> bool:
+    """Initialize concurrently the hardware of the modules (each one in its own thread) and wait for all of them
+
+    Returns
+    -------
+    bool: True if all the modules have been initialized
+    """
+    for module in modules:
+        module.init_hardware()
+    return all([module.wait_initialized(timeout) for module in modules])
+
+
+def load_preset(filename: Union[str, Path], init=True, timeout: int = INIT_TIMEOUT) \
+        -> Tuple[List[HeadlessMove], List[HeadlessViewer]]:
+    """Create headless actuators and detectors from a preset file (as the DashBoard does) and initialize them
+
+    All the Master modules are initialized concurrently, the Slave ones (sharing the same controller ID) as soon as
+    their Master is initialized, using its controller.
+
+    Parameters
+    ----------
+    filename: str or Path
+        the preset xml file
+    init: bool
+        if True, initialize the modules whose init option is checked in the preset
+    timeout: int
+        maximum duration to wait for the completion of the next initialization, in milliseconds
+
+    Returns
+    -------
+    tuple: the list of HeadlessMove and the list of HeadlessViewer
+
+    Raises
+    ------
+    MasterSlaveError: if the Master/Slave status of the modules sharing a controller ID is inconsistent
+
+    See Also
+    --------
+    get_preset_masters, ModulesInitializer
+    """
+    preset = Parameter.create(title='Preset', name='Preset', type='group',
+                              children=ioxml.XML_file_to_parameter(str(filename)))
+    actuators = []
+    detectors = []
+
+    def create_module(plugin_type: str, plug_name: str, plug_settings: Parameter) -> HeadlessControlModule:
+        if plugin_type == 'move':
+            module = HeadlessMove(plug_name, plug_settings['main_settings', 'move_type'])
+            actuators.append(module)
+        else:
+            module = HeadlessViewer(plug_name, plug_settings['main_settings', 'DAQ_type'],
+                                    plug_settings['main_settings', 'detector_type'])
+            detectors.append(module)
+        try:
+            module.set_settings(plug_settings)
+        except KeyError as e:
+            logger.warning(f'Could not set this setting: {str(e)}\n'
+                           f'The Preset is no more compatible with the plugin {plug_name}')
+        return module
+
+    masters = get_preset_masters(preset, create_module)
+
+    if init:
+        initializer = ModulesInitializer(masters)
+        initializer.start()
+        if not initializer.wait(timeout):
+            logger.warning('Some modules could not be initialized:\n' + '\n'.join(initializer.report()))
+    return actuators, detectors
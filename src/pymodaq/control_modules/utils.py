@@ -4,6 +4,11 @@ Created the 03/10/2022
 
 @author: Sebastien Weber
 """
+from collections import deque
+import threading
+import time
+from typing import List
+
 from easydict import EasyDict as edict
 
 from qtpy import QtCore
@@ -81,6 +86,135 @@ def get_viewer_plugins(daq_type, det_name):
     return det_params, obj
 
 
+class DataMailbox(QObject):
+    """Thread safe mailbox between a producer posting data from its own thread and a consumer in the main thread
+
+    Posted data are queued and the consumer is notified with the data_posted signal only if it is not already
+    notified, so that at most one notification waits in the Qt event queue whatever the data rate. On notification,
+    the consumer takes at once all the data posted since its last call.
+
+    Attributes
+    ----------
+    data_posted: Signal[]
+        emitted when data are posted in an empty mailbox
+    """
+    data_posted = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._notified = False
+        self._posted = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    @property
+    def posted(self) -> int:
+        """int: the number of data posted since the last reset"""
+        return self._posted
+
+    def post(self, data):
+        """Post data in the mailbox, can be called from any thread"""
+        with self._lock:
+            self._pending.append(data)
+            self._posted += 1
+            notify = not self._notified
+            self._notified = True
+        if notify:
+            self.data_posted.emit()
+
+    def take(self) -> List:
+        """Get all the data posted since the last call, the oldest first"""
+        with self._lock:
+            data = list(self._pending)
+            self._pending.clear()
+            self._notified = False
+        return data
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self._notified = False
+            self._posted = 0
+
+
+class DisplayGovernor:
+    """Decide when data can be displayed so that the display keeps up with the data rate
+
+    A new display can start only if the previous one is done and if the display period elapsed since its start. The
+    period is the largest of a minimum refresh time and of the measured display duration divided by the fraction of
+    the time the main thread may spend displaying data, so that the display adapts its rate to its own cost.
+
+    Parameters
+    ----------
+    refresh_time: float
+        the minimum period between two displays in ms
+    display_load: float
+        the maximum fraction of the time spent displaying data (between 0 and 1)
+    busy_timeout: float
+        duration in ms after which a display not signaled as done is considered done anyway
+
+    See Also
+    --------
+    pymodaq.control_modules.daq_viewer.DAQ_Viewer.show_data
+    """
+
+    def __init__(self, refresh_time: float = 0., display_load: float = config('viewer', 'display_load'),
+                 busy_timeout: float = 1000.):
+        self.refresh_time = refresh_time
+        self.display_load = display_load
+        self.busy_timeout = busy_timeout
+        self._display_duration = 0.  # exponential moving average in s
+        self._start_time: float = None
+        self._busy = False
+
+    @property
+    def display_duration(self) -> float:
+        """float: the averaged duration of a display in ms"""
+        return self._display_duration * 1000
+
+    @property
+    def period(self) -> float:
+        """float: the current minimum period between two displays in ms"""
+        return max(self.refresh_time, self.display_duration / self.display_load)
+
+    @property
+    def busy(self) -> bool:
+        """bool: True if a display is ongoing"""
+        return self._busy and (time.perf_counter() - self._start_time) * 1000 < self.busy_timeout
+
+    def get_delay(self) -> float:
+        """Get the time to wait in ms before a new display can start
+
+        If a display is ongoing, this is the time before it is considered done anyway
+        """
+        if self._start_time is None:
+            return 0.
+        elapsed = (time.perf_counter() - self._start_time) * 1000
+        if self.busy:
+            return max(0., self.busy_timeout - elapsed)
+        return max(0., self.period - elapsed)
+
+    def display_started(self):
+        self._start_time = time.perf_counter()
+        self._busy = True
+
+    def display_done(self):
+        if self._busy:
+            duration = time.perf_counter() - self._start_time
+            self._display_duration = duration if self._display_duration == 0. else \
+                0.8 * self._display_duration + 0.2 * duration
+        self._busy = False
+
+    def reset(self):
+        self._display_duration = 0.
+        self._start_time = None
+        self._busy = False
+
+
 class ControlModule(QObject):
     """Abstract Base class common to both DAQ_Move and DAQ_Viewer control modules
 
@@ -41,11 +41,17 @@ params = [
         {'title': 'Controller ID:', 'name': 'controller_ID', 'type': 'int', 'value': 0, 'default': 0, 'readonly': False},
         {'title': 'Show data and process:', 'name': 'show_data', 'type': 'bool', 'value': True, },
         {'title': 'Refresh time (ms):', 'name': 'refresh_time', 'type': 'float', 'value': 50., 'min': 0.},
+        {'title': 'Displayed frames:', 'name': 'displayed_frames', 'type': 'int', 'value': 0, 'readonly': True,
+         'tip': 'Number of data displayed since the start of the continuous grab'},
+        {'title': 'Dropped frames:', 'name': 'dropped_frames', 'type': 'int', 'value': 0, 'readonly': True,
+         'tip': 'Number of data saved or exported but not displayed to keep up with the data rate'},
         {'title': 'Naverage', 'name': 'Naverage', 'type': 'int', 'default': 1, 'value': 1, 'min': 1},
         {'title': 'Show averaging:', 'name': 'show_averaging', 'type': 'bool', 'default': False, 'value': False},
         {'title': 'Live averaging:', 'name': 'live_averaging', 'type': 'bool', 'default': False, 'value': False},
         {'title': 'N Live aver.:', 'name': 'N_live_averaging', 'type': 'int', 'default': 0, 'value': 0,
          'visible': False},
+        {'title': 'Live aver. std error:', 'name': 'live_averaging_sem', 'type': 'bool', 'default': False,
+         'value': False, 'visible': False, 'tip': 'Also export the standard error of the live averaged data'},
         {'title': 'Wait time (ms):', 'name': 'wait_time', 'type': 'int', 'default': 0, 'value': 00, 'min': 0},
         {'title': 'Continuous saving:', 'name': 'continuous_saving_opt', 'type': 'bool', 'default': False,
          'value': False},
@@ -19,7 +19,7 @@ import pymodaq.utils.gui_utils.layout as layout_mod
 from pymodaq.utils.messenger import messagebox
 from pymodaq.utils.parameter import utils as putils
 from pymodaq.utils import daq_utils as utils
-from pymodaq.utils.managers.modules_manager import ModulesManager
+from pymodaq.utils.managers.modules_manager import ModulesManager, ModulesInitializer, get_preset_masters
 from pymodaq.utils.daq_utils import get_version, find_dict_in_list_from_key_val
 from pymodaq.utils.managers.preset_manager import PresetManager
 from pymodaq.utils.managers.overshoot_manager import OvershootManager
@@ -55,6 +55,8 @@ remote_path = configmod.get_set_remote_path()
 
 extensions = extmod.get_extensions()
 
+INIT_TIMEOUT = 60000  # ms, maximum duration of the initialization of a module
+
 
 class DashBoard(QObject):
     """
@@ -673,112 +675,23 @@ class DashBoard(QObject):
             det_docks_viewer = []
             move_forms = []
 
-            # ################################################################
-            # ##### sort plugins by IDs and within the same IDs by Master and Slave status
-            plugins = []
-            plugins += [{'type': 'move', 'value': child} for child in
-                        self.preset_manager.preset_params.child('Moves').children()]
-            plugins += [{'type': 'det', 'value': child} for child in
-                        self.preset_manager.preset_params.child('Detectors').children()]
-
-            for plug in plugins:
-                plug['ID'] = plug['value'].child('params', 'main_settings', 'controller_ID').value()
-                if plug["type"] == 'det':
-                    plug['status'] = plug['value'].child('params', 'detector_settings', 'controller_status').value()
+            def create_module(plugin_type: str, plug_name: str, plug_settings):
+                self.splash_sc.showMessage('Loading {:s} module: {:s}'.format(plugin_type, plug_name),
+                                           color=Qt.white)
+                if plugin_type == 'move':
+                    plug_type = plug_settings.child('main_settings', 'move_type').value()
+                    self.add_move(plug_name, plug_settings, plug_type, move_docks, move_forms, actuators_modules)
+                    return actuators_modules[-1]
                 else:
-                    if 'multiaxes' in [child.name() for child in plug['value'].child('params',
-                                                                                     'move_settings').children()]:
-                        plug['status'] = plug['value'].child('params', 'move_settings',
-                                                             'multiaxes', 'multi_status').value()
-                    else:
-                        plug['status'] = 'Master'
-
-            IDs = list(set([plug['ID'] for plug in plugins]))
-            # %%
-            plugins_sorted = []
-            for id in IDs:
-                plug_Ids = []
-                for plug in plugins:
-                    if plug['ID'] == id:
-                        plug_Ids.append(plug)
-                plug_Ids.sort(key=lambda status: status['status'])
-                plugins_sorted.append(plug_Ids)
-            #################################################################
-            #######################
-
-            ind_det = -1
-            for plug_IDs in plugins_sorted:
-                for ind_plugin, plugin in enumerate(plug_IDs):
-                    plug_name = plugin['value'].child('name').value()
-                    plug_init = plugin['value'].child('init').value()
-                    plug_settings = plugin['value'].child('params')
-                    self.splash_sc.showMessage('Loading {:s} module: {:s}'.format(plugin['type'], plug_name),
-                                               color=Qt.white)
-
-                    if plugin['type'] == 'move':
-                        plug_type = plug_settings.child('main_settings', 'move_type').value()
-                        self.add_move(plug_name, plug_settings, plug_type, move_docks, move_forms,
-                                      actuators_modules)
-
-                        if ind_plugin == 0:  # should be a master type plugin
-                            if plugin['status'] != "Master":
-                                raise MasterSlaveError(f'The instrument {plug_name} should'
-                                                       f' be defined as Master')
-                            if plug_init:
-                                actuators_modules[-1].init_hardware_ui()
-                                QtWidgets.QApplication.processEvents()
-                                self.poll_init(actuators_modules[-1])
-                                QtWidgets.QApplication.processEvents()
-                                master_controller = actuators_modules[-1].controller
-                            elif plugin['status'] == "Master" and len(plug_IDs) > 1:
-                                raise MasterSlaveError(f'The instrument {plug_name} defined as Master has to be '
-                                                       f'initialized (init checked in the preset) in order to init '
-                                                       f'its associated slave instrument'
-                                                       )
-                        else:
-                            if plugin['status'] != "Slave":
-                                raise MasterSlaveError(f'The instrument {plug_name} should'
-                                                       f' be defined as slave')
-                            if plug_init:
-                                actuators_modules[-1].controller = master_controller
-                                actuators_modules[-1].init_hardware_ui()
-                                QtWidgets.QApplication.processEvents()
-                                self.poll_init(actuators_modules[-1])
-                                QtWidgets.QApplication.processEvents()
-                    else:
-                        ind_det += 1
-                        self.add_det(plug_name, plug_settings, det_docks_settings, det_docks_viewer,
-                                     detector_modules)
-                        QtWidgets.QApplication.processEvents()
+                    self.add_det(plug_name, plug_settings, det_docks_settings, det_docks_viewer, detector_modules)
+                    QtWidgets.QApplication.processEvents()
+                    module = detector_modules[-1]
+                    module.settings.child('main_settings', 'overshoot').show()
+                    module.overshoot_signal[bool].connect(self.stop_moves)
+                    return module
 
-                        if ind_plugin == 0:  # should be a master type plugin
-                            if plugin['status'] != "Master":
-                                raise MasterSlaveError(f'The instrument {plug_name} should'
-                                                       f' be defined as Master')
-                            if plug_init:
-                                detector_modules[-1].init_hardware_ui()
-                                QtWidgets.QApplication.processEvents()
-                                self.poll_init(detector_modules[-1])
-                                QtWidgets.QApplication.processEvents()
-                                master_controller = detector_modules[-1].controller
-                            elif plugin['status'] == "Master" and len(plug_IDs) > 1:
-                                raise MasterSlaveError(f'The instrument {plug_name} defined as Master has to be '
-                                                       f'initialized (init checked in the preset) in order to init '
-                                                       f'its associated slave instrument'
-                                                       )
-                        else:
-                            if plugin['status'] != "Slave":
-                                raise MasterSlaveError(f'The instrument {plug_name} should'
-                                                       f' be defined as Slave')
-                            if plug_init:
-                                detector_modules[-1].controller = master_controller
-                                detector_modules[-1].init_hardware_ui()
-                                QtWidgets.QApplication.processEvents()
-                                self.poll_init(detector_modules[-1])
-                                QtWidgets.QApplication.processEvents()
-
-                        detector_modules[-1].settings.child('main_settings', 'overshoot').show()
-                        detector_modules[-1].overshoot_signal[bool].connect(self.stop_moves)
+            masters = get_preset_masters(self.preset_manager.preset_params, create_module)
+            self.init_modules(masters)
 
             QtWidgets.QApplication.processEvents()
             # restore dock state if saved
@@ -796,16 +709,43 @@ class DashBoard(QObject):
             logger.error('Invalid file selected')
             return actuators_modules, detector_modules
 
-    def poll_init(self, module):
-        is_init = False
+    def init_modules(self, masters, timeout=INIT_TIMEOUT):
+        """Initialize concurrently the hardware of the modules, the Slave ones once their Master is initialized
+
+        The duration of each initialization is logged at the end
+
+        Parameters
+        ----------
+        masters: list of tuple
+            each tuple is made of a Master module and the list of its Slave modules to be initialized
+        timeout: int
+            maximum duration to wait for the completion of the next initialization, in milliseconds
+
+        Returns
+        -------
+        bool: True if all the modules have been initialized
+
+        See Also
+        --------
+        ModulesInitializer
+        """
+        initializer = ModulesInitializer(masters)
+        initializer.module_initialized.connect(
+            lambda title, initialized, duration: self.splash_sc.showMessage(
+                f'{title} {"initialized" if initialized else "could not be initialized"} in {duration:.2f} s',
+                color=Qt.white))
         tstart = perf_counter()
-        while not is_init:
-            QThread.msleep(1000)
-            QtWidgets.QApplication.processEvents()
-            is_init = module.initialized_state
-            if perf_counter() - tstart > 60:  # timeout of 60sec
-                break
-        return is_init
+        initializer.start()
+        all_initialized = initializer.wait(timeout)
+        if len(initializer.modules) != 0:
+            logger.info(f'Modules initialized in {perf_counter() - tstart:.2f} s:\n' +
+                        '\n'.join(initializer.report()))
+        return all_initialized
+
+    def poll_init(self, module, timeout=INIT_TIMEOUT):
+        """Wait for the initialization of a module (without blocking the Qt events)"""
+        ModulesManager.wait_for(module.init_signal, lambda: module.initialized_state, timeout)
+        return module.initialized_state
 
     def set_roi_configuration(self, filename):
         if not isinstance(filename, Path):
@@ -1101,10 +1041,7 @@ class DashBoard(QObject):
                             actuators_modules[-1].controller = dict(curr_point=self.pid_module.curr_points_signal,
                                                                     setpoint=self.pid_module.setpoints_signal,
                                                                     emit_curr_points=self.pid_module.emit_curr_points_sig)
-                            actuators_modules[-1].init_hardware_ui()
-                            QtWidgets.QApplication.processEvents()
-                            self.poll_init(actuators_modules[-1])
-                            QtWidgets.QApplication.processEvents()
+                            self.init_modules([(actuators_modules[-1], [])])
 
                     # Update actuators modules and module manager
                     self.actuators_modules = actuators_modules
@@ -10,8 +10,9 @@ from collections import OrderedDict
 import logging
 import os
 from pathlib import Path
+import queue
 import sys
-import tempfile
+import threading
 from typing import List, Tuple, TYPE_CHECKING
 
 import numpy as np
@@ -33,14 +34,14 @@ from pymodaq.utils.plotting.scan_selector import ScanSelector, SelectorItem
 from pymodaq.utils.scanner.scanner import Scanner, scanner_factory  #, adaptive, adaptive_losses
 from pymodaq.utils.managers.batchscan_manager import BatchScanner
 from pymodaq.utils.managers.modules_manager import ModulesManager
-from pymodaq.post_treatment.load_and_plot import LoaderPlotter
+from pymodaq.post_treatment.load_and_plot import LoaderPlotter, LiveScanData
 from pymodaq.utils.messenger import messagebox
 from pymodaq.extensions.daq_scan_ui import DAQScanUI
 
 from pymodaq.utils import daq_utils as utils
 from pymodaq.utils import gui_utils as gutils
 from pymodaq.utils.h5modules.saving import H5Saver
-from pymodaq.utils.h5modules import module_saving, data_saving
+from pymodaq.utils.h5modules import module_saving
 from pymodaq.utils.data import DataToExport, DataActuator
 
 if TYPE_CHECKING:
@@ -81,6 +82,13 @@ class DAQScan(QObject, ParameterManager):
         ]},
         {'title': 'Scan options', 'name': 'scan_options', 'type': 'group', 'children': [
             {'title': 'Naverage:', 'name': 'scan_average', 'type': 'int', 'value': 1, 'min': 1},
+            {'title': 'Pipelined saving:', 'name': 'pipelined', 'type': 'bool', 'value': False,
+             'tip': 'Save the data of a given scan point in a dedicated thread while moving to the next one'},
+            {'title': 'Saving queue size:', 'name': 'pipeline_queue_size', 'type': 'int', 'value': 10, 'min': 1,
+             'tip': 'Maximum number of scan points waiting to be saved before the scan is paused'},
+            {'title': 'Headless grab:', 'name': 'headless_grab', 'type': 'bool', 'value': False,
+             'tip': 'Collect the data straight from the detectors without waiting for their display (data computed'
+                    ' by the viewers, for instance from ROIs, are then not saved)'},
         ]},
 
         {'title': 'Plotting options', 'name': 'plot_options', 'type': 'group', 'children': [
@@ -146,9 +154,7 @@ class DAQScan(QObject, ParameterManager):
         self.module_and_data_saver = module_saving.ScanSaver(self)
         self.module_and_data_saver.h5saver = self.h5saver
 
-        self.extended_saver: data_saving.DataToExportExtendedSaver = None
-        self.h5temp: H5Saver = None
-        self.temp_path: tempfile.TemporaryDirectory = None
+        self.live_data: LiveScanData = None
 
         self.h5saver.settings.child('do_save').hide()
         self.h5saver.settings.child('custom_name').hide()
@@ -206,6 +212,9 @@ class DAQScan(QObject, ParameterManager):
         self.settings.child('time_flow', 'timeout').setValue(config['scan']['timeflow']['timeout'])
 
         self.settings.child('scan_options',  'scan_average').setValue(config['scan']['Naverage'])
+        self.settings.child('scan_options', 'pipelined').setValue(config['scan']['pipelined'])
+        self.settings.child('scan_options', 'pipeline_queue_size').setValue(config['scan']['pipeline_queue_size'])
+        self.settings.child('scan_options', 'headless_grab').setValue(config['scan']['headless_grab'])
 
     def process_ui_cmds(self, cmd: utils.ThreadCommand):
         """Process commands sent by actions done in the ui
@@ -269,13 +278,6 @@ class DAQScan(QObject, ParameterManager):
             quit_fun
         """
         try:
-            if self.temp_path is not None:
-                try:
-                    self.h5temp.close()
-                    self.temp_path.cleanup()
-                except Exception as e:
-                    logger.exception(str(e))
-
             self.h5saver.close_file()
             self.mainwindow.close()
 
@@ -685,6 +687,7 @@ class DAQScan(QObject, ParameterManager):
     #  PLOTTING
 
     def save_temp_live_data(self, scan_data: ScanDataTemp):
+        """Fill the in memory live data at the indexes of the current scan step"""
         if scan_data.scan_index == 0:
             nav_axes = self.scanner.get_nav_axes()
             Naverage = self.settings['scan_options', 'scan_average']
@@ -695,10 +698,9 @@ class DAQScan(QObject, ParameterManager):
                                               data=np.linspace(0, Naverage - 1, Naverage),
                                               index=0))
 
-            self.extended_saver.add_nav_axes(self.h5temp.raw_group, nav_axes)
+            self.live_data.set_nav_axes(nav_axes)
 
-        self.extended_saver.add_data(self.h5temp.raw_group, scan_data.data, scan_data.indexes,
-                                     distribution=self.scanner.distribution)
+        self.live_data.add_data(scan_data.indexes, scan_data.data)
         if self.settings['plot_options', 'plot_at_each_step']:
             self.update_live_plots()
 
@@ -876,20 +878,8 @@ class DAQScan(QObject, ParameterManager):
             scan_shape.extend(self.scanner.get_scan_shape())
         else:
             scan_shape = self.scanner.get_scan_shape()
-        if self.temp_path is not None:
-            try:
-                self.h5temp.close()
-                self.temp_path.cleanup()
-            except Exception as e:
-                logger.exception(str(e))
-
-        self.h5temp = H5Saver()
-        self.temp_path = tempfile.TemporaryDirectory(prefix='pymo')
-        addhoc_file_path = Path(self.temp_path.name).joinpath('temp_data.h5')
-        self.h5temp.init_file(custom_naming=True, addhoc_file_path=addhoc_file_path)
-        self.extended_saver: data_saving.DataToExportExtendedSaver =\
-            data_saving.DataToExportExtendedSaver(self.h5temp, extended_shape=scan_shape)
-        self.live_plotter.h5saver = self.h5temp
+        self.live_data = LiveScanData(scan_shape, distribution=self.scanner.distribution, average=Naverage > 1)
+        self.live_plotter.live_data = self.live_data
 
         self.prepare_viewers()
         QtWidgets.QApplication.processEvents()
@@ -969,6 +959,11 @@ class DAQScanAcquisition(QObject):
 
         self.isadaptive = self.scanner.scan_sub_type == 'Adaptive'
 
+        self.pipelined = self.scan_settings['scan_options', 'pipelined']
+        self.headless_grab = self.scan_settings['scan_options', 'headless_grab']
+        self._save_queue: queue.Queue = None
+        self._saver_thread: threading.Thread = None
+
         self.modules_manager.timeout_signal.connect(self.timeout)
         self.timeout_scan_flag = False
 
@@ -997,6 +992,11 @@ class DAQScanAcquisition(QObject):
             det.module_and_data_saver = module_saving.DetectorExtendedSaver(det, self.scan_shape)
         self.module_and_data_saver.h5saver = self.h5saver  # will update its h5saver and all submodules's h5saver
 
+        # per point running mean over the averages, saved at the end of the scan
+        self.running_mean: data_mod.DataRunningMean = \
+            data_mod.DataRunningMean(scan_shape, max_size=config('scan', 'running_mean_max_size')) \
+            if self.Naverage > 1 else None
+
     @Slot(utils.ThreadCommand)
     def queue_command(self, command):
         """Process the commands sent by the main ui
@@ -1041,6 +1041,8 @@ class DAQScanAcquisition(QObject):
             self.status_sig.emit(["Update_Status", "Acquisition has started", 'log'])
 
             self.timeout_scan_flag = False
+            if self.pipelined:
+                self.start_saver_thread()
             for ind_average in range(self.Naverage):
                 self.ind_average = ind_average
                 self.ind_scan = -1
@@ -1078,7 +1080,8 @@ class DAQScanAcquisition(QObject):
                     QThread.msleep(self.scan_settings['time_flow', 'wait_time_between'])
 
                     #grab datas and wait for grab completion
-                    self.det_done(self.modules_manager.grab_datas(positions=positions), positions)
+                    self.det_done(self.modules_manager.grab_datas(headless=self.headless_grab, positions=positions),
+                                  positions)
 
                     if self.isadaptive:
                         #todo update for v4
@@ -1097,6 +1100,9 @@ class DAQScanAcquisition(QObject):
                     # daq_scan wait time
                     QThread.msleep(self.scan_settings.child('time_flow', 'wait_time').value())
 
+            if self.pipelined:
+                self.stop_saver_thread()
+            self.save_averaged_data()
             self.h5saver.flush()
             self.modules_manager.connect_actuators(False)
             self.modules_manager.connect_detectors(False)
@@ -1106,8 +1112,83 @@ class DAQScanAcquisition(QObject):
 
         except Exception as e:
             logger.exception(str(e))
+            if self.pipelined:
+                self.stop_saver_thread()
             # self.status_sig.emit(["Update_Status", getLineInfo() + str(e), 'log'])
 
+    def start_saver_thread(self):
+        """Start the thread saving the scan points pushed into a bounded queue (pipelined mode)
+
+        When the queue is full, the scan waits for the saving of older points before going on
+        """
+        self._save_queue = queue.Queue(maxsize=self.scan_settings['scan_options', 'pipeline_queue_size'])
+        self._saver_thread = threading.Thread(target=self._saver_worker, name='DAQScanSaver', daemon=True)
+        self._saver_thread.start()
+
+    def stop_saver_thread(self):
+        """Wait for all queued scan points to be saved then stop the saver thread"""
+        if self._saver_thread is not None:
+            self._save_queue.put(None)
+            self._saver_thread.join()
+            self._saver_thread = None
+
+    def _saver_worker(self):
+        while True:
+            item = self._save_queue.get()
+            try:
+                if item is None:
+                    break
+                self.save_data(*item)
+            except Exception as e:
+                logger.exception(str(e))
+            finally:
+                self._save_queue.task_done()
+
+    def get_nav_axes(self) -> List[data_mod.Axis]:
+        """Get the navigation axes of the scan including the Average one if any"""
+        nav_axes = self.scanner.get_nav_axes()
+        if self.Naverage > 1:
+            for nav_axis in nav_axes:
+                nav_axis.index += 1
+            nav_axes.append(data_mod.Axis('Average', data=np.linspace(0, self.Naverage - 1,
+                                                                      self.Naverage),
+                                          index=0))
+        return nav_axes
+
+    def save_data(self, indexes: Tuple[int], data_to_save: list, distribution: data_mod.DataDistribution,
+                  nav_axes: List[data_mod.Axis] = None, mean_dtes: List[DataToExport] = None):
+        """Save the data of all detectors at a given scan index
+
+        Everything is prepared beforehand by the acquisition thread (see det_done) so that only the h5 file is
+        accessed here and this can be executed by the saver thread
+
+        Parameters
+        ----------
+        indexes: tuple of int
+            the indexes within the extended arrays where to save the data
+        data_to_save: list
+            the detectors, their nodes, data and background as returned by ScanSaver.get_data_to_save
+        distribution: DataDistribution
+        nav_axes: list of Axis
+            The navigation axes to be saved (at the first scan index), None otherwise
+        mean_dtes: list of DataToExport
+            The data to be added to the running mean over the averages if any (the ones saved, filtered as specified
+            by the H5Saver and the 'save' attribute of the data)
+        """
+        if nav_axes is not None:
+            self.module_and_data_saver.add_nav_axes(nav_axes, [item[0] for item in data_to_save])
+
+        self.module_and_data_saver.add_data_to_save(data_to_save, indexes, distribution)
+
+        if self.running_mean is not None and mean_dtes is not None:
+            for dte in mean_dtes:
+                self.running_mean.add(indexes[1:], dte)
+
+    def save_averaged_data(self):
+        """Save the running mean over the averages of each detector data in an Averaged group of its node"""
+        if self.running_mean is not None and len(self.running_mean) != 0:
+            self.module_and_data_saver.add_averaged_data(self.running_mean.mean(), self.scanner.get_nav_axes())
+
     def det_done(self, det_done_datas: data_mod.DataToExport, positions):
         """
 
@@ -1117,17 +1198,18 @@ class DAQScanAcquisition(QObject):
             if self.Naverage > 1:
                 indexes = [self.ind_average] + list(indexes)
             indexes = tuple(indexes)
-            if self.ind_scan == 0:
-                nav_axes = self.scanner.get_nav_axes()
-                if self.Naverage > 1:
-                    for nav_axis in nav_axes:
-                        nav_axis.index += 1
-                    nav_axes.append(data_mod.Axis('Average', data=np.linspace(0, self.Naverage - 1,
-                                                                              self.Naverage),
-                                                  index=0))
-                self.module_and_data_saver.add_nav_axes(nav_axes)
-
-            self.module_and_data_saver.add_data(indexes=indexes, distribution=self.scanner.distribution)
+
+            # everything reading the modules' settings is done here, the saving itself only accesses the h5 file. The
+            # data sent by each detector for this grab are saved (their current data may be updated asynchronously)
+            # and, filtered as the saved ones, fed to the running mean
+            data_to_save = self.module_and_data_saver.get_data_to_save(indexes, self.modules_manager.det_done_dtes)
+            item = (indexes, data_to_save, self.scanner.distribution,
+                    self.get_nav_axes() if self.ind_scan == 0 else None,
+                    [dte for _, _, dte, _ in data_to_save] if self.running_mean is not None else None)
+            if self.pipelined:
+                self._save_queue.put(item)
+            else:
+                self.save_data(*item)
 
             #todo related to adaptive (solution lies along the Enlargeable data saver)
             if self.isadaptive:
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Scans without user interface: the actuators and detectors are driven by headless control modules (see
+pymodaq.control_modules.headless), the scan is defined by a Scanner and the data are saved by the same
+DAQScanAcquisition as in the DAQScan extension, but no dashboard, dock nor data viewer is created. To be used from
+scripts or from the command line (daq_scan_headless entry point) for automated or remote acquisitions.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import sys
+import time
+from typing import List, Union
+
+from qtpy import QtWidgets
+from qtpy.QtCore import QObject, Signal, QDateTime
+
+from pymodaq.utils.logger import set_logger, get_module_name
+from pymodaq.utils.config import Config
+from pymodaq.utils import exceptions
+from pymodaq.utils.parameter import Parameter, ioxml
+from pymodaq.utils.managers.parameter_manager import ParameterManager
+from pymodaq.utils.managers.modules_manager import ModulesManager
+from pymodaq.utils.scanner.scanner import Scanner
+from pymodaq.utils.scanner.scan_factory import ScannerBase
+from pymodaq.utils.h5modules.saving import H5Saver
+from pymodaq.utils.h5modules import module_saving
+from pymodaq.control_modules.headless import HeadlessMove, HeadlessViewer, load_preset
+from pymodaq.extensions.daq_scan import DAQScan, DAQScanAcquisition
+
+config = Config()
+logger = set_logger(get_module_name(__file__))
+
+
+def save_scanner_settings(scanner: Scanner, filename: Union[str, Path]):
+    """Save the settings of a Scanner (scan type and scan parameters) into a xml file
+
+    See Also
+    --------
+    load_scanner_settings
+    """
+    settings = Parameter.create(name='scanner_file', type='group')
+    settings.addChildren([ParameterManager.create_parameter(scanner.settings),
+                          ParameterManager.create_parameter(scanner.get_scanner_sub_settings())])
+    ioxml.parameter_to_xml_file(settings, filename)
+
+
+def load_scanner_settings(scanner: Scanner, filename: Union[str, Path]):
+    """Apply to a Scanner the settings saved in a xml file with save_scanner_settings (or in a batch scan file)"""
+    settings = ParameterManager.create_parameter(Path(filename))
+    scanner.set_scan_from_settings(settings.child(Scanner.settings_name), settings.child(ScannerBase.settings_name))
+
+
+class HeadlessScan(QObject):
+    """DAQScan without user interface
+
+    The scan is done in the calling thread (blocking the run method) and the data of the detectors are collected
+    straight from their hardware thread (headless grab)
+
+    Parameters
+    ----------
+    actuators: list of HeadlessMove
+        the actuators to be used in the scan (in the order of the scanner axes)
+    detectors: list of HeadlessViewer
+        the detectors whose data are saved at each step
+    title: str
+
+    Attributes
+    ----------
+    status_signal: Signal[str]
+        emitted with the status messages of the acquisition
+    """
+    settings_name = DAQScan.settings_name
+    status_signal = Signal(str)
+
+    def __init__(self, actuators: List[HeadlessMove], detectors: List[HeadlessViewer], title='HeadlessScan'):
+        super().__init__()
+        self.title = title
+        self.ui = None
+        self.settings = Parameter.create(name=self.settings_name, type='group', children=DAQScan.params)
+        self.set_config()
+
+        self.modules_manager = ModulesManager(detectors, actuators, detectors, actuators)
+        self.modules_manager.actuator_timeout = self.settings['time_flow', 'timeout']
+        self.modules_manager.detector_timeout = self.settings['time_flow', 'timeout']
+        self.scanner = Scanner(actuators=self.modules_manager.actuators)
+        self.h5saver = H5Saver(save_type='scan')
+        self.module_and_data_saver = module_saving.ScanSaver(self)
+
+        self._acquisition: DAQScanAcquisition = None
+        self._timeout = False
+        self.scan_duration = 0.
+
+    def set_config(self):
+        self.settings.child('time_flow', 'wait_time').setValue(config['scan']['timeflow']['wait_time'])
+        self.settings.child('time_flow', 'wait_time_between').setValue(config['scan']['timeflow']['wait_time'])
+        self.settings.child('time_flow', 'timeout').setValue(config['scan']['timeflow']['timeout'])
+
+        self.settings.child('scan_options', 'scan_average').setValue(config['scan']['Naverage'])
+        self.settings.child('scan_options', 'pipelined').setValue(config['scan']['pipelined'])
+        self.settings.child('scan_options', 'pipeline_queue_size').setValue(config['scan']['pipeline_queue_size'])
+        self.settings.child('scan_options', 'headless_grab').setValue(True)  # nothing to be displayed
+        self.settings.child('plot_options', 'plot_0d').setValue(dict(all_items=[], selected=[]))
+        self.settings.child('plot_options', 'plot_1d').setValue(dict(all_items=[], selected=[]))
+
+    def load_scanner_settings(self, filename: Union[str, Path]):
+        load_scanner_settings(self.scanner, filename)
+
+    def save_scanner_settings(self, filename: Union[str, Path]):
+        save_scanner_settings(self.scanner, filename)
+
+    def set_scan(self):
+        """Compute the scan positions and check the scan can be done
+
+        Raises
+        ------
+        DAQ_ScanException: if the scan has too many steps, does not correspond to the actuators or if a module is not
+            initialized
+        """
+        if self.scanner.set_scan():
+            raise exceptions.DAQ_ScanException(
+                f'The scan settings give approximately {int(self.scanner.n_steps)} steps, more than the limit set '
+                f'in the config file ({config["scan"]["steps_limit"]})')
+        if self.modules_manager.Nactuators != self.scanner.n_axes:
+            raise exceptions.DAQ_ScanException('There are not enough or too much actuators for this scan')
+        for module in self.modules_manager.modules:
+            if not module.initialized_state:
+                raise exceptions.DAQ_ScanException(f'module {module.title} is not initialized')
+
+    def save_metadata(self, node):
+        """Save the scan information and all the settings as attributes of the scan node (see DAQScan.save_metadata)
+        """
+        attr = node.attrs
+        attr['type'] = 'scan'
+        attr['author'] = config['user']['name']
+        attr['date_time'] = QDateTime.currentDateTime().toString('dd/mm/yyyy HH:MM:ss')
+        attr['scan_type'] = self.scanner.scan_type
+        attr['scan_sub_type'] = self.scanner.scan_sub_type
+        attr['scan_name'] = node.name
+        attr['description'] = ''
+        settings_str = b'<All_settings title="All Settings" type="group">'
+        for settings in [self.settings, self.h5saver.settings, self.scanner.settings]:
+            settings_xml = ioxml.parameter_to_xml_string(settings)
+            if len(settings_str + settings_xml) < 60000:
+                # size limit for any object header (including all the other attributes) is 64kb
+                settings_str += settings_xml
+            else:
+                break
+        attr['settings'] = settings_str + b'</All_settings>'
+
+    def run(self, h5_path: Union[str, Path] = None) -> Path:
+        """Do the scan and save the data
+
+        Parameters
+        ----------
+        h5_path: str or Path
+            the h5 file where to save the scan, appended as a new scan if it exists. If None a new file is created
+            following the saving settings of the configuration
+
+        Returns
+        -------
+        Path: the h5 file where the scan has been saved
+        """
+        self.set_scan()
+        self.h5saver.init_file(update_h5=h5_path is None, addhoc_file_path=h5_path)
+        try:
+            self.module_and_data_saver.h5saver = self.h5saver
+            last_node = self.module_and_data_saver.get_last_node()
+            scan_node = self.module_and_data_saver.get_set_node(
+                new=last_node is not None and last_node.attrs['scan_done'])
+            self.save_metadata(scan_node)
+
+            self._timeout = False
+            self._acquisition = DAQScanAcquisition(self.settings, self.scanner, self.h5saver.settings,
+                                                   self.modules_manager, module_saver=self.module_and_data_saver)
+            self._acquisition.status_sig[list].connect(self.thread_status)
+            start = time.perf_counter()
+            self._acquisition.start_acquisition()
+            self.scan_duration = time.perf_counter() - start
+
+            scan_node.attrs['scan_done'] = True
+            self._acquisition.h5saver.close_file()
+            h5_file = Path(self.h5saver.settings['current_h5_file'])
+        finally:
+            self._acquisition = None
+            self.h5saver.close_file()
+        if self._timeout:
+            raise exceptions.DAQ_ScanException('Timeout during acquisition')
+        return h5_file
+
+    def stop(self):
+        """Stop the running scan (to be called from a slot, the scan processing the Qt events while waiting for the
+        actuators and the detectors)"""
+        if self._acquisition is not None:
+            self._acquisition.stop_scan_flag = True
+
+    def thread_status(self, status: list):
+        if status[0] == "Update_Status":
+            self.status_signal.emit(status[1])
+            logger.info(status[1])
+        elif status[0] == "Timeout":
+            self._timeout = True
+
+    def quit_fun(self):
+        """Close all the control modules"""
+        for module in self.modules_manager.modules_all:
+            module.quit_fun()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Do a PyMoDAQ scan without user interface')
+    parser.add_argument('preset', help='the preset xml file defining the actuators and detectors')
+    parser.add_argument('--scanner', help='xml file with the scanner settings (see --save-scanner)')
+    parser.add_argument('--save-scanner', help='save the default scanner settings for the given actuators into '
+                                               'this xml file (to be edited) then exit')
+    parser.add_argument('--h5', help='h5 file where to save the scan (a new scan is appended if it exists), '
+                                     'default from the configuration')
+    parser.add_argument('--actuators', nargs='+', help='titles of the actuators to be scanned (default: all)')
+    parser.add_argument('--detectors', nargs='+', help='titles of the detectors to be saved (default: all)')
+    parser.add_argument('--average', type=int, help='number of scan averages')
+    parser.add_argument('--pipelined', action='store_true', help='save the data in a dedicated thread')
+    args = parser.parse_args()
+
+    if 'QT_QPA_PLATFORM' not in os.environ:  # no display is needed
+        os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+    app = QtWidgets.QApplication(sys.argv)
+
+    actuators_all, detectors_all = load_preset(args.preset, init=args.save_scanner is None)
+    actuators = actuators_all if args.actuators is None else \
+        [act for title in args.actuators for act in actuators_all if act.title == title]
+    detectors = detectors_all if args.detectors is None else \
+        [det for title in args.detectors for det in detectors_all if det.title == title]
+    scan = HeadlessScan(actuators, detectors)
+    status = 0
+    try:
+        if args.save_scanner is not None:
+            scan.save_scanner_settings(args.save_scanner)
+        else:
+            if args.scanner is not None:
+                scan.load_scanner_settings(args.scanner)
+            if args.average is not None:
+                scan.settings.child('scan_options', 'scan_average').setValue(args.average)
+            if args.pipelined:
+                scan.settings.child('scan_options', 'pipelined').setValue(True)
+            h5_file = scan.run(args.h5)
+            print(f'{scan.scanner.n_steps} steps done in {scan.scan_duration:.3f} s, data saved in {h5_file}')
+    except Exception as e:
+        logger.exception(str(e))
+        print(f'Scan failed: {str(e)}', file=sys.stderr)
+        status = 1
+    finally:
+        for module in actuators_all + detectors_all:
+            module.quit_fun()
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,19 +4,105 @@ Created the 22/01/2023
 
 @author: Sebastien Weber
 """
+import copy
 import os
 import sys
-from typing import List, Union, Callable, Iterable
+from typing import List, Union, Callable, Iterable, Dict, Tuple
 
+import numpy as np
 from qtpy import QtWidgets, QtCore
 
-from pymodaq.utils.data import DataToExport, DataFromPlugins, DataDim, enum_checker
+from pymodaq.utils.data import (DataToExport, DataFromPlugins, DataDim, enum_checker, DataWithAxes, Axis,
+                                DataDistribution, DataRunningMean)
 from pymodaq.utils.h5modules.data_saving import DataLoader
 from pymodaq.utils.h5modules.saving import H5Saver
 from pymodaq.utils.plotting.data_viewers.viewer import ViewerBase, ViewersEnum, ViewerDispatcher
 from pymodaq.utils.gui_utils import Dock, DockArea
 
 
+class LiveScanData:
+    """In memory navigation arrays holding the data of a running scan, to be used for live plotting
+
+    The arrays of a given data (identified by its full name) are allocated with the full scan shape the first time
+    this data is added, then each new scan step only fills its own indexes. Getting the data doesn't copy the arrays.
+
+    For averaged scans, the running mean over the averages is updated at each step in the running_mean attribute.
+
+    Parameters
+    ----------
+    scan_shape: Iterable[int]
+        the shape of the navigation arrays (including the average dimension for averaged scans)
+    distribution: DataDistribution or str
+        the distribution of the scan
+    average: bool
+        if True, the first dimension of scan_shape is the average one
+    """
+
+    def __init__(self, scan_shape: Iterable[int], distribution: Union[DataDistribution, str] = 'uniform',
+                 average=False):
+        self._scan_shape: Tuple[int] = tuple(scan_shape)
+        self._distribution = enum_checker(DataDistribution, distribution)
+        self._nav_axes: List[Axis] = []
+        self._data: Dict[str, DataWithAxes] = dict([])
+        self._signal_shapes: Dict[str, Tuple[int]] = dict([])
+        self.running_mean: DataRunningMean = DataRunningMean(self._scan_shape[1:]) if average else None
+
+    @property
+    def scan_shape(self) -> Tuple[int]:
+        return self._scan_shape
+
+    def set_nav_axes(self, nav_axes: List[Axis]):
+        """Set the navigation axes of the scan (indexed within the scan shape), clearing the already added data"""
+        self._nav_axes = [copy.deepcopy(axis) for axis in nav_axes]
+        self.clear()
+
+    def clear(self):
+        self._data = dict([])
+        self._signal_shapes = dict([])
+        if self.running_mean is not None:
+            self.running_mean.reset()
+
+    def _allocate(self, dwa: DataWithAxes) -> DataWithAxes:
+        signal_shape = () if dwa.dim == 'Data0D' else dwa.shape
+        axes = []
+        for axis in dwa.axes:
+            axis = copy.deepcopy(axis)
+            axis.index += len(self._scan_shape)
+            axes.append(axis)
+        axes.extend([copy.deepcopy(axis) for axis in self._nav_axes])
+        data = DataWithAxes(dwa.name, source=dwa.source, dim='DataND', distribution=self._distribution,
+                            data=[np.zeros(self._scan_shape + signal_shape, dtype=array.dtype) for array in dwa],
+                            labels=dwa.labels[:], origin=dwa.origin,
+                            nav_indexes=tuple(range(len(self._scan_shape))), axes=axes)
+        data.create_missing_axes()
+        self._signal_shapes[dwa.get_full_name()] = dwa.shape
+        return data
+
+    def add_data(self, indexes: Iterable[int], data: DataToExport):
+        """Fill the navigation arrays at the given indexes with the data
+
+        Parameters
+        ----------
+        indexes: Iterable[int]
+            the indexes of this scan step within the scan shape
+        data: DataToExport
+        """
+        indexes = tuple(indexes)
+        for dwa in data:
+            full_name = dwa.get_full_name()
+            if full_name not in self._data or self._signal_shapes[full_name] != dwa.shape or \
+                    len(self._data[full_name]) != len(dwa):
+                self._data[full_name] = self._allocate(dwa)
+            for array, new_array in zip(self._data[full_name], dwa):
+                array[indexes] = new_array[0] if dwa.dim == 'Data0D' else new_array
+        if self.running_mean is not None:
+            self.running_mean.add(indexes[1:], data)
+
+    def get_data(self) -> DataToExport:
+        """Get the scan data as a DataToExport whose DataWithAxes share the navigation arrays"""
+        return DataToExport('All', data=[dwa._copy_with_new_data(dwa.data[:]) for dwa in self._data.values()])
+
+
 class LoaderPlotter:
 
     grouped_data0D_fullname = 'Grouped/Data0D'
@@ -30,6 +116,7 @@ class LoaderPlotter:
         self._h5saver: H5Saver = None
         self._data: DataToExport = None
         self.dataloader: DataLoader = None
+        self.live_data: LiveScanData = None
 
     @property
     def viewers(self) -> List[ViewerBase]:
@@ -63,8 +150,8 @@ class LoaderPlotter:
                   filter_full_names: List[str] = None, remove_navigation: bool = True,
                   group_0D=False, average_axis: int=None, average_index: int = 0,
                   last_step=False):
-        """Load Data from the h5 node of the dataloader and apply some filtering/manipulation before
-        plotting
+        """Load Data from the h5 node of the dataloader (or from the live_data if set) and apply some
+        filtering/manipulation before plotting
 
         Parameters
         ----------
@@ -90,8 +177,11 @@ class LoaderPlotter:
         DataToExport
         """
 
-        self._data = DataToExport('All')
-        self.dataloader.load_all('/', self._data)
+        if self.live_data is not None:
+            self._data = self.live_data.get_data()
+        else:
+            self._data = DataToExport('All')
+            self.dataloader.load_all('/', self._data)
 
         if average_axis is not None:
             self.average_axis(average_axis, average_index, last_step=last_step)
@@ -124,11 +214,20 @@ class LoaderPlotter:
             which step in the averaging process are we in.
         last_step: bool
             tells if this is the very last step of the (averaged) scan
+
+        Notes
+        -----
+        If the data come from a LiveScanData holding a running mean, the averaged data are not computed but taken
+        from it
         """
+        running_mean = self.live_data.running_mean if self.live_data is not None else None
         for ind, data in enumerate(self._data):
             current_data = data.inav[average_index, ...]
             if average_index > 0:
-                if last_step:
+                if running_mean is not None and data.get_full_name() in running_mean.full_names:
+                    data_to_append = current_data._copy_with_new_data(
+                        running_mean.get_mean_arrays(data.get_full_name())[:])
+                elif last_step:
                     data_to_append = data.inav[0:, ...].mean(axis=average_axis)
                 else:
                     if average_index == 1:
@@ -2,6 +2,7 @@ import os
 import sys
 import datetime
 import importlib
+import importlib.util
 import inspect
 import json
 import functools
@@ -21,7 +22,7 @@ from qtpy import QtCore
 from qtpy.QtCore import QLocale
 
 from pymodaq.utils import logger as logger_module
-from pymodaq.utils.config import get_set_preset_path, Config
+from pymodaq.utils.config import get_set_preset_path, get_set_local_dir, Config
 from pymodaq.utils.messenger import deprecation_msg
 from pymodaq.utils.qvariant import QVariant
 
@@ -571,93 +572,210 @@ def get_entrypoints(group='pymodaq.plugins'):
     return discovered_entrypoints
 
 
-@cache
-def get_instrument_plugins():  # pragma: no cover
-    """
-    Get plugins names as a list
+PLUGINS_INDEX_VERSION = 1
+VIEWER_TYPES = ['0D', '1D', '2D', 'ND']
+
+
+class InstrumentPlugin(dict):
+    """Description of an installed instrument plugin as a dictionary
+
+    The 'name' and 'type' keys are known without importing anything, the 'module' (package containing the plugin
+    module) and 'parent_module' (the plugin package) keys are imported when first accessed, together with the plugin
+    module itself, so that plugins are imported only when selected and their import errors show up at that time.
+
     Parameters
     ----------
-    plugin_type: (str) plugin type either 'daq_0Dviewer', 'daq_1Dviewer', 'daq_2Dviewer', 'daq_NDviewer' or 'daq_move'
-    module: (module) parent module of the plugins
+    name: str
+        the name of the instrument, for instance 'Mock'
+    plugin_type: str
+        either 'daq_move', 'daq_0Dviewer', 'daq_1Dviewer', 'daq_2Dviewer' or 'daq_NDviewer'
+    package: str
+        the package containing the plugin module, for instance 'pymodaq_plugins_mock.daq_move_plugins'
+    module_name: str
+        the name of the plugin module, for instance 'daq_move_Mock'
+    parent_package: str
+        the name of the plugin package, for instance 'pymodaq_plugins_mock'
+    """
+    _lazy_keys = ('module', 'parent_module')
+
+    def __init__(self, name: str, plugin_type: str, package: str, module_name: str, parent_package: str):
+        super().__init__(name=name, type=plugin_type)
+        self.package = package
+        self.module_name = module_name
+        self.parent_package = parent_package
+
+    def __getitem__(self, key):
+        if key in self._lazy_keys and not super().__contains__(key):
+            self.load()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        return key in self._lazy_keys or super().__contains__(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    @property
+    def loaded(self) -> bool:
+        return super().__contains__('module')
+
+    def load(self):
+        """Import the plugin module and return the package containing it"""
+        try:
+            module = importlib.import_module(self.package)
+            importlib.import_module(f'{self.package}.{self.module_name}')
+            parent_module = importlib.import_module(self.parent_package)
+        except Exception as e:
+            logger.error(f'Impossible to import Instrument plugin {self["name"]} from module: {self.package}: '
+                         f'{str(e)}')
+            raise
+        self.update(module=module, parent_module=parent_module)
+        return module
+
+    def to_dict(self) -> dict:
+        """Serializable description of the plugin, see from_dict"""
+        return dict(name=self['name'], type=self['type'], package=self.package, module_name=self.module_name,
+                    parent_package=self.parent_package)
+
+    @classmethod
+    def from_dict(cls, plugin_dict: dict) -> 'InstrumentPlugin':
+        return cls(plugin_dict['name'], plugin_dict['type'], plugin_dict['package'], plugin_dict['module_name'],
+                   plugin_dict['parent_package'])
+
+
+def get_plugins_index_path() -> Path:
+    """Path of the on-disk index of the installed instrument plugins"""
+    return get_set_local_dir(user=True).joinpath('instrument_plugins_index.json')
+
+
+def _get_plugin_folders(package: str) -> dict:
+    """Get the folders (if any) containing the instrument plugin modules of a package without importing it
 
     Returns
     -------
+    dict: the folder of each type of plugins ('daq_move', 'daq_0Dviewer'...)
+    """
+    spec = importlib.util.find_spec(package)
+    if spec is None or spec.submodule_search_locations is None:
+        return dict([])
+    folders = dict([])
+    for location in spec.submodule_search_locations:
+        folders['daq_move'] = Path(location).joinpath('daq_move_plugins')
+        for vtype in VIEWER_TYPES:
+            folders[f'daq_{vtype}viewer'] = Path(location).joinpath('daq_viewer_plugins', f'plugins_{vtype}')
+    return dict([(plugin_type, folder) for plugin_type, folder in folders.items() if folder.is_dir()])
+
+
+def _get_entrypoint_key(entrypoint, folders: dict) -> dict:
+    """Key identifying the installed state of a plugin package: distribution version and plugin folders mtimes"""
+    distribution = getattr(entrypoint, 'dist', None)
+    return dict(package=entrypoint.value,
+                distribution=None if distribution is None else distribution.name,
+                version=None if distribution is None else distribution.version,
+                mtimes=dict([(plugin_type, folder.stat().st_mtime) for plugin_type, folder in folders.items()]))
+
+
+def _scan_plugin_package(package: str, folders: dict) -> List[InstrumentPlugin]:
+    """List the instrument plugins of a package from the names of its modules, without importing them"""
+    plugins = []
+    for plugin_type, folder in folders.items():
+        match_name = 'daq_move' if plugin_type == 'daq_move' else f'daq_{plugin_type[4:6]}viewer'
+        subpackage = f'{package}.daq_move_plugins' if plugin_type == 'daq_move' else \
+            f'{package}.daq_viewer_plugins.plugins_{plugin_type[4:6]}'
+        for module_info in pkgutil.iter_modules([str(folder)]):
+            if match_name in module_info.name:
+                plugins.append(InstrumentPlugin(module_info.name[len(match_name) + 1:], plugin_type, subpackage,
+                                                module_info.name, package))
+                logger.info(f"Found {'Move' if plugin_type == 'daq_move' else 'Viewer'} Instrument: "
+                            f"{plugins[-1]['name']}")
+    return plugins
+
+
+def _load_plugins_index(index_path: Path) -> dict:
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if index.get('version', None) == PLUGINS_INDEX_VERSION:
+            return index['packages']
+    except Exception as e:
+        logger.debug(f'Cannot load the instrument plugins index: {str(e)}')
+    return dict([])
+
 
+def _save_plugins_index(index_path: Path, packages: dict):
+    try:
+        with open(index_path, 'w') as f:
+            json.dump(dict(version=PLUGINS_INDEX_VERSION, packages=packages), f, indent=1)
+    except Exception as e:
+        logger.debug(f'Cannot save the instrument plugins index: {str(e)}')
+
+
+def discover_instrument_plugins(use_index: bool = config('general', 'plugins_index')) -> List[InstrumentPlugin]:
+    """List the installed instrument plugins without importing them
+
+    The plugins are found from the names of the modules of the packages registered with the 'pymodaq.instruments'
+    (or the older 'pymodaq.plugins') entry point. If use_index is True, the list of plugins of each package is stored
+    in an on-disk index and only rescanned if the package version or the mtime of its plugin folders changed.
+
+    Parameters
+    ----------
+    use_index: bool
+        if True use (and update) the on-disk index
+
+    Returns
+    -------
+    list of InstrumentPlugin
     """
-    plugins_import = []
     discovered_plugins = []
     discovered_plugins_all = get_entrypoints(group='pymodaq.plugins')  # old naming of the instrument plugins
     discovered_plugins_all.extend(get_entrypoints(group='pymodaq.instruments'))  # new naming convention
     for entry in discovered_plugins_all:
         if entry.name not in [ent.name for ent in discovered_plugins]:
             discovered_plugins.append(entry)
-    logger.debug(f'Found {len(discovered_plugins)} installed plugins, trying to import them')
-    viewer_types = ['0D', '1D', '2D', 'ND']
+    logger.debug(f'Found {len(discovered_plugins)} installed plugins packages')
+
+    index_path = get_plugins_index_path() if use_index else None
+    index = _load_plugins_index(index_path) if use_index else dict([])
+    new_index = dict([])
+    plugins = []
     for entrypoint in discovered_plugins:
-        #print(f'Looking for valid instrument plugins in package: {module.value}')
-        plugin_list = []
         try:
-            try:
-                movemodule = importlib.import_module(f'{entrypoint.value}.daq_move_plugins', entrypoint.value)
-                plugin_list.extend([{'name': mod[len('daq_move') + 1:],
-                                     'module': movemodule,
-                                     'parent_module': importlib.import_module(entrypoint.value),
-                                     'type': 'daq_move'}
-                                    for mod in [mod[1] for mod in pkgutil.iter_modules([str(movemodule.path.parent)])]
-                                    if 'daq_move' in mod])
-                if len(plugin_list) > 0:
-                    logger.info(f"Found Move Instrument: {plugin_list[-1]['name']}")
-            except ModuleNotFoundError:
-                pass
-            viewer_modules = {}
-            for vtype in viewer_types:
-                try:
-                    viewer_modules[vtype] = importlib.import_module(f'{entrypoint.value}.daq_viewer_plugins.plugins_{vtype}',
-                                                    entrypoint.value)
-                    plugin_list.extend([{'name': mod[len(f'daq_{vtype}viewer') + 1:],
-                                     'module': viewer_modules[vtype],
-                                     'parent_module': importlib.import_module(entrypoint.value),
-                                     'type': f'daq_{vtype}viewer'}
-                                    for mod in [mod[1] for mod in pkgutil.iter_modules([str(viewer_modules[vtype].path.parent)])]
-                                    if f'daq_{vtype}viewer' in mod])
-                    if len(plugin_list) > 0:
-                        logger.info(f"Found Viewer Instrument: {plugin_list[-1]['name']}")
-                except ModuleNotFoundError:
-                    pass
-
-            # check if modules are importable
-            for mod in plugin_list:
-                try:
-                    plugin_type = mod['type']
-                    if plugin_type == 'daq_move':
-                        submodule = mod['module']
-                        importlib.import_module(f'{submodule.__package__}.daq_move_{mod["name"]}')
-                    else:
-                        submodule = mod['module']
-                        importlib.import_module(f'{submodule.__package__}.daq_{plugin_type[4:6]}viewer_{mod["name"]}')
-                    plugins_import.append(mod)
-                except Exception as e:  # pragma: no cover
-                    """If an error is generated at the import, then exclude this plugin"""
-                    logger.debug(f'Impossible to import Instrument plugin {mod["name"]}'
-                                 f' from module: {mod["parent_module"].__package__}')
+            folders = _get_plugin_folders(entrypoint.value)
+            key = _get_entrypoint_key(entrypoint, folders)
+            if entrypoint.name in index and index[entrypoint.name]['key'] == key:
+                package_plugins = [InstrumentPlugin.from_dict(plugin)
+                                   for plugin in index[entrypoint.name]['plugins']]
+            else:
+                package_plugins = _scan_plugin_package(entrypoint.value, folders)
+            new_index[entrypoint.name] = dict(key=key, plugins=[plugin.to_dict() for plugin in package_plugins])
+            plugins.extend(package_plugins)
         except Exception as e:  # pragma: no cover
             logger.debug(str(e))
-            
-    # add utility plugin for PID
-    try:
-        pidmodule = importlib.import_module('pymodaq.extensions.pid')
-        mod = [{'name': 'PID',
-               'module': pidmodule,
-               'parent_module': pidmodule,
-               'type': 'daq_move'}]
-        importlib.import_module(f'{pidmodule.__package__}.daq_move_PID')
-        plugins_import.extend(mod)
+    if use_index and new_index != index:
+        _save_plugins_index(index_path, new_index)
+    return plugins
 
-    except Exception as e:
-        logger.debug(f'Impossible to import PID utility plugin: {str(e)}')
 
+@cache
+def get_instrument_plugins():  # pragma: no cover
+    """
+    Get the installed instrument plugins as a list of dictionaries
+
+    The plugins are listed without being imported, see discover_instrument_plugins, each one being imported when
+    its 'module' or 'parent_module' key is first accessed, see InstrumentPlugin.
+
+    Returns
+    -------
+    list of InstrumentPlugin
+    """
+    plugins_import = discover_instrument_plugins()
+
+    # add utility plugin for PID
+    plugins_import.append(InstrumentPlugin('PID', 'daq_move', 'pymodaq.extensions.pid', 'daq_move_PID',
+                                           'pymodaq.extensions.pid'))
     return plugins_import
 
+
 def get_plugins(plugin_type='daq_0Dviewer'):  # pragma: no cover
     """
     Get plugins names as a list
@@ -670,7 +788,8 @@ def get_plugins(plugin_type='daq_0Dviewer'):  # pragma: no cover
     -------
 
     """
-    return [plug for plug in get_instrument_plugins() if plug['type'] == plugin_type]
+    return elt_as_first_element_dicts([plug for plug in get_instrument_plugins() if plug['type'] == plugin_type],
+                                      match_word='Mock')
 
 
 def check_vals_in_iterable(iterable1, iterable2):
@@ -67,6 +67,18 @@ class DataDimError(Exception):
     pass
 
 
+def is_lazy_array(obj) -> bool:
+    """Check if an object is a lazy array: a read-only proxy exposing the shape, dtype and size attributes of a
+    ndarray, returning ndarrays when indexed and loaded in memory when converted using np.asarray
+
+    See Also
+    --------
+    pymodaq.utils.h5modules.lazy.LazyArray
+    """
+    return not isinstance(obj, np.ndarray) and all([hasattr(obj, attr) for attr in
+                                                    ('shape', 'dtype', 'size', '__getitem__', '__array__')])
+
+
 class DwaType(BaseEnum):
     DataWithAxes = 0
     DataRaw = 1
@@ -461,6 +473,10 @@ class DataBase(DataLowLevel):
     origin: str
         An identifier of the element where the data originated, for instance the DAQ_Viewer's name. Used when appending
         DataToExport in DAQ_Scan to disintricate from which origin data comes from when scanning multiple detectors.
+    stacked: bool
+        If True, all the nd-arrays live in a single contiguous (n_channels, *shape) ndarray (see stacked_data), the
+        data list holding views on it. data can then also be given directly as such a (n_channels, *shape) ndarray.
+        Arithmetic, averaging, comparisons and slicing are then done with single numpy operations.
     kwargs: named parameters
         All other parameters are stored dynamically using the name/value pair. The name of these extra parameters are
         added into the extra_attributes attribute
@@ -518,13 +534,16 @@ class DataBase(DataLowLevel):
 
     def __init__(self, name: str, source: DataSource = None, dim: DataDim = None,
                  distribution: DataDistribution = DataDistribution['uniform'], data: List[np.ndarray] = None,
-                 labels: List[str] = [], origin: str = '', **kwargs):
+                 labels: List[str] = [], origin: str = '', stacked: bool = False, **kwargs):
 
         super().__init__(name=name)
         self._iter_index = 0
         self._shape = None
         self._size = None
         self._data = None
+        self._stacked = stacked
+        self._stack: np.ndarray = None
+        self._stack_rows: Tuple[np.ndarray] = None
         self._length = None
         self._labels = None
         self._dim = dim
@@ -586,46 +605,141 @@ class DataBase(DataLowLevel):
 
     def __setitem__(self, key, value):
         if isinstance(key, int) and key < len(self) and isinstance(value, np.ndarray) and value.shape == self.shape:
-            self.data[key] = value
+            if self.is_stacked:
+                self._stack[key] = value  # copied into the contiguous store
+            else:
+                self.data[key] = value
         else:
             raise IndexError(f'The index should be an positive integer lower than the data length')
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.is_stacked:  # the channels are rebuilt as views on the (copied) stack
+            state['_data'] = None
+            state['_stack_rows'] = None
+        else:
+            state['_stack'] = None
+            state['_stack_rows'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._stack is not None:
+            self._stack_rows = tuple(self._stack)
+            self._data = list(self._stack_rows)
+
+    def _set_stack(self, stack: np.ndarray):
+        """Store the data as rows of a single (n_channels, *shape) ndarray"""
+        self._stacked = True
+        self._stack = stack
+        self._stack_rows = tuple(stack)
+        self._data = list(self._stack_rows)
+
+    @property
+    def is_lazy(self) -> bool:
+        """bool: True if some of the data arrays are lazy proxies, read from a file only when sliced"""
+        return self._data is not None and any([is_lazy_array(array) for array in self._data])
+
+    def load(self) -> 'DataBase':
+        """Read in memory the lazy arrays (if any) of the data"""
+        if self.is_lazy:
+            self._data = [np.asarray(array) for array in self._data]
+        return self
+
+    @property
+    def is_stacked(self) -> bool:
+        """bool: True if the nd-arrays are views on a single contiguous (n_channels, *shape) ndarray"""
+        return self._stack is not None and self._data is not None and len(self._data) == len(self._stack_rows) and\
+            all([array is row for array, row in zip(self._data, self._stack_rows)])
+
+    @property
+    def stacked_data(self) -> np.ndarray:
+        """np.ndarray: the data as a (n_channels, *shape) ndarray, without copy if the object is stacked"""
+        if self.is_stacked:
+            return self._stack
+        return np.stack(self._data)
+
+    def stack(self):
+        """Move the nd-arrays into a single contiguous (n_channels, *shape) ndarray, the data list holding views on it
+        """
+        if not self.is_stacked:
+            self._set_stack(np.stack(self._data))
+        return self
+
+    def _copy_with_new_data(self, data: Union[List[np.ndarray], np.ndarray]) -> 'DataBase':
+        """Copy of self (metadata, axes...) whose data arrays are replaced by data without copying the original ones
+
+        data arrays should have the same shape as the original ones. If data is a (n_channels, *shape) ndarray, the
+        new object is stacked. self is not modified, so this can be called concurrently from several threads
+        """
+        state = {key: value for key, value in self.__dict__.items() if key not in ('_data', '_stack', '_stack_rows')}
+        new_data = self.__class__.__new__(self.__class__)
+        # the memo makes the attributes referring to self (the inav/isig slicers) refer to the new object
+        new_data.__dict__.update(copy.deepcopy(state, {id(self): new_data}))
+        new_data._data, new_data._stack, new_data._stack_rows = None, None, None
+        if isinstance(data, np.ndarray):
+            new_data._set_stack(data)
+        else:
+            new_data._stacked = False
+            new_data._data = data
+        return new_data
+
+    def _is_stacked_with(self, other: 'DataBase') -> bool:
+        return isinstance(other, DataBase) and self.is_stacked and other.is_stacked and \
+            self._stack.shape == other._stack.shape
+
+    def view(self) -> 'DataBase':
+        """Get a copy of self sharing the data arrays as read-only views
+
+        The arrays are not copied, so this is cheap, and any attempt to modify them in place raises a ValueError.
+        Consumers needing to modify the data should work on a deepcopy or use the arithmetic operators that return
+        new objects.
+        """
+        if self.is_stacked:
+            stack = self._stack.view()
+            stack.flags.writeable = False
+            return self._copy_with_new_data(stack)
+        arrays = []
+        for array in self._data:
+            if isinstance(array, np.ndarray):  # lazy arrays are already read-only
+                array = array.view()
+                array.flags.writeable = False
+            arrays.append(array)
+        return self._copy_with_new_data(arrays)
+
     def __add__(self, other: object):
-        if isinstance(other, DataBase) and len(other) == len(self):
-            new_data = copy.deepcopy(self)
-            for ind_array in range(len(new_data)):
+        if self._is_stacked_with(other):
+            return self._copy_with_new_data(self._stack + other._stack)
+        elif isinstance(other, DataBase) and len(other) == len(self):
+            for ind_array in range(len(self)):
                 if self[ind_array].shape != other[ind_array].shape:
                     raise ValueError('The shapes of arrays stored into the data are not consistent')
-                new_data[ind_array] = self[ind_array] + other[ind_array]
-            return new_data
+            return self._copy_with_new_data([self[ind_array] + other[ind_array] for ind_array in range(len(self))])
         elif isinstance(other, numbers.Number) and self.length == 1 and self.size == 1:
-            new_data = copy.deepcopy(self)
-            new_data = new_data + DataActuator(data=other)
-            return new_data
+            return self + DataActuator(data=other)
         else:
             raise TypeError(f'Could not add a {other.__class__.__name__} or a {self.__class__.__name__} '
                             f'of a different length')
 
     def __sub__(self, other: object):
-        if isinstance(other, DataBase) and len(other) == len(self):
-            new_data = copy.deepcopy(self)
-            for ind_array in range(len(new_data)):
-                new_data[ind_array] = self[ind_array] - other[ind_array]
-            return new_data
+        if self._is_stacked_with(other):
+            return self._copy_with_new_data(self._stack - other._stack)
+        elif isinstance(other, DataBase) and len(other) == len(self):
+            for ind_array in range(len(self)):
+                if self[ind_array].shape != other[ind_array].shape:
+                    raise ValueError('The shapes of arrays stored into the data are not consistent')
+            return self._copy_with_new_data([self[ind_array] - other[ind_array] for ind_array in range(len(self))])
         elif isinstance(other, numbers.Number) and self.length == 1 and self.size == 1:
-            new_data = copy.deepcopy(self)
-            new_data = new_data - DataActuator(data=other)
-            return new_data
+            return self - DataActuator(data=other)
         else:
             raise TypeError(f'Could not substract a {other.__class__.__name__} or a {self.__class__.__name__} '
                             f'of a different length')
 
     def __mul__(self, other):
-        if isinstance(other, numbers.Number):
-            new_data = copy.deepcopy(self)
-            for ind_array in range(len(new_data)):
-                new_data[ind_array] = self[ind_array] * other
-            return new_data
+        if isinstance(other, numbers.Number) and self.is_stacked:
+            return self._copy_with_new_data(self._stack * other)
+        elif isinstance(other, numbers.Number):
+            return self._copy_with_new_data([self[ind_array] * other for ind_array in range(len(self))])
         else:
             raise TypeError(f'Could not multiply a {other.__class__.__name__} and a {self.__class__.__name__} '
                             f'of a different length')
@@ -641,6 +755,8 @@ class DataBase(DataLowLevel):
         if isinstance(other, DataBase):
             if not(self.name == other.name and len(self) == len(other)):
                 return False
+            if self._is_stacked_with(other):
+                return bool(np.all(getattr(self._stack, operator)(other._stack)))
             eq = True
             for ind in range(len(self)):
                 if self[ind].shape != other[ind].shape:
@@ -683,9 +799,24 @@ class DataBase(DataLowLevel):
         Returns
         -------
         DataBase: the averaged DataBase object
+
+        See Also
+        --------
+        DataAccumulator: to average many objects without allocating new arrays for each of them
         """
-        if isinstance(other, DataBase) and len(other) == len(self) and isinstance(weight, numbers.Number):
-            return (other * weight + self) / (weight + 1)
+        if self._is_stacked_with(other) and isinstance(weight, numbers.Number):
+            stack = np.multiply(other._stack, weight, dtype=np.result_type(other._stack, float))
+            np.add(stack, self._stack, out=stack)
+            np.divide(stack, weight + 1, out=stack)
+            return other._copy_with_new_data(stack)
+        elif isinstance(other, DataBase) and len(other) == len(self) and isinstance(weight, numbers.Number):
+            arrays = []
+            for ind_array in range(len(self)):
+                array = np.multiply(other[ind_array], weight, dtype=np.result_type(other[ind_array], float))
+                np.add(array, self[ind_array], out=array)
+                np.divide(array, weight + 1, out=array)
+                arrays.append(array)
+            return other._copy_with_new_data(arrays)
         else:
             raise TypeError(f'Could not average a {other.__class__.__name__} or a {self.__class__.__name__} '
                             f'of a different length')
@@ -693,19 +824,28 @@ class DataBase(DataLowLevel):
     def abs(self):
         """ Take the absolute value of itself"""
         new_data = copy.copy(self)
-        new_data.data = [np.abs(dat) for dat in new_data]
+        if self.is_stacked:
+            new_data._set_stack(np.abs(self._stack))
+        else:
+            new_data.data = [np.abs(dat) for dat in new_data]
         return new_data
 
     def flipud(self):
         """Reverse the order of elements along axis 0 (up/down)"""
         new_data = copy.copy(self)
-        new_data.data = [np.flipud(dat) for dat in new_data]
+        if self.is_stacked:
+            new_data._set_stack(np.flip(self._stack, axis=1))
+        else:
+            new_data.data = [np.flipud(dat) for dat in new_data]
         return new_data
 
     def fliplr(self):
         """Reverse the order of elements along axis 1 (left/right)"""
         new_data = copy.copy(self)
-        new_data.data = [np.fliplr(dat) for dat in new_data]
+        if self.is_stacked:
+            new_data._set_stack(np.flip(self._stack, axis=2))
+        else:
+            new_data.data = [np.fliplr(dat) for dat in new_data]
         return new_data
 
     def append(self, data: DataWithAxes):
@@ -797,7 +937,7 @@ class DataBase(DataLowLevel):
         if isinstance(data, list):
             if len(data) == 0:
                 is_valid = False
-            if not isinstance(data[0], np.ndarray):
+            if not (isinstance(data[0], np.ndarray) or is_lazy_array(data[0])):
                 is_valid = False
             elif len(data[0].shape) == 0:
                 is_valid = False
@@ -862,10 +1002,17 @@ class DataBase(DataLowLevel):
 
     @data.setter
     def data(self, data: List[np.ndarray]):
+        stack = None
+        if self._stacked and isinstance(data, np.ndarray) and len(data.shape) > 1:
+            stack = data
+            data = list(data)
         data = self._check_data_type(data)
         self._check_shape_dim_consistency(data)
         self._check_same_shape(data)
-        self._data = data
+        if self._stacked:
+            self._set_stack(stack if stack is not None else np.stack(data))
+        else:
+            self._data = data
 
 
 class AxesManagerBase:
@@ -1505,6 +1652,8 @@ class DataWithAxes(DataBase):
         -------
         DataWithAxes
         """
+        if self.is_stacked:
+            return self.deepcopy_with_new_data(np.mean(self._stack, axis=axis + 1), remove_axes_index=axis)
         dat_mean = []
         for dat in self.data:
             dat_mean.append(np.mean(dat, axis=axis))
@@ -1521,6 +1670,8 @@ class DataWithAxes(DataBase):
         -------
         DataWithAxes
         """
+        if self.is_stacked:
+            return self.deepcopy_with_new_data(np.sum(self._stack, axis=axis + 1), remove_axes_index=axis)
         dat_sum = []
         for dat in self.data:
             dat_sum.append(np.sum(dat, axis=axis))
@@ -1682,7 +1833,15 @@ class DataWithAxes(DataBase):
         if isinstance(slices, numbers.Number) or isinstance(slices, slice):
             slices = [slices]
         total_slices = self._compute_slices(slices, is_navigation)
-        new_arrays_data = [np.atleast_1d(np.squeeze(dat[total_slices])) for dat in self.data]
+        if self.is_stacked:
+            new_stack = self._stack[(slice(None),) + total_slices]
+            new_stack = np.squeeze(new_stack, axis=tuple([ind for ind in range(1, len(new_stack.shape))
+                                                          if new_stack.shape[ind] == 1]))
+            if len(new_stack.shape) == 1:
+                new_stack = new_stack[:, np.newaxis]
+            new_arrays_data = new_stack
+        else:
+            new_arrays_data = [np.atleast_1d(np.squeeze(dat[total_slices])) for dat in self.data]
         tmp_axes = self._am.get_signal_axes() if is_navigation else self._am.get_nav_axes()
         axes_to_append = [copy.deepcopy(axis) for axis in tmp_axes]
 
@@ -1723,7 +1882,7 @@ class DataWithAxes(DataBase):
         for ind in range(len(nav_indexes)):
             nav_indexes[ind] -= lower_indexes[nav_indexes[ind]]
         data = DataWithAxes(self.name, data=new_arrays_data, nav_indexes=tuple(nav_indexes), axes=axes,
-                            source='calculated', origin=self.origin,
+                            source='calculated', origin=self.origin, stacked=self.is_stacked,
                             labels=self.labels[:],
                             distribution=self.distribution if len(nav_indexes) != 0 else DataDistribution['uniform'])
         return data
@@ -1738,8 +1897,8 @@ class DataWithAxes(DataBase):
 
         Parameters
         ----------
-        data: list of numpy ndarray
-            The new data
+        data: list of numpy ndarray or ndarray
+            The new data, if a (n_channels, *shape) ndarray, the new object is stacked
         remove_axes_index: tuple of int
             indexes of the axis to be removed
         source: DataSource
@@ -1752,10 +1911,7 @@ class DataWithAxes(DataBase):
         DataWithAxes
         """
         try:
-            old_data = self.data
-            self._data = None
-            new_data = self.deepcopy()
-            new_data._data = data
+            new_data = self._copy_with_new_data(data)
             new_data.get_dim_from_data(data)
 
             if source is not None:
@@ -1809,8 +1965,6 @@ class DataWithAxes(DataBase):
 
         except Exception as e:
             pass
-        finally:
-            self._data = old_data
 
     def deepcopy(self):
         return copy.deepcopy(self)
@@ -1993,8 +2147,7 @@ class DataToExport(DataLowLevel):
         """
         if isinstance(other, DataToExport) and len(other) == len(self):
             new_data = copy.copy(self)
-            for ind_dfp in range(len(self)):
-                new_data[ind_dfp] = self[ind_dfp].average(other[ind_dfp], weight)
+            new_data._data = [self[ind_dfp].average(other[ind_dfp], weight) for ind_dfp in range(len(self))]
             return new_data
         else:
             raise TypeError(f'Could not average a {other.__class__.__name__} with a {self.__class__.__name__} '
@@ -2308,6 +2461,17 @@ class DataToExport(DataLowLevel):
     def deepcopy(self):
         return DataToExport('Copy', data=[data.deepcopy() for data in self])
 
+    def view(self) -> DataToExport:
+        """Get a copy of self whose DataWithAxes share their data arrays as read-only views
+
+        See Also
+        --------
+        DataBase.view
+        """
+        new_data = copy.copy(self)
+        new_data._data = [dwa.view() for dwa in self]
+        return new_data
+
     @dispatch(list)
     def append(self, data_list: List[DataWithAxes]):
         for dwa in data_list:
@@ -2339,6 +2503,303 @@ class DataScan(DataToExport):
         super().__init__(name, data, **kwargs)
 
 
+class DataAccumulator:
+    """Running accumulation of DataToExport (or DataWithAxes) objects for software averaging
+
+    The means (and optionally the sums of squared deviations from the mean) of the data arrays are stored into
+    buffers allocated when the first object is added and updated in place for the following ones (Welford's
+    algorithm, numerically stable even for signals with a large offset), so that no new array is created per added
+    object. The mean, standard deviation and standard error objects are built on demand.
+
+    If an added object doesn't have the same structure (names, number and shapes of arrays) as the previous ones, the
+    accumulation restarts from it.
+
+    Parameters
+    ----------
+    compute_std: bool
+        if True, the sums of squared deviations are also accumulated to get the standard deviation and standard error
+
+    Examples
+    --------
+    >>> accumulator = DataAccumulator(compute_std=True)
+    >>> for ind in range(10):
+    ...     accumulator.add(DataRaw('mydata', data=[np.random.rand(256, 256)]))
+    >>> accumulator.count
+    10
+    >>> mean = accumulator.mean()
+    >>> sem = accumulator.sem()
+    """
+
+    def __init__(self, compute_std=False):
+        self.compute_std = compute_std
+        self._count = 0
+        self._reference: DataToExport = None
+        self._is_dwa = False
+        self._means: List[List[np.ndarray]] = []
+        self._squares: List[List[np.ndarray]] = []
+        self._deltas: List[List[np.ndarray]] = []
+        self._buffers: List[List[np.ndarray]] = []
+
+    @property
+    def count(self) -> int:
+        """int: the number of accumulated objects"""
+        return self._count
+
+    def reset(self):
+        """Restart the accumulation, the buffers are allocated again at the next added object"""
+        self._count = 0
+        self._reference = None
+        self._means = []
+        self._squares = []
+        self._deltas = []
+        self._buffers = []
+
+    def _is_compatible(self, dte: DataToExport) -> bool:
+        if self._reference is None or len(dte) != len(self._reference):
+            return False
+        for dwa, dwa_ref in zip(dte, self._reference):
+            if dwa.name != dwa_ref.name or len(dwa) != len(dwa_ref) or dwa.shape != dwa_ref.shape:
+                return False
+        return True
+
+    def _allocate(self, dte: DataToExport):
+        self._means = [[np.zeros(array.shape, dtype=np.result_type(array.dtype, np.float64)) for array in dwa]
+                       for dwa in dte]
+        self._deltas = [[np.zeros_like(mean) for mean in means] for means in self._means]
+        if self.compute_std:
+            self._squares = [[np.zeros(array.shape) for array in dwa] for dwa in dte]
+            self._buffers = [[np.zeros(array.shape) for array in dwa] for dwa in dte]
+        self._count = 0
+
+    def add(self, data: Union[DataToExport, DataWithAxes]):
+        """Accumulate the arrays of a DataToExport or a DataWithAxes
+
+        Parameters
+        ----------
+        data: DataToExport or DataWithAxes
+        """
+        self._is_dwa = isinstance(data, DataWithAxes)
+        dte = DataToExport(data.name, data=[data]) if self._is_dwa else data
+        if self._count == 0 or not self._is_compatible(dte):
+            self._allocate(dte)
+        self._count += 1
+        for ind_dwa, dwa in enumerate(dte):
+            for ind_array, array in enumerate(dwa):
+                mean = self._means[ind_dwa][ind_array]
+                delta = self._deltas[ind_dwa][ind_array]
+                np.subtract(array, mean, out=delta)
+                if self.compute_std:  # M2 += delta * (x - new mean) = |delta|^2 * (n - 1) / n
+                    buffer = self._buffers[ind_dwa][ind_array]
+                    if np.iscomplexobj(delta):
+                        np.abs(delta, out=buffer)
+                        np.multiply(buffer, buffer, out=buffer)
+                    else:
+                        np.multiply(delta, delta, out=buffer)
+                    np.multiply(buffer, (self._count - 1) / self._count, out=buffer)
+                    np.add(self._squares[ind_dwa][ind_array], buffer, out=self._squares[ind_dwa][ind_array])
+                np.divide(delta, self._count, out=delta)
+                np.add(mean, delta, out=mean)
+        self._reference = dte
+
+    def _to_data(self, arrays: List[List[np.ndarray]], suffix='') -> Union[DataToExport, DataWithAxes]:
+        dte = copy.copy(self._reference)
+        dte._data = []
+        for dwa, dwa_arrays in zip(self._reference, arrays):
+            new_dwa = dwa._copy_with_new_data(dwa_arrays)
+            if suffix != '':
+                new_dwa.name = f'{dwa.name}_{suffix}'
+                new_dwa._source = DataSource['calculated']
+            dte._data.append(new_dwa)
+        return dte[0] if self._is_dwa else dte
+
+    def mean(self) -> Union[DataToExport, DataWithAxes]:
+        """Get the mean of the accumulated data (same type and metadata as the last added object)
+
+        The arrays are copies of the running means, not modified by the next added objects
+        """
+        if self._count == 0:
+            raise ValueError('No data has been accumulated')
+        return self._to_data([[array.copy() for array in means] for means in self._means])
+
+    def std(self) -> Union[DataToExport, DataWithAxes]:
+        """Get the standard deviation of the accumulated data (named with a _std suffix)"""
+        return self._to_data(self._get_std(), 'std')
+
+    def sem(self) -> Union[DataToExport, DataWithAxes]:
+        """Get the standard error of the mean of the accumulated data (named with a _sem suffix)"""
+        return self._to_data(self._get_std(1 / np.sqrt(self._count)), 'sem')
+
+    def _get_std(self, factor: float = 1.) -> List[List[np.ndarray]]:
+        if not self.compute_std:
+            raise ValueError('The standard deviation is only available if compute_std is True')
+        if self._count == 0:
+            raise ValueError('No data has been accumulated')
+        stds = []
+        for squares in self._squares:
+            arrays = []
+            for array_square in squares:
+                std = np.divide(array_square, self._count)
+                np.sqrt(std, out=std)
+                if factor != 1.:
+                    np.multiply(std, factor, out=std)
+                arrays.append(std)
+            stds.append(arrays)
+        return stds
+
+
+class DataRunningMean:
+    """Per point running mean of data acquired at given navigation indexes, for instance over the successive sweeps
+    of an averaged scan
+
+    For each DataWithAxes (identified by its full name), the means (and optionally the sums of squared deviations, to
+    get the variance) of its arrays at each navigation point are stored into arrays of shape nav_shape + signal shape
+    allocated when this data is first added. Adding a new point updates in place only this point (Welford's
+    algorithm) whatever the number of already added values.
+
+    Parameters
+    ----------
+    nav_shape: Iterable[int]
+        the shape of the navigation points
+    compute_variance: bool
+        if True, the variance is also computed
+    max_size: int
+        if not None, the maximum number of values (number of navigation points times the size of the data) of the
+        averaged arrays. Larger data (typically camera frames over large scans) are not averaged
+
+    Examples
+    --------
+    >>> running_mean = DataRunningMean((10,))
+    >>> for ind_average in range(5):
+    ...     for ind in range(10):
+    ...         running_mean.add((ind,), DataRaw('mydata', data=[np.random.rand(256)], origin='det'))
+    >>> running_mean.get_count('det/mydata')[0]
+    5
+    >>> mean = running_mean.mean()
+    >>> mean[0].shape
+    (10, 256)
+    """
+
+    def __init__(self, nav_shape: IterableType[int], compute_variance=False, max_size: int = None):
+        self._nav_shape = tuple(nav_shape)
+        self.compute_variance = compute_variance
+        self.max_size = max_size
+        self._too_large: set = set([])
+        self._references: dict = dict([])
+        self._counts: dict = dict([])
+        self._means: dict = dict([])
+        self._squares: dict = dict([])
+
+    def __len__(self):
+        return len(self._references)
+
+    @property
+    def nav_shape(self) -> Tuple[int]:
+        return self._nav_shape
+
+    @property
+    def full_names(self) -> List[str]:
+        """List[str]: the full names of the averaged data"""
+        return list(self._references.keys())
+
+    def reset(self):
+        self._too_large = set([])
+        self._references = dict([])
+        self._counts = dict([])
+        self._means = dict([])
+        self._squares = dict([])
+
+    def _allocate(self, dwa: DataWithAxes) -> bool:
+        """Allocate the arrays of the running mean of dwa if their size is allowed, return True if allocated"""
+        full_name = dwa.get_full_name()
+        signal_shape = () if dwa.dim == 'Data0D' else dwa.shape
+        for arrays in (self._references, self._counts, self._means, self._squares):
+            arrays.pop(full_name, None)
+        if self.max_size is not None and int(np.prod(self._nav_shape + signal_shape)) > self.max_size:
+            if full_name not in self._too_large:
+                self._too_large.add(full_name)
+                logger.warning(f'The running mean of {full_name} is not computed: its size would be larger than '
+                               f'{self.max_size} values')
+            return False
+        self._references[full_name] = dwa._copy_with_new_data([])
+        self._counts[full_name] = np.zeros(self._nav_shape, dtype=int)
+        self._means[full_name] = [np.zeros(self._nav_shape + signal_shape,
+                                           dtype=np.result_type(array.dtype, np.float64)) for array in dwa]
+        if self.compute_variance:
+            self._squares[full_name] = [np.zeros(self._nav_shape + signal_shape) for _ in dwa]
+        return True
+
+    def add(self, indexes: IterableType[int], data: Union[DataToExport, DataWithAxes]):
+        """Update the running means at the given navigation indexes with the arrays of a DataToExport or DataWithAxes
+
+        If a DataWithAxes doesn't have the same structure (number and shapes of arrays) as the previous ones with the
+        same full name, its averaging restarts from it. DataWithAxes whose running mean would exceed max_size are
+        ignored.
+
+        Parameters
+        ----------
+        indexes: Iterable[int]
+            the navigation indexes of the point
+        data: DataToExport or DataWithAxes
+        """
+        indexes = tuple(indexes)
+        dwas = [data] if isinstance(data, DataWithAxes) else data
+        for dwa in dwas:
+            full_name = dwa.get_full_name()
+            if full_name not in self._references or self._references[full_name].shape != dwa.shape or \
+                    len(self._means[full_name]) != len(dwa):
+                if not self._allocate(dwa):
+                    continue
+            self._counts[full_name][indexes] += 1
+            count = self._counts[full_name][indexes]
+            for ind_array, array in enumerate(dwa):
+                value = array[0] if dwa.dim == 'Data0D' else array
+                mean = self._means[full_name][ind_array]
+                delta = value - mean[indexes]
+                mean[indexes] += delta / count
+                if self.compute_variance:
+                    self._squares[full_name][ind_array][indexes] += np.real(np.conj(delta) *
+                                                                            (value - mean[indexes]))
+
+    def get_count(self, full_name: str) -> np.ndarray:
+        """Get the number of values added at each navigation point for the data with the given full name"""
+        return self._counts[full_name]
+
+    def get_mean_arrays(self, full_name: str) -> List[np.ndarray]:
+        """Get the arrays (shared, not copied) holding the running means of the data with the given full name"""
+        return self._means[full_name]
+
+    def _to_data(self, arrays: dict, suffix='') -> DataToExport:
+        dte = DataToExport('Averaged')
+        for full_name, reference in self._references.items():
+            axes = []
+            for axis in reference.axes:
+                axis = copy.deepcopy(axis)
+                axis.index += len(self._nav_shape)
+                axes.append(axis)
+            dte._data.append(DataCalculated(f'{reference.name}_{suffix}' if suffix != '' else reference.name,
+                                            data=arrays[full_name], labels=reference.labels[:],
+                                            origin=reference.origin, dim='DataND', axes=axes,
+                                            nav_indexes=tuple(range(len(self._nav_shape)))))
+        return dte
+
+    def mean(self) -> DataToExport:
+        """Get the running means as a DataToExport of DataCalculated whose navigation indexes are the first ones
+
+        The navigation axes are not included, only the signal ones. The arrays are shared, not copied
+        """
+        return self._to_data(self._means)
+
+    def variance(self) -> DataToExport:
+        """Get the variance (named with a _variance suffix) of the values added at each navigation point"""
+        if not self.compute_variance:
+            raise ValueError('The variance is only available if compute_variance is True')
+        variances = dict([])
+        for full_name, squares in self._squares.items():
+            count = self._counts[full_name].reshape(self._nav_shape + (1,) * (squares[0].ndim - len(self._nav_shape)))
+            variances[full_name] = [array / np.maximum(count, 1) for array in squares]
+        return self._to_data(variances, 'variance')
+
+
 if __name__ == '__main__':
 
 
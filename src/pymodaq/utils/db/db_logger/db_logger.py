@@ -1,6 +1,8 @@
 import logging
 import datetime
-from typing import List
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
 
 from pymodaq.utils.logger import set_logger, get_module_name, get_module_name
 from pymodaq.utils.config import Config
@@ -37,30 +39,78 @@ class DBLogHandler(logging.StreamHandler):
         self.dblogger.add_log(msg)
 
 
+DATA_MODELS = (Data0D, Data1D, Data2D)
+MAX_MODULE_ID_RETRY_DELAY = 60.  # s
+DATA_COLUMNS = ('timestamp', 'control_module_id', 'channel', 'value')
+
+
 class DbLogger:
+    """Log data into a database
+
+    Data are not written into the database when added but stored in columnar buffers. These are bulk inserted by a
+    background writer thread either when their size reaches `flush_size` rows or every `flush_interval` milliseconds.
+    Rows whose writing failed are kept buffered and retried at the next flush, the oldest rows being dropped if more
+    than `max_backlog` rows are waiting to be written
+
+    Parameters
+    ----------
+    database_name: str
+    ip_address: str
+    port: int
+    save2D: bool
+        if True, also log 2D data
+    url: str
+        if specified, the database URL to be used instead of the PostgreSQL one built from the other parameters
+        (for instance "sqlite:///path/to/file.db")
+    flush_size: int
+        number of buffered rows triggering their writing into the database
+    flush_interval: int
+        maximum duration in ms rows are buffered before being written into the database
+    max_backlog: int
+        maximum number of buffered rows, the oldest ones being dropped above
+    """
     user = config('network', 'logging', 'user', 'username')
     user_pwd = config('network', 'logging', 'user', 'pwd')
 
     def __init__(self, database_name, ip_address=config('network', 'logging', 'sql', 'ip'),
-                 port=config('network', 'logging', 'sql', 'port'), save2D=False):
-        """
-
-        Parameters
-        ----------
-        models_base
-        ip_address
-        port
-        database_name
-        """
+                 port=config('network', 'logging', 'sql', 'port'), save2D=False, url: str = None,
+                 flush_size: int = config('network', 'logging', 'sql', 'flush_size'),
+                 flush_interval: int = config('network', 'logging', 'sql', 'flush_interval_ms'),
+                 max_backlog: int = config('network', 'logging', 'sql', 'max_backlog')):
 
         self.ip_address = ip_address
         self.port = port
         self.database_name = database_name
+        self._url = url
 
         self.engine = None
         self.Session = None
         self._save2D = save2D
 
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_backlog = max_backlog
+        self._module_ids: Dict[str, int] = dict([])
+        self._module_id_retries: Dict[str, Tuple[float, float]] = dict([])  # next retry time and retry delay in s
+        self._buffers_lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # so that a flush returns only when previously buffered rows are written
+        self._buffers = self._empty_buffers()
+        self._backlog = 0
+        self._oldest_buffered_time: float = None
+        self._rows_written = 0
+        self._rows_dropped = 0
+        self._last_flush_duration = 0.
+        self._last_latency = 0.
+        self._flush_event = threading.Event()
+        self._stop_writer = False
+        self._writer_thread: threading.Thread = None
+
+    @property
+    def url(self) -> str:
+        if self._url is not None:
+            return self._url
+        return f"postgresql://{self.user}:{self.user_pwd}@{self.ip_address}:{self.port}/{self.database_name}"
+
     @property
     def save2D(self):
         return self._save2D
@@ -70,8 +120,14 @@ class DbLogger:
         self._save2D = value
 
     @contextmanager
-    def session_scope(self):
-        """Provide a transactional scope around a series of operations."""
+    def session_scope(self, raise_errors=False):
+        """Provide a transactional scope around a series of operations.
+
+        Parameters
+        ----------
+        raise_errors: bool
+            if True, errors are raised after the rollback of the session, otherwise they are only logged
+        """
         session = self.Session()
         try:
             yield session
@@ -79,16 +135,15 @@ class DbLogger:
         except Exception as e:
             logger.error(str(e))
             session.rollback()
+            if raise_errors:
+                raise
         finally:
             session.close()
 
     def connect_db(self):
-        url = f"postgresql://{self.user}:{self.user_pwd}@{self.ip_address}:"\
-              f"{self.port}/{self.database_name}"
-        logger.debug(f'Connecting database using: {url}')
+        logger.debug(f'Connecting database using: {self.url}')
         try:
-            self.engine = create_engine(f"postgresql://{self.user}:{self.user_pwd}@{self.ip_address}:"
-                                        f"{self.port}/{self.database_name}")
+            self.engine = create_engine(self.url)
         except ModuleNotFoundError as e:
             messagebox('warning', 'ModuleError',
                        f'The postgresql backend *psycopg2* has not been installed.\n'
@@ -106,13 +161,132 @@ class DbLogger:
 
         self.create_table()
         self.Session = sessionmaker(bind=self.engine)
+        self._module_ids = dict([])
+        self.start_writer()
         logger.debug(f'Database Connected')
         return True
 
     def close(self):
+        self.stop_writer()
         if self.engine is not None:
             self.engine.dispose()
 
+    def start_writer(self):
+        """Start the background thread writing the buffered data into the database"""
+        if self._writer_thread is None:
+            self._stop_writer = False
+            self._writer_thread = threading.Thread(target=self._writer_loop, name='DbLoggerWriter', daemon=True)
+            self._writer_thread.start()
+
+    def stop_writer(self):
+        """Stop the background writer thread after having written all buffered data"""
+        if self._writer_thread is not None:
+            self._stop_writer = True
+            self._flush_event.set()
+            self._writer_thread.join()
+            self._writer_thread = None
+
+    def _writer_loop(self):
+        while not self._stop_writer:
+            self._flush_event.wait(self.flush_interval / 1000)
+            self._flush_event.clear()
+            self.flush()
+        self.flush()
+
+    @staticmethod
+    def _empty_buffers() -> Dict[type, Dict[str, list]]:
+        return {model: {column: [] for column in DATA_COLUMNS} for model in DATA_MODELS}
+
+    def _buffer_rows(self, model: type, timestamp: float, module_id: int, channel: str, value):
+        buffer = self._buffers[model]
+        buffer['timestamp'].append(timestamp)
+        buffer['control_module_id'].append(module_id)
+        buffer['channel'].append(channel)
+        buffer['value'].append(value)
+
+    def _requeue_rows(self, buffers: Dict[type, Dict[str, list]], oldest_buffered_time: float):
+        """Put back rows whose writing failed in front of the rows buffered in the meantime"""
+        with self._buffers_lock:
+            for model, columns in buffers.items():
+                for column, values in columns.items():
+                    self._buffers[model][column][:0] = values
+                self._backlog += len(columns['timestamp'])
+            if self._oldest_buffered_time is None or oldest_buffered_time < self._oldest_buffered_time:
+                self._oldest_buffered_time = oldest_buffered_time
+            self._drop_oldest_rows()
+
+    def _drop_oldest_rows(self):
+        """Drop the oldest buffered rows of each table so that no more than max_backlog rows are buffered
+
+        To be called while holding the buffers lock
+        """
+        excess = self._backlog - self.max_backlog
+        if excess <= 0:
+            return
+        ndropped = 0
+        for model, columns in self._buffers.items():
+            nrows = min(excess - ndropped, len(columns['timestamp']))
+            for values in columns.values():
+                del values[:nrows]
+            ndropped += nrows
+        self._backlog -= ndropped
+        self._rows_dropped += ndropped
+        logger.warning(f'{ndropped} rows have been dropped as the database cannot keep up with the data rate')
+
+    def flush(self):
+        """Write all buffered rows into the database using one bulk insert per table
+
+        If the writing fails, the rows are buffered again to be written at the next flush
+        """
+        if self.Session is None:  # not connected yet, keep buffering
+            return
+        with self._flush_lock:
+            with self._buffers_lock:
+                if self._backlog == 0:
+                    return
+                buffers = self._buffers
+                oldest_buffered_time = self._oldest_buffered_time
+                self._buffers = self._empty_buffers()
+                self._backlog = 0
+                self._oldest_buffered_time = None
+
+            tzero = time.perf_counter()
+            nrows = 0
+            try:
+                with self.session_scope(raise_errors=True) as session:
+                    for model, columns in buffers.items():
+                        if len(columns['timestamp']) != 0:
+                            mappings = [dict(zip(DATA_COLUMNS, row))
+                                        for row in zip(*[columns[col] for col in DATA_COLUMNS])]
+                            session.bulk_insert_mappings(model, mappings)
+                            nrows += len(mappings)
+            except Exception:
+                self._requeue_rows(buffers, oldest_buffered_time)
+                return
+            self._rows_written += nrows
+            self._last_flush_duration = time.perf_counter() - tzero
+            self._last_latency = time.perf_counter() - oldest_buffered_time
+
+    @property
+    def backlog(self) -> int:
+        """Number of buffered rows waiting to be written into the database"""
+        return self._backlog
+
+    def get_stats(self) -> dict:
+        """Get metrics about the writing of the data into the database
+
+        Returns
+        -------
+        dict with keys:
+            * backlog: number of rows waiting to be written
+            * rows_written: total number of rows written since the creation of this object
+            * rows_dropped: total number of rows dropped because too many rows were waiting to be written
+            * flush_duration: duration in seconds of the last bulk insertion
+            * latency: time in seconds spent by the oldest row of the last bulk insertion before being written
+        """
+        return dict(backlog=self._backlog, rows_written=self._rows_written, rows_dropped=self._rows_dropped,
+                    flush_duration=self._last_flush_duration, latency=self._last_latency)
+
     def create_table(self):
         # create tables if not existing
         if self.engine is not None:
@@ -163,6 +337,40 @@ class DbLogger:
         """
         self.add_control_modules(actuators, 'DAQ_Move')
 
+    def get_module_id(self, module_name: str, module_type='DAQ_Viewer') -> Optional[int]:
+        """Get the database id of a given control module, creating it if needed
+
+        Ids are cached so that the database is only queried once per control module. If the query fails, the
+        database is not queried again for this module before a delay starting at flush_interval and doubled at each
+        failure (up to MAX_MODULE_ID_RETRY_DELAY), so that an unreachable database doesn't stall each call
+
+        Returns
+        -------
+        int or None: the id or None if it could not be obtained from the database
+        """
+        if module_name not in self._module_ids:
+            if module_name in self._module_id_retries and \
+                    time.perf_counter() < self._module_id_retries[module_name][0]:
+                return None
+            try:
+                with self.session_scope(raise_errors=True) as session:
+                    module = session.query(ControlModule).filter_by(name=module_name).first()
+                    if module is None:
+                        module = ControlModule(name=module_name, module_type=module_type)
+                        session.add(module)
+                        session.flush()
+                    module_id = module.id
+            except Exception as e:
+                delay = min(2 * self._module_id_retries[module_name][1], MAX_MODULE_ID_RETRY_DELAY) \
+                    if module_name in self._module_id_retries else self.flush_interval / 1000
+                self._module_id_retries[module_name] = (time.perf_counter() + delay, delay)
+                logger.error(f'Could not get the id of {module_name} from the database ({str(e)}), its data are not '
+                             f'logged for the next {delay:.1f} s')
+                return None
+            self._module_ids[module_name] = module_id  # only cached once committed
+            self._module_id_retries.pop(module_name, None)
+        return self._module_ids[module_name]
+
     def add_control_modules(self, modules, module_type='DAQ_Viewer'):
         if not isinstance(modules, list):
             modules = [modules]
@@ -182,33 +390,43 @@ class DbLogger:
             session.add(LogInfo(log))
 
     def add_data(self, data: DataToExport):
-        with self.session_scope() as session:
-            time_stamp = data.timestamp
-            module_name = data.name
-
-            if session.query(ControlModule).filter_by(name=module_name).count() == 0:
-                self.add_control_modules(session, dict(name=module_name), data.control_module)
+        """Buffer the data to be written into the database by the writer thread
 
-            module_id = session.query(ControlModule).filter_by(name=module_name).one().id  # detector/actuator names should/are unique
+        Parameters
+        ----------
+        data: DataToExport
+            its name should be the name of the control module having produced the data
+        """
+        # detector/actuator names should/are unique
+        module_id = self.get_module_id(data.name, getattr(data, 'control_module', 'DAQ_Viewer'))
+        if module_id is None:  # the failure is logged by get_module_id
+            return
 
+        with self._buffers_lock:
+            nrows = 0
             for dwa in data.get_data_from_dim('Data0D'):
                 for ind, data_array in enumerate(dwa):
-                    session.add(Data0D(timestamp=dwa.timestamp, control_module_id=module_id, channel=dwa.labels[ind],
-                                       value=float(data_array[0])))
+                    self._buffer_rows(Data0D, dwa.timestamp, module_id, dwa.labels[ind], float(data_array[0]))
+                    nrows += 1
 
             for dwa in data.get_data_from_dim('Data1D'):
                 for ind, data_array in enumerate(dwa):
-                    session.add(Data1D(timestamp=dwa.timestamp, control_module_id=module_id,
-                                       channel=dwa.labels[ind],
-                                       value=data_array.tolist()))
+                    self._buffer_rows(Data1D, dwa.timestamp, module_id, dwa.labels[ind], data_array.tolist())
+                    nrows += 1
+
             if self.save2D:
                 for dwa in data.get_data_from_dim('Data2D'):
                     for ind, data_array in enumerate(dwa):
-                        session.add(Data2D(timestamp=dwa.timestamp, control_module_id=module_id,
-                                           channel=dwa.labels[ind],
-                                           value=data_array.tolist()))
+                        self._buffer_rows(Data2D, dwa.timestamp, module_id, dwa.labels[ind], data_array.tolist())
+                        nrows += 1
 
             # not yet dataND as db should not know where to save these datas
+            if nrows != 0 and self._oldest_buffered_time is None:
+                self._oldest_buffered_time = time.perf_counter()
+            self._backlog += nrows
+            self._drop_oldest_rows()
+            if self._backlog >= self.flush_size:
+                self._flush_event.set()
 
 
 class DbLoggerGUI(DbLogger, ParameterManager):
@@ -222,6 +440,10 @@ class DbLoggerGUI(DbLogger, ParameterManager):
             'value': config('network', 'logging', 'sql', 'port')},
         {'title': 'Connect:', 'name': 'connect_db', 'type': 'bool_push', 'value': False},
         {'title': 'Connected:', 'name': 'connected_db', 'type': 'led', 'value': False},
+        {'title': 'Backlog:', 'name': 'backlog', 'type': 'int', 'value': 0, 'readonly': True,
+         'tip': 'Number of rows waiting to be written into the database'},
+        {'title': 'Latency (ms):', 'name': 'latency', 'type': 'float', 'value': 0., 'readonly': True,
+         'tip': 'Time spent by the data in memory before being written into the database'},
     ] + dashboard_submodules_params
 
     def __init__(self, database_name):
@@ -285,12 +507,16 @@ class DataBaseLogger(AbstractLogger):
         self.dblogger.add_data(data)
         self.settings.child('N_saved').setValue(
             self.settings.child('N_saved').value() + 1)
+        stats = self.dblogger.get_stats()
+        self.settings.child('backlog').setValue(stats['backlog'])
+        self.settings.child('latency').setValue(stats['latency'] * 1000)
 
     def stop_logger(self):
-        pass
+        self.dblogger.flush()
 
     def close(self):
-        pass
+        self.dblogger.close()
+        self.settings.child('connected_db').setValue(False)
 
 
 if __name__ == '__main__':
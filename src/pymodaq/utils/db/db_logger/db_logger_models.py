@@ -1,11 +1,16 @@
 import datetime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, JSON
 from sqlalchemy.dialects.postgresql import ARRAY as Array
 Base = declarative_base()
 
 
+def array_type(dimensions: int):
+    """Native array on PostgreSQL, JSON serialized list on other backends (SQLite for testing)"""
+    return Array(Float, dimensions=dimensions).with_variant(JSON(), 'sqlite')
+
+
 class Configuration(Base):
     __tablename__ = 'configurations'
     id = Column(Integer, primary_key=True)
@@ -79,7 +84,7 @@ class Data1D(Base):
     timestamp = Column(Integer, nullable=False, index=True)
     control_module_id = Column(Integer, ForeignKey('control_modules.id'), index=True)
     channel = Column(String(128))
-    value = Column(Array(Float, dimensions=1))
+    value = Column(array_type(1))
 
     def __repr__(self):
         return f"<Data1D(channel='{self.channel}', timestamp='{self.timestamp}', value='{self.value}')>"
@@ -92,7 +97,7 @@ class Data2D(Base):
     timestamp = Column(Integer, nullable=False, index=True)
     control_module_id = Column(Integer, ForeignKey('control_modules.id'), index=True)
     channel = Column(String(128))
-    value = Column(Array(Float, dimensions=2))
+    value = Column(array_type(2))
 
     def __repr__(self):
         return f"<Data2D(channel='{self.channel}', timestamp='{self.timestamp}', value='{self.value}')>"
@@ -51,6 +51,56 @@ except Exception as e:                              # pragma: no cover
 if not (is_tables or is_h5py or is_h5pyd):
     logger.exception('No valid hdf5 backend has been installed, please install either pytables or h5py')
 
+is_hdf5plugin = True
+# optional, registers the blosc filters for the h5py backend
+try:
+    import hdf5plugin
+except Exception:                                   # pragma: no cover
+    is_hdf5plugin = False
+
+COMPRESSION_LIBRARIES = ['zlib', 'gzip', 'lzf', 'blosc:blosclz', 'blosc:lz4', 'blosc:lz4hc', 'blosc:zstd', 'blosc:zlib']
+
+
+def get_chunk_shape(shape, itemsize: int, nav_dims: int = 0, chunk_size: int = None) -> tuple:
+    """Compute a chunk shape suited to the saving of data, one signal (or a few) at a time
+
+    The signal dimensions (the last ones) are kept whole unless a single signal is bigger than chunk_size, in which
+    case the biggest signal dimension is halved until it fits. Then as many signals as possible are grouped along the
+    navigation dimensions (starting from the last one, the fastest varying in a scan) up to chunk_size.
+
+    Parameters
+    ----------
+    shape: Iterable[int]
+        the shape of the full array (an enlargeable dimension should be given as its expected length)
+    itemsize: int
+        the number of bytes of an array element
+    nav_dims: int
+        the number of leading navigation dimensions in shape
+    chunk_size: int
+        the target size of a chunk in bytes. If None, retrieved from the configuration file
+
+    Returns
+    -------
+    tuple of int
+    """
+    if chunk_size is None:
+        chunk_size = config('data_saving', 'h5file', 'chunk_size') * 1024
+    shape = [max(1, int(size)) for size in shape]
+    chunk = [1 for _ in shape[:nav_dims]] + shape[nav_dims:]
+    nbytes = int(np.prod(chunk)) * itemsize
+
+    while nbytes > chunk_size and max(chunk[nav_dims:], default=1) > 1:
+        ind_max = nav_dims + int(np.argmax(chunk[nav_dims:]))
+        chunk[ind_max] = int(np.ceil(chunk[ind_max] / 2))
+        nbytes = int(np.prod(chunk)) * itemsize
+
+    for ind in reversed(range(nav_dims)):
+        chunk[ind] = min(shape[ind], max(1, chunk_size // nbytes))
+        nbytes *= chunk[ind]
+        if chunk[ind] < shape[ind]:
+            break
+    return tuple(chunk)
+
 
 class NodeError(Exception):
     pass
@@ -362,6 +412,14 @@ class CARRAY(Node):
         else:
             return self._array[:]
 
+    @property
+    def chunk_shape(self):
+        """The shape of the chunks of the array in the file, None if not chunked"""
+        if self.backend == 'tables':
+            return getattr(self.array, 'chunkshape', None)
+        else:
+            return self.array.chunks
+
     def __len__(self):
         if self.backend == 'tables':
             return self.array.nrows
@@ -571,10 +629,9 @@ class H5Backend:
         """Flush data and close the h5file
         """
         try:
-            if self._h5file is not None:
+            if self._h5file is not None and self.isopen():
                 self.flush()
-                if self.isopen():
-                    self._h5file.close()
+                self._h5file.close()
         except Exception as e:
             print(e)  # no big deal
 
@@ -622,23 +679,54 @@ class H5Backend:
         if self._h5file is not None:
             self._h5file.flush()
 
-    def define_compression(self, compression, compression_opts):
-        """Define cmpression library and level of compression
+    def define_compression(self, compression, compression_opts, shuffle=True):
+        """Define compression library and level of compression used by default for all created arrays
+        Parameters
+        ----------
+        compression: (str) one of COMPRESSION_LIBRARIES, see get_filters
+        compression_opts (int) : 0 to 9  0: None, 9: maximum compression
+        shuffle: (bool) if True, apply the shuffle filter before compression
+        """
+        self.compression = self.get_filters(compression, compression_opts, shuffle)
+
+    def get_filters(self, compression, compression_opts, shuffle=True):
+        """Get the backend specific compression filters to be used for one or all arrays
+
         Parameters
         ----------
         compression: (str) either gzip and zlib are supported here as they are compatible
-                        but zlib is used by pytables while gzip is used by h5py
+                        but zlib is used by pytables while gzip is used by h5py. The blosc compressors
+                        ('blosc:lz4', 'blosc:zstd'...) are natively supported by pytables and by h5py if the
+                        hdf5plugin package is installed. lzf is only available with h5py
         compression_opts (int) : 0 to 9  0: None, 9: maximum compression
+        shuffle: (bool) if True, apply the shuffle filter before compression
+
+        Returns
+        -------
+        tables.Filters or dict: to be used respectively with the tables or h5py/h5pyd backends
         """
-        #
         if self.backend == 'tables':
             if compression == 'gzip':
                 compression = 'zlib'
-            self.compression = self.h5_library.Filters(complevel=compression_opts, complib=compression)
+            elif compression == 'lzf':
+                logger.warning('lzf compression is not available with the tables backend, using zlib')
+                compression = 'zlib'
+            return self.h5_library.Filters(complevel=compression_opts, complib=compression, shuffle=shuffle)
         else:
             if compression == 'zlib':
                 compression = 'gzip'
-            self.compression = dict(compression=compression, compression_opts=compression_opts)
+            elif compression.startswith('blosc'):
+                if is_hdf5plugin and self.backend == 'h5py':
+                    cname = compression.split(':')[1] if ':' in compression else 'blosclz'
+                    return dict(hdf5plugin.Blosc(cname=cname, clevel=compression_opts,
+                                                 shuffle=hdf5plugin.Blosc.SHUFFLE if shuffle else
+                                                 hdf5plugin.Blosc.NOSHUFFLE))
+                logger.warning(f'{compression} compression is not available with the {self.backend} backend, '
+                               f'using gzip')
+                compression = 'gzip'
+            if compression == 'lzf':
+                return dict(compression=compression, shuffle=shuffle)
+            return dict(compression=compression, compression_opts=compression_opts, shuffle=shuffle)
 
     def get_set_group(self, where, name, title=''):
         """Retrieve or create (if absent) a node group
@@ -856,34 +944,78 @@ class H5Backend:
         else:
             return array[:]
 
-    def create_carray(self, where, name, obj=None, title=''):
+    def create_carray(self, where, name, obj=None, title='', shape=None, dtype=None, chunk_shape=None, filters=None):
+        """create a fixed size array either from data or from a given shape and type (initialized with zeros)
+
+        Parameters
+        ----------
+        where: (str or Node) group location in the file where to create the array node
+        name: (str) name of the array
+        obj: (ndarray) data to be saved in the array. If None, shape and dtype are mandatory
+        title: (str) node title attribute (written in capitals)
+        shape: (tuple of int) the shape of the array if obj is None
+        dtype: (dtype) numpy dtype style if obj is None
+        chunk_shape: (tuple of int) the shape of the hdf5 chunks, if None automatically chosen by the backend
+        filters: compression filters for this array (see get_filters), if None the default ones are used
+
+        Returns
+        -------
+        CARRAY
+        """
         if isinstance(where, Node):
             where = where.node
         if obj is None:
-            raise ValueError('Data to be saved as carray cannot be None')
-        dtype = obj.dtype
+            if shape is None or dtype is None:
+                raise ValueError('Data to be saved as carray cannot be None')
+            dtype = np.dtype(dtype)
+            shape = tuple(shape)
+        else:
+            dtype = obj.dtype
+            shape = obj.shape
+        if filters is None:
+            filters = self.compression
         if self.backend == 'tables':
-            array = CARRAY(self._h5file.create_carray(where, name, obj=obj,
-                                                      title=title,
-                                                      filters=self.compression), self.backend)
+            if obj is None:
+                array = CARRAY(self._h5file.create_carray(where, name, atom=self.h5_library.Atom.from_dtype(dtype),
+                                                          shape=shape, title=title, filters=filters,
+                                                          chunkshape=chunk_shape), self.backend)
+            else:
+                array = CARRAY(self._h5file.create_carray(where, name, obj=obj, title=title, filters=filters,
+                                                          chunkshape=chunk_shape), self.backend)
         else:
-            if self.compression is not None:
-                array = CARRAY(self.get_node(where).node.create_dataset(name, data=obj, **self.compression),
+            kwargs = dict(chunks=chunk_shape) if chunk_shape is not None else dict([])
+            if filters is not None:
+                kwargs.update(filters)
+            if obj is None:
+                array = CARRAY(self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype, **kwargs),
                                self.backend)
             else:
-                array = CARRAY(self.get_node(where).node.create_dataset(name, data=obj), self.backend)
+                array = CARRAY(self.get_node(where).node.create_dataset(name, data=obj, **kwargs), self.backend)
             array.array.attrs['TITLE'] = title
             array.array.attrs[
                 'CLASS'] = 'CARRAY'  # direct writing using h5py to be compatible with pytable automatic class writing as binary
-        array.attrs['shape'] = obj.shape
+        array.attrs['shape'] = shape
         array.attrs['dtype'] = dtype.name
         array.attrs['subdtype'] = ''
         array.attrs['backend'] = self.backend
         return array
 
-    def create_earray(self, where, name, dtype, data_shape=None, title=''):
+    def create_earray(self, where, name, dtype, data_shape=None, title='', chunk_shape=None, expected_rows=None,
+                      filters=None):
         """create enlargeable arrays from data with a given shape and of a given type. The array is enlargeable along
         the first dimension
+
+        Parameters
+        ----------
+        where: (str or Node) group location in the file where to create the array node
+        name: (str) name of the array
+        dtype: (dtype) numpy dtype style
+        data_shape: (tuple of int) the shape of the data to be appended
+        title: (str) node title attribute (written in capitals)
+        chunk_shape: (tuple of int) the shape of the hdf5 chunks (including the enlargeable dimension), if None
+            automatically chosen by the backend
+        expected_rows: (int) the expected final length of the enlargeable dimension, used as a hint by pytables
+        filters: compression filters for this array (see get_filters), if None the default ones are used
         """
         if isinstance(where, Node):
             where = where.node
@@ -892,24 +1024,26 @@ class H5Backend:
         if data_shape is not None:
             shape.extend(list(data_shape))
         shape = tuple(shape)
+        if filters is None:
+            filters = self.compression
 
         if self.backend == 'tables':
             atom = self.h5_library.Atom.from_dtype(dtype)
+            kwargs = dict(expectedrows=expected_rows) if expected_rows is not None else dict([])
             array = EARRAY(self._h5file.create_earray(where, name, atom, shape=shape, title=title,
-                                                      filters=self.compression), self.backend)
+                                                      filters=filters, chunkshape=chunk_shape, **kwargs),
+                           self.backend)
         else:
             maxshape = [None]
             if data_shape is not None:
                 maxshape.extend(list(data_shape))
             maxshape = tuple(maxshape)
-            if self.compression is not None:
-                array = EARRAY(
-                    self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype, maxshape=maxshape,
-                                                             **self.compression), self.backend)
-            else:
-                array = EARRAY(
-                    self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype, maxshape=maxshape),
-                    self.backend)
+            kwargs = dict(chunks=chunk_shape) if chunk_shape is not None else dict([])
+            if filters is not None:
+                kwargs.update(filters)
+            array = EARRAY(
+                self.get_node(where).node.create_dataset(name, shape=shape, dtype=dtype, maxshape=maxshape,
+                                                         **kwargs), self.backend)
             array.array.attrs['TITLE'] = title
             array.array.attrs[
                 'CLASS'] = 'EARRAY'  # direct writing using h5py to be compatible with pytable automatic class writing as binary
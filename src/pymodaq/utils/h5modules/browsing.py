@@ -33,7 +33,7 @@ from pymodaq.utils import daq_utils as utils
 from pymodaq.utils.managers.action_manager import ActionManager
 from pymodaq.utils.managers.parameter_manager import ParameterManager
 from pymodaq.utils.messenger import messagebox
-from .backends import H5Backend
+from .backends import H5Backend, CARRAY
 from .saving import H5Saver
 from . import data_saving
 from .exporter import ExporterFactory
@@ -527,7 +527,9 @@ class H5Browser(QObject, ActionManager):
                 for txt in node.read():
                     self.view.text_list.addItem(txt)
             elif 'data_type' in node.attrs:
-                data_with_axes = self.data_loader.load_data(node, with_bkg=with_bkg, load_all=plot_all)
+                lazy = isinstance(node, CARRAY) and np.prod(node.array.shape) * node.array.dtype.itemsize > \
+                    config('data_saving', 'h5file', 'lazy_loading_size') * 1024 ** 2
+                data_with_axes = self.data_loader.load_data(node, with_bkg=with_bkg, load_all=plot_all, lazy=lazy)
                 self.hyper_viewer.show_data(data_with_axes, force_update=True)
 
         except Exception as e:
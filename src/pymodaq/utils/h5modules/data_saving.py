@@ -14,6 +14,7 @@ from pymodaq.utils.enums import enum_checker
 from pymodaq.utils.data import Axis, DataDim, DataWithAxes, DataToExport, DataDistribution, DataDimError
 from .saving import DataType, H5Saver
 from .backends import GROUP, CARRAY, Node, EARRAY, NodeError
+from .lazy import ChunkCache, LazyArray
 from pymodaq.utils.daq_utils import capitalize
 from pymodaq.utils.scanner.utils import ScanType
 
@@ -257,6 +258,7 @@ class DataSaverLoader(DataManagement):
         self.data_type = enum_checker(DataType, self.data_type)
         self._h5saver = h5saver
         self._axis_saver = AxisSaverLoader(h5saver)
+        self._chunk_cache = ChunkCache()
 
     def isopen(self) -> bool:
         """ Get the opened status of the underlying hdf5 file"""
@@ -309,7 +311,7 @@ class DataSaverLoader(DataManagement):
         return bkg_nodes
 
     def get_data_arrays(self, where: Union[Node, str], with_bkg=False,
-                        load_all=False) -> List[np.ndarray]:
+                        load_all=False, lazy=False) -> List[Union[np.ndarray, LazyArray]]:
         """
 
         Parameters
@@ -320,10 +322,13 @@ class DataSaverLoader(DataManagement):
             If True try to load background node and return the array with background subtraction
         load_all: bool
             If True load all similar nodes hanging from a parent
+        lazy: bool
+            If True, return LazyArray proxies reading only the requested slices from the file. Ignored if the
+            background is subtracted
 
         Returns
         -------
-        list of ndarray
+        list of ndarray (or LazyArray)
         """
         where = self._get_node(where)
         if with_bkg:
@@ -341,10 +346,12 @@ class DataSaverLoader(DataManagement):
         if with_bkg:
             return [np.atleast_1d(np.squeeze(array.read()-bkg.read()))
                     for array, bkg in zip(getter(where), bkg_nodes)]
+        elif lazy:
+            return [LazyArray(array, self._chunk_cache) for array in getter(where)]
         else:
             return [np.atleast_1d(np.squeeze(array.read())) for array in getter(where)]
 
-    def load_data(self, where, with_bkg=False, load_all=False) -> DataWithAxes:
+    def load_data(self, where, with_bkg=False, load_all=False, lazy=False) -> DataWithAxes:
         """Return a DataWithAxes object from the Data and Axis Nodes hanging from (or among) a
         given Node
 
@@ -359,6 +366,9 @@ class DataSaverLoader(DataManagement):
             If True try to load background node and return the data with background subtraction
         load_all: bool
             If True, will load all data hanging from the same parent node
+        lazy: bool
+            If True, the data arrays are LazyArray proxies: slicing the data (using inav/isig) reads only
+            the requested hyperslab from the file, which should stay opened
 
         See Also
         --------
@@ -382,7 +392,7 @@ class DataSaverLoader(DataManagement):
             axes = [Axis(label=data_node.attrs['label'], units=data_node.attrs['units'],
                          data=np.linspace(0, ndarrays[0].size-1, ndarrays[0].size-1))]
         else:
-            ndarrays = self.get_data_arrays(data_node, with_bkg=with_bkg, load_all=load_all)
+            ndarrays = self.get_data_arrays(data_node, with_bkg=with_bkg, load_all=load_all, lazy=lazy)
             axes = self.get_axes(parent_node)
 
         extra_attributes = data_node.attrs.to_dict()
@@ -483,6 +493,7 @@ class DataEnlargeableSaver(DataSaverLoader):
                                                       nav_indexes=tuple(nav_indexes)))
             if save_axes:
                 for axis in data.axes:
+                    axis = axis.copy()  # the saved data are left untouched
                     axis.index += 1  # because of enlargeable data will have an extra shape
                     self._axis_saver.add_axis(where, axis)
 
@@ -569,6 +580,7 @@ class DataExtendedSaver(DataSaverLoader):
 
             if save_axes:
                 for axis in data.axes:
+                    axis = axis.copy()  # the saved data are left untouched
                     axis.index += len(self.extended_shape)
                     # because there will be len(self.extended_shape) extra navigation axes
                     self._axis_saver.add_axis(where, axis)
@@ -856,7 +868,7 @@ class DataLoader:
                     return self._h5saver.get_node(node, SPECIAL_GROUP_NAMES['nav_axes'])
             node = node.parent_node
 
-    def load_data(self, where: Union[Node, str], with_bkg=False, load_all=False) -> DataWithAxes:
+    def load_data(self, where: Union[Node, str], with_bkg=False, load_all=False, lazy=False) -> DataWithAxes:
         """Load data from a node (or channel node)
 
         Loaded data contains also nav_axes if any and with optional background subtraction
@@ -869,6 +881,12 @@ class DataLoader:
             If True will attempt to substract a background data node before loading
         load_all: bool
             If True, will load all data hanging from the same parent node
+        lazy: bool
+            If True, the data are not read but only the slices requested using inav/isig
+
+        See Also
+        --------
+        DataSaverLoader.load_data
 
         Returns
         -------
@@ -876,7 +894,7 @@ class DataLoader:
         """
         node_data_type = DataType[self._h5saver.get_node(where).attrs['data_type']]
         self._data_loader.data_type = node_data_type
-        data = self._data_loader.load_data(where, with_bkg=with_bkg, load_all=load_all)
+        data = self._data_loader.load_data(where, with_bkg=with_bkg, load_all=load_all, lazy=lazy)
         if 'axis' not in node_data_type.name:
             nav_group = self.get_nav_group(where)
             if nav_group is not None:
@@ -33,7 +33,7 @@ class H5LogHandler(logging.StreamHandler):
 
     def emit(self, record):
         msg = self.format(record)
-        self.h5saver.add_log(msg)
+        self.h5saver.submit(self.h5saver.add_log, msg)
 
 
 class H5Logger(AbstractLogger):
@@ -65,6 +65,7 @@ class H5Logger(AbstractLogger):
         self.h5saver.flush()
         self.module_and_data_saver.h5saver = self.h5saver
         logger_node = self.module_and_data_saver.get_set_node(new=True)
+        self.h5saver.start_write_behind()
         return True
 
     def get_handler(self):
@@ -77,9 +78,13 @@ class H5Logger(AbstractLogger):
         pass
 
     def add_data(self, dte: DataToExport):
-        self.module_and_data_saver.add_data(dte)
-
-        self.settings.child('N_saved').setValue(self.settings.child('N_saved').value() + 1)
+        data_to_save = self.module_and_data_saver.get_data_to_save(dte)  # settings are read in the caller's thread
+        if data_to_save is None:
+            return
+        if self.h5saver.submit(self.module_and_data_saver.write_data, *data_to_save):
+            self.settings.child('N_saved').setValue(self.settings.child('N_saved').value() + 1)
+        self.h5saver.update_write_behind_status()
 
     def stop_logger(self):
+        self.h5saver.stop_write_behind()
         self.h5saver.flush()
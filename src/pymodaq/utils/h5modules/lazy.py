@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+from collections import OrderedDict
+import itertools
+import numbers
+from typing import Callable, Hashable, List, Tuple
+
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+from pymodaq.utils.config import Config
+from .backends import CARRAY, get_chunk_shape
+
+config = Config()
+
+
+class ChunkCache:
+    """Least recently used cache of the chunks read from array nodes of h5files
+
+    Parameters
+    ----------
+    max_size: int
+        The maximum number of bytes held by the cache. If None, retrieved from the configuration file
+
+    Attributes
+    ----------
+    hits: int
+        The number of chunks retrieved from the cache
+    misses: int
+        The number of chunks read from the file
+    """
+
+    def __init__(self, max_size: int = None):
+        if max_size is None:
+            max_size = int(config('data_saving', 'h5file', 'chunk_cache_size') * 1024 ** 2)
+        self.max_size = max_size
+        self._chunks: OrderedDict = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._chunks)
+
+    @property
+    def size(self) -> int:
+        """The number of bytes currently held by the cache"""
+        return self._size
+
+    def clear(self):
+        self._chunks.clear()
+        self._size = 0
+
+    def get(self, key: Hashable, reader: Callable[[], np.ndarray]) -> np.ndarray:
+        """Get the chunk stored with key, reading it with reader (and caching it) if not already in the cache
+
+        Parameters
+        ----------
+        key: Hashable
+            a key identifying the chunk
+        reader: Callable
+            function without argument returning the chunk as a ndarray
+
+        Returns
+        -------
+        ndarray: the read-only chunk
+        """
+        if key in self._chunks:
+            self._chunks.move_to_end(key)
+            self.hits += 1
+            return self._chunks[key]
+        self.misses += 1
+        chunk = reader()
+        chunk.flags.writeable = False
+        if chunk.nbytes <= self.max_size:
+            self._chunks[key] = chunk
+            self._size += chunk.nbytes
+            while self._size > self.max_size:
+                _, old_chunk = self._chunks.popitem(last=False)
+                self._size -= old_chunk.nbytes
+        return chunk
+
+
+class LazyArray(NDArrayOperatorsMixin):
+    """Read-only numpy like proxy of an array node of a h5file
+
+    Nothing is read when the proxy is created. Indexing it (with integers and slices) reads only the requested
+    hyperslab, chunk by chunk through a ChunkCache, and returns a ndarray. Converting it to a ndarray (np.asarray)
+    reads the whole node, as do the arithmetic and comparison operators (and numpy ufuncs) that return ndarrays. As
+    when loading data with the DataSaverLoader, the singleton dimensions of the node are squeezed.
+
+    The proxy is valid as long as the h5file holding the node is opened.
+
+    Parameters
+    ----------
+    node: CARRAY
+        the array node
+    cache: ChunkCache
+        the cache to be used, it may be shared between proxies. If None, a new one is created
+    """
+
+    def __init__(self, node: CARRAY, cache: ChunkCache = None):
+        self._node = node
+        self._cache = cache if cache is not None else ChunkCache()
+        self._node_shape: Tuple[int] = tuple(int(size) for size in node.array.shape)
+        self._kept_axes: List[int] = [ind for ind, size in enumerate(self._node_shape) if size != 1]
+        self._shape: Tuple[int] = tuple(self._node_shape[ind] for ind in self._kept_axes)
+        self._dtype = np.dtype(node.array.dtype)
+
+        chunk_shape = node.chunk_shape
+        if chunk_shape is None:  # contiguous array, pseudo chunks are used for the cache
+            nav_dims = len(node.attrs['nav_indexes']) if 'nav_indexes' in node.attrs and \
+                node.attrs['nav_indexes'] is not None else 0
+            chunk_shape = get_chunk_shape(self._node_shape, self._dtype.itemsize, nav_dims=nav_dims)
+        self._chunk_shape: Tuple[int] = tuple(int(size) for size in chunk_shape)
+        self._key = (getattr(node.h5file, 'filename', id(node.h5file)), node.path, self._node_shape)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}: <{self._node.path}> - <shape: {self.shape}> - <dtype: {self.dtype}>'
+
+    def __deepcopy__(self, memo):
+        return self  # read-only proxy, sharing it is safe
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[...]
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+        return array
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if any([isinstance(array, LazyArray) for array in kwargs.get('out', ())]):
+            return NotImplemented  # read-only
+        inputs = [np.asarray(array) if isinstance(array, LazyArray) else array for array in inputs]
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    @property
+    def node(self) -> CARRAY:
+        return self._node
+
+    @property
+    def cache(self) -> ChunkCache:
+        return self._cache
+
+    @property
+    def shape(self) -> Tuple[int]:
+        return self._shape if len(self._shape) != 0 else (1,)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * self.dtype.itemsize
+
+    def read(self) -> np.ndarray:
+        """Read the whole node"""
+        return np.asarray(self)
+
+    def _normalize_item(self, item) -> Tuple:
+        """Get a tuple of int or slice, one per dimension of self, from a basic numpy index. Return None if the index
+        is not basic (arrays, newaxis...)"""
+        if not isinstance(item, tuple):
+            item = (item,)
+        if sum([it is Ellipsis for it in item]) > 1:
+            raise IndexError('an index can only have a single ellipsis')
+        if not all([isinstance(it, (numbers.Integral, slice)) or it is Ellipsis for it in item]):
+            return None
+        n_explicit = len([it for it in item if it is not Ellipsis])
+        if n_explicit > self.ndim:
+            raise IndexError(f'too many indices for array: array is {self.ndim}-dimensional, but {n_explicit} were'
+                             f' indexed')
+        normalized = []
+        for it in item:
+            if it is Ellipsis:
+                normalized.extend([slice(None) for _ in range(self.ndim - n_explicit)])
+            else:
+                normalized.append(it)
+        normalized.extend([slice(None) for _ in range(self.ndim - len(normalized))])
+        return tuple(normalized)
+
+    def __getitem__(self, item) -> np.ndarray:
+        normalized = self._normalize_item(item)
+        if normalized is None or len(self._shape) == 0:  # advanced indexing or scalar node
+            return np.atleast_1d(np.squeeze(self._node.read()))[item]
+
+        node_item = [0 for _ in self._node_shape]  # squeezed dimensions are indexed with 0
+        for ind, it in zip(self._kept_axes, normalized):
+            node_item[ind] = it
+
+        starts, stops, selections, is_int = [], [], [], []
+        for it, size in zip(node_item, self._node_shape):
+            if isinstance(it, slice):
+                indexes = range(*it.indices(size))
+                if len(indexes) == 0:
+                    return np.zeros(self._sliced_shape(node_item), dtype=self.dtype)
+                starts.append(min(indexes[0], indexes[-1]))
+                stops.append(max(indexes[0], indexes[-1]) + 1)
+                selections.append(None if indexes.step == 1 else np.array(indexes) - starts[-1])
+                is_int.append(False)
+            else:
+                index = int(it) + size if it < 0 else int(it)
+                if not 0 <= index < size:
+                    raise IndexError(f'index {it} is out of bounds for axis with size {size}')
+                starts.append(index)
+                stops.append(index + 1)
+                selections.append(None)
+                is_int.append(True)
+
+        array = self._read_hyperslab(starts, stops)
+        for axis, selection in enumerate(selections):
+            if selection is not None:
+                array = np.take(array, selection, axis=axis)
+        return array[tuple([0 if integer else slice(None) for integer in is_int])]
+
+    def _sliced_shape(self, node_item) -> Tuple[int]:
+        return tuple([len(range(*it.indices(size))) for it, size in zip(node_item, self._node_shape)
+                      if isinstance(it, slice)])
+
+    def _read_hyperslab(self, starts: List[int], stops: List[int]) -> np.ndarray:
+        """Read the contiguous hyperslab of the node between starts and stops (excluded) using the chunk cache
+
+        If the chunks covering the hyperslab cannot fit in the cache, the hyperslab is directly read from the node
+        """
+        chunk_ranges = [range(start // chunk, (stop - 1) // chunk + 1)
+                        for start, stop, chunk in zip(starts, stops, self._chunk_shape)]
+        chunks_nbytes = int(np.prod([len(chunk_range) * chunk for chunk_range, chunk in
+                                     zip(chunk_ranges, self._chunk_shape)])) * self.dtype.itemsize
+        if chunks_nbytes > self._cache.max_size // 2:
+            return self._node[tuple([slice(start, stop) for start, stop in zip(starts, stops)])]
+
+        array = np.empty([stop - start for start, stop in zip(starts, stops)], dtype=self.dtype)
+        for chunk_index in itertools.product(*chunk_ranges):
+            chunk_starts = [ind * chunk for ind, chunk in zip(chunk_index, self._chunk_shape)]
+            chunk_slices = tuple([slice(start, min(start + chunk, size)) for start, chunk, size in
+                                  zip(chunk_starts, self._chunk_shape, self._node_shape)])
+            chunk = self._cache.get(self._key + (chunk_index,),
+                                    lambda: np.asarray(self._node[chunk_slices], dtype=self.dtype))
+            dest, src = [], []
+            for start, stop, chunk_start, chunk_slice in zip(starts, stops, chunk_starts, chunk_slices):
+                low, high = max(start, chunk_start), min(stop, chunk_slice.stop)
+                dest.append(slice(low - start, high - start))
+                src.append(slice(low - chunk_start, high - chunk_start))
+            array[tuple(dest)] = chunk[tuple(src)]
+        return array
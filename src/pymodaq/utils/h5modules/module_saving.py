@@ -13,6 +13,7 @@ import xml.etree.ElementTree as ET
 import numpy as np
 
 from pymodaq.utils.abstract import ABCMeta, abstract_attribute, abstractmethod
+from pymodaq.utils.logger import set_logger, get_module_name
 from pymodaq.utils.daq_utils import capitalize
 from pymodaq.utils.data import Axis, DataDim, DataWithAxes, DataToExport, DataDistribution
 from .saving import H5SaverLowLevel
@@ -26,6 +27,8 @@ if TYPE_CHECKING:
     from pymodaq.control_modules.daq_move import DAQ_Move
     from pymodaq.utils.h5modules.h5logging import H5Logger
 
+logger = set_logger(get_module_name(__file__))
+
 
 class ModuleSaver(metaclass=ABCMeta):
     """Abstract base class to save info and data from main modules (DAQScan, DAQViewer, DAQMove, ...)"""
@@ -250,6 +253,24 @@ class DetectorExtendedSaver(DetectorSaver):
     def add_nav_axes(self, where: Union[Node, str], axes: List[Axis]):
         self._datatoexport_saver.add_nav_axes(where, axes)
 
+    def add_averaged_data(self, where: Union[Node, str], data: DataToExport, axes: List[Axis]):
+        """Save data averaged over the extended average dimension, with their own navigation axes, in an Averaged
+        group of the module node
+
+        Parameters
+        ----------
+        where: Union[Node, str]
+            the path of the node holding the module node or the node itself
+        data: DataToExport
+            the averaged data, their first indexes being the navigation ones
+        axes: List[Axis]
+            the navigation axes of the averaged data (without the average one)
+        """
+        averaged_group = self._h5saver.get_set_group(self.get_set_node(where), 'Averaged',
+                                                     title='Mean over the averages')
+        self._datatoexport_saver.add_nav_axes(averaged_group, axes)
+        DataToExportSaver(self._h5saver).add_data(averaged_group, data)
+
 
 class ActuatorSaver(ModuleSaver):
     """Implementation of the ModuleSaver class dedicated to DAQ_Move modules
@@ -357,17 +378,104 @@ class ScanSaver(ModuleSaver):
                                             settings_as_xml=ET.tostring(settings_xml),
                                             metadata=metadata)
 
-    def add_nav_axes(self, axes: List[Axis]):
-        for detector in self._module.modules_manager.detectors:
+    def add_nav_axes(self, axes: List[Axis], detectors: List[DAQ_Viewer] = None):
+        """Save the navigation axes into the node of each detector
+
+        Parameters
+        ----------
+        axes: List[Axis]
+        detectors: list of DAQ_Viewer
+            the detectors whose nodes are to be completed, if None the detectors of the modules manager
+        """
+        if detectors is None:
+            detectors = self._module.modules_manager.detectors
+        for detector in detectors:
             detector.module_and_data_saver.add_nav_axes(self._module_group, axes)
 
     def add_data(self, dte: DataToExport = None, indexes: Tuple[int] = None,
-                 distribution=DataDistribution['uniform']):
+                 distribution=DataDistribution['uniform'], detectors_dte: Dict[str, DataToExport] = None):
+        """Insert the data of all selected detectors at given indexes
+
+        Parameters
+        ----------
+        dte: DataToExport
+            not used
+        indexes: tuple of int
+        distribution: DataDistribution
+        detectors_dte: dict
+            data to be inserted with detector's titles as keys. If None, the current data of each detector is used
+        """
+        self.add_data_to_save(self.get_data_to_save(indexes, detectors_dte), indexes, distribution)
+
+    def get_data_to_save(self, indexes: Tuple[int], detectors_dte: Dict[str, DataToExport] = None) \
+            -> List[Tuple[DAQ_Viewer, Node, DataToExport, DataToExport]]:
+        """Get a snapshot of all what is needed to insert the data of the selected detectors at given indexes
+
+        To be called from the thread owning the detectors (their settings are read). The nodes of the detectors within
+        the current scan node are resolved once here, so that add_data_to_save only accesses the h5 file and can be
+        called from a saver thread
+
+        Parameters
+        ----------
+        indexes: tuple of int
+        detectors_dte: dict
+            data to be inserted with detector's titles as keys. If None, the current data of each detector is used.
+            The detectors missing from it (no data received) are not saved
+
+        Returns
+        -------
+        list of tuple: for each detector, the detector, its node, its data and background to be saved
+        """
+        init_step = bool(np.all(np.array(indexes) == 0))
+        data_to_save = []
         for detector in self._module.modules_manager.detectors:
+            if detectors_dte is not None and detector.title not in detectors_dte:
+                logger.warning(f'No data received from {detector.title} to be saved at {indexes}')
+                continue
             try:
-                detector.insert_data(indexes, where=self._module_group, distribution=distribution)
+                dte, bkg = detector.get_data_to_save(detectors_dte[detector.title] if detectors_dte is not None
+                                                     else None, init_step)
+                node = detector.module_and_data_saver.module_group
+                if node is None:  # only at the first call, before any data is handed to a saver thread
+                    node = detector.module_and_data_saver.get_set_node(self._module_group)
+                data_to_save.append((detector, node, dte, bkg))
             except Exception as e:
-                pass
+                logger.exception(f'Could not get the data of {detector.title} to be saved: {str(e)}')
+        return data_to_save
+
+    def add_data_to_save(self, data_to_save: List[Tuple[DAQ_Viewer, Node, DataToExport, DataToExport]],
+                         indexes: Tuple[int], distribution=DataDistribution['uniform']):
+        """Insert at given indexes the data obtained from get_data_to_save
+
+        Only the h5 file is accessed, so this may be called from a saver thread
+
+        Parameters
+        ----------
+        data_to_save: list of tuple
+            as returned by get_data_to_save
+        indexes: tuple of int
+        distribution: DataDistribution
+        """
+        for detector, node, dte, bkg in data_to_save:
+            try:
+                detector.write_data_to_saver(node, dte, bkg, indexes=indexes, distribution=distribution)
+            except Exception as e:
+                logger.exception(f'Could not save the data of {detector.title}: {str(e)}')
+
+    def add_averaged_data(self, dte: DataToExport, axes: List[Axis]):
+        """Save the data averaged over the scan averages, each detector data into its own node
+
+        Parameters
+        ----------
+        dte: DataToExport
+            the averaged data of all detectors (the origin of the data being the detector title)
+        axes: List[Axis]
+            the navigation axes of the scan (without the average one)
+        """
+        for detector in self._module.modules_manager.detectors:
+            detector_dte = DataToExport('Averaged', data=[dwa for dwa in dte if dwa.origin == detector.title])
+            if len(detector_dte) != 0:
+                detector.module_and_data_saver.add_averaged_data(self._module_group, detector_dte, axes)
 
 
 class LoggerSaver(ScanSaver):
@@ -382,11 +490,35 @@ class LoggerSaver(ScanSaver):
     """
     group_type = GroupType['data_logger']
 
+    def __init__(self, module):
+        super().__init__(module)
+        self._logged_modules = set([])
+
+    def get_set_node(self, where: Union[Node, str] = None, new=False) -> GROUP:
+        self._logged_modules = set([])
+        return super().get_set_node(where, new)
+
     def add_data(self, dte: DataToExport):
         """Add data to it's corresponding control module
 
         The name of the control module is the DataToExport name attribute
         """
+        data_to_save = self.get_data_to_save(dte)
+        if data_to_save is not None:
+            self.write_data(*data_to_save)
+
+    def get_data_to_save(self, dte: DataToExport) \
+            -> Union[None, Tuple[Union[DAQ_Viewer, DAQ_Move], Node, DataToExport, DataToExport]]:
+        """Get a snapshot of all what is needed to add data to it's corresponding control module
+
+        To be called from the thread owning the control modules (their settings are read), so that write_data only
+        accesses the h5 file and can be executed by a writer thread
+
+        Returns
+        -------
+        tuple or None: the control module, its node, the data and background to be saved. None if the DataToExport
+            name is not the one of a selected control module
+        """
         if dte.name in self._module.modules_manager.detectors_name:
             control_module = self._module.modules_manager.detectors[
                 self._module.modules_manager.detectors_name.index(dte.name)]
@@ -396,4 +528,14 @@ class LoggerSaver(ScanSaver):
         else:
             return
 
-        control_module.append_data(dte=dte, where=self._module_group)
+        dte, bkg = control_module.get_data_to_save(dte, init_step=control_module.title not in self._logged_modules)
+        self._logged_modules.add(control_module.title)
+        node = control_module.module_and_data_saver.module_group
+        if node is None:
+            node = control_module.module_and_data_saver.get_set_node(self._module_group)
+        return control_module, node, dte, bkg
+
+    def write_data(self, control_module: Union[DAQ_Viewer, DAQ_Move], node: Node, dte: DataToExport,
+                   bkg: DataToExport = None):
+        """Write data obtained from get_data_to_save into the node of the control module"""
+        control_module.write_data_to_saver(node, dte, bkg)
@@ -10,7 +10,10 @@ from dateutil import parser
 from numbers import Number
 import os
 from pathlib import Path
-from typing import Union, Iterable
+import queue
+import threading
+import time
+from typing import Union, Iterable, Callable
 
 
 import numpy as np
@@ -34,7 +37,7 @@ from pymodaq.utils.messenger import deprecation_msg
 
 from .backends import (H5Backend, backends_available, SaveType, InvalidSave, InvalidExport, InvalidDataType,
                        InvalidGroupType, InvalidGroupDataType, Node, GroupType, InvalidDataDimension, InvalidScanType,
-                       GROUP, VLARRAY)
+                       GROUP, VLARRAY, COMPRESSION_LIBRARIES, get_chunk_shape)
 from . import browsing
 
 
@@ -59,6 +62,124 @@ class DataType(BaseEnum):
     data_enlargeable = 'EnlData'
 
 
+class H5WriteBehind:
+    """Asynchronous writing of data into a h5file
+
+    Writing jobs (any callable using the h5file) are put into a bounded queue and executed in order by a single
+    writer thread that is then the only one accessing the file. The file is flushed every flush_frames jobs or every
+    flush_interval milliseconds, whichever comes first.
+
+    Parameters
+    ----------
+    h5saver: H5SaverLowLevel
+        the object owning the h5file
+    queue_size: int
+        the maximum number of pending jobs
+    flush_frames: int
+        flush the file after this number of executed jobs
+    flush_interval: int
+        flush the file if the last flush is older than this time (in ms)
+    drop_if_full: bool
+        if True, jobs submitted while the queue is full are dropped, otherwise the submission waits for a free slot
+        (backpressure)
+
+    Attributes
+    ----------
+    written: int
+        the number of executed jobs
+    dropped: int
+        the number of jobs dropped because the queue was full
+    blocked: int
+        the number of submissions that had to wait because the queue was full
+    errors: int
+        the number of jobs that raised an exception (logged)
+    """
+
+    def __init__(self, h5saver: 'H5SaverLowLevel', queue_size: int = 100, flush_frames: int = 100,
+                 flush_interval: int = 1000, drop_if_full: bool = False):
+        self._h5saver = h5saver
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread = None
+        self.flush_frames = flush_frames
+        self.flush_interval = flush_interval
+        self.drop_if_full = drop_if_full
+
+        self.written = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def backlog(self) -> int:
+        """int: the number of jobs waiting to be executed"""
+        return self._queue.qsize()
+
+    def start(self):
+        if not self.running:
+            self._thread = threading.Thread(target=self._writer_loop, name='H5WriteBehind', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Execute all pending jobs, flush the file and stop the writer thread"""
+        if self.running:
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+
+    def submit(self, job: Callable, *args, **kwargs) -> bool:
+        """Queue a writing job to be executed by the writer thread (executed directly if the thread is not running)
+
+        Returns
+        -------
+        bool: False if the job has been dropped because the queue was full
+        """
+        if not self.running or threading.current_thread() is self._thread:
+            job(*args, **kwargs)
+            return True
+        try:
+            self._queue.put_nowait((job, args, kwargs))
+        except queue.Full:
+            if self.drop_if_full:
+                self.dropped += 1
+                return False
+            self.blocked += 1
+            self._queue.put((job, args, kwargs))
+        return True
+
+    def _writer_loop(self):
+        last_flush = time.perf_counter()
+        not_flushed = 0
+        while True:
+            timeout = max(0., self.flush_interval / 1000 - (time.perf_counter() - last_flush))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+            if item is None:
+                break
+            if item:
+                job, args, kwargs = item
+                try:
+                    job(*args, **kwargs)
+                    self.written += 1
+                    not_flushed += 1
+                except Exception as e:
+                    self.errors += 1
+                    logger.exception(str(e))
+            if not_flushed >= self.flush_frames or \
+                    (not_flushed > 0 and time.perf_counter() - last_flush >= self.flush_interval / 1000):
+                self._h5saver.flush()
+                not_flushed = 0
+                last_flush = time.perf_counter()
+            elif not_flushed == 0:
+                last_flush = time.perf_counter()
+        self._h5saver.flush()
+
+
 class H5SaverLowLevel(H5Backend):
     """Object containing basic methods in order to structure and interact with a h5file compatible with the h5browser
 
@@ -189,7 +310,7 @@ class H5SaverLowLevel(H5Backend):
     def add_array(self, where: Union[GROUP, str], name: str, data_type: DataType, array_to_save: np.ndarray = None,
                   data_shape: tuple = None, array_type: np.dtype = None, data_dimension: DataDim = None,
                   scan_shape: tuple = tuple([]), add_scan_dim=False, enlargeable: bool = False,
-                  title: str = '', metadata=dict([]), ):
+                  title: str = '', metadata=dict([]), expected_rows: int = None, filters=None):
 
         """save data arrays on the hdf5 file together with metadata
         Parameters
@@ -219,6 +340,11 @@ class H5SaverLowLevel(H5Backend):
             dictionnary whose keys will be saved as the array attributes
         add_scan_dim: if True, the scan axes dimension (scan_shape iterable) is prepended to the array shape on the hdf5
                       In that case, the array is usually initialized as zero and further populated
+        expected_rows: int
+            for enlargeable arrays, the expected final length of the enlargeable dimension. Used to compute the chunk
+            shape, if None retrieved from the configuration file
+        filters: tables.Filters or dict
+            compression filters specific to this array (see H5Backend.get_filters), if None the default ones are used
 
         Returns
         -------
@@ -240,17 +366,28 @@ class H5SaverLowLevel(H5Backend):
         if enlargeable:
             # if data_shape == (1,):
             #     data_shape = None
+            if expected_rows is None:
+                expected_rows = config('data_saving', 'h5file', 'expected_rows')
+            shape = [expected_rows]
+            if data_shape is not None:
+                shape.extend(data_shape)
+            chunk_shape = get_chunk_shape(shape, np.dtype(array_type).itemsize, nav_dims=1)
             array = self.create_earray(where, utils.capitalize(name), dtype=np.dtype(array_type),
-                                       data_shape=data_shape, title=title)
+                                       data_shape=data_shape, title=title, chunk_shape=chunk_shape,
+                                       expected_rows=expected_rows, filters=filters)
+        elif add_scan_dim:  # means it is an array initialization to zero
+            shape = list(scan_shape[:])
+            if not(len(data_shape) == 1 and data_shape[0] == 1):  # means data are not ndarrays of scalars
+                shape.extend(data_shape)
+            chunk_shape = get_chunk_shape(shape, np.dtype(array_type).itemsize, nav_dims=len(scan_shape))
+            if array_to_save is None:  # zero initialized by the backend without allocating the whole array in memory
+                array = self.create_carray(where, utils.capitalize(name), shape=shape, dtype=array_type, title=title,
+                                           chunk_shape=chunk_shape, filters=filters)
+            else:
+                array = self.create_carray(where, utils.capitalize(name), obj=array_to_save, title=title,
+                                           chunk_shape=chunk_shape, filters=filters)
         else:
-            if add_scan_dim:  # means it is an array initialization to zero
-                shape = list(scan_shape[:])
-                if not(len(data_shape) == 1 and data_shape[0] == 1):  # means data are not ndarrays of scalars
-                    shape.extend(data_shape)
-                if array_to_save is None:
-                    array_to_save = np.zeros(shape, dtype=np.dtype(array_type))
-
-            array = self.create_carray(where, utils.capitalize(name), obj=array_to_save, title=title)
+            array = self.create_carray(where, utils.capitalize(name), obj=array_to_save, title=title, filters=filters)
         self.set_attr(array, 'data_type', data_type.name)
         self.set_attr(array, 'data_dimension', data_dimension.name)
 
@@ -508,10 +645,28 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
          'limits': config('data_saving', 'data_type', 'dynamics'),
          'value': config('data_saving', 'data_type', 'dynamic')},
         {'title': 'Compression options:', 'name': 'compression_options', 'type': 'group', 'children': [
-            {'title': 'Compression library:', 'name': 'h5comp_library', 'type': 'list', 'value': 'zlib',
-                'limits': ['zlib', 'gzip']},
+            {'title': 'Compression library:', 'name': 'h5comp_library', 'type': 'list',
+                'value': config('data_saving', 'h5file', 'compression_library'), 'limits': COMPRESSION_LIBRARIES},
             {'title': 'Compression level:', 'name': 'h5comp_level', 'type': 'int',
                 'value': config('data_saving', 'h5file', 'compression_level'), 'min': 0, 'max': 9},
+            {'title': 'Shuffle:', 'name': 'h5comp_shuffle', 'type': 'bool',
+                'value': config('data_saving', 'h5file', 'shuffle')},
+        ]},
+        {'title': 'Write-behind options:', 'name': 'write_behind', 'type': 'group', 'expanded': False, 'children': [
+            {'title': 'Asynchronous writing:', 'name': 'async_write', 'type': 'bool',
+                'value': config('data_saving', 'h5file', 'write_behind', 'enabled'),
+                'tip': 'Continuous saving is done from a dedicated writer thread'},
+            {'title': 'Queue size:', 'name': 'queue_size', 'type': 'int',
+                'value': config('data_saving', 'h5file', 'write_behind', 'queue_size'), 'min': 1},
+            {'title': 'Flush every (frames):', 'name': 'flush_frames', 'type': 'int',
+                'value': config('data_saving', 'h5file', 'write_behind', 'flush_frames'), 'min': 1},
+            {'title': 'Flush every (ms):', 'name': 'flush_interval', 'type': 'int',
+                'value': config('data_saving', 'h5file', 'write_behind', 'flush_interval_ms'), 'min': 0},
+            {'title': 'Drop if full?:', 'name': 'drop_if_full', 'type': 'bool',
+                'value': config('data_saving', 'h5file', 'write_behind', 'drop_if_full')},
+            {'title': 'Backlog:', 'name': 'backlog', 'type': 'int', 'value': 0, 'readonly': True},
+            {'title': 'Waits (queue full):', 'name': 'N_blocked', 'type': 'int', 'value': 0, 'readonly': True},
+            {'title': 'Dropped:', 'name': 'N_dropped', 'type': 'int', 'value': 0, 'readonly': True},
         ]},
     ]
 
@@ -532,12 +687,61 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
 
         self.current_scan_group = None
         self.current_scan_name = None
+        self._write_behind: H5WriteBehind = None
 
         self.settings.child('save_type').setValue(self.save_type.name)
 
     def show_settings(self, show=True):
         self.settings_tree.setVisible(show)
 
+    @property
+    def write_behind(self) -> H5WriteBehind:
+        return self._write_behind
+
+    def start_write_behind(self):
+        """Start the asynchronous writer thread if the async_write option is set
+
+        From then on, the h5file should only be accessed through the submit method, until the writer is stopped
+        """
+        self.stop_write_behind()
+        if self.settings['write_behind', 'async_write']:
+            self._write_behind = H5WriteBehind(self, queue_size=self.settings['write_behind', 'queue_size'],
+                                               flush_frames=self.settings['write_behind', 'flush_frames'],
+                                               flush_interval=self.settings['write_behind', 'flush_interval'],
+                                               drop_if_full=self.settings['write_behind', 'drop_if_full'])
+            self._write_behind.start()
+            self.update_write_behind_status()
+
+    def stop_write_behind(self):
+        """Execute all pending writing jobs and stop the asynchronous writer thread"""
+        if self._write_behind is not None:
+            self._write_behind.stop()
+            self.update_write_behind_status()
+            self._write_behind = None
+
+    def submit(self, job: Callable, *args, **kwargs) -> bool:
+        """Execute a writing job on the h5file, either directly or queued in the asynchronous writer thread
+
+        Returns
+        -------
+        bool: False if the job has been dropped because the writing queue was full
+        """
+        if self._write_behind is None:
+            job(*args, **kwargs)
+            return True
+        return self._write_behind.submit(job, *args, **kwargs)
+
+    def update_write_behind_status(self):
+        """Update the backlog and the backpressure/drop counters displayed in the settings"""
+        if self._write_behind is not None:
+            self.settings.child('write_behind', 'backlog').setValue(self._write_behind.backlog)
+            self.settings.child('write_behind', 'N_blocked').setValue(self._write_behind.blocked)
+            self.settings.child('write_behind', 'N_dropped').setValue(self._write_behind.dropped)
+
+    def close_file(self):
+        self.stop_write_behind()
+        super().close_file()
+
     def init_file(self, update_h5=False, custom_naming=False, addhoc_file_path=None, metadata=dict([])):
         """Initializes a new h5 file.
         Could set the h5_file attributes as:
@@ -820,7 +1024,8 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
         elif param.name() in putils.iter_children(self.settings.child('compression_options'), []):
             compression = self.settings.child('compression_options', 'h5comp_library').value()
             compression_opts = self.settings.child('compression_options', 'h5comp_level').value()
-            self.define_compression(compression, compression_opts)
+            shuffle = self.settings.child('compression_options', 'h5comp_shuffle').value()
+            self.define_compression(compression, compression_opts, shuffle)
 
     def update_status(self, status):
         logger.warning(status)
@@ -1,14 +1,18 @@
-from typing import List, Union, TYPE_CHECKING
+from typing import Dict, List, Tuple, Union, TYPE_CHECKING, Callable
 
 from collections import OrderedDict
-from qtpy.QtCore import QObject, Signal, Slot, QThread
+from functools import partial
+import threading
+from time import perf_counter
+
+from qtpy.QtCore import QObject, Signal, Slot, QThread, QEventLoop, QTimer
 from qtpy import QtWidgets
-import time
 
 from pymodaq.utils.logger import set_logger, get_module_name, get_module_name
 from pymodaq.utils import daq_utils as utils
 from pymodaq.utils.config import Config
 from pymodaq.utils.data import DataToExport, DataFromPlugins, DataActuator
+from pymodaq.utils.exceptions import MasterSlaveError
 from pyqtgraph.parametertree import Parameter, ParameterTree
 from pymodaq.utils.managers.parameter_manager import ParameterManager
 
@@ -16,11 +20,233 @@ from pymodaq.utils.managers.parameter_manager import ParameterManager
 if TYPE_CHECKING:
     from pymodaq.control_modules.daq_viewer import DAQ_Viewer
     from pymodaq.control_modules.daq_move import DAQ_Move
+    from pymodaq.control_modules.utils import ControlModule
 
 logger = set_logger(get_module_name(__file__))
 config = Config()
 
 
+class DetectorsDataCollector(QObject):
+    """Thread safe collection of the data sent by the detectors during a single grab
+
+    Data may be posted from any thread, for instance straight from the hardware threads of the detectors (see
+    DAQ_Viewer.set_data_sink). The all_received signal is emitted (from the posting thread) once all the expected data
+    have been posted, or when the collection is aborted
+
+    Parameters
+    ----------
+    n_expected: int
+        The number of DataToExport expected (one per detector)
+    """
+    all_received = Signal()
+
+    def __init__(self, n_expected: int):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._n_expected = n_expected
+        self._received: List[DataToExport] = []
+        self._aborted = False
+
+    @property
+    def done(self) -> bool:
+        """bool: True if all the expected data have been posted or if the collection has been aborted"""
+        with self._lock:
+            return self._aborted or len(self._received) >= self._n_expected
+
+    @property
+    def received(self) -> List[DataToExport]:
+        """list of DataToExport: the data posted so far, in their order of arrival"""
+        with self._lock:
+            return self._received[:]
+
+    def post(self, dte: DataToExport):
+        """Store the data of one detector, further data are ignored once the collection is done"""
+        with self._lock:
+            if self._aborted or len(self._received) >= self._n_expected:
+                return
+            self._received.append(dte)
+            done = len(self._received) == self._n_expected
+        if done:
+            self.all_received.emit()
+
+    def abort(self):
+        """Stop the collection, unblocking the grab waiting for it"""
+        with self._lock:
+            self._aborted = True
+        self.all_received.emit()
+
+
+def get_preset_masters(preset: Parameter, create_module: Callable[[str, str, Parameter], 'ControlModule']) \
+        -> List[Tuple['ControlModule', List['ControlModule']]]:
+    """Create the modules defined in a preset and group the ones to be initialized by Master with their Slaves
+
+    Modules are sorted by controller ID and, within the same ID, by Master/Slave status. The modules are created in
+    this order
+
+    Parameters
+    ----------
+    preset: Parameter
+        the preset parameter with its Moves and Detectors children (see PresetManager)
+    create_module: Callable
+        called with the type ('move' or 'det'), the name and the settings of each plugin of the preset, should
+        return the corresponding control module
+
+    Returns
+    -------
+    list of tuple: each tuple is made of a Master module and the list of its Slave modules to be initialized (the
+        modules whose init option is checked in the preset), see ModulesInitializer
+
+    Raises
+    ------
+    MasterSlaveError: if the Master/Slave status of the modules sharing a controller ID is inconsistent
+    """
+    plugins = []
+    plugins += [{'type': 'move', 'value': child} for child in preset.child('Moves').children()]
+    plugins += [{'type': 'det', 'value': child} for child in preset.child('Detectors').children()]
+    for plug in plugins:
+        plug['ID'] = plug['value'].child('params', 'main_settings', 'controller_ID').value()
+        if plug["type"] == 'det':
+            plug['status'] = plug['value'].child('params', 'detector_settings', 'controller_status').value()
+        else:
+            if 'multiaxes' in [child.name() for child in plug['value'].child('params', 'move_settings').children()]:
+                plug['status'] = plug['value'].child('params', 'move_settings', 'multiaxes', 'multi_status').value()
+            else:
+                plug['status'] = 'Master'
+
+    masters = []  # the modules to be initialized: Master ones with their Slave ones
+    for plug_id in list(dict.fromkeys([plug['ID'] for plug in plugins])):
+        plug_ids = sorted([plug for plug in plugins if plug['ID'] == plug_id], key=lambda plug: plug['status'])
+        for ind_plugin, plugin in enumerate(plug_ids):
+            plug_name = plugin['value'].child('name').value()
+            plug_init = plugin['value'].child('init').value()
+            module = create_module(plugin['type'], plug_name, plugin['value'].child('params'))
+
+            if ind_plugin == 0:  # should be a master type plugin
+                if plugin['status'] != "Master":
+                    raise MasterSlaveError(f'The instrument {plug_name} should be defined as Master')
+                if plug_init:
+                    masters.append((module, []))
+                elif len(plug_ids) > 1:
+                    raise MasterSlaveError(f'The instrument {plug_name} defined as Master has to be initialized '
+                                           f'(init checked in the preset) in order to init its associated slave '
+                                           f'instrument')
+            else:
+                if plugin['status'] != "Slave":
+                    raise MasterSlaveError(f'The instrument {plug_name} should be defined as Slave')
+                if plug_init:
+                    masters[-1][1].append(module)
+    return masters
+
+
+class ModulesInitializer(QObject):
+    """Concurrent initialization of the hardware of control modules sharing or not their controller
+
+    All the Master modules are initialized at once (each one in its own hardware thread). As soon as a Master is
+    initialized, its controller is given to its Slave modules whose initialization then starts. Completion is tracked
+    using the init_signal of the modules and notified with the module_initialized signal.
+
+    Parameters
+    ----------
+    masters: list of tuple
+        each tuple is made of a Master module and the list of its Slave modules to be initialized
+
+    Attributes
+    ----------
+    results: OrderedDict
+        for each completed initialization, the title of the module as key and a tuple (initialized state, duration
+        in seconds) as value, in their order of completion
+    """
+    module_initialized = Signal(str, bool, float)  # title, initialized state and duration of the initialization
+
+    def __init__(self, masters: List[Tuple['ControlModule', List['ControlModule']]]):
+        super().__init__()
+        self._masters = masters
+        self._pending = []
+        self._slots = {}
+        self._start_times = {}
+        self.results = OrderedDict()
+
+    @property
+    def modules(self) -> List['ControlModule']:
+        """list of ControlModule: all the modules to be initialized"""
+        modules = []
+        for master, slaves in self._masters:
+            modules.append(master)
+            modules.extend(slaves)
+        return modules
+
+    @property
+    def done(self) -> bool:
+        """bool: True if no initialization is running"""
+        return len(self._pending) == 0
+
+    def start(self):
+        """Start the initialization of all the Master modules"""
+        for master, slaves in self._masters:
+            self._start(master)
+
+    def wait(self, timeout: int) -> bool:
+        """Block (processing the Qt events) until all the initializations are completed
+
+        Parameters
+        ----------
+        timeout: int
+            maximum duration to wait for the completion of the next initialization, in milliseconds
+
+        Returns
+        -------
+        bool: True if all the modules have been initialized
+        """
+        while not self.done:
+            ncompleted = len(self.results)
+            if not ModulesManager.wait_for(self.module_initialized,
+                                           lambda: len(self.results) != ncompleted or self.done, timeout):
+                break
+        return all([self.results.get(module.title, (False,))[0] for module in self.modules])
+
+    def report(self) -> List[str]:
+        """Get a line per module with the duration of its initialization or why it is not initialized"""
+        lines = []
+        for module in self.modules:
+            if module.title in self.results:
+                initialized, duration = self.results[module.title]
+                lines.append(f'{module.title}: {"initialized" if initialized else "initialization failed"} in '
+                             f'{duration:.2f} s')
+            elif module in self._pending:
+                lines.append(f'{module.title}: initialization not completed after '
+                             f'{perf_counter() - self._start_times[id(module)]:.2f} s')
+            else:
+                lines.append(f'{module.title}: not initialized as its Master is not')
+        return lines
+
+    def _start(self, module: 'ControlModule'):
+        self._pending.append(module)
+        self._slots[id(module)] = partial(self._module_initialized, module)
+        module.init_signal.connect(self._slots[id(module)])
+        self._start_times[id(module)] = perf_counter()
+        if getattr(module, 'ui', None) is not None:
+            module.init_hardware_ui()
+        else:
+            module.init_hardware()
+
+    def _module_initialized(self, module: 'ControlModule', initialized: bool):
+        if module not in self._pending:
+            return
+        module.init_signal.disconnect(self._slots.pop(id(module)))
+        self._pending.remove(module)
+        duration = perf_counter() - self._start_times[id(module)]
+        self.results[module.title] = (initialized, duration)
+        if initialized:
+            for master, slaves in self._masters:
+                if master is module:
+                    for slave in slaves:
+                        slave.controller = module.controller
+                        self._start(slave)
+        else:
+            logger.warning(f'The module {module.title} could not be initialized')
+        self.module_initialized.emit(module.title, initialized, duration)
+
+
 class ModulesManager(QObject, ParameterManager):
     """Class to manage DAQ_Viewers and DAQ_Moves with UI to select some
 
@@ -40,6 +266,7 @@ class ModulesManager(QObject, ParameterManager):
     det_done_signal = Signal(DataToExport)  # dte here contains DataWithAxes
     move_done_signal = Signal(DataToExport)  # dte here contains DataActuators
     timeout_signal = Signal(bool)
+    _move_done_all = Signal()  # internal, emitted when the last selected actuator has reached its target
 
     params = [
         {'title': 'Actuators/Detectors Selection', 'name': 'modules', 'type': 'group', 'children': [
@@ -72,11 +299,15 @@ class ModulesManager(QObject, ParameterManager):
         for mod in selected_detectors:
             assert mod in detectors
 
-        self.actuator_timeout = config('actuator', 'timeout')
-        self.detector_timeout = config('viewer', 'timeout')
+        self.actuator_timeout = config('actuator', 'timeout')  # in ms
+        self.detector_timeout = config('viewer', 'timeout')  # in ms
+        self.headless_grab = config('scan', 'headless_grab')
 
         self.det_done_datas: DataToExport = None
+        self.det_done_dtes: Dict[str, DataToExport] = dict([])
         self.det_done_flag = False
+        self._collector: DetectorsDataCollector = None
+        self._headless_titles: List[str] = []
         self.move_done_positions: DataToExport = None
         self.move_done_flag = False
 
@@ -272,26 +503,93 @@ class ModulesManager(QObject, ParameterManager):
         """
         return self.settings.child('data_dimensions', f'det_data_list{dim.upper()}').value()['selected']
 
-    def grab_datas(self, **kwargs):
-        """Do a single grab of connected and selected detectors"""
+    @staticmethod
+    def wait_for(done_signal: Signal, is_done: Callable[[], bool], timeout: int) -> bool:
+        """Block until a signal is emitted without busy polling
+
+        A local QEventLoop is run in the calling thread (so queued events keep being processed) and exits as soon as
+        the signal is emitted (whatever the emitting thread) or when the timeout is reached
+
+        Parameters
+        ----------
+        done_signal: Signal
+            bound signal notifying the completion
+        is_done: Callable
+            returns True if completion already occurred
+        timeout: int
+            maximum duration to wait for, in milliseconds
+
+        Returns
+        -------
+        bool: True if completion occurred, False if timeout fired
+        """
+        if is_done():
+            return True
+        loop = QEventLoop()
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(loop.quit)
+        done_signal.connect(loop.quit)
+        try:
+            if not is_done():  # could have been done before the connection
+                timer.start(timeout)
+                loop.exec()
+        finally:
+            timer.stop()
+            done_signal.disconnect(loop.quit)
+        return is_done()
+
+    def grab_datas(self, headless: bool = None, **kwargs):
+        """Do a single grab of connected and selected detectors
+
+        Parameters
+        ----------
+        headless: bool
+            If True, the data of the detectors supporting it (see DAQ_Viewer.set_data_sink) are collected straight from
+            their hardware thread, so that the grab completes without waiting for the data to be displayed (the
+            display being done asynchronously). The data processed by the viewers (for instance from ROIs) are then
+            not collected. If False, the data are collected from the grab_done_signal of the detectors, once
+            displayed. If None, the headless_grab attribute is used (default from the configuration)
+
+        Returns
+        -------
+        DataToExport: the data of all the selected detectors. The DataToExport sent by each detector are also stored
+            in the det_done_dtes dictionary with the titles of the detectors as keys
+        """
+        if headless is None:
+            headless = self.headless_grab
+        detectors = self.detectors
         self.det_done_datas = DataToExport(name=__class__.__name__, control_module='DAQ_Viewer')
-        self._received_data = 0
         self.det_done_flag = False
         self.settings.child('det_done').setValue(self.det_done_flag)
-        tzero = time.perf_counter()
 
-        for mod in self.detectors:
-            kwargs.update(dict(Naverage=mod.Naverage))
-            mod.command_hardware.emit(utils.ThreadCommand("single", kwargs))
+        headless_detectors = [mod for mod in detectors if headless and hasattr(mod, 'set_data_sink')]
+        self._headless_titles = self.get_names(headless_detectors)
+        self._collector = DetectorsDataCollector(len(detectors))
+        collector = self._collector
+        for mod in headless_detectors:
+            mod.set_data_sink(collector.post)
 
-        while not self.det_done_flag:
-            # wait for grab done signals to end
+        try:
+            for mod in detectors:
+                kwargs.update(dict(Naverage=mod.Naverage))
+                mod.command_hardware.emit(utils.ThreadCommand("single", kwargs))
 
-            QtWidgets.QApplication.processEvents()
-            if time.perf_counter() - tzero > self.detector_timeout:
+            if not self.wait_for(collector.all_received, lambda: collector.done, self.detector_timeout):
                 self.timeout_signal.emit(True)
                 logger.error('Timeout Fired during waiting for data to be acquired')
-                break
+        finally:
+            for mod in headless_detectors:
+                mod.set_data_sink(None)
+            self._headless_titles = []
+
+        self.det_done_dtes = dict([(dte.name, dte) for dte in collector.received])
+        for dte in collector.received:
+            if len(dte) != 0:
+                self.det_done_datas.append(dte)
+        if collector.done:
+            self.det_done_flag = True
+            self.settings.child('det_done').setValue(self.det_done_flag)
 
         self.det_done_signal.emit(self.det_done_datas)
         return self.det_done_datas
@@ -430,16 +728,10 @@ class ModulesManager(QObject, ParameterManager):
             logger.error('Invalid number of positions compared to selected actuators')
             return self.move_done_positions
 
-        tzero = time.perf_counter()
         if polling:
-            while not self.move_done_flag:  # polling move done
-
-                QtWidgets.QApplication.processEvents()
-                if time.perf_counter() - tzero > self.actuator_timeout / 1000:  # timeout in seconds
-                    self.timeout_signal.emit(True)
-                    logger.error('Timeout Fired during waiting for actuators to be moved')
-                    break
-                QThread.msleep(20)
+            if not self.wait_for(self._move_done_all, lambda: self.move_done_flag, self.actuator_timeout):
+                self.timeout_signal.emit(True)
+                logger.error('Timeout Fired during waiting for actuators to be moved')
 
         self.move_done_signal.emit(self.move_done_positions)
         return self.move_done_positions
@@ -447,6 +739,9 @@ class ModulesManager(QObject, ParameterManager):
     def reset_signals(self):
         self.move_done_flag = True
         self.det_done_flag = True
+        self._move_done_all.emit()
+        if self._collector is not None:
+            self._collector.abort()
 
     def order_positions(self, positions: DataToExport):
         """ Reorder the content of the DataToExport given the order of the selected actuators"""
@@ -465,23 +760,15 @@ class ModulesManager(QObject, ParameterManager):
             if len(self.move_done_positions) == len(self.actuators):
                 self.move_done_flag = True
                 self.settings.child('move_done').setValue(self.move_done_flag)
+                self._move_done_all.emit()
         except Exception as e:
             logger.exception(str(e))
 
     def det_done(self, data: DataToExport):
-        if self.det_done_datas is not None:  # means that somehow data are not initialized so no further processing
-            self._received_data += 1
-            if len(data) != 0:
-                self.det_done_datas.append(data)
-
-            if self._received_data == len(self.detectors):
-                self.det_done_flag = True
-                self.settings.child('det_done').setValue(self.det_done_flag)
-
-        # if data.name not in list(self.det_done_datas.keys()):
-        #     self.det_done_datas[data['name']] = data
-        # if len(self.det_done_datas.items()) == len(self.detectors):
-        #     self.det_done_flag = True
+        if self._collector is not None:  # means that somehow data are not initialized so no further processing
+            if data.name in self._headless_titles:
+                return  # data already collected from the detector thread, the ones emitted here are the displayed ones
+            self._collector.post(data)
 
 
 if __name__ == '__main__':
@@ -173,6 +173,7 @@ class EllipseROI(ROI):
         self.addScaleHandle([0.5 * 2. ** -0.5 + 0.5, 0.5 * 2. ** -0.5 + 0.5], [0.5, 0.5])
         self.index = index
         self.sigRegionChangeFinished.connect(self.emit_index_signal)
+        self._mask: np.ndarray = None
 
     def center(self):       
         # Project width/height in rotated frame         
@@ -197,9 +198,11 @@ class EllipseROI(ROI):
             return arr
         w = arr.shape[axes[0]]
         h = arr.shape[axes[1]]
-        # generate an ellipsoidal mask
-        mask = np.fromfunction(
-            lambda x, y: (((x + 0.5) / (w / 2.) - 1) ** 2 + ((y + 0.5) / (h / 2.) - 1) ** 2) ** 0.5 < 1, (w, h))
+        # generate an ellipsoidal mask, only if the region shape changed
+        if self._mask is None or self._mask.shape != (w, h):
+            self._mask = np.fromfunction(
+                lambda x, y: (((x + 0.5) / (w / 2.) - 1) ** 2 + ((y + 0.5) / (h / 2.) - 1) ** 2) ** 0.5 < 1, (w, h))
+        mask = self._mask
 
         # reshape to match array axes
         if axes[0] > axes[1]:
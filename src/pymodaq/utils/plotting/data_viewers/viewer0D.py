@@ -39,9 +39,6 @@ class DataDisplayer(QObject):
         self._max_lines: List[pyqtgraph.InfiniteLine] = []
         self._data = Data0DWithHistory()
 
-        self._mins: List = []
-        self._maxs: List = []
-
         self._show_lines: bool = False
 
         axis = self._plotitem.getAxis('bottom')
@@ -57,8 +54,6 @@ class DataDisplayer(QObject):
 
     def clear_data(self):
         self._data.clear_data()
-        self._mins = []
-        self._maxs = []
 
     def update_axis(self, history_length: int):
         self._data.length = history_length
@@ -68,21 +63,11 @@ class DataDisplayer(QObject):
             self.update_display_items(data)
 
         self._data.add_datas(data)
-        for ind, data_str in enumerate(self._data.datas):
-            self._plot_items[ind].setData(self._data.xaxis, self._data.datas[data_str])
-        if len(self._mins) != len(self._data.datas):
-            self._mins = []
-            self._maxs = []
-
-        for ind, label in enumerate(self._data.datas):
-            if len(self._mins) != len(self._data.datas):
-                self._mins.append(float(np.min(self._data.datas[label])))
-                self._maxs.append(float(np.max(self._data.datas[label])))
-            else:
-                self._mins[ind] = min(self._mins[ind], float(np.min(self._data.datas[label])))
-                self._maxs[ind] = max(self._maxs[ind], float(np.max(self._data.datas[label])))
-            self._min_lines[ind].setValue(self._mins[ind])
-            self._max_lines[ind].setValue(self._maxs[ind])
+        xaxis = self._data.xaxis
+        for ind, (label, array) in enumerate(self._data.datas.items()):
+            self._plot_items[ind].setData(xaxis, array)
+            self._min_lines[ind].setValue(float(self._data.mins[label]))
+            self._max_lines[ind].setValue(float(self._data.maxs[label]))
 
     def update_display_items(self, data: data_mod.DataRaw):
         while len(self._plot_items) > 0:
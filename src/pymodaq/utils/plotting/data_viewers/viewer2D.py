@@ -652,6 +652,7 @@ class Viewer2D(ViewerBase):
                                                  IMAGE_TYPES)
         self.filter_from_rois.register_activation_signal(self.view.get_action('roi').triggered)
         self.filter_from_rois.register_target_slot(self.process_roi_lineouts)
+        self.parent.destroyed.connect(self.filter_from_rois.close)
 
         self.filter_from_crosshair = Filter2DFromCrosshair(self.view.crosshair, self.view.data_displayer.get_images(),
                                                            IMAGE_TYPES)
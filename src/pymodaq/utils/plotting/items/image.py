@@ -2,10 +2,14 @@ import collections
 
 import numpy as np
 import pyqtgraph as pg
-from pymodaq.utils.plotting.utils.plot_utils import makeAlphaTriangles, makePolygons
+from pymodaq.utils.plotting.utils.plot_utils import makeAlphaTriangles, makePolygons, rasterizeTriangles, \
+    SpreadIndex, Triangulation
+from pymodaq.utils.config import Config
 from pyqtgraph import debug as debug, Point, functions as fn
 from qtpy import QtCore, QtGui
 
+config = Config()
+
 
 class PymodaqImage(pg.ImageItem):
     def __init__(self, image=None, **kargs):
@@ -68,9 +72,16 @@ class SpreadImageItem(PymodaqImage):
     :class:`HistogramLUTItem <pyqtgraph.HistogramLUTItem>` or
     :class:`HistogramLUTWidget <pyqtgraph.HistogramLUTWidget>` to provide a GUI
     for controlling the levels and lookup table used to display the image.
+
+    The Delaunay triangulation of the points is kept as long as the points do not change and is updated incrementally
+    when points are appended (as in a spread scan). Up to *raster_points* points, each triangle is drawn with the mean
+    value of its vertices, above the values are linearly interpolated on a QImage of *raster_size* pixels along its
+    longest side.
     """
 
-    def __init__(self, image=None, **kargs):
+    raster_size = 512
+
+    def __init__(self, image=None, raster_points: int = config('viewer', 'spread_raster_points'), **kargs):
         """
         See :func:`setImage <pyqtgraph.ImageItem.setImage>` for all allowed initialization arguments.
         """
@@ -80,6 +91,10 @@ class SpreadImageItem(PymodaqImage):
         self.triangulation = None
         self.tri_data = None
         self.mesh_pen = [255, 255, 255]
+        self.raster_points = raster_points
+        self._triangles_index: SpreadIndex = None
+        self._polygons = None
+        self._raster = None
 
     def width(self):
         if self.image is None:
@@ -221,6 +236,7 @@ class SpreadImageItem(PymodaqImage):
         else:
             lut = self.lut
 
+        image = self.image
         if self.autoDownsample:
             # reduce dimensions of image based on screen resolution
             o = self.mapToDevice(QtCore.QPointF(0, 0))
@@ -238,8 +254,6 @@ class SpreadImageItem(PymodaqImage):
             # image = fn.downsample(self.image, xds, axis=axes[0])
             # image = fn.downsample(image, yds, axis=axes[1])
             self._lastDownsample = (xds, yds)
-        else:
-            image = self.image
 
         # if the image data is a small int, then we can combine levels + lut
         # into a single lut for better performance
@@ -248,16 +262,89 @@ class SpreadImageItem(PymodaqImage):
         # Assume images are in column-major order for backward compatibility
         # (most images are in row-major order)
 
-        self.triangulation, self.tri_data, rgba_values, alpha = makeAlphaTriangles(image, lut=lut, levels=levels,
-                                                                                   useRGBA=True)
-        polygons = makePolygons(self.triangulation)
-        self.qimage = dict(polygons=polygons, values=rgba_values, alpha=alpha)
+        self.update_triangulation(image[:, :2])
+        profile('triangulation')
+        if len(image) > self.raster_points:
+            self.tri_data = np.mean(image[self.triangulation.simplices, 2], axis=1)
+            self.qimage = self.render_raster(image[:, 2], lut, levels)
+        else:
+            _, self.tri_data, rgba_values, alpha = makeAlphaTriangles(image, lut=lut, levels=levels, useRGBA=True,
+                                                                      tri=self.triangulation)
+            if self._polygons is None:
+                self._polygons = makePolygons(self.triangulation)
+            self.qimage = dict(polygons=self._polygons, values=rgba_values, alpha=alpha)
+        profile('render')
+
+    def update_triangulation(self, points: np.ndarray):
+        """Update the Delaunay triangulation of the points
+
+        The triangulation is kept if the points did not change and is updated incrementally if points have been
+        appended to the ones previously triangulated, otherwise it is recomputed.
+        """
+        if self.triangulation is not None:
+            npoints = self.triangulation.npoints
+            if len(points) >= npoints and np.array_equal(self.triangulation.points, points[:npoints]):
+                if len(points) == npoints:
+                    return
+                self.triangulation.add_points(points[npoints:])
+            else:
+                self.triangulation.close()
+                self.triangulation = None
+                self._raster = None
+        if self.triangulation is None:
+            self.triangulation = Triangulation(points, incremental=True)
+        self._triangles_index = None
+        self._polygons = None
+
+    def render_raster(self, values: np.ndarray, lut, levels) -> dict:
+        """Linearly interpolate the values of the points on an image covering the item bounding rect
+
+        The mapping between the image pixels and the triangles is kept as long as the bounding rect does not change,
+        only the pixels of the triangles created by appended points being updated, so that updating the values mostly
+        costs a weighted sum.
+        """
+        rect = self.boundingRect()
+        keys = self._simplices_keys(self.triangulation.simplices)
+        if self._raster is None or self._raster['rect'] != rect:
+            longest = max(rect.width(), rect.height())
+            shape = tuple(max(1, int(np.ceil(self.raster_size * length / longest))) if longest > 0 else 1
+                          for length in (rect.height(), rect.width()))
+            npixels = shape[0] * shape[1]
+            self._raster = dict(rect=rect, shape=shape, keys=keys[:0],
+                                vertices=np.zeros((npixels, 3), dtype=int), weights=np.zeros((npixels, 3)),
+                                filled=np.zeros((npixels,), dtype=bool))
+        new_triangles = ~np.isin(keys, self._raster['keys'], assume_unique=True)
+        if np.any(new_triangles):
+            pixels, vertices, weights = rasterizeTriangles(self.triangulation.points,
+                                                           self.triangulation.simplices[new_triangles],
+                                                           self._raster['shape'], rect)
+            self._raster['vertices'][pixels] = vertices
+            self._raster['weights'][pixels] = weights
+            self._raster['filled'][pixels] = True
+            self._raster['pixels'] = np.flatnonzero(self._raster['filled'])
+            self._raster['keys'] = keys
+
+        pixels = self._raster['pixels']
+        raster_data = np.zeros(self._raster['filled'].shape)
+        raster_data[pixels] = np.sum(values[self._raster['vertices'][pixels]] * self._raster['weights'][pixels],
+                                     axis=1)
+        if levels is None:
+            levels = [np.min(values), np.max(values)]
+        argb, alpha = fn.makeARGB(raster_data.reshape(self._raster['shape']), lut=lut, levels=levels)
+        argb[..., 3] = 255 * self._raster['filled'].reshape(self._raster['shape'])
+        return dict(image=fn.makeQImage(argb, alpha=True, transpose=False), argb=argb, rect=rect)
+
+    @staticmethod
+    def _simplices_keys(simplices: np.ndarray) -> np.ndarray:
+        """Unique key identifying each triangle from its (sorted) vertices"""
+        simplices = np.ascontiguousarray(np.sort(simplices, axis=1).astype(np.int64))
+        return simplices.view(np.dtype((np.void, 3 * simplices.itemsize)))[:, 0]
 
     def get_points_at(self, axis='x', val=0):
         """
         get all triangles values whose 'x' value is val or 'y' value is val
-        1) compute triangle centroids
-        2) set one of the coordinates as val
+        1) get from the spatial index the triangles whose bounding box is crossed by the line
+        2) compute their centroids and set one of the coordinates as val
         3) check if this new point is still in the corresponding triangle
         4) if yes add point
         Parameters
@@ -271,19 +358,32 @@ class SpreadImageItem(PymodaqImage):
         """
         if self.triangulation is None:
             self.render()
-        centroids = self.compute_centroids()
+        indexes = self.triangles_index.at(axis, val)
+        centroids = self.compute_centroids(indexes)
         points_to_test = centroids.copy()
         if axis == 'x':
             points_to_test[:, 0] = val
         elif axis == 'y':
             points_to_test[:, 1] = val
 
-        simplex = self.triangulation.find_simplex(points_to_test)
-        good_indexes = np.where(simplex == np.linspace(0, len(simplex) - 1, len(simplex), dtype=int))
-        return centroids[good_indexes[0]], self.tri_data[good_indexes[0]]
+        # barycentric coordinates of the points within their triangle
+        transforms = self.triangulation.transform[indexes]
+        barycentric = np.einsum('ijk,ik->ij', transforms[:, :2, :], points_to_test - transforms[:, 2, :])
+        eps = 100 * np.finfo(float).eps
+        good_indexes = np.all(barycentric >= -eps, axis=1) & (np.sum(barycentric, axis=1) <= 1 + eps)
+        return centroids[good_indexes], self.tri_data[indexes[good_indexes]]
 
-    def compute_centroids(self):
-        return np.mean(self.triangulation.points[self.triangulation.simplices], axis=1)
+    @property
+    def triangles_index(self) -> SpreadIndex:
+        """SpreadIndex of the triangles of the current triangulation"""
+        if self.triangulation is None:
+            self.render()
+        if self._triangles_index is None:
+            self._triangles_index = SpreadIndex.from_triangulation(self.triangulation)
+        return self._triangles_index
+
+    def compute_centroids(self, indexes=slice(None)):
+        return np.mean(self.triangulation.points[self.triangulation.simplices[indexes]], axis=1)
 
     def dataTransform(self):
         """Return the transform that maps from this image's input array to its
@@ -327,11 +427,14 @@ class SpreadImageItem(PymodaqImage):
 
         self.setTransform(self.dataTransform())
 
-        for pol, color in zip(self.qimage['polygons'], self.qimage['values']):
+        if 'image' in self.qimage:
+            p.drawImage(self.qimage['rect'], self.qimage['image'])
+        else:
+            for pol, color in zip(self.qimage['polygons'], self.qimage['values']):
 
-            p.setPen(fn.mkPen(*self.mesh_pen, 100, width=0.75))
-            p.setBrush(fn.mkBrush(*color))
-            p.drawPolygon(pol)
+                p.setPen(fn.mkPen(*self.mesh_pen, 100, width=0.75))
+                p.setBrush(fn.mkBrush(*color))
+                p.drawPolygon(pol)
 
         profile('p.drawImage')
         if self.border is not None:
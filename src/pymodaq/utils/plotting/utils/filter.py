@@ -1,25 +1,28 @@
 import numpy as np
 from pyqtgraph.parametertree import Parameter
 from qtpy import QtCore, QtWidgets, QtGui
-from qtpy.QtCore import QPointF, Slot, Signal, QObject
-from typing import List, Tuple
+from qtpy.QtCore import QPointF, Slot, Signal, QObject, QThread
+from typing import Callable, Dict, List, Tuple
 
 from pyqtgraph import LinearRegionItem
 
 from pymodaq.utils import data as data_mod
 from pymodaq.utils import daq_utils as utils
 from pymodaq.utils import math_utils as mutils
-from pymodaq.utils.managers.roi_manager import ROIManager, LinearROI, RectROI
+from pymodaq.utils.managers.roi_manager import ROIManager, LinearROI, RectROI, EllipseROI, ROI
 from pymodaq.utils.plotting.items.crosshair import Crosshair
 from pymodaq.utils.plotting.items.image import UniformImageItem
+from pymodaq.utils.plotting.utils.plot_utils import SpreadIndex, points_in_polygon
 from pymodaq.utils.plotting.data_viewers.viewer1Dbasic import Viewer1DBasic
 from pymodaq.utils.logger import set_logger, get_module_name
+from pymodaq.utils.config import Config
 
 
 from pymodaq.post_treatment.process_to_scalar import DataProcessorFactory
 
 
 logger = set_logger(get_module_name(__file__))
+config = Config()
 
 
 data_processors = DataProcessorFactory()
@@ -249,9 +252,127 @@ class Filter1DFromRois(Filter):
         return slice(ind_x_min, ind_x_max)
 
 
+class RoiRegion:
+    """Pixels of an image within an axis aligned ROI, as integer slices and an optional boolean mask
+
+    The number of masked pixels along each axis are computed once, so that the lineouts and the integrated value of
+    any image can then be computed by summing once the pixels within the slices, without copy.
+
+    Parameters
+    ----------
+    slices: Tuple[slice]
+        the slices along the rows and the columns of the image
+    mask: np.ndarray of bool
+        the pixels within the slices that belong to the ROI, None if they all do
+    """
+    def __init__(self, slices: Tuple[slice], mask: np.ndarray = None):
+        self.slices = slices
+        self.mask = mask
+        self.shape = (slices[0].stop - slices[0].start, slices[1].stop - slices[1].start)
+        self.xvals = np.arange(slices[1].start, slices[1].stop, dtype=float)
+        self.yvals = np.arange(slices[0].start, slices[0].stop, dtype=float)
+        if mask is None:
+            self._row_counts = np.full((self.shape[0],), self.shape[1])
+            self._col_counts = np.full((self.shape[1],), self.shape[0])
+        else:
+            self._row_counts = np.count_nonzero(mask, axis=1)
+            self._col_counts = np.count_nonzero(mask, axis=0)
+        self.size = int(np.sum(self._row_counts))
+
+    def get_statistics(self, array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Get the horizontal and vertical lineouts (means along the columns and the rows) and the mean of an image
+        within the region"""
+        sub_array = array[self.slices]
+        if self.mask is not None:
+            sub_array = np.where(self.mask, sub_array, 0)
+        row_sums = np.sum(sub_array, axis=1)
+        col_sums = np.sum(sub_array, axis=0)
+        ver_data = np.divide(row_sums, self._row_counts, out=np.zeros(row_sums.shape), where=self._row_counts > 0)
+        hor_data = np.divide(col_sums, self._col_counts, out=np.zeros(col_sums.shape), where=self._col_counts > 0)
+        return hor_data, ver_data, float(np.sum(row_sums)) / self.size
+
+
+class RoiRegionCache:
+    """Cache of the RoiRegion of ROIs drawn over an image item
+
+    The region of a ROI is recomputed only if its position, size or angle, the image shape or the image transform
+    changed since the last call. Regions are available only for ROIs whose sides are parallel to the image axes.
+    """
+    def __init__(self):
+        self._keys: Dict[str, tuple] = dict([])
+        self._regions: Dict[str, RoiRegion] = dict([])
+
+    def __len__(self):
+        return len(self._regions)
+
+    def clear(self):
+        self._keys = dict([])
+        self._regions = dict([])
+
+    def remove_missing(self, roi_keys: List[str]):
+        """Forget the regions of the ROIs not in roi_keys"""
+        for roi_key in list(self._keys.keys()):
+            if roi_key not in roi_keys:
+                self._keys.pop(roi_key)
+                self._regions.pop(roi_key)
+
+    def get_region(self, roi_key: str, roi: ROI, graph_item: UniformImageItem, shape: Tuple[int]) -> RoiRegion:
+        """Get the region of a ROI, None if the ROI is rotated with respect to the image"""
+        transform = graph_item.transform()
+        key = (roi.pos().x(), roi.pos().y(), roi.size().x(), roi.size().y(), roi.angle(), tuple(shape),
+               transform.m11(), transform.m12(), transform.m21(), transform.m22(), transform.dx(), transform.dy())
+        if self._keys.get(roi_key, None) != key:
+            self._keys[roi_key] = key
+            self._regions[roi_key] = self._compute_region(roi, graph_item, shape)
+        return self._regions[roi_key]
+
+    @staticmethod
+    def _compute_region(roi: ROI, graph_item: UniformImageItem, shape: Tuple[int]):
+        corners = [graph_item.mapFromItem(roi, QPointF(x, y)) for x, y in
+                   ((0, 0), (roi.size().x(), 0), (0, roi.size().y()), (roi.size().x(), roi.size().y()))]
+        xs = np.array([corner.x() for corner in corners])
+        ys = np.array([corner.y() for corner in corners])
+        if len(np.unique(np.round(xs, 6))) > 2 or len(np.unique(np.round(ys, 6))) > 2:
+            return None  # rotated
+        x_min, x_max, y_min, y_max = np.min(xs), np.max(xs), np.min(ys), np.max(ys)
+        slices = (slice(int(min(max(y_min, 0), shape[0])), int(max(0, min(y_max, shape[0])))),
+                  slice(int(min(max(x_min, 0), shape[1])), int(max(0, min(x_max, shape[1])))))
+        mask = None
+        if isinstance(roi, EllipseROI) and x_max > x_min and y_max > y_min:
+            rows, cols = np.ogrid[slices[0], slices[1]]
+            mask = (((cols + 0.5 - (x_min + x_max) / 2) / ((x_max - x_min) / 2)) ** 2 +
+                    ((rows + 0.5 - (y_min + y_max) / 2) / ((y_max - y_min) / 2)) ** 2) < 1
+        return RoiRegion(slices, mask)
+
+
+class RoiFilterWorker(QObject):
+    """Compute in its own thread the data of ROIs as prepared by Filter2DFromRois"""
+    filtered = Signal(dict)
+
+    @Slot(list)
+    def filter_data(self, tasks: List[Tuple[str, Callable, tuple]]):
+        data_dict = dict([])
+        for roi_key, function, args in tasks:
+            try:
+                data_dict[roi_key] = function(*args)
+            except Exception as e:
+                logger.warning(f'Could not compute the data of {roi_key}: {str(e)}')
+        self.filtered.emit(data_dict)
+
+
+class RoiFilterSignaler(QObject):
+    """Exchange the tasks and results of Filter2DFromRois with its RoiFilterWorker (Filter is not a QObject)"""
+    filter_in_thread = Signal(list)
+    filtered = Signal(dict)
+
+
 class Filter2DFromRois(Filter):
     """Filters 2D data using 2D ROIs
 
+    For uniform data and ROIs parallel to the image axes, the pixels within each ROI are cached as slices (and a mask
+    for elliptical ROIs) updated only when the ROI or the image geometry change, the lineouts and integrated values
+    are then computed from views of the data. Other ROIs use the interpolated ROI region from pyqtgraph.
+
     Parameters
     ----------
     roi_manager: ROIManager
@@ -259,8 +380,13 @@ class Filter2DFromRois(Filter):
         The graphical item where data and ROIs are plotted
     image_keys : (list) list of string identifier to link datas to their graph_items. This means that in
         _filter_data, datas.data[key] is plotted on graph_items[key] for key in image_keys
+    in_thread: bool
+        if True, the data of the ROIs (for the cached regions) are computed in a dedicated thread, only the latest
+        data being computed if this thread is busy. The thread is stopped by close, which is also called when the
+        application is about to quit or when this object is destroyed
     """
-    def __init__(self, roi_manager: ROIManager, graph_item: UniformImageItem, image_keys):
+    def __init__(self, roi_manager: ROIManager, graph_item: UniformImageItem, image_keys,
+                 in_thread: bool = config('viewer', 'roi_in_thread')):
 
         super().__init__()
         self._roi_settings = roi_manager.settings
@@ -268,23 +394,128 @@ class Filter2DFromRois(Filter):
         self._graph_item = graph_item
         self.axes = (0, 1)
         self._ROIs = roi_manager.ROIs
+        self._regions = RoiRegionCache()
+        self._spread_index: Tuple[np.ndarray, np.ndarray, SpreadIndex] = None
+
+        self._signaler = None
+        self._worker = None
+        self._worker_thread: QThread = None
+        self._worker_busy = False
+        self._pending: Tuple[list, dict] = None
+        self._gui_data_dict: dict = None
+        if in_thread:
+            self._init_thread()
+
+    @property
+    def in_thread(self) -> bool:
+        return self._worker_thread is not None
+
+    def _init_thread(self):
+        self._signaler = RoiFilterSignaler()
+        self._worker = RoiFilterWorker()
+        self._worker_thread = QThread()
+        self._worker.moveToThread(self._worker_thread)
+        self._signaler.filter_in_thread.connect(self._worker.filter_data)
+        self._worker.filtered.connect(self._signaler.filtered)  # queued back into the GUI thread
+        self._signaler.filtered.connect(self._data_filtered_in_thread)
+        if QtWidgets.QApplication.instance() is not None:
+            QtWidgets.QApplication.instance().aboutToQuit.connect(self._worker_thread.quit)
+        self._worker_thread.start()
+
+    def close(self):
+        """Stop the dedicated thread if any"""
+        if self._worker_thread is not None:
+            self._worker_thread.quit()
+            self._worker_thread.wait()
+            self._worker_thread = None
+
+    def __del__(self):
+        if getattr(self, '_worker_thread', None) is not None:  # a running QThread must not be destroyed
+            self.close()
+
+    def filter_data(self, data: data_mod.DataFromPlugins):
+        if not self.in_thread:
+            super().filter_data(data)
+        elif self._is_active and data is not None:
+            try:
+                tasks, data_dict = self._prepare_tasks(data)
+                if self._worker_busy:
+                    self._pending = (tasks, data_dict)  # latest wins
+                else:
+                    self._send_to_thread(tasks, data_dict)
+            except Exception as e:
+                logger.warning(str(e))
+
+    def _send_to_thread(self, tasks: list, data_dict: dict):
+        self._worker_busy = True
+        self._gui_data_dict = data_dict
+        self._signaler.filter_in_thread.emit(tasks)
+
+    def _data_filtered_in_thread(self, data_dict: dict):
+        self._worker_busy = False
+        self._gui_data_dict.update(data_dict)
+        data_dict = dict([(roi_key, self._gui_data_dict[roi_key]) for roi_key in self._ROIs
+                          if roi_key in self._gui_data_dict])
+        if self._pending is not None:
+            self._send_to_thread(*self._pending)
+            self._pending = None
+        if self._slot_to_send_data is not None:
+            self._slot_to_send_data(data_dict)
+
+    def _prepare_tasks(self, data: data_mod.DataFromPlugins) -> Tuple[List[Tuple[str, Callable, tuple]], dict]:
+        """Get (in the GUI thread) the functions and arguments computing the data of each ROI that can run in any
+        thread and compute the data of the other ROIs
+
+        Returns
+        -------
+        list of tuple: the ROI key, function and its arguments of each task
+        dict: the data of the ROIs computed directly
+        """
+        self._regions.remove_missing(list(self._ROIs.keys()))
+        tasks = []
+        data_dict = dict([])
+        channels = dict([])
+        for roi_key, roi in self._ROIs.items():
+            image_index = self._image_keys.index(self._roi_settings['ROIs', roi_key, 'use_channel'])
+            math_function = self._roi_settings['ROIs', roi_key, 'math_function']
+            if image_index not in channels:  # single channel data sharing the arrays of data
+                channels[image_index] = data.deepcopy_with_new_data([data[image_index]], source=None, keep_dim=True)
+                channels[image_index].labels = [data.labels[image_index]]
+            sub_data = channels[image_index]
+            region = None
+            if data.distribution.name == 'uniform':
+                region = self._regions.get_region(roi_key, roi, self._graph_item, sub_data.shape)
+            if region is not None:
+                tasks.append((roi_key, self.get_data_from_region, (region, sub_data, math_function)))
+            else:
+                data_dict[roi_key] = self.get_xydata_from_roi(roi, sub_data, math_function)
+        return tasks, data_dict
 
     def _filter_data(self, data: data_mod.DataFromPlugins) -> dict:
         data_dict = dict([])
         try:
             if data is not None:
-                for roi_key, roi in self._ROIs.items():
-                    image_key = self._roi_settings['ROIs', roi_key, 'use_channel']
-                    image_index = self._image_keys.index(image_key)
-
-                    sub_data = data.deepcopy()
-                    sub_data.data = [data[image_index]]
-                    data_dict[roi_key] = self.get_xydata_from_roi(roi, sub_data,
-                                                                  self._roi_settings['ROIs', roi_key, 'math_function'])
+                tasks, data_dict = self._prepare_tasks(data)
+                for roi_key, function, args in tasks:
+                    data_dict[roi_key] = function(*args)
+                data_dict = dict([(roi_key, data_dict[roi_key]) for roi_key in self._ROIs])
         except Exception as e:
             pass
         return data_dict
 
+    @staticmethod
+    def get_data_from_region(region: RoiRegion, data: data_mod.DataWithAxes, math_function: str) -> 'LineoutData':
+        """Compute the lineouts, integrated and math data of single channel uniform data within a region
+
+        Can be called from any thread
+        """
+        if region.size == 0:
+            return LineoutData()
+        hor_data, ver_data, int_data = region.get_statistics(data[0])
+        math_data = data_processors.get(math_function).process(data.isig[region.slices[0], region.slices[1]]).data
+        return LineoutData(hor_axis=region.xvals, ver_axis=region.yvals, hor_data=hor_data, ver_data=ver_data,
+                           int_data=np.array([int_data]), math_data=math_data)
+
     def get_slices_from_roi(self, roi: RectROI, data: data_mod.DataWithAxes) -> Tuple[slice]:
         x, y = roi.pos().x(), roi.pos().y()
         width, height = roi.size().x(), roi.size().y()
@@ -338,21 +569,49 @@ class Filter2DFromRois(Filter):
         data, coords = roi.getArrayRegion(data, self._graph_item, self.axes, returnMappedCoords=True)
         return data, coords
 
+    def get_spread_index(self, xdata: np.ndarray, ydata: np.ndarray) -> SpreadIndex:
+        """Get the spatial index of the points of spread data, rebuilt only if the points changed"""
+        if self._spread_index is not None:
+            xcached, ycached, index = self._spread_index
+            if (xcached is xdata and ycached is ydata) or (np.array_equal(xcached, xdata) and
+                                                         np.array_equal(ycached, ydata)):
+                return index
+        index = SpreadIndex.from_points(xdata, ydata)
+        self._spread_index = (xdata, ydata, index)
+        return index
+
+    def get_indexes_in_roi(self, roi: ROI, xdata: np.ndarray, ydata: np.ndarray) -> np.ndarray:
+        """Get the indexes of the spread points (in the ROI parent coordinates) lying within the ROI
+
+        The points in the bounding box of the ROI are found from the spatial index, then mapped into the ROI local
+        coordinates and tested analytically for rectangular and elliptical ROIs or against the ROI shape otherwise.
+        """
+        transform = roi.transform() * QtGui.QTransform.fromTranslate(roi.pos().x(), roi.pos().y())
+        width, height = roi.size().x(), roi.size().y()
+        bounds = transform.mapRect(QtCore.QRectF(0, 0, width, height))
+        indexes = self.get_spread_index(xdata, ydata).in_box(bounds.left(), bounds.right(),
+                                                             bounds.top(), bounds.bottom())
+        inverse, invertible = transform.inverted()
+        if len(indexes) == 0 or not invertible:
+            return indexes
+        xpoints, ypoints = xdata[indexes], ydata[indexes]
+        xlocal = inverse.m11() * xpoints + inverse.m21() * ypoints + inverse.m31()
+        ylocal = inverse.m12() * xpoints + inverse.m22() * ypoints + inverse.m32()
+        if isinstance(roi, EllipseROI):
+            inside = ((2 * xlocal / width - 1) ** 2 + (2 * ylocal / height - 1) ** 2) <= 1
+        elif isinstance(roi, RectROI):
+            inside = (xlocal >= 0) & (xlocal <= width) & (ylocal >= 0) & (ylocal <= height)
+        else:
+            polygon = roi.shape().toFillPolygon()
+            inside = points_in_polygon(xlocal, ylocal,
+                                       np.array([(point.x(), point.y()) for point in polygon]))
+        return indexes[inside]
+
     def get_xydata_spread(self, data, roi):
-        xvals = []
-        yvals = []
-        data_out = []
-        for ind in range(data.shape[0]):
-            # invoke the QPainterpath of the ROI (from the shape method)
-            if roi.shape().contains(QPointF(data.get_axis_from_index(0)[0].get_data()[ind] - roi.pos().x(),
-                                            data.get_axis_from_index(0)[1].get_data()[ind] - roi.pos().y())):
-                xvals.append(data.get_axis_from_index(0)[0].get_data()[ind])
-                yvals.append(data.get_axis_from_index(0)[1].get_data()[ind])
-                data_out.append(data[0][ind])
-        data_out = np.array(data_out)
-        xvals = np.array(xvals)
-        yvals = np.array(yvals)
-        return xvals, yvals, data_out
+        xdata = data.get_axis_from_index(0)[0].get_data()
+        ydata = data.get_axis_from_index(0)[1].get_data()
+        indexes = self.get_indexes_in_roi(roi, xdata, ydata)
+        return xdata[indexes], ydata[indexes], data[0][indexes]
 
 
 class LineoutData:
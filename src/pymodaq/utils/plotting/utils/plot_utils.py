@@ -225,7 +225,7 @@ class QVector(QtCore.QLineF):
         return vec
 
 
-def makeAlphaTriangles(data, lut=None, levels=None, scale=None, useRGBA=False):
+def makeAlphaTriangles(data, lut=None, levels=None, scale=None, useRGBA=False, tri=None):
     """
     Convert an array of values into an ARGB array suitable for building QImages,
     OpenGL textures, etc.
@@ -263,6 +263,7 @@ def makeAlphaTriangles(data, lut=None, levels=None, scale=None, useRGBA=False):
                    The default is False, which returns in ARGB order for use with QImage
                    (Note that 'ARGB' is a term used by the Qt documentation; the *actual* order
                    is BGRA).
+    tri            Optional triangulation of the points to be reused, computed if None.
     ============== ==================================================================================
     """
     points = data[:, :2]
@@ -272,10 +273,9 @@ def makeAlphaTriangles(data, lut=None, levels=None, scale=None, useRGBA=False):
     if points.ndim not in (2,):
         raise TypeError("points must be 1D sequence of points")
 
-    tri = Triangulation(points)
-    tri_data = np.zeros((len(tri.simplices),))
-    for ind, pts in enumerate(tri.simplices):
-        tri_data[ind] = np.mean(values[pts])
+    if tri is None:
+        tri = Triangulation(points)
+    tri_data = np.mean(values[tri.simplices], axis=1)
     data = tri_data.copy()
     if lut is not None and not isinstance(lut, np.ndarray):
         lut = np.array(lut)
@@ -398,14 +398,189 @@ def makePolygons(tri):
     return polygons
 
 
+def rasterizeTriangles(points, simplices, shape, rect):
+    """Map the pixels of an image covering a rectangle onto triangles
+
+    For each triangle, the pixels whose center lies within its bounding box are tested (all at once) using their
+    barycentric coordinates, so that the values of the points can then be linearly interpolated on the image.
+
+    Parameters
+    ----------
+    points: ndarray
+        (N, 2) coordinates of the points
+    simplices: ndarray
+        (M, 3) indexes of the points forming each triangle (for instance from a Triangulation)
+    shape: tuple of int
+        the number of rows (along y) and columns (along x) of the image
+    rect: QtCore.QRectF
+        the area covered by the image in the coordinates of the points
+
+    Returns
+    -------
+    ndarray: the flat indexes of the image pixels lying within the triangles
+    ndarray: (K, 3) indexes of the points of the triangle of each of these pixels
+    ndarray: (K, 3) barycentric weights of these points
+    """
+    nrows, ncols = shape
+    dx = rect.width() / ncols if rect.width() > 0 else 1.
+    dy = rect.height() / nrows if rect.height() > 0 else 1.
+    vertices = points[simplices]
+
+    def pixel_range(coordinates, origin, step, size):
+        start = np.clip(np.ceil((np.min(coordinates, axis=1) - origin) / step - 0.5), 0, size).astype(int)
+        stop = np.clip(np.floor((np.max(coordinates, axis=1) - origin) / step - 0.5), -1, size - 1).astype(int)
+        return start, np.maximum(stop - start + 1, 0)
+
+    col_start, col_count = pixel_range(vertices[..., 0], rect.left(), dx, ncols)
+    row_start, row_count = pixel_range(vertices[..., 1], rect.top(), dy, nrows)
+    counts = col_count * row_count
+    triangles = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(len(triangles)) - np.repeat(np.cumsum(counts) - counts, counts)
+    rows = row_start[triangles] + offsets // col_count[triangles]
+    cols = col_start[triangles] + offsets % col_count[triangles]
+
+    origins = vertices[triangles, 0]
+    edge_b = vertices[triangles, 1] - origins
+    edge_c = vertices[triangles, 2] - origins
+    to_center = np.stack((rect.left() + (cols + 0.5) * dx, rect.top() + (rows + 0.5) * dy), axis=1) - origins
+    dot_bb = np.sum(edge_b * edge_b, axis=1)
+    dot_bc = np.sum(edge_b * edge_c, axis=1)
+    dot_cc = np.sum(edge_c * edge_c, axis=1)
+    dot_pb = np.sum(to_center * edge_b, axis=1)
+    dot_pc = np.sum(to_center * edge_c, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):  # degenerated triangles are not filled
+        denominator = dot_bb * dot_cc - dot_bc ** 2
+        weight_b = (dot_cc * dot_pb - dot_bc * dot_pc) / denominator
+        weight_c = (dot_bb * dot_pc - dot_bc * dot_pb) / denominator
+        weights = np.stack((1 - weight_b - weight_c, weight_b, weight_c), axis=1)
+        inside = np.all(weights >= -100 * np.finfo(float).eps, axis=1)
+
+    pixels, unique_indexes = np.unique((rows * ncols + cols)[inside], return_index=True)
+    return pixels, simplices[triangles[inside][unique_indexes]], weights[inside][unique_indexes]
+
+
+class SpreadIndex:
+    """Spatial index of the bounding boxes of scattered items (points or triangles of spread data)
+
+    The boxes are sorted along their minimum x value so that the ones intersecting a given box (or crossed by a
+    vertical or horizontal line) are found with a binary search followed by vectorized tests on the few candidates.
+
+    Parameters
+    ----------
+    xmin: ndarray
+        the minimum x values of the boxes
+    xmax: ndarray
+        the maximum x values of the boxes
+    ymin: ndarray
+        the minimum y values of the boxes
+    ymax: ndarray
+        the maximum y values of the boxes
+
+    See Also
+    --------
+    from_points, from_triangulation
+    """
+
+    def __init__(self, xmin: np.ndarray, xmax: np.ndarray, ymin: np.ndarray, ymax: np.ndarray):
+        self._order = np.argsort(xmin, kind='stable')
+        self._xmin = np.asarray(xmin)[self._order]
+        self._xmax = np.asarray(xmax)[self._order]
+        self._ymin = np.asarray(ymin)[self._order]
+        self._ymax = np.asarray(ymax)[self._order]
+        self._max_width = float(np.max(self._xmax - self._xmin)) if len(self) > 0 else 0.
+
+    def __len__(self):
+        return len(self._order)
+
+    @classmethod
+    def from_points(cls, xdata: np.ndarray, ydata: np.ndarray) -> 'SpreadIndex':
+        """Index of points given by their x and y coordinates"""
+        return cls(xdata, xdata, ydata, ydata)
+
+    @classmethod
+    def from_triangulation(cls, triangulation: Triangulation) -> 'SpreadIndex':
+        """Index of the triangles of a Delaunay triangulation"""
+        vertices = triangulation.points[triangulation.simplices]
+        return cls(np.min(vertices[..., 0], axis=1), np.max(vertices[..., 0], axis=1),
+                   np.min(vertices[..., 1], axis=1), np.max(vertices[..., 1], axis=1))
+
+    def in_box(self, xmin=-np.inf, xmax=np.inf, ymin=-np.inf, ymax=np.inf) -> np.ndarray:
+        """Get the indexes of the items whose bounding box intersects the given box
+
+        Parameters
+        ----------
+        xmin: float
+        xmax: float
+        ymin: float
+        ymax: float
+
+        Returns
+        -------
+        ndarray: sorted indexes of the items as given at the index creation
+        """
+        start = np.searchsorted(self._xmin, xmin - self._max_width, side='left')
+        stop = np.searchsorted(self._xmin, xmax, side='right')
+        selection = slice(start, stop)
+        valid = ((self._xmax[selection] >= xmin) & (self._ymin[selection] <= ymax) &
+                 (self._ymax[selection] >= ymin))
+        return np.sort(self._order[selection][valid])
+
+    def at(self, axis='x', val=0.) -> np.ndarray:
+        """Get the indexes of the items crossed by the vertical (axis='x') or horizontal (axis='y') line at val"""
+        if axis == 'x':
+            return self.in_box(xmin=val, xmax=val)
+        else:
+            return self.in_box(ymin=val, ymax=val)
+
+
+def points_in_polygon(xdata: np.ndarray, ydata: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """Vectorized even-odd test of points being inside a polygon
+
+    Parameters
+    ----------
+    xdata: ndarray
+        x coordinates of the points to test
+    ydata: ndarray
+        y coordinates of the points to test
+    polygon: ndarray
+        (N, 2) array of the polygon vertices
+
+    Returns
+    -------
+    ndarray: boolean array, True for points inside the polygon
+    """
+    inside = np.zeros(np.shape(xdata), dtype=bool)
+    x0, y0 = polygon[-1]
+    for x1, y1 in polygon:
+        if y0 != y1:
+            crossing = (y1 > ydata) != (y0 > ydata)
+            x_cross = x1 + (ydata - y1) * (x0 - x1) / (y0 - y1)
+            inside ^= crossing & (xdata < x_cross)
+        x0, y0 = x1, y1
+    return inside
+
+
 class Data0DWithHistory:
-    """Object to store scalar values and keep a history of a given length to them"""
+    """Object to store scalar values and keep a history of a given length to them
+
+    The history of each channel is stored in a preallocated circular buffer of twice the history length, each value
+    being written at two positions, so that the retained values are always available as a contiguous view (not a
+    copy) of the buffer. Adding a value, and updating the minimum and maximum values added since the last clear, have
+    a constant cost whatever the history length.
+
+    Notes
+    -----
+    The arrays returned by `datas` and `xaxis` are views of the buffers, they are overwritten by the next added values
+    """
     def __init__(self, Nsamples=200):
         super().__init__()
-        self._datas = dict([])
         self._Nsamples = Nsamples
-        self._xaxis = None
+        self._buffers = dict([])
+        self._xbuffer = np.zeros((2 * self._Nsamples,))
+        self._mins = dict([])
+        self._maxs = dict([])
         self._data_length = 0
+        self._Nkept = 0
 
     @property
     def size(self):
@@ -417,8 +592,21 @@ class Data0DWithHistory:
 
     @length.setter
     def length(self, history_length: int):
-        if history_length > 0:
+        if history_length > 0 and history_length != self._Nsamples:
+            datas = self.datas
+            xaxis = self.xaxis
+            self._Nkept = min(self._Nkept, history_length)
             self._Nsamples = history_length
+            indexes = np.arange(self._data_length - self._Nkept, self._data_length) % self._Nsamples
+            self._xbuffer = self._reallocate(xaxis[len(xaxis) - self._Nkept:], indexes)
+            self._buffers = {data_key: self._reallocate(data[len(data) - self._Nkept:], indexes)
+                             for data_key, data in datas.items()}
+
+    def _reallocate(self, values: np.ndarray, indexes: np.ndarray) -> np.ndarray:
+        buffer = np.zeros((2 * self._Nsamples,), dtype=values.dtype)
+        buffer[indexes] = values
+        buffer[indexes + self._Nsamples] = values
+        return buffer
 
     def __len__(self):
         return self.length
@@ -447,40 +635,57 @@ class Data0DWithHistory:
         ----------
         datas: (dict) dictionaary of floats or np.array(float)
         """
-        if datas.keys() != self._datas.keys():
+        if datas.keys() != self._buffers.keys():
             self.clear_data()
 
+        index = self._data_length % self._Nsamples
+        self._xbuffer[index] = self._xbuffer[index + self._Nsamples] = self._data_length
         self._data_length += 1
-
-        if self._data_length > self._Nsamples:
-            self._xaxis += 1
-        else:
-            self._xaxis = np.linspace(0, self._data_length, self._data_length, endpoint=False)
+        self._Nkept = min(self._Nkept + 1, self._Nsamples)
 
         for data_key, data in datas.items():
-            if not isinstance(data, np.ndarray):
-                data = np.array([data])
-
-            if self._data_length == 1:
-                self._datas[data_key] = data
-            else:
-                self._datas[data_key] = np.concatenate((self._datas[data_key], data))
-
-            if self._data_length > self._Nsamples:
-                self._datas[data_key] = self._datas[data_key][1:]
+            if isinstance(data, np.ndarray):
+                data = data.flat[0]
+            if data_key not in self._buffers:
+                self._buffers[data_key] = np.zeros((2 * self._Nsamples,),
+                                                   dtype=np.result_type(np.asarray(data).dtype, np.float64))
+                self._mins[data_key] = data
+                self._maxs[data_key] = data
+            buffer = self._buffers[data_key]
+            buffer[index] = buffer[index + self._Nsamples] = data
+            if data < self._mins[data_key]:
+                self._mins[data_key] = data
+            elif data > self._maxs[data_key]:
+                self._maxs[data_key] = data
+
+    def _get_view(self, buffer: np.ndarray) -> np.ndarray:
+        start = (self._data_length - self._Nkept) % self._Nsamples
+        return buffer[start:start + self._Nkept]
 
     @property
     def datas(self):
-        return self._datas
+        return {data_key: self._get_view(buffer) for data_key, buffer in self._buffers.items()}
 
     @property
     def xaxis(self):
-        return self._xaxis
+        return self._get_view(self._xbuffer)
+
+    @property
+    def mins(self) -> dict:
+        """dict: the minimum value of each channel since the last clear"""
+        return self._mins
+
+    @property
+    def maxs(self) -> dict:
+        """dict: the maximum value of each channel since the last clear"""
+        return self._maxs
 
     def clear_data(self):
-        self._datas = dict([])
+        self._buffers = dict([])
+        self._mins = dict([])
+        self._maxs = dict([])
         self._data_length = 0
-        self._xaxis = np.array([])
+        self._Nkept = 0
 
 
 class View_cust(pg.ViewBox):
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+
+Compression of the arrays sent within the frames of the TCP/IP protocol (version 2)
+
+Each array payload of a compressed frame is preceded by a fixed size descriptor giving the codec, the byte shuffle
+filter, the dtype of the array, the dtype used on the wire (if downcast) and the number of stored bytes.
+"""
+import struct
+import zlib
+from typing import List, Tuple, Union
+
+import numpy as np
+
+try:
+    import blosc2
+except Exception:  # pragma: no cover
+    blosc2 = None
+
+NO_COMPRESSION = 'none'
+CODECS = [NO_COMPRESSION, 'zlib', 'blosc2:lz4', 'blosc2:zstd']  # the index of a codec is its id on the wire
+COMPRESSION_LEVELS = {'zlib': 1, 'blosc2:lz4': 5, 'blosc2:zstd': 1}
+BLOSC2_MAX_BUFFERSIZE = 2 ** 31 - 64
+PAYLOAD_DESCRIPTOR = struct.Struct('>B?8s8sQ6x')  # codec, shuffle, dtype, wire dtype, stored length (32 bytes)
+DOWNCAST_DTYPES = [np.dtype(dtype) for dtype in ['u1', 'i1', 'u2', 'i2', 'u4', 'i4', 'u8', 'i8']]
+
+
+def available_codecs() -> List[str]:
+    """Get the codecs that can be used to compress and decompress arrays in this environment"""
+    codecs = [NO_COMPRESSION, 'zlib']
+    if blosc2 is not None:
+        codecs.extend(['blosc2:lz4', 'blosc2:zstd'])
+    return codecs
+
+
+def _check_blosc2_nthreads():
+    """Make sure blosc2 uses at least one thread (it may be wrongly detected as 0, leading to a division by zero)
+
+    Done when blosc2 is used rather than at import so that its global state is not changed for other importers
+    """
+    if blosc2.nthreads < 1:
+        blosc2.set_nthreads(1)
+
+
+def downcast(array: np.ndarray) -> np.ndarray:
+    """Get the array converted to the smallest dtype representing exactly all its values
+
+    Integer arrays, and float arrays holding only integer values (like camera counts stored as floats) and no
+    negative zero, are converted to the smallest integer dtype containing their range of values. Other float64 arrays are converted to
+    float32 only if no value is changed by the conversion.
+
+    Parameters
+    ----------
+    array: np.ndarray
+
+    Returns
+    -------
+    np.ndarray: the converted array or the array itself if no smaller dtype is exact
+    """
+    if array.size == 0 or array.dtype.kind not in 'uif':
+        return array
+    if array.dtype.kind in 'ui' or np.all(np.isfinite(array)):
+        amin, amax = array.min(), array.max()
+        for dtype in DOWNCAST_DTYPES:
+            if dtype.itemsize >= array.dtype.itemsize:
+                break
+            info = np.iinfo(dtype)
+            if info.min <= amin and amax <= info.max:
+                converted = array.astype(dtype)
+                if array.dtype.kind in 'ui' or (np.array_equal(converted, array) and
+                                                not np.any(np.signbit(array) & (array == 0))):  # -0. == 0.
+                    return converted
+                break  # not integer values, none of the larger integer dtypes would be exact either
+    if array.dtype == np.float64:
+        converted = array.astype(np.float32)
+        if np.array_equal(converted, array, equal_nan=True):
+            return converted
+    return array
+
+
+def shuffle(buffer: np.ndarray, itemsize: int) -> np.ndarray:
+    """Byte shuffle: group the first bytes of all items, then the second bytes... (improves the compression)"""
+    return np.ascontiguousarray(buffer.reshape((-1, itemsize)).T).reshape(-1)
+
+
+def unshuffle(buffer: np.ndarray, itemsize: int) -> np.ndarray:
+    return np.ascontiguousarray(buffer.reshape((itemsize, -1)).T).reshape(-1)
+
+
+def encode_array(array: np.ndarray, codec: str = NO_COMPRESSION, cast: bool = False) -> List[Union[bytes, memoryview]]:
+    """Get the descriptor and the stored bytes of an array payload
+
+    The array is stored uncompressed if the compression does not reduce its size
+
+    Parameters
+    ----------
+    array: np.ndarray
+        a C-contiguous array
+    codec: str
+        one of the available codecs
+    cast: bool
+        if True, the array is sent using the smallest dtype representing exactly its values
+
+    Returns
+    -------
+    list of bytes or memoryview: the descriptor then the stored bytes
+    """
+    wire_array = downcast(array) if cast else array
+    stored = memoryview(wire_array.reshape(-1).view(np.uint8))
+    do_shuffle = wire_array.dtype.itemsize > 1
+    if codec != NO_COMPRESSION and stored.nbytes != 0:
+        compressed = compress(wire_array, codec, do_shuffle)
+        if compressed is not None and len(compressed) < stored.nbytes:
+            stored = compressed
+        else:
+            codec = NO_COMPRESSION
+    else:
+        codec = NO_COMPRESSION
+    descriptor = PAYLOAD_DESCRIPTOR.pack(CODECS.index(codec), do_shuffle and codec != NO_COMPRESSION,
+                                         array.dtype.str.encode(), wire_array.dtype.str.encode(), len(stored))
+    return [descriptor, stored]
+
+
+def compress(array: np.ndarray, codec: str, do_shuffle: bool = True) -> Union[bytes, None]:
+    """Compress the buffer of an array, None if the codec cannot compress it"""
+    if codec == 'zlib':
+        buffer = array.reshape(-1).view(np.uint8)
+        if do_shuffle:
+            buffer = shuffle(buffer, array.dtype.itemsize)
+        return zlib.compress(buffer, COMPRESSION_LEVELS[codec])
+    elif codec.startswith('blosc2') and blosc2 is not None:
+        if array.nbytes > BLOSC2_MAX_BUFFERSIZE:
+            return None
+        _check_blosc2_nthreads()
+        return blosc2.compress(array, typesize=array.dtype.itemsize, clevel=COMPRESSION_LEVELS[codec],
+                               filter=blosc2.Filter.SHUFFLE if do_shuffle else blosc2.Filter.NOFILTER,
+                               codec=getattr(blosc2.Codec, codec.split(':')[1].upper()))
+    raise ValueError(f'Unknown or unavailable compression codec: {codec}')
+
+
+def decode_payload(payload: memoryview) -> Tuple[memoryview, int]:
+    """Get the bytes of an array from its payload (descriptor and stored bytes)
+
+    Parameters
+    ----------
+    payload: memoryview
+        the bytes starting with the payload descriptor
+
+    Returns
+    -------
+    memoryview: the bytes of the array with its original dtype, a view on the payload if not compressed nor downcast
+    int: the length of the payload
+    """
+    codec_id, do_shuffle, dtype, wire_dtype, length = PAYLOAD_DESCRIPTOR.unpack(payload[:PAYLOAD_DESCRIPTOR.size])
+    dtype = np.dtype(dtype.rstrip(b'\x00').decode())
+    wire_dtype = np.dtype(wire_dtype.rstrip(b'\x00').decode())
+    stored = payload[PAYLOAD_DESCRIPTOR.size:PAYLOAD_DESCRIPTOR.size + length]
+    if stored.nbytes != length:
+        raise ValueError(f'Only {stored.nbytes} bytes of payload left to be read while {length} are stored')
+    codec = CODECS[codec_id]
+    if codec == NO_COMPRESSION:
+        buffer = np.frombuffer(stored, dtype=np.uint8)
+    elif codec == 'zlib':
+        buffer = zlib.decompress(stored)
+        buffer = unshuffle(np.frombuffer(buffer, dtype=np.uint8), wire_dtype.itemsize) if do_shuffle else \
+            np.frombuffer(bytearray(buffer), dtype=np.uint8)
+    elif codec.startswith('blosc2') and blosc2 is not None:
+        _check_blosc2_nthreads()
+        buffer = np.frombuffer(blosc2.decompress(stored, as_bytearray=True), dtype=np.uint8)
+    else:
+        raise ValueError(f'Unknown or unavailable compression codec: {codec}')
+    array = buffer.view(wire_dtype)
+    if wire_dtype != dtype:
+        array = array.astype(dtype)
+    return memoryview(array.view(np.uint8)), PAYLOAD_DESCRIPTOR.size + length
@@ -5,17 +5,37 @@ Created the 26/10/2023
 @author: Sebastien Weber
 """
 import socket
-from typing import Union
+from typing import Union, Iterable
 
-from pymodaq.utils.tcp_ip.serializer import Serializer
+from pymodaq.utils.logger import set_logger, get_module_name
+from pymodaq.utils.tcp_ip.compression import NO_COMPRESSION
+from pymodaq.utils.tcp_ip.serializer import (Serializer, FrameSerializer, FrameString, Segment, FRAME_HEADER,
+                                             FRAME_MAGIC, read_frame_header)
+
+logger = set_logger(get_module_name(__file__))
+
+IOV_MAX = 1024  # maximum number of buffers handled at once by sendmsg
+RECV_CHUNK = 1 << 20  # maximum number of bytes read at once by recv
 
 
 class Socket:
     """Custom Socket wrapping the built-in one and added functionalities to
-    make sure message have been sent and received entirely"""
+    make sure message have been sent and received entirely
+
+    Messages are sent and received using the version 1 of the protocol (each field sent separately) unless the
+    version 2 (one frame per message, see FrameSerializer) has been negotiated with the peer and set using the
+    sending_protocol and receiving_protocol attributes. Using the version 2, the arrays larger than
+    compression_threshold bytes can be sent compressed (compression attribute) and/or downcast (downcast attribute).
+    """
     def __init__(self, socket: socket.socket = None):
         super().__init__()
         self._socket = socket
+        self.sending_protocol = 1
+        self.receiving_protocol = 1
+        self.compression = NO_COMPRESSION
+        self.compression_threshold = 0
+        self.downcast = False
+        self._frame: FrameString = None
 
     def __eq__(self, other_obj):
         if isinstance(other_obj, Socket):
@@ -67,17 +87,54 @@ class Socket:
         while sended < len(data_bytes):
             sended += self.socket.send(data_bytes[sended:])
 
+    def check_sended_segments(self, segments: Iterable[Segment]):
+        """
+        Make sure all segments (bytes or memoryview) are sent through the socket
+
+        Uses scatter/gather sendmsg if the underlying socket supports it, so that the segments are not joined into an
+        intermediate bytes string before being sent
+
+        Parameters
+        ----------
+        segments: iterable of bytes or memoryview
+        """
+        views = [memoryview(segment).cast('B') for segment in segments]
+        views = [view for view in views if view.nbytes != 0]
+        if hasattr(self.socket, 'sendmsg'):
+            while len(views) != 0:
+                sended = self.socket.sendmsg(views[:IOV_MAX])
+                while sended > 0 and len(views) != 0:
+                    if sended >= views[0].nbytes:
+                        sended -= views.pop(0).nbytes
+                    else:
+                        views[0] = views[0][sended:]
+                        sended = 0
+        else:
+            for view in views:
+                sended = 0
+                while sended < view.nbytes:
+                    sended += self.socket.send(view[sended:])
+
     def check_sended_with_serializer(self, obj: object):
-        """ Convenience function to convert permitted objects to bytes and then use the check_sended method
+        """ Convenience function to convert permitted objects to bytes segments and then use the check_sended_segments
+        method
 
-        For a list of allowed objects, see :meth:`Serializer.to_bytes`
+        For a list of allowed objects, see :meth:`Serializer.to_bytes`. The object is sent as a single frame if the
+        version 2 of the protocol is used for sending
         """
-        self.check_sended(Serializer(obj).to_bytes())
+        if self.sending_protocol >= 2:
+            self.check_sended_segments(FrameSerializer(obj, self.compression, self.compression_threshold,
+                                                       self.downcast).to_segments())
+        else:
+            self.check_sended_segments(Serializer(obj).to_segments())
 
     def check_received_length(self, length) -> bytes:
         """
         Make sure all bytes (length) that should be received are received through the socket
 
+        Large messages are received into a single preallocated buffer (using recv_into if available) so that the cost
+        is linear with the message length
+
         Parameters
         ----------
         length: int
@@ -89,21 +146,33 @@ class Socket:
         """
         if not isinstance(length, int):
             raise TypeError(f'{length} should be an integer, not a {type(length)}')
+        if length == 0:
+            return b''
+
+        data_bytes = self.socket.recv(min(length, RECV_CHUNK))  # small messages are most often received at once
+        if len(data_bytes) == length:
+            return data_bytes
+        if len(data_bytes) == 0:
+            raise ConnectionError('The socket connection has been closed before receiving all data')
+
+        if hasattr(self.socket, 'recv_into'):
+            buffer = bytearray(length)
+            buffer[:len(data_bytes)] = data_bytes
+            self._recv_into(memoryview(buffer)[len(data_bytes):])
+            return bytes(buffer)
 
-        mess_length = 0
-        data_bytes = b''
-        while mess_length < length:
-            if mess_length < length - 4096:
-                data_bytes_tmp = self.socket.recv(4096)
-            else:
-                data_bytes_tmp = self.socket.recv(length - mess_length)
-            mess_length += len(data_bytes_tmp)
-            data_bytes += data_bytes_tmp
-        # print(data_bytes)
-        return data_bytes
+        chunks = [data_bytes]
+        received = len(data_bytes)
+        while received < length:
+            chunk = self.socket.recv(min(length - received, RECV_CHUNK))
+            if len(chunk) == 0:
+                raise ConnectionError('The socket connection has been closed before receiving all data')
+            chunks.append(chunk)
+            received += len(chunk)
+        return b''.join(chunks)
 
     def get_first_nbytes(self, length: int) -> bytes:
-        """ Read the first N bytes from the socket
+        """ Read the first N bytes from the socket (or from the current frame if using the version 2 of the protocol)
 
         Parameters
         ----------
@@ -114,5 +183,79 @@ class Socket:
         -------
         bytes: the read bytes string
         """
+        if self.receiving_protocol >= 2:
+            return self._current_frame().get_first_nbytes(length)
         return self.check_received_length(length)
 
+    def get_first_nbytes_into(self, buffer: Union[bytearray, memoryview]):
+        """ Read from the socket as many bytes as the length of a preallocated buffer directly into it
+
+        Parameters
+        ----------
+        buffer: bytearray or memoryview
+            a writable buffer, for instance a memoryview on a numpy array
+        """
+        if self.receiving_protocol >= 2:
+            self._current_frame().get_first_nbytes_into(buffer)
+        else:
+            self._receive_into(memoryview(buffer).cast('B'))
+
+    def get_first_nbytes_view(self, length: int) -> memoryview:
+        """ Read the first N bytes from the socket as a writable memoryview
+
+        Using the version 2 of the protocol, this is a view on the received frame without copy
+
+        Parameters
+        ----------
+        length: int
+            The number of bytes to be read from the socket
+
+        Returns
+        -------
+        memoryview
+        """
+        if self.receiving_protocol >= 2:
+            return self._current_frame().get_first_nbytes_view(length)
+        buffer = bytearray(length)
+        self._receive_into(memoryview(buffer))
+        return memoryview(buffer)
+
+    def _current_frame(self) -> FrameString:
+        if self._frame is None or self._frame.bytes_left == 0:
+            self._frame = self.receive_frame()
+        return self._frame
+
+    def receive_frame(self) -> FrameString:
+        """ Receive a whole frame (protocol version 2) from the socket
+
+        If the received bytes do not start with a frame header, they are dropped until the next frame header so that
+        the communication is resynchronized
+
+        Returns
+        -------
+        FrameString: the body of the frame from which the message can be deserialized
+        """
+        header = self.check_received_length(FRAME_HEADER.size)
+        if header[:len(FRAME_MAGIC)] != FRAME_MAGIC:
+            logger.warning('Invalid frame received, skipping bytes up to the next frame')
+            while header[:len(FRAME_MAGIC)] != FRAME_MAGIC:
+                header = header[1:] + self.check_received_length(1)
+        flags, metadata_length, body_length = read_frame_header(header)
+        body = bytearray(body_length)
+        self._receive_into(memoryview(body))
+        return FrameString(body, metadata_length, flags)
+
+    def _receive_into(self, view: memoryview):
+        if not hasattr(self.socket, 'recv_into'):
+            view[:] = self.check_received_length(view.nbytes)
+        else:
+            self._recv_into(view)
+
+    def _recv_into(self, view: memoryview):
+        """Fill a writable bytes memoryview with data received from the socket, as many bytes as possible at once"""
+        received = 0
+        while received < view.nbytes:
+            nbytes = self.socket.recv_into(view[received:], view.nbytes - received)
+            if nbytes == 0:
+                raise ConnectionError('The socket connection has been closed before receiving all data')
+            received += nbytes
@@ -5,21 +5,36 @@ Created the 20/10/2023
 @author: Sebastien Weber
 """
 import numbers
+import struct
 from typing import Tuple, List, Union, TYPE_CHECKING, Iterable
 
 
 import numpy as np
 from pymodaq.utils import data as data_mod
 from pymodaq.utils.data import DataWithAxes, DataToExport, Axis, DwaType
+from pymodaq.utils.tcp_ip.compression import NO_COMPRESSION, encode_array, decode_payload
 
 if TYPE_CHECKING:
     from pymodaq.utils.tcp_ip.mysocket import Socket
 
+PROTOCOL_VERSION = 2  # latest version of the protocol, version 1 being the non framed one
+FRAME_MAGIC = b'\x89PMQ'  # cannot be confused with the length of a version 1 message (more than 2GB)
+FRAME_HEADER = struct.Struct('>4sBBHIQ')  # magic, version, flags, reserved, metadata length, body length
+FRAME_ALIGNMENT = 64  # alignment of the arrays payloads within the frame body
+FRAME_COMPRESSED = 0x01  # flag set if each array payload starts with a descriptor (compression, downcast)
+
+
+def align(position: int, alignment: int = FRAME_ALIGNMENT) -> int:
+    """Get the first position greater or equal to position and multiple of alignment"""
+    return -(-position // alignment) * alignment
+
 
 class SocketString:
     """Mimic the Socket object but actually using a bytes string not a socket connection
 
-    Implements a minimal interface of two methods
+    Implements a minimal interface of two methods (and the get_first_nbytes_into variant). The bytes string is never
+    sliced, a cursor keeps track of the bytes already read so that reading a message is linear with its length
+    whatever its number of fields
 
     Parameters
     ----------
@@ -30,7 +45,18 @@ class SocketString:
     :class:`~pymodaq.utils.tcp_ip.mysocket.Socket`
     """
     def __init__(self, bytes_string: bytes):
-        self._bytes_string = bytes_string
+        self._bytes_string = memoryview(bytes_string).cast('B')
+        self._cursor = 0
+
+    @property
+    def bytes_left(self) -> int:
+        """Number of bytes not yet read"""
+        return self._bytes_string.nbytes - self._cursor
+
+    def _read(self, length: int) -> memoryview:
+        view = self._bytes_string[self._cursor:self._cursor + length]
+        self._cursor += view.nbytes
+        return view
 
     def check_received_length(self, length: int) -> bytes:
         """
@@ -47,9 +73,7 @@ class SocketString:
         -------
         bytes
         """
-        data = self._bytes_string[0:length]
-        self._bytes_string = self._bytes_string[length:]
-        return data
+        return self._read(length).tobytes()
 
     def get_first_nbytes(self, length: int) -> bytes:
         """ Read the first N bytes from the socket
@@ -66,17 +90,148 @@ class SocketString:
         """
         return self.check_received_length(length)
 
+    def get_first_nbytes_into(self, buffer: Union[bytearray, memoryview]):
+        """ Copy as many bytes as the length of a preallocated buffer directly into it
+
+        Parameters
+        ----------
+        buffer: bytearray or memoryview
+            a writable buffer, for instance a memoryview on a numpy array
+        """
+        view = memoryview(buffer).cast('B')
+        data = self._read(view.nbytes)
+        if data.nbytes != view.nbytes:
+            raise ValueError(f'Only {data.nbytes} bytes left to be read while {view.nbytes} are requested')
+        view[:] = data
+
+
+class FrameString(SocketString):
+    """Mimic the Socket object reading from the body of a single frame (protocol version 2)
+
+    The body is made of a metadata block (the headers of all serialized fields) followed by the aligned payloads of the
+    arrays. Headers are read from the metadata block while the arrays data are read from the payloads, either copied
+    (get_first_nbytes_into) or as a view on the frame buffer (get_first_nbytes_view). Compressed payloads are
+    decompressed when read.
+
+    Parameters
+    ----------
+    body: bytes, bytearray or memoryview
+        the frame body, to be writable for the arrays views to be writable
+    metadata_length: int
+        the length of the metadata block at the beginning of the body
+    flags: int
+        the flags of the frame header
+
+    See Also
+    --------
+    :class:`FrameSerializer`
+    """
+    def __init__(self, body: Union[bytes, bytearray, memoryview], metadata_length: int, flags: int = 0):
+        body = memoryview(body).cast('B')
+        super().__init__(body[:metadata_length])
+        self._body = body
+        self._payload_cursor = metadata_length
+        self._compressed = bool(flags & FRAME_COMPRESSED)
+
+    @classmethod
+    def from_frame(cls, frame: Union[bytes, bytearray, memoryview]) -> 'FrameString':
+        """Get a FrameString from a whole frame: header and body"""
+        frame = memoryview(frame).cast('B')
+        flags, metadata_length, body_length = read_frame_header(frame[:FRAME_HEADER.size])
+        if frame.nbytes != FRAME_HEADER.size + body_length:
+            raise ValueError(f'The frame should be {FRAME_HEADER.size + body_length} bytes long not {frame.nbytes}')
+        return cls(frame[FRAME_HEADER.size:], metadata_length, flags)
+
+    @property
+    def bytes_left(self) -> int:
+        """Number of bytes not yet read, metadata and payloads"""
+        return super().bytes_left + self._body.nbytes - self._payload_cursor
+
+    def get_first_nbytes_view(self, length: int) -> memoryview:
+        """ Get a view on the next payload of the frame
+
+        Parameters
+        ----------
+        length: int
+            The number of bytes of the payload
+
+        Returns
+        -------
+        memoryview
+        """
+        if length == 0:
+            return self._body[0:0]
+        self._payload_cursor = align(self._payload_cursor)
+        if self._compressed:
+            view, payload_length = decode_payload(self._body[self._payload_cursor:])
+        else:
+            view = self._body[self._payload_cursor:self._payload_cursor + length]
+            payload_length = view.nbytes
+        if view.nbytes != length:
+            raise ValueError(f'Got {view.nbytes} bytes of payload while {length} are requested')
+        self._payload_cursor += payload_length
+        return view
+
+    def get_first_nbytes_into(self, buffer: Union[bytearray, memoryview]):
+        """ Copy the next payload of the frame into a preallocated buffer
+
+        Parameters
+        ----------
+        buffer: bytearray or memoryview
+            a writable buffer, for instance a memoryview on a numpy array
+        """
+        view = memoryview(buffer).cast('B')
+        view[:] = self.get_first_nbytes_view(view.nbytes)
+
+
+def read_frame_header(header: Union[bytes, memoryview]) -> Tuple[int, int, int]:
+    """Check a frame header and get its flags, metadata length and body length
+
+    Raises
+    ------
+    ValueError if the header is not a valid frame header
+    """
+    magic, version, flags, _, metadata_length, body_length = FRAME_HEADER.unpack(header)
+    if magic != FRAME_MAGIC:
+        raise ValueError(f'Invalid frame header: {bytes(header)}')
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f'Unsupported protocol version: {version}')
+    if flags & ~FRAME_COMPRESSED:
+        raise ValueError(f'Unsupported frame flags: {flags}')
+    if metadata_length > body_length:
+        raise ValueError('Invalid frame header: the metadata are longer than the frame body')
+    return flags, metadata_length, body_length
+
+
+Segment = Union[bytes, memoryview]
+
 
 class Serializer:
-    """Used to Serialize to bytes python objects, numpy arrays and PyMoDAQ DataWithAxes and DataToExport objects"""
+    """Used to Serialize to bytes python objects, numpy arrays and PyMoDAQ DataWithAxes and DataToExport objects
+
+    The serialization can be obtained either as a single bytes string (:meth:`to_bytes`) or as a list of segments
+    (:meth:`to_segments`) where the raw buffers of the numpy arrays are referenced as memoryview and not copied. The
+    latter is meant to be sent through a socket using scatter/gather methods such as `socket.sendmsg`
+    """
 
     def __init__(self, obj: Union[int, str, numbers.Number, list, np.ndarray, Axis, DataWithAxes, DataToExport] = None):
-        self._bytes_string = b''
         self._obj = obj
 
-    def to_bytes(self):
+    def to_bytes(self) -> bytes:
         """ Generic method to obtain the bytes string from various objects
 
+        See Also
+        --------
+        :meth:`to_segments`
+        """
+        return b''.join(self.to_segments())
+
+    def to_segments(self) -> List[Segment]:
+        """ Generic method to obtain the serialized object as a list of bytes segments
+
+        Small headers (types, lengths, shapes...) are coalesced into bytes objects while the numpy arrays buffers are
+        referenced as memoryview without any intermediate copy.
+
         Compatible objects are:
 
         * :class:`bytes`
@@ -88,25 +243,56 @@ class Serializer:
         * :class:`~pymodaq.utils.data.DataToExport`
         * :class:`list` of any objects above
 
+        Returns
+        -------
+        list of bytes or memoryview
         """
+        segments = []
         if isinstance(self._obj, bytes):
-            return self.bytes_serialization(self._obj)
+            segments = [self.bytes_serialization(self._obj)]
         elif isinstance(self._obj, numbers.Number):
-            return self.scalar_serialization(self._obj)
+            segments = [self.scalar_serialization(self._obj)]
         elif isinstance(self._obj, str):
-            return self.string_serialization(self._obj)
+            segments = [self.string_serialization(self._obj)]
         elif isinstance(self._obj, np.ndarray):
-            return self.ndarray_serialization(self._obj)
+            segments = self._ndarray_segments(self._obj)
         elif isinstance(self._obj, Axis):
-            return self.axis_serialization(self._obj)
+            segments = self._axis_segments(self._obj)
         elif self._obj.__class__.__name__ in DwaType.names():
-            return self.dwa_serialization(self._obj)
+            segments = self._dwa_segments(self._obj)
         elif isinstance(self._obj, DataToExport):
-            return self.dte_serialization(self._obj)
+            segments = self._dte_segments(self._obj)
         elif isinstance(self._obj, list):
-            return self.list_serialization(self._obj)
+            segments = self._list_segments(self._obj)
         elif isinstance(self._obj, bool):
-            return self.scalar_serialization(int(self._obj))
+            segments = [self.scalar_serialization(int(self._obj))]
+        return self.coalesce_segments(segments)
+
+    @staticmethod
+    def coalesce_segments(segments: Iterable[Segment]) -> List[Segment]:
+        """ Join consecutive bytes segments together, leaving the memoryview segments untouched
+
+        Parameters
+        ----------
+        segments: iterable of bytes or memoryview
+
+        Returns
+        -------
+        list of bytes or memoryview
+        """
+        coalesced = []
+        pending = []
+        for segment in segments:
+            if isinstance(segment, memoryview):
+                if len(pending) != 0:
+                    coalesced.append(b''.join(pending))
+                    pending = []
+                coalesced.append(segment)
+            else:
+                pending.append(segment)
+        if len(pending) != 0:
+            coalesced.append(b''.join(pending))
+        return coalesced
 
     @staticmethod
     def int_to_bytes(an_integer: int) -> bytes:
@@ -155,10 +341,7 @@ class Serializer:
     def _int_serialization(self, int_obj: int) -> bytes:
         """serialize an unsigned integer used for getting the length of messages internaly, for outside integer
         serialization or deserialization use scalar_serialization"""
-        int_bytes = self.int_to_bytes(int_obj)
-        bytes_string = int_bytes
-        self._bytes_string += bytes_string
-        return bytes_string
+        return self.int_to_bytes(int_obj)
 
     def bytes_serialization(self, bytes_string_in: bytes) -> bytes:
         bytes_string = b''
@@ -181,7 +364,6 @@ class Serializer:
         cmd_bytes, cmd_length_bytes = self.str_len_to_bytes(string)
         bytes_string += cmd_length_bytes
         bytes_string += cmd_bytes
-        self._bytes_string += bytes_string
         return bytes_string
 
     def scalar_serialization(self, scalar: numbers.Number) -> bytes:
@@ -205,7 +387,6 @@ class Serializer:
         bytes_string += self.string_serialization(data_type)
         bytes_string += self._int_serialization(len(data_bytes))
         bytes_string += data_bytes
-        self._bytes_string += bytes_string
         return bytes_string
 
     def ndarray_serialization(self, array: np.ndarray) -> bytes:
@@ -232,23 +413,31 @@ class Serializer:
         * serialize data shape length
         * serialize all values of the shape as integers converted to bytes
         * serialize array as bytes
+
+        See Also
+        --------
+        :meth:`_ndarray_segments`
+        """
+        return b''.join(self._ndarray_segments(array))
+
+    def _ndarray_segments(self, array: np.ndarray) -> List[Segment]:
+        """ Convert a ndarray into a header bytes message and a memoryview on the array raw buffer
+
+        The array buffer is not copied unless the array is not C-contiguous
         """
         if not isinstance(array, np.ndarray):
             raise TypeError(f'{array} should be an numpy array, not a {type(array)}')
         array_type = array.dtype.descr[0][1]
         array_shape = array.shape
 
-        array = array.reshape(array.size)
-        array_bytes = array.tobytes()
+        array_buffer = memoryview(np.ascontiguousarray(array).reshape(array.size).view(np.uint8))
         bytes_string = b''
         bytes_string += self.string_serialization(array_type)
-        bytes_string += self._int_serialization(len(array_bytes))
+        bytes_string += self._int_serialization(array_buffer.nbytes)
         bytes_string += self._int_serialization(len(array_shape))
         for shape_elt in array_shape:
             bytes_string += self._int_serialization(shape_elt)
-        bytes_string += array_bytes
-        self._bytes_string += bytes_string
-        return bytes_string
+        return [bytes_string, array_buffer]
 
     def object_type_serialization(self, obj: Union[Axis, DataToExport, DataWithAxes]) -> bytes:
         """ Convert an object type into a bytes message as a string together with the info to convert it back
@@ -280,18 +469,19 @@ class Serializer:
         * serialize the axis
         * serialize the axis spread_order
         """
+        return b''.join(self._axis_segments(axis))
+
+    def _axis_segments(self, axis: Axis) -> List[Segment]:
         if not isinstance(axis, Axis):
             raise TypeError(f'{axis} should be a list, not a {type(axis)}')
 
-        bytes_string = b''
-        bytes_string += self.object_type_serialization(axis)
-        bytes_string += self.string_serialization(axis.label)
-        bytes_string += self.string_serialization(axis.units)
-        bytes_string += self.ndarray_serialization(axis.get_data())
-        bytes_string += self.scalar_serialization(axis.index)
-        bytes_string += self.scalar_serialization(axis.spread_order)
-        self._bytes_string += bytes_string
-        return bytes_string
+        segments = [self.object_type_serialization(axis),
+                    self.string_serialization(axis.label),
+                    self.string_serialization(axis.units)]
+        segments.extend(self._ndarray_segments(axis.get_data()))
+        segments.append(self.scalar_serialization(axis.index))
+        segments.append(self.scalar_serialization(axis.spread_order))
+        return segments
 
     def list_serialization(self, list_object: List) -> bytes:
         """ Convert a list of objects into a bytes message together with the info to convert it back
@@ -317,53 +507,55 @@ class Serializer:
         * get data type as a string
         * use the serialization method adapted to each object in the list
         """
+        return b''.join(self._list_segments(list_object))
+
+    def _list_segments(self, list_object: List) -> List[Segment]:
         if not isinstance(list_object, list):
             raise TypeError(f'{list_object} should be a list, not a {type(list_object)}')
 
-        bytes_string = b''
-
-        bytes_string += self._int_serialization(len(list_object))
+        segments = [self._int_serialization(len(list_object))]
         for obj in list_object:
-            bytes_string += self.type_and_object_serialization(obj)
-        self._bytes_string += bytes_string
-        return bytes_string
+            segments.extend(self._type_and_object_segments(obj))
+        return segments
 
-    def type_and_object_serialization(self, obj):
-        bytes_string = b''
+    def type_and_object_serialization(self, obj) -> bytes:
+        return b''.join(self._type_and_object_segments(obj))
+
+    def _type_and_object_segments(self, obj) -> List[Segment]:
         if isinstance(obj, DataWithAxes):
-            bytes_string += self.string_serialization('dwa')
-            bytes_string += self.dwa_serialization(obj)
+            segments = [self.string_serialization('dwa')]
+            segments.extend(self._dwa_segments(obj))
 
         elif isinstance(obj, Axis):
-            bytes_string += self.string_serialization('axis')
-            bytes_string += self.axis_serialization(obj)
+            segments = [self.string_serialization('axis')]
+            segments.extend(self._axis_segments(obj))
 
         elif isinstance(obj, np.ndarray):
-            bytes_string += self.string_serialization('array')
-            bytes_string += self.ndarray_serialization(obj)
+            segments = [self.string_serialization('array')]
+            segments.extend(self._ndarray_segments(obj))
 
         elif isinstance(obj, str):
-            bytes_string += self.string_serialization('string')
-            bytes_string += self.string_serialization(obj)
+            segments = [self.string_serialization('string'),
+                        self.string_serialization(obj)]
 
         elif isinstance(obj, numbers.Number):
-            bytes_string += self.string_serialization('scalar')
-            bytes_string += self.scalar_serialization(obj)
+            segments = [self.string_serialization('scalar'),
+                        self.scalar_serialization(obj)]
 
         elif isinstance(obj, bool):
-            bytes_string += self.string_serialization('bool')
-            bytes_string += self.scalar_serialization(int(obj))
+            segments = [self.string_serialization('bool'),
+                        self.scalar_serialization(int(obj))]
 
         elif isinstance(obj, list):
-            bytes_string += self.string_serialization('list')
-            bytes_string += self.list_serialization(obj)
+            segments = [self.string_serialization('list')]
+            segments.extend(self._list_segments(obj))
 
         else:
             raise TypeError(
                 f'the element {obj} type cannot be serialized into bytes, only numpy arrays'
                 f', strings, or scalars (int or float)')
 
-        return bytes_string
+        return segments
 
     def dwa_serialization(self, dwa: DataWithAxes) -> bytes:
         """ Convert a DataWithAxes into a bytes string
@@ -394,26 +586,27 @@ class Serializer:
         * serialize the list of names of extra attributes
         * serialize the extra attributes
         """
+        return b''.join(self._dwa_segments(dwa))
+
+    def _dwa_segments(self, dwa: DataWithAxes) -> List[Segment]:
         if not isinstance(dwa, DataWithAxes):
             raise TypeError(f'{dwa} should be a DataWithAxes, not a {type(dwa)}')
 
-        bytes_string = b''
-        bytes_string += self.object_type_serialization(dwa)
-        bytes_string += self.scalar_serialization(dwa.timestamp)
-        bytes_string += self.string_serialization(dwa.name)
-        bytes_string += self.string_serialization(dwa.source.name)
-        bytes_string += self.string_serialization(dwa.dim.name)
-        bytes_string += self.string_serialization(dwa.distribution.name)
-        bytes_string += self.list_serialization(dwa.data)
-        bytes_string += self.list_serialization(dwa.labels)
-        bytes_string += self.string_serialization(dwa.origin)
-        bytes_string += self.list_serialization(list(dwa.nav_indexes))
-        bytes_string += self.list_serialization(dwa.axes)
-        bytes_string += self.list_serialization(dwa.extra_attributes)
+        segments = [self.object_type_serialization(dwa),
+                    self.scalar_serialization(dwa.timestamp),
+                    self.string_serialization(dwa.name),
+                    self.string_serialization(dwa.source.name),
+                    self.string_serialization(dwa.dim.name),
+                    self.string_serialization(dwa.distribution.name)]
+        segments.extend(self._list_segments(dwa.data))
+        segments.extend(self._list_segments(dwa.labels))
+        segments.append(self.string_serialization(dwa.origin))
+        segments.extend(self._list_segments(list(dwa.nav_indexes)))
+        segments.extend(self._list_segments(dwa.axes))
+        segments.extend(self._list_segments(dwa.extra_attributes))
         for attribute in dwa.extra_attributes:
-            bytes_string += self.type_and_object_serialization(getattr(dwa, attribute))
-        self._bytes_string += bytes_string
-        return bytes_string
+            segments.extend(self._type_and_object_segments(getattr(dwa, attribute)))
+        return segments
 
     def dte_serialization(self, dte: DataToExport) -> bytes:
         """ Convert a DataToExport into a bytes string
@@ -435,16 +628,98 @@ class Serializer:
         * serialize the name
         * serialize the list of DataWithAxes
         """
+        return b''.join(self._dte_segments(dte))
+
+    def _dte_segments(self, dte: DataToExport) -> List[Segment]:
         if not isinstance(dte, DataToExport):
             raise TypeError(f'{dte} should be a DataToExport, not a {type(dte)}')
 
-        bytes_string = b''
-        bytes_string += self.object_type_serialization(dte)
-        bytes_string += self.scalar_serialization(dte.timestamp)
-        bytes_string += self.string_serialization(dte.name)
-        bytes_string += self.list_serialization(dte.data)
-        self._bytes_string += bytes_string
-        return bytes_string
+        segments = [self.object_type_serialization(dte),
+                    self.scalar_serialization(dte.timestamp),
+                    self.string_serialization(dte.name)]
+        segments.extend(self._list_segments(dte.data))
+        return segments
+
+
+class FrameSerializer(Serializer):
+    """Serialize objects into a single frame (protocol version 2)
+
+    The frame starts with a fixed size header (magic, version, flags, metadata length and body length) so that a
+    receiver gets a whole message in one read. The body holds first a metadata block made of the headers of all the
+    serialized fields (as produced by the Serializer) then the raw buffers of all the numpy arrays, each aligned on
+    FRAME_ALIGNMENT bytes so that they can be used without copy by the receiver.
+
+    Optionally, the arrays larger than a threshold can be compressed and/or sent using the smallest dtype representing
+    exactly their values, each payload being then preceded by a descriptor (see the compression module)
+
+    Parameters
+    ----------
+    obj: object
+        the object to serialize, see :meth:`Serializer.to_segments`
+    compression: str
+        the codec used to compress the arrays, one of compression.available_codecs()
+    threshold: int
+        arrays with less bytes are neither compressed nor downcast
+    cast: bool
+        if True, arrays are sent using the smallest dtype representing exactly their values
+
+    See Also
+    --------
+    :class:`FrameString`
+    """
+
+    def __init__(self, obj=None, compression: str = NO_COMPRESSION, threshold: int = 0, cast: bool = False):
+        super().__init__(obj)
+        self._compression = compression
+        self._threshold = threshold
+        self._cast = cast
+        self._dtypes: List[np.dtype] = []
+
+    @property
+    def compressed(self) -> bool:
+        return self._compression != NO_COMPRESSION or self._cast
+
+    def _ndarray_segments(self, array: np.ndarray) -> List[Segment]:
+        segments = super()._ndarray_segments(array)
+        self._dtypes.append(array.dtype)
+        return segments
+
+    def to_segments(self) -> List[Segment]:
+        """ Get the frame as a list of bytes segments, the arrays buffers being referenced as memoryview
+
+        Returns
+        -------
+        list of bytes or memoryview
+        """
+        self._dtypes = []
+        metadata = []
+        payloads = []
+        for segment in super().to_segments():
+            if isinstance(segment, memoryview):
+                payloads.append(segment)
+            else:
+                metadata.append(segment)
+        metadata = b''.join(metadata)
+
+        body = [metadata]
+        position = len(metadata)
+        for payload, dtype in zip(payloads, self._dtypes):
+            if payload.nbytes != 0:
+                body.append(bytes(align(position) - position))
+                position = align(position)
+                if self.compressed:
+                    if payload.nbytes >= self._threshold:
+                        payload_segments = encode_array(np.frombuffer(payload, dtype=dtype), self._compression,
+                                                        self._cast)
+                    else:
+                        payload_segments = encode_array(np.frombuffer(payload, dtype=dtype))
+                else:
+                    payload_segments = [payload]
+                body.extend(payload_segments)
+                position += sum([memoryview(segment).nbytes for segment in payload_segments])
+        header = FRAME_HEADER.pack(FRAME_MAGIC, PROTOCOL_VERSION, FRAME_COMPRESSED if self.compressed else 0, 0,
+                                   len(metadata), position)
+        return self.coalesce_segments([header] + body)
 
 
 class DeSerializer:
@@ -453,7 +728,7 @@ class DeSerializer:
 
     Parameters
     ----------
-    bytes_string: bytes or Socket
+    bytes_string: bytes, bytearray, memoryview or Socket
         the bytes string to deserialize into an object: int, float, string, arrays, list, Axis, DataWithAxes...
         Could also be a Socket object reading bytes from the network having a `get_first_nbytes` method
 
@@ -463,8 +738,8 @@ class DeSerializer:
     :py:class:`~pymodaq.utils.tcp_ip.mysocket.Socket`
     """
 
-    def __init__(self, bytes_string:  Union[bytes, 'Socket'] = None):
-        if isinstance(bytes_string, bytes):
+    def __init__(self, bytes_string:  Union[bytes, bytearray, memoryview, 'Socket'] = None):
+        if isinstance(bytes_string, (bytes, bytearray, memoryview)):
             bytes_string = SocketString(bytes_string)
         self._bytes_string = bytes_string
 
@@ -568,7 +843,10 @@ class DeSerializer:
     def ndarray_deserialization(self) -> np.ndarray:
         """Convert bytes into a numpy ndarray object
 
-        Convert the first bytes into a ndarray reading first information about the array's data
+        Convert the first bytes into a ndarray reading first information about the array's data. If the underlying
+        bytes provider has a `get_first_nbytes_view` method (like a frame), the array is a view on the received
+        buffer. If it has a `get_first_nbytes_into` method (like a Socket), the raw data are directly received into a
+        preallocated array without intermediate copies.
 
         Returns
         -------
@@ -582,7 +860,13 @@ class DeSerializer:
             shape_elt = self._int_deserialization()
             shape.append(shape_elt)
 
-        ndarray = np.frombuffer(self._bytes_string.get_first_nbytes(ndarray_len), dtype=ndarray_type)
+        if hasattr(self._bytes_string, 'get_first_nbytes_view'):
+            ndarray = np.frombuffer(self._bytes_string.get_first_nbytes_view(ndarray_len), dtype=ndarray_type)
+        elif hasattr(self._bytes_string, 'get_first_nbytes_into'):
+            ndarray = np.empty(ndarray_len // np.dtype(ndarray_type).itemsize, dtype=ndarray_type)
+            self._bytes_string.get_first_nbytes_into(memoryview(ndarray.view(np.uint8)))
+        else:
+            ndarray = np.frombuffer(self._bytes_string.get_first_nbytes(ndarray_len), dtype=ndarray_type)
         ndarray = ndarray.reshape(tuple(shape))
         ndarray = np.atleast_1d(ndarray)  # remove singleton dimensions
         return ndarray
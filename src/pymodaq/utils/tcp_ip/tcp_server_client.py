@@ -10,7 +10,7 @@ from typing import List
 import socket
 
 import numpy as np
-from qtpy.QtCore import QObject, Signal, Slot, QThread
+from qtpy.QtCore import QObject, Signal, Slot, QThread, QSocketNotifier
 from qtpy import QtWidgets
 
 from pymodaq.utils.parameter import utils as putils
@@ -22,10 +22,14 @@ from pymodaq.utils.config import Config
 from pymodaq.utils.parameter import Parameter
 from pymodaq.utils.data import DataToExport
 from pymodaq.utils.tcp_ip.mysocket import Socket
-from pymodaq.utils.tcp_ip.serializer import Serializer, DeSerializer
+from pymodaq.utils.tcp_ip.compression import NO_COMPRESSION, available_codecs
+from pymodaq.utils.tcp_ip.serializer import Serializer, DeSerializer, PROTOCOL_VERSION
 
 config = Config()
 
+PROTOCOL_COMMAND = f'protocol_v{PROTOCOL_VERSION}'  # command used to negotiate the protocol version with a server
+COMPRESSION_COMMAND = 'compression'  # command sending the codecs a peer can decode (once the version 2 is used)
+
 tcp_parameters = [
     {'title': 'Port:', 'name': 'port_id', 'type': 'int', 'value': config('network', 'tcp-server', 'port'), },
     {'title': 'IP:', 'name': 'socket_ip', 'type': 'str', 'value': config('network', 'tcp-server', 'ip'), },
@@ -35,6 +39,31 @@ tcp_parameters = [
      'value': dict(), 'header': ['Type', 'adress']}, ]
 
 
+def send_compression_codecs(sock: Socket):
+    """Send to the peer the codecs this side can decode, using the COMPRESSION_COMMAND"""
+    sock.check_sended_with_serializer(COMPRESSION_COMMAND)
+    sock.check_sended_with_serializer(available_codecs())
+
+
+def configure_compression(sock: Socket, peer_codecs: List[str]):
+    """Set the compression of the arrays sent through a socket from the configuration
+
+    The configured codec is used only if both sides can use it, otherwise arrays are sent uncompressed
+
+    Parameters
+    ----------
+    sock: Socket
+    peer_codecs: list of str
+        the codecs the peer can decode
+    """
+    codec = config('network', 'tcp-server', 'compression')
+    if codec not in peer_codecs or codec not in available_codecs():
+        codec = NO_COMPRESSION
+    sock.compression = codec
+    sock.compression_threshold = config('network', 'tcp-server', 'compression_threshold')
+    sock.downcast = config('network', 'tcp-server', 'downcast')
+
+
 class TCPClientTemplate:
     params = []
 
@@ -278,6 +307,7 @@ class TCPClient(TCPClientTemplate, QObject):
 
         self.cmd_signal.emit(ThreadCommand('connected'))
         self.socket.check_sended_with_serializer(self.client_type)
+        self.socket.check_sended_with_serializer(PROTOCOL_COMMAND)  # ignored by servers not knowing the protocol
 
         self.send_infos_xml(ioxml.parameter_to_xml_string(self.settings))
         for command in extra_commands:
@@ -298,7 +328,15 @@ class TCPClient(TCPClientTemplate, QObject):
         if self.socket is not None:
             messg = ThreadCommand(message)
 
-            if message == 'set_info':
+            if message == PROTOCOL_COMMAND:
+                self.acknowledge_protocol()
+                return
+
+            elif message == COMPRESSION_COMMAND:
+                configure_compression(self.socket, self._deserializer.list_deserialization())
+                return
+
+            elif message == 'set_info':
                 path = self._deserializer.list_deserialization()
                 param_xml = self._deserializer.string_deserialization()
                 messg.attribute = [path, param_xml]
@@ -312,10 +350,29 @@ class TCPClient(TCPClientTemplate, QObject):
     def data_ready(self, data: DataToExport):
         self.send_data(data)
 
+    def acknowledge_protocol(self):
+        """The server accepted the version 2 of the protocol
+
+        All its following messages are frames. The acknowledgment is the last message sent with the version 1, it is
+        followed by the codecs the client can decode
+
+        See Also
+        --------
+        TCPServer.negotiate_protocol
+        """
+        self.socket.receiving_protocol = PROTOCOL_VERSION
+        self.socket.check_sended_with_serializer(PROTOCOL_COMMAND)
+        self.socket.sending_protocol = PROTOCOL_VERSION
+        send_compression_codecs(self.socket)
+
 
 class TCPServer(QObject):
     """
     Abstract class to be used as inherited by DAQ_Viewer_TCP or DAQ_Move_TCP
+
+    The server is event driven: each connected socket (and the server socket itself) is watched by a QSocketNotifier
+    (living in the thread where init_server is called) so that incoming connections and messages are processed as soon
+    as bytes are available, independently for each client.
     """
 
     def __init__(self, client_type='GRABBER'):
@@ -325,6 +382,7 @@ class TCPServer(QObject):
         self.listening = True
         self.processing = False
         self.client_type = client_type
+        self._notifiers = dict([])
 
     def close_server(self):
         """
@@ -356,30 +414,35 @@ class TCPServer(QObject):
                                             'log']))
             raise ConnectionError('Bind failed. Error Code : ' + str(msg.errno) + ' Message ' + msg.strerror)
 
-        self.serversocket.listen(1)
+        self.serversocket.listen(5)
         self.connected_clients.append(dict(socket=self.serversocket, type='server'))
         self.settings.child('conn_clients').setValue(self.set_connected_clients_table())
+        self.watch_socket(self.serversocket)
 
-        self.timer = self.startTimer(100)  # Timer event fired every 100ms
-        # self.listen_client()
-
-    def timerEvent(self, event):
-        """
-            Called by set timers.
-            If the process is free, start the listen_client function.
-
-            =============== ==================== ==============================================
-            **Parameters**   **Type**              **Description**
+    def watch_socket(self, sock: Socket):
+        """Process the incoming connections or messages of a socket as soon as they are available
 
-            *event*          QTimerEvent object    Containing id from timer issuing this event
-            =============== ==================== ==============================================
-
-            See Also
-            --------
-            listen_client
+        See Also
+        --------
+        process_socket
         """
-        if not self.processing:
-            self.listen_client()
+        notifier = QSocketNotifier(sock.socket.fileno(), QSocketNotifier.Read, self)
+        notifier.activated.connect(lambda *args: self._socket_activated(sock, notifier))
+        self._notifiers[sock.socket] = notifier
+
+    def unwatch_socket(self, sock: Socket):
+        notifier = self._notifiers.pop(sock.socket, None)
+        if notifier is not None:
+            notifier.setEnabled(False)
+            notifier.deleteLater()
+
+    def _socket_activated(self, sock: Socket, notifier: QSocketNotifier):
+        notifier.setEnabled(False)  # no reentrant activation while the message is read and processed
+        try:
+            self.process_socket(sock)
+        finally:
+            if sock.socket in self._notifiers:
+                notifier.setEnabled(True)
 
     def find_socket_within_connected_clients(self, client_type) -> Socket:
         """
@@ -449,6 +512,7 @@ class TCPServer(QObject):
     def remove_client(self, sock):
         sock_type = self.find_socket_type_within_connected_clients(sock)
         if sock_type is not None:
+            self.unwatch_socket(sock)
             self.connected_clients.remove(dict(socket=sock, type=sock_type))
             self.settings.child('conn_clients').setValue(self.set_connected_clients_table())
             try:
@@ -487,55 +551,103 @@ class TCPServer(QObject):
     def listen_client(self):
         """
             Server function.
-            Used to connect or listen incoming message from a client.
+            Used to connect or listen incoming message from a client, polling all the connected sockets at once. Not
+            needed once init_server has been called as sockets are then processed as soon as they are readable.
+
+            See Also
+            --------
+            process_socket
         """
         try:
             self.processing = True
-            # QtWidgets.QApplication.processEvents() #to let external commands in
             read_sockets, write_sockets, error_sockets = self.select(
                 [client['socket'] for client in self.connected_clients], [],
                 [client['socket'] for client in self.connected_clients],
                 0)
+            sockets = {client['socket'].socket: client['socket'] for client in self.connected_clients}
             for sock in error_sockets:
                 self.remove_client(sock)
 
             for sock in read_sockets:
-                QThread.msleep(100)
-                if sock == self.serversocket:  # New connection
-                    # means a new socket (client) try to reach the server
-                    (client_socket, address) = self.serversocket.accept()
-                    DAQ_type = DeSerializer(client_socket).string_deserialization()
-                    if DAQ_type not in self.socket_types:
-                        self.emit_status(ThreadCommand("Update_Status", [DAQ_type + ' is not a valid type', 'log']))
-                        client_socket.close()
-                        break
-
-                    self.connected_clients.append(dict(socket=client_socket, type=DAQ_type))
-                    self.settings.child('conn_clients').setValue(self.set_connected_clients_table())
-                    self.emit_status(ThreadCommand("Update_Status",
-                                                   [DAQ_type + ' connected with ' + address[0] + ':' + str(address[1]),
-                                                    'log']))
-                    QtWidgets.QApplication.processEvents()
-
-                else:  # Some incoming message from a client
-                    # Data received from client, process it
-                    try:
-                        message = DeSerializer(sock).string_deserialization()
-                        if message in ['Done', 'Info', 'Infos', 'Info_xml', 'position_is', 'move_done']:
-                            self.process_cmds(message, command_sock=None)
-                        elif message == 'Quit':
-                            raise Exception("socket disconnect by user")
-                        else:
-                            self.process_cmds(message, command_sock=sock)
-
-                    # client disconnected, so remove from socket list
-                    except Exception as e:
-                        self.remove_client(sock)
-
-            self.processing = False
+                self.process_socket(sockets.get(sock.socket, sock))
 
         except Exception as e:
             self.emit_status(ThreadCommand("Update_Status", [str(e), 'log']))
+        finally:
+            self.processing = False
+
+    def process_socket(self, sock: Socket):
+        """Accept a new client if sock is the server socket or process the message sent by a client
+
+        Parameters
+        ----------
+        sock: Socket
+            a socket ready to be read
+        """
+        if sock == self.serversocket:  # New connection
+            # means a new socket (client) try to reach the server
+            try:
+                (client_socket, address) = self.serversocket.accept()
+                DAQ_type = DeSerializer(client_socket).string_deserialization()
+            except Exception as e:
+                self.emit_status(ThreadCommand("Update_Status", [str(e), 'log']))
+                return
+            if DAQ_type not in self.socket_types:
+                self.emit_status(ThreadCommand("Update_Status", [DAQ_type + ' is not a valid type', 'log']))
+                client_socket.close()
+                return
+
+            self.connected_clients.append(dict(socket=client_socket, type=DAQ_type))
+            self.settings.child('conn_clients').setValue(self.set_connected_clients_table())
+            if self.serversocket.socket in self._notifiers:
+                self.watch_socket(client_socket)
+            self.emit_status(ThreadCommand("Update_Status",
+                                           [DAQ_type + ' connected with ' + address[0] + ':' + str(address[1]),
+                                            'log']))
+
+        else:  # Some incoming message from a client
+            # Data received from client, process it
+            try:
+                message = DeSerializer(sock).string_deserialization()
+                if message == PROTOCOL_COMMAND:
+                    self.negotiate_protocol(sock)
+                elif message == COMPRESSION_COMMAND:
+                    configure_compression(sock, DeSerializer(sock).list_deserialization())
+                elif message in ['Done', 'Info', 'Infos', 'Info_xml', 'position_is', 'move_done']:
+                    self.process_cmds(message, command_sock=None)
+                elif message == 'Quit':
+                    raise Exception("socket disconnect by user")
+                else:
+                    self.process_cmds(message, command_sock=sock)
+
+            # client disconnected, so remove from socket list
+            except Exception as e:
+                self.remove_client(sock)
+
+    def negotiate_protocol(self, sock: Socket):
+        """Switch to the version 2 of the protocol (one frame per message) with a client proposing it
+
+        The negotiation is done in three steps so that each side knows from which message the other one sends frames:
+
+        * the client proposes the protocol sending the PROTOCOL_COMMAND
+        * the server acknowledges it sending back the PROTOCOL_COMMAND, its following messages being frames
+        * the client confirms sending again the PROTOCOL_COMMAND, its following messages being frames
+
+        Both sides then send the codecs they can decode (COMPRESSION_COMMAND) and compress the arrays they send using
+        the codec set in the configuration if the other side can decode it.
+        Clients not proposing it (previous versions or non PyMoDAQ clients) keep using the version 1
+
+        Parameters
+        ----------
+        sock: Socket
+            the socket of the client having sent the PROTOCOL_COMMAND
+        """
+        if sock.sending_protocol < PROTOCOL_VERSION:
+            sock.check_sended_with_serializer(PROTOCOL_COMMAND)
+            sock.sending_protocol = PROTOCOL_VERSION
+        else:
+            sock.receiving_protocol = PROTOCOL_VERSION
+            send_compression_codecs(sock)
 
     def send_command(self, sock: Socket, command="move_at"):
         """
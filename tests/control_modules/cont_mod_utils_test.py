@@ -4,7 +4,11 @@ Created the 15/11/2022
 
 @author: Sebastien Weber
 """
+import threading
+import time
+
 import pytest
+from qtpy import QtCore
 
 from pymodaq.control_modules import utils
 from pymodaq.utils.plotting.data_viewers.viewer import ViewersEnum
@@ -25,3 +29,64 @@ class TestDAQType:
         assert daq_type.to_daq_type() == daq_type_str
         assert daq_type.to_viewer_type() == viewer_type_str
         assert daq_type.to_data_type() == data_type_str
+
+
+class TestDataMailbox:
+    def test_post_take(self, qtbot):
+        mailbox = utils.DataMailbox()
+        notifications = []
+        mailbox.data_posted.connect(lambda: notifications.append(len(mailbox)))
+        for ind in range(5):
+            mailbox.post(ind)
+        assert notifications == [1]  # a single notification until the data are taken
+        assert len(mailbox) == 5
+        assert mailbox.take() == [0, 1, 2, 3, 4]
+        assert len(mailbox) == 0
+        mailbox.post(5)
+        assert notifications == [1, 1]
+        assert mailbox.posted == 6
+        mailbox.reset()
+        assert mailbox.posted == 0
+        assert mailbox.take() == []
+
+    def test_from_thread(self, qtbot):
+        mailbox = utils.DataMailbox()
+        notifications = []
+        mailbox.data_posted.connect(lambda: notifications.append(None), QtCore.Qt.QueuedConnection)
+
+        thread = threading.Thread(target=lambda: [mailbox.post(ind) for ind in range(1000)])
+        thread.start()
+        thread.join()
+        qtbot.waitUntil(lambda: len(notifications) == 1)
+        assert mailbox.take() == list(range(1000))
+
+
+class TestDisplayGovernor:
+    def test_delay(self):
+        governor = utils.DisplayGovernor(refresh_time=50., display_load=0.5, busy_timeout=1000.)
+        assert governor.get_delay() == 0.
+        governor.display_started()
+        assert governor.busy
+        assert governor.get_delay() > 900.  # waiting for the display to be done
+        governor.display_done()
+        assert not governor.busy
+        assert 0. < governor.get_delay() <= 50.
+        assert governor.period == 50.
+
+    def test_adapt_to_display_duration(self):
+        governor = utils.DisplayGovernor(refresh_time=0., display_load=0.5)
+        governor.display_started()
+        time.sleep(0.02)
+        governor.display_done()
+        assert governor.display_duration == pytest.approx(20., abs=10.)
+        assert governor.period == pytest.approx(2 * governor.display_duration)
+        assert governor.get_delay() > 0.
+        governor.reset()
+        assert governor.period == 0.
+        assert governor.get_delay() == 0.
+
+    def test_busy_timeout(self):
+        governor = utils.DisplayGovernor(busy_timeout=10.)
+        governor.display_started()
+        time.sleep(0.02)
+        assert not governor.busy  # never signaled as done but considered done anyway
@@ -16,6 +16,8 @@ from pymodaq.utils.config import Config
 from pymodaq.utils.parameter import utils as putils
 from pymodaq.utils.parameter import Parameter
 from pymodaq.utils.h5modules.browsing import H5BrowserUtil
+from pymodaq.utils.data import DataToExport, DataFromPlugins
+from pymodaq.utils.daq_utils import find_dict_in_list_from_key_val
 
 config = Config()
 config_viewer = daqvm.config
@@ -81,6 +83,14 @@ class TestWithoutUI:
         prog, qtbot = ini_daq_viewer_without_ui
         prog.daq_type = 'DAQ0D'
         prog.detector = det
+        plugin = find_dict_in_list_from_key_val(DET_TYPES['DAQ0D'], 'name', det)
+        try:
+            plugin['module']
+        except Exception:  # plugins are listed without being imported, import errors show up when selected
+            assert prog.detector == det
+            with pytest.raises(Exception):
+                get_viewer_plugins(prog.daq_type.name, prog.detector)
+            return
         det_params, _class = get_viewer_plugins(prog.daq_type.name, prog.detector)
         assert putils.iter_children(prog.settings.child('detector_settings'), []) == \
             putils.iter_children(det_params, [])
@@ -106,3 +116,95 @@ class TestWithUI:
             prog.ui.get_action('stop').trigger()
         assert blocker.args[0].command == 'stop'
 
+
+
+class TestDisplayGovernor:
+    def test_frames_dropped_not_lost(self, ini_daq_viewer_ui):
+        prog, qtbot, dockarea = ini_daq_viewer_ui
+        prog.settings.child('main_settings', 'refresh_time').setValue(100.)
+        prog._grabing = True  # as in continuous grab
+        received = []
+        prog.grab_done_signal.connect(received.append)
+
+        Nframes = 50
+        for ind in range(Nframes):
+            prog._data_mailbox.post(DataToExport('Mock', data=[
+                DataFromPlugins('data', data=[np.array([float(ind)])])]))
+        qtbot.waitUntil(lambda: len(received) >= Nframes - 1)
+        assert prog.displayed_frames == 1  # the first data are displayed, the others are too close in time
+        prog.stop()  # the data waiting to be displayed are then displayed
+        qtbot.waitUntil(lambda: len(received) == Nframes)
+
+        assert [float(dte[0][0][0]) for dte in received] == list(range(Nframes))  # lossless and in order
+        assert prog.displayed_frames == 2
+        assert prog.dropped_frames == Nframes - 2
+        assert prog.settings['main_settings', 'dropped_frames'] == Nframes - 2
+
+    def test_order_with_asynchronous_viewers(self, ini_daq_viewer_ui):
+        prog, qtbot, dockarea = ini_daq_viewer_ui
+        prog.settings.child('main_settings', 'refresh_time').setValue(0.)
+        for viewer in prog.viewers:  # the viewers send back their data 50 ms later (as when processing in a thread)
+            viewer.data_to_export_signal.disconnect(prog._get_data_from_viewer)
+            viewer.data_to_export_signal.connect(
+                lambda dte: QtCore.QTimer.singleShot(50, lambda: prog._get_data_from_viewer(dte)))
+        prog._grabing = True  # as in continuous grab
+        received = []
+        prog.grab_done_signal.connect(received.append)
+
+        Nframes = 40
+        for ind in range(Nframes):
+            prog._data_mailbox.post(DataToExport('Mock', data=[
+                DataFromPlugins('data', data=[np.array([float(ind)])])]))
+            qtbot.wait(5)
+        prog.stop()
+        qtbot.waitUntil(lambda: len(received) == Nframes)
+        assert 1 < prog.displayed_frames < Nframes
+        assert [float(dte.get_data_from_name('data')[0][0]) for dte in received] == list(range(Nframes))
+
+    def test_live_averaging_dropped_frames(self, ini_daq_viewer_ui):
+        prog, qtbot, dockarea = ini_daq_viewer_ui
+        prog.settings.child('main_settings', 'refresh_time').setValue(100.)
+        prog.settings.child('main_settings', 'live_averaging').setValue(True)
+        prog._grabing = True  # as in continuous grab
+        received = []
+        prog.grab_done_signal.connect(received.append)
+
+        Nframes = 50
+        for ind in range(Nframes):
+            prog._data_mailbox.post(DataToExport('Mock', data=[
+                DataFromPlugins('data', data=[np.array([float(ind)])])]))
+        qtbot.waitUntil(lambda: prog._live_accumulator.count == Nframes)
+        prog.stop()
+        qtbot.waitUntil(lambda: len(received) == 2)
+        assert prog.displayed_frames == 2  # the average is only computed and exported for the displayed frames
+        assert prog.dropped_frames == Nframes - 2
+        assert float(received[0][0][0][0]) == approx(0.)
+        assert float(received[-1][0][0][0]) == approx(np.mean(range(Nframes)))
+
+    def test_snap_not_governed(self, ini_daq_viewer_ui):
+        prog, qtbot, dockarea = ini_daq_viewer_ui
+        prog.settings.child('main_settings', 'refresh_time').setValue(1000.)
+        received = []
+        prog.grab_done_signal.connect(received.append)
+        for ind in range(3):
+            with qtbot.waitSignal(prog.grab_done_signal):
+                prog._data_mailbox.post(DataToExport('Mock', data=[
+                    DataFromPlugins('data', data=[np.array([float(ind)])])]))
+        assert len(received) == 3
+        assert prog.displayed_frames == 3
+
+    def test_data_sink(self, ini_daq_viewer_ui):
+        prog, qtbot, dockarea = ini_daq_viewer_ui
+        sunk = []
+        prog.set_data_sink(sunk.append)
+        with qtbot.waitSignal(prog.grab_done_signal) as blocker:
+            prog._post_data(DataToExport('Mock', data=[DataFromPlugins('data', data=[np.array([1.])])]))
+            assert len(sunk) == 1  # synchronously, before any display
+        assert sunk[0].name == prog.title
+        assert sunk[0][0].origin == prog.title
+        assert float(sunk[0][0][0][0]) == approx(float(blocker.args[0].get_data_from_name('data')[0][0]))
+
+        prog.set_data_sink(None)
+        with qtbot.waitSignal(prog.grab_done_signal):
+            prog._post_data(DataToExport('Mock', data=[DataFromPlugins('data', data=[np.array([2.])])]))
+        assert len(sunk) == 1
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+from pathlib import Path
+
+import pytest
+from pytest import approx
+
+import pymodaq
+
+from pymodaq.utils.data import DataToExport
+from pymodaq.utils.exceptions import DetectorError, ActuatorError, MasterSlaveError
+from pymodaq.utils.parameter import Parameter, ioxml
+from pymodaq.control_modules.headless import HeadlessViewer, HeadlessMove, init_modules, load_preset
+
+PRESET = ioxml.XML_file_to_parameter(Path(pymodaq.__file__).parent.joinpath('resources', 'preset_default.xml'))
+
+
+@pytest.fixture
+def modules(qtbot):
+    """Collects the modules created by a test and close them at the end"""
+    modules = []
+    yield modules
+    for module in modules:
+        module.quit_fun()
+
+
+def make_preset(tmp_path, remove=('det01',), xaxis_status='Master'):
+    """Write the default preset (Mock plugins only) without the given modules"""
+    preset = Parameter.create(name='Preset', type='group', children=PRESET)
+    for name in remove:
+        preset.child('Detectors', name).remove()
+    preset.child('Moves', 'move00', 'params', 'move_settings', 'multiaxes', 'multi_status').setValue(xaxis_status)
+    ioxml.parameter_to_xml_file(preset, tmp_path.joinpath('preset.xml'))
+    return tmp_path.joinpath('preset.xml')
+
+
+class TestHeadlessViewer:
+    def test_invalid(self, qtbot):
+        with pytest.raises(DetectorError):
+            HeadlessViewer('det', 'DAQ2D', 'not_a_detector')
+        with pytest.raises(DetectorError):
+            HeadlessViewer('det', 'DAQ5D', 'Mock')
+
+    def test_acquire(self, modules):
+        viewer = HeadlessViewer('det', 'DAQ2D', 'Mock')
+        modules.append(viewer)
+        assert viewer.settings['main_settings', 'module_name'] == 'det'
+        assert viewer.acquire() is None  # not initialized
+
+        assert init_modules([viewer], 10000)
+        assert viewer.initialized_state
+        dte = viewer.acquire()
+        assert isinstance(dte, DataToExport)
+        assert dte.name == 'det'
+        assert len(dte) == 2
+        assert all([dwa.origin == 'det' for dwa in dte])
+        assert viewer.current_data is dte
+
+        viewer.settings.child('detector_settings', 'Nx').setValue(50)  # sent to the plugin
+        assert viewer.acquire()[0].shape[1] == 50
+
+    def test_grab_done_signal(self, modules, qtbot):
+        viewer = HeadlessViewer('det', 'DAQ0D', 'Mock')
+        modules.append(viewer)
+        init_modules([viewer], 10000)
+        with qtbot.waitSignal(viewer.grab_done_signal, timeout=10000) as blocker:
+            viewer.snap()
+        assert blocker.args[0].get_data_from_dim('Data0D')[0].origin == 'det'
+
+    def test_quit(self, qtbot):
+        viewer = HeadlessViewer('det', 'DAQ0D', 'Mock')
+        init_modules([viewer], 10000)
+        viewer.quit_fun()
+        assert not viewer.initialized_state
+        assert not viewer._hardware_thread.isRunning()
+
+
+class TestHeadlessMove:
+    def test_invalid(self, qtbot):
+        with pytest.raises(ActuatorError):
+            HeadlessMove('act', 'not_an_actuator')
+
+    def test_move(self, modules, qtbot):
+        move = HeadlessMove('act', 'Mock')
+        modules.append(move)
+        move.settings.child('move_settings', 'tau').setValue(10)
+        assert init_modules([move], 10000)
+        assert move.move_to(0.5).value() == approx(0.5, abs=move.settings['move_settings', 'epsilon'])
+        assert move.current_value.name == 'act'
+
+        with qtbot.waitSignal(move.move_done_signal, timeout=10000):
+            move.move_rel(0.5)
+        assert move.current_value.value() == approx(1., abs=2 * move.settings['move_settings', 'epsilon'])
+
+        with qtbot.waitSignal(move.current_value_signal, timeout=10000):
+            move.get_actuator_value()
+
+
+class TestLoadPreset:
+    def test_load(self, tmp_path, modules):
+        actuators, detectors = load_preset(make_preset(tmp_path), timeout=20000)
+        modules.extend(actuators + detectors)
+        assert [act.title for act in actuators] == ['Xaxis', 'Yaxis', 'Theta axis']
+        assert [det.title for det in detectors] == ['Det 0D', 'Det 2D']
+        assert all([module.initialized_state for module in actuators + detectors])
+        assert actuators[1].controller is actuators[0].controller  # slaves use the controller of their master
+        assert actuators[2].controller is actuators[0].controller
+
+    def test_no_init(self, tmp_path, modules):
+        actuators, detectors = load_preset(make_preset(tmp_path), init=False)
+        modules.extend(actuators + detectors)
+        assert not any([module.initialized_state for module in actuators + detectors])
+
+    def test_master_slave_error(self, tmp_path, qtbot):
+        with pytest.raises(MasterSlaveError):
+            load_preset(make_preset(tmp_path, xaxis_status='Slave'), init=False)
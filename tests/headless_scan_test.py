@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import pymodaq
+from pymodaq.utils import exceptions
+from pymodaq.utils.parameter import Parameter, ioxml
+from pymodaq.utils.h5modules.saving import H5SaverLowLevel
+from pymodaq.utils.h5modules.data_saving import DataLoader
+from pymodaq.control_modules.headless import HeadlessViewer, HeadlessMove, init_modules
+from pymodaq.extensions.headless_scan import HeadlessScan
+
+
+@pytest.fixture
+def scan(qtbot):
+    move = HeadlessMove('act', 'Mock')
+    move.settings.child('move_settings', 'tau').setValue(10)
+    detectors = [HeadlessViewer('det0D', 'DAQ0D', 'Mock'), HeadlessViewer('det2D', 'DAQ2D', 'Mock')]
+    init_modules([move] + detectors, 10000)
+    scan = HeadlessScan([move], detectors)
+    scan.scanner.set_scan_type_and_subtypes('Scan1D', 'Linear')
+    set_linear(scan, 0., 1., 0.25)
+    yield scan
+    scan.quit_fun()
+
+
+def make_preset(tmp_path):
+    """Write the default preset (Mock plugins only) with a 0D and a 2D detectors"""
+    preset = Parameter.create(name='Preset', type='group', children=ioxml.XML_file_to_parameter(
+        Path(pymodaq.__file__).parent.joinpath('resources', 'preset_default.xml')))
+    preset.child('Detectors', 'det01').remove()
+    ioxml.parameter_to_xml_file(preset, tmp_path.joinpath('preset.xml'))
+    return tmp_path.joinpath('preset.xml')
+
+
+def set_linear(scan: HeadlessScan, start, stop, step):
+    scanner_settings = scan.scanner.get_scanner_sub_settings()
+    scanner_settings.child('start').setValue(start)
+    scanner_settings.child('stop').setValue(stop)
+    scanner_settings.child('step').setValue(step)
+
+
+def load(h5_file, path):
+    h5saver = H5SaverLowLevel()
+    h5saver.init_file(h5_file)
+    try:
+        return DataLoader(h5saver).load_data(path, load_all=True)
+    finally:
+        h5saver.close_file()
+
+
+class TestHeadlessScan:
+    def test_run(self, scan, tmp_path):
+        h5_file = scan.run(tmp_path.joinpath('scan.h5'))
+        assert h5_file == tmp_path.joinpath('scan.h5')
+        assert scan.scan_duration > 0
+
+        dwa = load(h5_file, '/RawData/Scan000/Detector000/Data0D/CH00/Data00')
+        assert dwa.shape == (5,)
+        assert np.allclose(dwa.get_nav_axes()[0].get_data(), np.linspace(0, 1, 5))
+        dwa = load(h5_file, '/RawData/Scan000/Detector001/Data2D/CH00/Data00')
+        assert dwa.shape == (5, 200, 100)
+        assert np.all(dwa.data[0].reshape((5, -1)).max(axis=1) > 0)  # all steps saved
+
+        scan.run(h5_file)  # appended as a new scan
+        h5saver = H5SaverLowLevel()
+        h5saver.init_file(h5_file)
+        assert h5saver.get_node('/RawData/Scan001').attrs['scan_done']
+        assert h5saver.get_node('/RawData/Scan001').attrs['scan_type'] == 'Scan1D'
+        h5saver.close_file()
+
+    def test_average(self, scan, tmp_path):
+        scan.settings.child('scan_options', 'scan_average').setValue(2)
+        scan.settings.child('scan_options', 'pipelined').setValue(True)
+        h5_file = scan.run(tmp_path.joinpath('scan.h5'))
+        assert load(h5_file, '/RawData/Scan000/Detector000/Data0D/CH00/Data00').shape == (2, 5)
+
+    @pytest.mark.parametrize('pipelined', [False, True])
+    def test_saved_data_from_grab(self, scan, tmp_path, monkeypatch, pipelined):
+        """the data saved at each step are the ones grabbed at this step, not the (asynchronously updated) current
+        data of the detectors"""
+        monkeypatch.setattr(HeadlessViewer, 'current_data', property(lambda self: None))
+        scan.settings.child('scan_options', 'scan_average').setValue(2)
+        scan.settings.child('scan_options', 'pipelined').setValue(pipelined)
+        grabbed = []
+        scan.modules_manager.det_done_signal.connect(
+            lambda dte: grabbed.append(dte.get_data_from_full_name('det0D/Mock0D').deepcopy()))
+        h5_file = scan.run(tmp_path.joinpath('scan.h5'))
+
+        saved = load(h5_file, '/RawData/Scan000/Detector000/Data0D/CH00/Data00')
+        assert saved.shape == (2, 5)
+        assert np.allclose(saved[0], np.array([dwa[0][0] for dwa in grabbed]).reshape((2, 5)))
+        averaged = load(h5_file, '/RawData/Scan000/Detector000/Averaged/DataND/CH00/Data00')
+        assert np.allclose(averaged[0], np.mean(saved[0], axis=0))
+        assert load(h5_file, '/RawData/Scan000/Detector001/Averaged/DataND/CH00/Data00').shape == (5, 200, 100)
+
+    def test_averaged_data_filtered(self, scan, tmp_path, monkeypatch):
+        """data not to be saved are not averaged either"""
+        grab_datas = scan.modules_manager.grab_datas
+
+        def grab_datas_not_saved(*args, **kwargs):
+            det_done_datas = grab_datas(*args, **kwargs)
+            for dwa in scan.modules_manager.det_done_dtes['det2D']:
+                dwa.add_extra_attribute(save=False)
+            return det_done_datas
+
+        monkeypatch.setattr(scan.modules_manager, 'grab_datas', grab_datas_not_saved)
+        scan.settings.child('scan_options', 'scan_average').setValue(2)
+        h5_file = scan.run(tmp_path.joinpath('scan.h5'))
+        assert load(h5_file, '/RawData/Scan000/Detector000/Averaged/DataND/CH00/Data00').shape == (5,)
+        h5saver = H5SaverLowLevel()
+        h5saver.init_file(h5_file)
+        assert 'Averaged' not in h5saver.get_node('/RawData/Scan000/Detector001').children_name()
+        h5saver.close_file()
+
+    def test_scanner_settings(self, scan, tmp_path):
+        scan.scanner.set_scan()
+        positions = scan.scanner.positions
+        scan.save_scanner_settings(tmp_path.joinpath('scanner.xml'))
+        set_linear(scan, 0., 2., 0.5)
+        scan.load_scanner_settings(tmp_path.joinpath('scanner.xml'))
+        scan.scanner.set_scan()
+        assert np.allclose(scan.scanner.positions, positions)
+
+    def test_errors(self, scan, tmp_path):
+        scan.scanner.set_scan_type_and_subtypes('Scan2D', 'Linear')
+        with pytest.raises(exceptions.DAQ_ScanException):
+            scan.run(tmp_path.joinpath('scan.h5'))
+
+        scan.scanner.set_scan_type_and_subtypes('Scan1D', 'Linear')
+        scan.modules_manager.detectors[0].quit_fun()
+        with pytest.raises(exceptions.DAQ_ScanException):
+            scan.run(tmp_path.joinpath('scan.h5'))
+
+
+def test_command_line(tmp_path):
+    preset = make_preset(tmp_path)
+    command = [sys.executable, '-m', 'pymodaq.extensions.headless_scan', str(preset), '--actuators', 'Xaxis',
+               '--detectors', 'Det 0D']
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+
+    subprocess.run(command + ['--save-scanner', str(tmp_path.joinpath('scanner.xml'))], env=env, check=True,
+                   timeout=120)
+    scanner_xml = tmp_path.joinpath('scanner.xml').read_text()
+    assert 'Scan1D' in scanner_xml
+
+    start, stop = scanner_xml.index('<step '), scanner_xml.index('</step>')
+    scanner_xml = scanner_xml[:start] + scanner_xml[start:stop].rsplit('>', 1)[0] + '>0.5' + scanner_xml[stop:]
+    tmp_path.joinpath('scanner.xml').write_text(scanner_xml)  # 3 steps
+    output = subprocess.run(command + ['--scanner', str(tmp_path.joinpath('scanner.xml')),
+                                       '--h5', str(tmp_path.joinpath('scan.h5'))],
+                            env=env, check=True, timeout=120, capture_output=True, text=True).stdout
+    assert output.startswith('3 steps done')
+    assert load(tmp_path.joinpath('scan.h5'), '/RawData/Scan000/Detector000/Data0D/CH00/Data00').shape == (3,)
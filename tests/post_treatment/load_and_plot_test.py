@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq.utils.gui_utils import DockArea
+from pymodaq.utils.data import DataToExport, DataFromPlugins, DataWithAxes, Axis
+from pymodaq.utils.h5modules.saving import H5SaverLowLevel
+from pymodaq.utils.h5modules.data_saving import DataLoader, DataToExportExtendedSaver
+from pymodaq.post_treatment.load_and_plot import LiveScanData, LoaderPlotter
+
+NAVERAGE = 3
+NSCAN = 5
+DATA1D = np.arange(4.)
+
+
+def init_dte(ind: int) -> DataToExport:
+    return DataToExport('det', data=[
+        DataFromPlugins('data0D', data=[np.array([ind]), np.array([-ind])], labels=['a', 'b'], origin='Det'),
+        DataFromPlugins('data1D', data=[ind * DATA1D], origin='Det',
+                        axes=[Axis('x', 'm', data=2 * DATA1D, index=0)])])
+
+
+def get_nav_axes(average: bool):
+    nav_axes = [Axis('pos', data=np.linspace(0, 1, NSCAN), index=1 if average else 0)]
+    if average:
+        nav_axes.append(Axis('Average', data=np.linspace(0, NAVERAGE - 1, NAVERAGE), index=0))
+    return nav_axes
+
+
+def get_indexes(average: bool):
+    if average:
+        return [(ind_ave, ind) for ind_ave in range(NAVERAGE) for ind in range(NSCAN)]
+    else:
+        return [(ind,) for ind in range(NSCAN)]
+
+
+class TestLiveScanData:
+    @pytest.mark.parametrize('average', (False, True))
+    def test_add_data(self, average):
+        scan_shape = (NAVERAGE, NSCAN) if average else (NSCAN,)
+        live_data = LiveScanData(scan_shape)
+        assert live_data.scan_shape == scan_shape
+        live_data.set_nav_axes(get_nav_axes(average))
+        assert len(live_data.get_data()) == 0
+
+        indexes = get_indexes(average)
+        live_data.add_data(indexes[0], init_dte(1))
+        dte = live_data.get_data()
+        assert len(dte) == 2
+        data0D = dte.get_data_from_full_name('Det/data0D')
+        assert isinstance(data0D, DataWithAxes)
+        assert data0D.shape == scan_shape
+        assert data0D.nav_indexes == tuple(range(len(scan_shape)))
+        assert data0D.labels == ['a', 'b']
+        assert data0D[0][indexes[0]] == 1
+        assert data0D[1][indexes[0]] == -1
+        assert np.all(data0D[0][indexes[1]] == 0)
+
+        data1D = dte.get_data_from_full_name('Det/data1D')
+        assert data1D.shape == scan_shape + DATA1D.shape
+        assert data1D.get_axis_from_index(len(scan_shape))[0].label == 'x'
+
+        arrays = [array for array in data1D]
+        for ind, index in enumerate(indexes[1:]):
+            live_data.add_data(index, init_dte(ind + 2))
+        data1D = live_data.get_data().get_data_from_full_name('Det/data1D')
+        assert data1D[0] is arrays[0]  # the arrays are filled in place
+        assert np.allclose(data1D[0][indexes[-1]], len(indexes) * DATA1D)
+
+    @pytest.mark.parametrize('average', (False, True))
+    def test_same_as_loaded(self, qtbot, tmp_path, average):
+        scan_shape = (NAVERAGE, NSCAN) if average else (NSCAN,)
+        h5saver = H5SaverLowLevel()
+        h5saver.init_file(file_name=tmp_path.joinpath('temp_data.h5'))
+        saver = DataToExportExtendedSaver(h5saver, extended_shape=scan_shape)
+        live_data = LiveScanData(scan_shape)
+
+        saver.add_nav_axes(h5saver.raw_group, get_nav_axes(average))
+        live_data.set_nav_axes(get_nav_axes(average))
+        for ind, index in enumerate(get_indexes(average)):
+            saver.add_data(h5saver.raw_group, init_dte(ind), index)
+            live_data.add_data(index, init_dte(ind))
+
+        loaded = DataToExport('All')
+        DataLoader(h5saver).load_all('/', loaded)
+        live = live_data.get_data()
+        assert len(live) == len(loaded)
+        for dwa in loaded:
+            live_dwa = live.get_data_from_full_name(dwa.get_full_name())
+            assert live_dwa == dwa
+            assert live_dwa.nav_indexes == dwa.nav_indexes
+            assert live_dwa.labels == dwa.labels
+        h5saver.close_file()
+
+    def test_loader_plotter(self, qtbot):
+        plotter = LoaderPlotter(DockArea())
+        plotter.live_data = LiveScanData((NSCAN,))
+        plotter.live_data.set_nav_axes(get_nav_axes(False))
+        for ind in range(NSCAN):
+            plotter.live_data.add_data((ind,), init_dte(ind))
+        data = plotter.load_data(group_0D=True)
+        assert len(data) == 2
+        grouped = data.get_data_from_full_name(LoaderPlotter.grouped_data0D_fullname)
+        assert grouped.labels == ['Det/data0D/a', 'Det/data0D/b']
+        assert np.allclose(grouped[0], np.arange(NSCAN))
+        data1D = data.get_data_from_full_name('Det/data1D')
+        assert data1D.nav_indexes == ()
+        assert data1D[0].shape == DATA1D.shape + (NSCAN,)  # transposed
+
+    def test_averaged_from_running_mean(self, qtbot):
+        plotter = LoaderPlotter(DockArea())
+        plotter.live_data = LiveScanData((NAVERAGE, NSCAN), average=True)
+        plotter.live_data.set_nav_axes(get_nav_axes(True))
+        indexes = get_indexes(True)
+        for ind, index in enumerate(indexes[:NSCAN + 2]):  # partial second sweep
+            plotter.live_data.add_data(index, init_dte(ind))
+        data = plotter.load_data(average_axis=0, average_index=1)
+
+        data0D = data.get_data_from_full_name('Det/data0D')
+        assert data0D.labels == ['a', 'b', 'a_averaged', 'b_averaged']
+        expected = np.arange(NSCAN, dtype=float)
+        expected[:2] = (expected[:2] + np.arange(NSCAN, NSCAN + 2)) / 2
+        assert np.allclose(data0D[2], expected)
+        assert np.allclose(data0D[3], -expected)
+        data1D = data.get_data_from_full_name('Det/data1D')
+        assert np.allclose(data1D[1], (expected[:, np.newaxis] * DATA1D).T)  # transposed
+
+        plotter.live_data.clear()
+        assert len(plotter.live_data.running_mean) == 0
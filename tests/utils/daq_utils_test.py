@@ -4,6 +4,7 @@ import pytest
 import re
 from pathlib import Path
 import datetime
+import json
 
 from pymodaq.utils import daq_utils as utils
 
@@ -155,6 +156,54 @@ def test_get_plugins():  # run on local with pytest option --import-mode=importl
     assert 'Mock' in [plug['name'] for plug in utils.get_plugins('daq_2Dviewer')]
 
 
+class TestInstrumentPlugins:
+    def test_lazy_import(self):
+        plugin = utils.InstrumentPlugin('Mock', 'daq_move', 'pymodaq_plugins_mock.daq_move_plugins',
+                                        'daq_move_Mock', 'pymodaq_plugins_mock')
+        assert plugin['name'] == 'Mock'
+        assert not plugin.loaded
+        assert 'module' in plugin
+        assert hasattr(plugin['module'], 'daq_move_Mock')
+        assert plugin.loaded
+        assert plugin['parent_module'].__name__ == 'pymodaq_plugins_mock'
+        assert utils.InstrumentPlugin.from_dict(plugin.to_dict()) == dict(name='Mock', type='daq_move')
+
+    def test_import_error(self):
+        plugin = utils.InstrumentPlugin('Missing', 'daq_move', 'pymodaq_plugins_mock.daq_move_plugins',
+                                        'daq_move_Missing', 'pymodaq_plugins_mock')
+        with pytest.raises(ModuleNotFoundError):
+            plugin['module']
+        assert not plugin.loaded
+
+    def test_discovery(self, tmp_path, monkeypatch):
+        index_path = tmp_path.joinpath('index.json')
+        monkeypatch.setattr(utils, 'get_plugins_index_path', lambda: index_path)
+        plugins = utils.discover_instrument_plugins(use_index=False)
+        assert not index_path.is_file()
+        assert ('Mock', 'daq_move') in [(plugin['name'], plugin['type']) for plugin in plugins]
+        assert ('Mock', 'daq_2Dviewer') in [(plugin['name'], plugin['type']) for plugin in plugins]
+        assert not any([plugin.loaded for plugin in plugins])
+
+        assert [plugin.to_dict() for plugin in utils.discover_instrument_plugins(use_index=True)] == \
+               [plugin.to_dict() for plugin in plugins]
+        assert index_path.is_file()
+
+        scanned = []
+        monkeypatch.setattr(utils, '_scan_plugin_package',
+                            lambda *args: scanned.append(args) or [])
+        indexed_plugins = utils.discover_instrument_plugins(use_index=True)
+        assert len(scanned) == 0  # listed from the index
+        assert [plugin.to_dict() for plugin in indexed_plugins] == [plugin.to_dict() for plugin in plugins]
+
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        index['packages']['mock']['key']['version'] = '0.0.0'
+        with open(index_path, 'w') as f:
+            json.dump(index, f)
+        utils.discover_instrument_plugins(use_index=True)
+        assert len(scanned) == 1  # package version changed, rescanned
+
+
 def test_check_vals_in_iterable():
     with pytest.raises(Exception):
         utils.check_vals_in_iterable([1, ], [])
@@ -5,6 +5,8 @@ Created the 28/10/2022
 @author: Sebastien Weber
 """
 import logging
+import copy
+
 import numpy as np
 import pytest
 from pytest import approx, mark
@@ -397,6 +399,49 @@ class TestDataBase:
         assert data.average(data, 1) == data
         assert data.average(data, 2) == data
 
+    def test_view(self):
+        data = init_data(data=DATA2D, Ndata=2)
+        data_view = data.view()
+        assert data_view == data
+        assert data_view is not data
+        for ind in range(len(data)):
+            assert np.shares_memory(data_view[ind], data[ind])
+            assert not data_view[ind].flags.writeable
+        with pytest.raises(ValueError):
+            data_view[0][0, 0] = 12
+        assert data[0].flags.writeable
+
+        data_view.name = 'another name'
+        assert data.name != data_view.name
+
+        data_sum = data_view + data_view  # operators return new writable objects
+        assert data_sum[0].flags.writeable
+        assert not np.shares_memory(data_sum[0], data[0])
+
+    def test_view_source_untouched(self, monkeypatch):
+        """the source is never modified while copied so that views can be built from any thread"""
+        data = init_data(data=DATA2D, Ndata=2)
+        deepcopy = copy.deepcopy
+        data_during_copy = []
+
+        def checking_deepcopy(*args, **kwargs):
+            data_during_copy.append(data.data)
+            return deepcopy(*args, **kwargs)
+
+        monkeypatch.setattr(copy, 'deepcopy', checking_deepcopy)
+        data_view = data.view()
+        assert len(data_during_copy) != 0
+        for data_arrays in data_during_copy:
+            assert data_arrays is not None and len(data_arrays) == 2
+        assert data_view == data
+
+    def test_copies_slicing(self):
+        """the slicers of the copies sharing or replacing the data arrays are bound to the copies, not to the source"""
+        data = init_data(data=DATA2D, Ndata=2)
+        for new_data, factor in [(data * 3, 3), (data + data, 2), (data - data, 0), (data.view(), 1)]:
+            assert new_data.isig.obj is new_data and new_data.inav.obj is new_data
+            assert np.allclose(new_data.isig[0:4, 0:3].data[1], factor * data.data[1][0:4, 0:3])
+
     def test_append(self):
         Ndata = 2
         labels = [f'label{ind}' for ind in range(Ndata)]
@@ -410,6 +455,91 @@ class TestDataBase:
         assert data.labels == labels + label_bis
 
 
+class TestStackedData:
+
+    def test_init(self):
+        arrays = [np.random.rand(5, 6) for _ in range(3)]
+        data = data_mod.DataRaw('stacked', data=arrays, stacked=True)
+        assert data.is_stacked
+        assert data.stacked_data.shape == (3, 5, 6)
+        assert data.stacked_data.flags.c_contiguous
+        for ind, array in enumerate(data):
+            assert np.shares_memory(array, data.stacked_data)
+            assert np.allclose(array, arrays[ind])
+        assert data.dim == 'Data2D'
+        assert data.length == 3
+
+        stack = np.random.rand(2, 10)
+        data = data_mod.DataRaw('stacked', data=stack, stacked=True)
+        assert data.stacked_data is stack
+        assert data.length == 2
+        assert data.dim == 'Data1D'
+
+        data = data_mod.DataRaw('stacked', data=[np.array([1.]), np.array([2.])], stacked=True)
+        assert data.dim == 'Data0D'
+        assert data.stacked_data.shape == (2, 1)
+
+    def test_list_api(self):
+        data = init_data(data=DATA2D, Ndata=2).stack()
+        assert data.is_stacked
+        data[1] = 2 * DATA2D  # copied into the stack
+        assert data.is_stacked
+        assert np.allclose(data.stacked_data[1], 2 * DATA2D)
+
+        data.data[0] = DATA2D.copy()  # bypassing the stack: falls back to the list
+        assert not data.is_stacked
+        assert np.allclose(data.stacked_data[0], DATA2D)
+
+    def test_copies(self):
+        data = init_data(data=DATA2D, Ndata=2).stack()
+        data_deepcopy = data.deepcopy()
+        assert data_deepcopy.is_stacked
+        assert not np.shares_memory(data_deepcopy.stacked_data, data.stacked_data)
+        assert data_deepcopy == data
+
+        data_copy = copy.copy(data)
+        assert data_copy.is_stacked
+        assert np.shares_memory(data_copy.stacked_data, data.stacked_data)
+
+        data_view = data.view()
+        assert data_view.is_stacked
+        assert not data_view.stacked_data.flags.writeable
+
+    def test_operations(self):
+        dat1 = init_data(data=DATA2D, Ndata=2)
+        dat2 = init_data(data=-0.3 * DATA2D, Ndata=2)
+        sdat1 = dat1.deepcopy().stack()
+        sdat2 = dat2.deepcopy().stack()
+
+        for result, expected in [(sdat1 + sdat2, dat1 + dat2), (sdat1 - sdat2, dat1 - dat2),
+                                 (sdat1 * 0.4, dat1 * 0.4), (sdat1 / 2, dat1 / 2),
+                                 (sdat1.average(sdat2, 3), dat1.average(dat2, 3)),
+                                 (sdat2.abs(), dat2.abs()), (sdat1.flipud(), dat1.flipud()),
+                                 (sdat1.fliplr(), dat1.fliplr())]:
+            assert result.is_stacked
+            assert result == expected
+        assert sdat1 == dat1
+        assert sdat1 != sdat2
+        assert (sdat1 + dat2) == dat1 + dat2  # mixing stacked and list data
+
+    def test_reduction_slicing(self, init_data_uniform):
+        data = init_data_uniform
+        data.data = [data.data[0], 2 * data.data[0]]
+        data_stacked = data.deepcopy().stack()
+
+        assert data_stacked.mean(2).is_stacked
+        assert data_stacked.mean(2) == data.mean(2)
+        assert data_stacked.sum(0) == data.sum(0)
+
+        for sliced, expected in [(data_stacked.inav[1, :], data.inav[1, :]),
+                                 (data_stacked.inav[1, 2], data.inav[1, 2]),
+                                 (data_stacked.isig[1, 2], data.isig[1, 2]),
+                                 (data_stacked.isig[1:3, :], data.isig[1:3, :])]:
+            assert sliced.is_stacked
+            assert sliced.shape == expected.shape
+            assert sliced == expected
+
+
 class TestDataWithAxesUniform:
     def test_init(self):
         Ndata = 2
@@ -876,6 +1006,122 @@ class TestDataActuator:
         assert d.data[0] == np.array([data_number])
 
 
+class TestDataAccumulator:
+
+    def test_mean_std(self):
+        arrays = [np.random.rand(5, 6) for _ in range(10)]
+        accumulator = data_mod.DataAccumulator(compute_std=True)
+        means = []
+        for array in arrays:
+            dwa = init_data(data=array, Ndata=2)
+            accumulator.add(dwa)
+            means.append(accumulator._means[0][0])
+        assert all([np.shares_memory(array_mean, means[0]) for array_mean in means])  # updated in place
+        assert accumulator.count == 10
+
+        mean = accumulator.mean()
+        assert isinstance(mean, data_mod.DataWithAxes)
+        assert mean.name == 'myData'
+        assert np.allclose(mean[0], np.mean(arrays, axis=0))
+        assert np.allclose(mean[1], np.mean(arrays, axis=0))
+
+        std = accumulator.std()
+        assert std.name == 'myData_std'
+        assert std.source == 'calculated'
+        assert np.allclose(std[0], np.std(arrays, axis=0))
+        assert np.allclose(accumulator.sem()[0], np.std(arrays, axis=0) / np.sqrt(10))
+        assert not np.shares_memory(mean[0], accumulator._means[0][0])
+
+    def test_std_large_offset(self):
+        arrays = [1e9 + np.random.rand(5, 6) for _ in range(100)]
+        accumulator = data_mod.DataAccumulator(compute_std=True)
+        for array in arrays:
+            accumulator.add(init_data(data=array))
+        assert np.allclose(accumulator.mean()[0], np.mean(arrays, axis=0), rtol=0, atol=1e-4)
+        assert np.allclose(accumulator.std()[0], np.std(arrays, axis=0), rtol=1e-6)
+
+    def test_dte(self):
+        accumulator = data_mod.DataAccumulator()
+        for ind in range(4):
+            dte = data_mod.DataToExport('toexport', data=[init_data(data=ind * DATA2D, Ndata=2, name='data2D'),
+                                                          init_data(data=ind * DATA1D, Ndata=1, name='data1D')])
+            accumulator.add(dte)
+        mean = accumulator.mean()
+        assert isinstance(mean, data_mod.DataToExport)
+        assert mean.get_data_from_name('data2D') == init_data(data=1.5 * DATA2D, Ndata=2, name='data2D')
+        assert mean.get_data_from_name('data1D') == init_data(data=1.5 * DATA1D, Ndata=1, name='data1D')
+        with pytest.raises(ValueError):
+            accumulator.std()
+
+        accumulator.add(data_mod.DataToExport('toexport', data=[init_data(data=DATA1D, name='other')]))
+        assert accumulator.count == 1  # different structure, accumulation restarted
+        accumulator.reset()
+        with pytest.raises(ValueError):
+            accumulator.mean()
+
+
+class TestDataRunningMean:
+
+    def test_mean_variance(self):
+        NAVERAGE, NX = 4, 3
+        sweeps = np.random.rand(NAVERAGE, NX, *DATA1D.shape)
+        running_mean = data_mod.DataRunningMean((NX,), compute_variance=True)
+        for ind_average in range(NAVERAGE):
+            for ind in range(NX):
+                running_mean.add((ind,), init_data(data=sweeps[ind_average, ind], Ndata=2, name='data1D'))
+        assert len(running_mean) == 1
+        assert running_mean.full_names == ['/data1D']
+        assert np.all(running_mean.get_count('/data1D') == NAVERAGE)
+
+        mean = running_mean.mean()
+        assert isinstance(mean, data_mod.DataToExport)
+        dwa = mean.get_data_from_name('data1D')
+        assert dwa.source == 'calculated'
+        assert dwa.nav_indexes == (0,)
+        assert dwa.shape == (NX,) + DATA1D.shape
+        assert np.allclose(dwa[0], np.mean(sweeps, axis=0))
+        assert np.allclose(dwa[1], np.mean(sweeps, axis=0))
+        assert np.shares_memory(dwa[0], running_mean.get_mean_arrays('/data1D')[0])
+
+        variance = running_mean.variance().get_data_from_name('data1D_variance')
+        assert np.allclose(variance[0], np.var(sweeps, axis=0))
+
+    def test_partial_sweep_0D(self):
+        running_mean = data_mod.DataRunningMean((2, 2))
+        values = [1., 2., 6.]
+        for value in values:
+            running_mean.add((0, 1), data_mod.DataToExport('toexport', data=[
+                init_data(data=np.array([value]), name='data0D')]))
+        running_mean.add((1, 0), data_mod.DataToExport('toexport', data=[
+            init_data(data=np.array([5.]), name='data0D')]))
+        dwa = running_mean.mean().get_data_from_name('data0D')
+        assert dwa.shape == (2, 2)
+        assert dwa[0][0, 1] == approx(np.mean(values))
+        assert dwa[0][1, 0] == approx(5.)
+        assert dwa[0][0, 0] == approx(0.)
+        assert np.all(running_mean.get_count('toexport/data0D') == np.array([[0, 3], [1, 0]]))
+        with pytest.raises(ValueError):
+            running_mean.variance()
+
+        running_mean.add((0, 0), data_mod.DataToExport('toexport', data=[
+            init_data(data=DATA1D, name='data0D')]))  # new structure, averaging restarted
+        assert running_mean.get_count('toexport/data0D')[0, 1] == 0
+        running_mean.reset()
+        assert len(running_mean) == 0
+
+    def test_max_size(self):
+        running_mean = data_mod.DataRunningMean((10,), max_size=10 * DATA1D.size)
+        dte = data_mod.DataToExport('toexport', data=[init_data(data=DATA1D, name='data1D'),
+                                                      init_data(data=DATA2D, name='data2D')])
+        for ind in range(10):
+            running_mean.add((ind,), dte)
+        assert running_mean.full_names == ['toexport/data1D']  # the 2D data would be too large
+        assert [dwa.name for dwa in running_mean.mean()] == ['data1D']
+
+        running_mean.add((0,), data_mod.DataToExport('toexport', data=[init_data(data=DATA2D, name='data1D')]))
+        assert len(running_mean) == 0  # the arrays of data now too large are released
+
+
 class TestDataToExport:
     def test_init(self, ini_data_to_export):
         dat1, dat2, data = ini_data_to_export
@@ -1101,10 +1347,26 @@ class TestDataToExport:
 
         WEIGHT = 6
 
-        data1 = data1.average(data2, WEIGHT)
+        data_averaged = data1.average(data2, WEIGHT)
+
+        assert data_averaged[0] == dat1.average(dat3, WEIGHT)
+        assert data_averaged[1] == dat2.average(dat2, WEIGHT)
+        assert data1[0] is dat1  # the averaged object is a new one
+        assert data1[1] is dat2
 
-        assert data1[0] == dat1.average(dat3, WEIGHT)
-        assert data1[1] == dat2.average(dat2, WEIGHT)
+    def test_view(self):
+        dat1 = init_data(data=DATA2D, Ndata=2, name='data2D1')
+        dat2 = init_data(data=DATA1D, Ndata=1, name='data1D')
+        dte = data_mod.DataToExport(name='toexport', data=[dat1, dat2], control_module='DAQ_Viewer')
+        dte_view = dte.view()
+        assert dte_view.name == dte.name
+        assert dte_view.timestamp == dte.timestamp
+        assert dte_view.control_module == 'DAQ_Viewer'
+        for dwa, dwa_view in zip(dte, dte_view):
+            assert dwa_view is not dwa
+            assert dwa_view == dwa
+            assert np.shares_memory(dwa_view[0], dwa[0])
+            assert not dwa_view[0].flags.writeable
 
     def test_merge(self):
 
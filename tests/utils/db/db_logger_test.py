@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sqlalchemy_utils')
+
+from pymodaq.utils.data import DataToExport, DataRaw
+from pymodaq.utils.db.db_logger.db_logger import DbLogger
+from pymodaq.utils.db.db_logger.db_logger_models import Data0D, Data1D, Data2D, ControlModule
+
+
+def get_dte(name='det', value=0.):
+    return DataToExport(name, data=[DataRaw('data0D', data=[np.array([value]), np.array([2 * value])],
+                                            labels=['ch0', 'ch1']),
+                                    DataRaw('data1D', data=[np.linspace(0, 1, 10)]),
+                                    DataRaw('data2D', data=[np.ones((3, 4))])])
+
+
+@pytest.fixture
+def db_logger(tmp_path):
+    dblogger = DbLogger('test', url=f"sqlite:///{tmp_path.joinpath('test.db')}", flush_size=10,
+                        flush_interval=10000)
+    assert dblogger.connect_db()
+    yield dblogger
+    dblogger.close()
+
+
+def count_rows(dblogger: DbLogger, model) -> int:
+    with dblogger.session_scope() as session:
+        return session.query(model).count()
+
+
+def test_buffered_add_data(db_logger):
+    db_logger.add_data(get_dte())
+    assert db_logger.backlog == 3
+    assert count_rows(db_logger, Data0D) == 0
+
+    db_logger.flush()
+    assert db_logger.backlog == 0
+    assert count_rows(db_logger, Data0D) == 2
+    assert count_rows(db_logger, Data1D) == 1
+    assert count_rows(db_logger, Data2D) == 0
+    assert db_logger.get_stats()['rows_written'] == 3
+
+
+def test_module_ids_cached(db_logger):
+    for ind in range(5):
+        db_logger.add_data(get_dte('det0', ind))
+        db_logger.add_data(get_dte('det1', ind))
+    db_logger.flush()
+    assert count_rows(db_logger, ControlModule) == 2
+    with db_logger.session_scope() as session:
+        values = [row.value for row in session.query(Data0D).filter_by(
+            control_module_id=db_logger.get_module_id('det1'), channel='ch1').order_by(Data0D.id)]
+    assert values == pytest.approx([2. * ind for ind in range(5)])
+
+
+def test_writer_thread_flush_size(db_logger):
+    for ind in range(4):  # 12 rows > flush_size
+        db_logger.add_data(get_dte(value=ind))
+    db_logger.stop_writer()
+    assert db_logger.backlog == 0
+    assert count_rows(db_logger, Data0D) == 8
+    assert count_rows(db_logger, Data1D) == 4
+
+
+def test_failed_flush_requeued(db_logger, monkeypatch):
+    def failing_insert(*args, **kwargs):
+        raise ConnectionError('database unreachable')
+
+    db_logger.add_data(get_dte(value=1.))
+    with monkeypatch.context() as m:
+        m.setattr('sqlalchemy.orm.Session.bulk_insert_mappings', failing_insert)
+        db_logger.flush()
+    assert db_logger.backlog == 3
+    assert db_logger.get_stats()['rows_written'] == 0
+
+    db_logger.add_data(get_dte(value=2.))
+    db_logger.flush()
+    assert db_logger.backlog == 0
+    assert db_logger.get_stats()['rows_written'] == 6
+    with db_logger.session_scope() as session:
+        values = [row.value for row in session.query(Data0D).filter_by(channel='ch0').order_by(Data0D.id)]
+    assert values == pytest.approx([1., 2.])
+
+
+def test_bounded_backlog(db_logger):
+    db_logger.max_backlog = 5
+    db_logger.flush_size = 100
+    for ind in range(3):
+        db_logger.add_data(get_dte(value=ind))
+    assert db_logger.backlog == 5
+    assert db_logger.get_stats()['rows_dropped'] == 4
+
+
+def test_module_id_failed_commit(db_logger, monkeypatch):
+    def failing_commit(*args, **kwargs):
+        raise ConnectionError('database unreachable')
+
+    with monkeypatch.context() as m:
+        m.setattr('sqlalchemy.orm.Session.commit', failing_commit)
+        assert db_logger.get_module_id('det') is None
+        db_logger.add_data(get_dte())
+    assert db_logger.backlog == 0
+    db_logger._module_id_retries['det'] = (0., 0.)  # retry delay elapsed
+    assert db_logger.get_module_id('det') is not None
+
+
+def test_module_id_retry_backoff(db_logger, monkeypatch):
+    queries = []
+
+    def failing_session_scope(*args, **kwargs):
+        queries.append(time.perf_counter())
+        raise ConnectionError('database unreachable')
+
+    db_logger.flush_interval = 200
+    with monkeypatch.context() as m:
+        m.setattr(db_logger, 'session_scope', failing_session_scope)
+        for ind in range(100):  # the database is not queried again before the retry delay
+            db_logger.add_data(get_dte())
+        assert len(queries) == 1
+        assert db_logger.backlog == 0
+        time.sleep(0.25)
+        db_logger.add_data(get_dte())
+        assert len(queries) == 2
+        assert db_logger._module_id_retries['det'][1] == pytest.approx(0.4)  # doubled at each failure
+        time.sleep(0.25)
+        db_logger.add_data(get_dte())
+        assert len(queries) == 2
+    db_logger._module_id_retries['det'] = (0., 0.)
+    db_logger.add_data(get_dte())
+    assert db_logger.backlog == 3
+    assert 'det' not in db_logger._module_id_retries
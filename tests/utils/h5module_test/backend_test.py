@@ -52,6 +52,24 @@ def get_temp_path(tmp_path, backend='h5pyd'):
         return tmp_path
 
 
+@pytest.mark.parametrize('shape, nav_dims, chunk', [((100, 2048), 1, (64, 2048)),
+                                                     ((10, 20, 1), 2, (10, 20, 1)),
+                                                     ((1000, 1000), 0, (250, 500)),
+                                                     ((3, 2000, 1000), 1, (1, 250, 500)),
+                                                     ((50, 50, 256, 256), 2, (1, 2, 256, 256))])
+def test_get_chunk_shape(shape, nav_dims, chunk):
+    chunk_size = 2**20
+    assert backends.get_chunk_shape(shape, 8, nav_dims, chunk_size) == chunk
+    assert np.prod(chunk) * 8 <= chunk_size
+
+
+def get_chunks(array):
+    if array.backend == 'tables':
+        return array.array.chunkshape
+    else:
+        return array.array.chunks
+
+
 def test_check_mandatory_attrs():
     attr_name = 'TITLE'
     attr = b'test'
@@ -267,6 +285,22 @@ class TestH5Backend:
         array1 = bck.create_carray(g1, 'carray1', obj=array_data)
         assert np.all(array1.read() == pytest.approx(array_data))
 
+    @pytest.mark.parametrize('compression', ['zlib', 'lzf', 'blosc:lz4', 'blosc:zstd'])
+    def test_carray_from_shape(self, get_backend, compression):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        shape = (20, 30, 100)
+        chunk_shape = (4, 30, 100)
+        array = bck.create_carray(g1, 'carray', shape=shape, dtype=float, chunk_shape=chunk_shape,
+                                  filters=bck.get_filters(compression, 5, shuffle=True))
+        utils.check_vals_in_iterable(array.attrs['shape'], shape)
+        assert array.attrs['dtype'] == 'float64'
+        assert get_chunks(array) == chunk_shape
+        assert np.all(array.read() == 0.)
+        data = generate_random_data(shape[1:])
+        array[3, :, :] = data
+        assert np.all(array[3, :, :] == pytest.approx(data))
+
     def test_earray(self, get_backend):
         bck = get_backend
         g1 = bck.get_set_group(bck.root(), 'g1')
@@ -308,6 +342,20 @@ class TestH5Backend:
         array.append(data)
         assert np.all(array[-1, :, :] == pytest.approx(data))
 
+    def test_earray_chunks(self, get_backend):
+        bck = get_backend
+        g1 = bck.get_set_group(bck.root(), 'g1')
+        array_shape = (10, 3)
+        chunk_shape = (100, 10, 3)
+        array = bck.create_earray(g1, 'array', dtype=np.uint32, data_shape=array_shape, chunk_shape=chunk_shape,
+                                  expected_rows=1000, filters=bck.get_filters('blosc:lz4', 3))
+        assert get_chunks(array) == chunk_shape
+        data = generate_random_data(array_shape, np.uint32)
+        for ind in range(150):
+            array.append(data)
+        utils.check_vals_in_iterable(array.attrs['shape'], (150, 10, 3))
+        assert np.all(array[-1, :, :] == pytest.approx(data))
+
     def test_vlarray(self, get_backend):
         bck = get_backend
         g1 = bck.get_set_group(bck.root(), 'g1')
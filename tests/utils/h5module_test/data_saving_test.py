@@ -544,4 +544,39 @@ class TestDataLoader:
         for dwa in data_all:
             assert len(dwa) == 2
             for data_array in dwa:
-                assert np.allclose(data_array, np.zeros(data_array.shape))
\ No newline at end of file
+                assert np.allclose(data_array, np.zeros(data_array.shape))
+
+    def test_load_lazy(self, get_h5saver, init_data_to_export):
+        h5saver = get_h5saver
+        data_to_export = init_data_to_export
+        data_loader = DataLoader(h5saver)
+        det_group = h5saver.get_set_group(h5saver.raw_group, 'MyDet')
+
+        EXT_SHAPE = (4, 3)
+        nav_axes = [Axis('navaxis0', '', data=np.linspace(0, EXT_SHAPE[0] - 1, EXT_SHAPE[0]), index=0),
+                    Axis('navaxis1', '', data=np.linspace(0, EXT_SHAPE[1] - 1, EXT_SHAPE[1]), index=1)]
+        data_saver = DataToExportExtendedSaver(h5saver, extended_shape=EXT_SHAPE)
+        data_saver.add_nav_axes(det_group, nav_axes)
+        for ind0 in range(EXT_SHAPE[0]):
+            for ind1 in range(EXT_SHAPE[1]):
+                data_saver.add_data(det_group, data_to_export * (ind0 * EXT_SHAPE[1] + ind1), [ind0, ind1])
+
+        node_path = '/RawData/MyDet/Data2D/CH00/Data00'
+        data_loaded = data_loader.load_data(node_path, load_all=True)
+        data_lazy = data_loader.load_data(node_path, load_all=True, lazy=True)
+        assert not data_loaded.is_lazy
+        assert data_lazy.is_lazy
+        assert data_lazy.shape == data_loaded.shape == EXT_SHAPE + DATA2D.shape
+        assert data_lazy.nav_indexes == data_loaded.nav_indexes
+        assert data_lazy == data_loaded
+
+        data_at = data_lazy.inav[2, 1]
+        assert not data_at.is_lazy
+        assert data_at == data_loaded.inav[2, 1]
+        assert np.allclose(data_at[0], 7 * DATA2D)
+        assert data_lazy.isig[1:3, 4] == data_loaded.isig[1:3, 4]
+        assert data_lazy.inav[1:, 0].isig[2, :] == data_loaded.inav[1:, 0].isig[2, :]
+
+        assert data_lazy.deepcopy().is_lazy
+        assert not data_lazy.load().is_lazy
+        assert data_lazy == data_loaded
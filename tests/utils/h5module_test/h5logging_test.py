@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from pymodaq.control_modules.headless import HeadlessViewer, init_modules
+from pymodaq.utils.data import DataToExport, DataRaw
+from pymodaq.utils.h5modules.h5logging import H5Logger
+from pymodaq.utils.managers.modules_manager import ModulesManager
+
+
+@pytest.fixture
+def detector(qtbot):
+    det = HeadlessViewer('det0D', 'DAQ0D', 'Mock')
+    init_modules([det], 10000)
+    yield det
+    det.quit_fun()
+
+
+def test_write_behind_logging(detector, tmp_path):
+    threads = []
+    get_data_to_save = detector.get_data_to_save
+
+    def get_data_to_save_in_thread(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return get_data_to_save(*args, **kwargs)
+
+    detector.get_data_to_save = get_data_to_save_in_thread
+
+    h5logger = H5Logger(ModulesManager([detector], [], selected_detectors=[detector]))
+    h5logger.settings.child('base_path').setValue(str(tmp_path))
+    h5logger.settings.child('write_behind', 'async_write').setValue(True)
+    assert h5logger.init_logger('')
+    assert h5logger.h5saver.write_behind.running
+    for ind in range(5):
+        h5logger.add_data(DataToExport('det0D', data=[DataRaw('data', data=[np.array([float(ind)])])]))
+    h5logger.stop_logger()
+
+    assert threads == [threading.main_thread()] * 5  # settings read in the caller thread only
+    node = h5logger.h5saver.get_node(
+        f'{detector.module_and_data_saver.module_group.path}/Data0D/CH00/EnlData00')
+    assert np.allclose(node.read()[:, 0], np.arange(5))
+    h5logger.close()
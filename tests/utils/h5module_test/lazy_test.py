@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import copy
+import importlib.util
+
+import numpy as np
+import pytest
+
+from pymodaq.utils.h5modules import backends
+from pymodaq.utils.h5modules.lazy import ChunkCache, LazyArray
+from pymodaq.utils.data import is_lazy_array
+
+tested_backend = [backend for backend in ('tables', 'h5py') if importlib.util.find_spec(backend) is not None]
+
+SHAPE = (6, 1, 5, 8, 9)
+CHUNK_SHAPE = (2, 1, 2, 8, 4)
+DATA = np.arange(np.prod(SHAPE), dtype=float).reshape(SHAPE)
+SQUEEZED = np.squeeze(DATA)
+
+
+@pytest.fixture(params=tested_backend)
+def get_backend(request, tmp_path):
+    bck = backends.H5Backend(request.param)
+    bck.open_file(tmp_path.joinpath('h5file.h5'), 'w', 'lazy file')
+    yield bck
+    bck.close_file()
+
+
+def create_array(bck, name='array', data=DATA, chunk_shape=CHUNK_SHAPE):
+    array = bck.create_carray(bck.root(), name, shape=data.shape, dtype=data.dtype, chunk_shape=chunk_shape)
+    array[...] = data
+    return array
+
+
+class TestChunkCache:
+    def test_get(self):
+        cache = ChunkCache(max_size=3 * 80)
+        reads = []
+
+        def reader(ind):
+            reads.append(ind)
+            return np.full((10,), ind, dtype=float)
+
+        for ind in range(3):
+            assert np.all(cache.get(ind, lambda: reader(ind)) == ind)
+        assert len(cache) == 3
+        assert cache.size == 3 * 80
+        assert cache.get(0, lambda: reader(0))[0] == 0  # 0 is now the most recently used
+        assert reads == [0, 1, 2]
+        assert cache.hits == 1
+        assert cache.misses == 3
+
+        cache.get(3, lambda: reader(3))  # evicts 1, the least recently used
+        assert len(cache) == 3
+        assert cache.size == 3 * 80
+        cache.get(1, lambda: reader(1))
+        assert reads == [0, 1, 2, 3, 1]
+
+        with pytest.raises(ValueError):
+            cache.get(0, lambda: reader(0))[0] = 12  # cached chunks are read-only
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size == 0
+
+    def test_too_big(self):
+        cache = ChunkCache(max_size=40)
+        chunk = cache.get('big', lambda: np.zeros((10,)))
+        assert chunk.shape == (10,)
+        assert len(cache) == 0
+
+
+class TestLazyArray:
+    def test_init(self, get_backend):
+        array = LazyArray(create_array(get_backend))
+        assert is_lazy_array(array)
+        assert not is_lazy_array(SQUEEZED)
+        assert array.shape == SQUEEZED.shape
+        assert array.ndim == SQUEEZED.ndim
+        assert array.size == SQUEEZED.size
+        assert array.nbytes == SQUEEZED.nbytes
+        assert array.dtype == SQUEEZED.dtype
+        assert len(array) == SQUEEZED.shape[0]
+        assert np.all(np.asarray(array) == SQUEEZED)
+        assert np.all(array.read() == SQUEEZED)
+        assert copy.deepcopy(array) is array
+
+    @pytest.mark.parametrize('item', [0, -1, (2, 3), (slice(1, 4), 2), (Ellipsis, 3), (1, Ellipsis, slice(2, 8)),
+                                      (slice(None, None, 2), slice(4, 0, -1), 7), (slice(5, 2), 1),
+                                      (slice(None), slice(1, 4), slice(3, 9), slice(1, 8, 3)),
+                                      [0, 2], (np.array([1, 3]), 0)])
+    def test_getitem(self, get_backend, item):
+        array = LazyArray(create_array(get_backend))
+        sliced = array[item]
+        assert isinstance(sliced, np.ndarray)
+        assert sliced.shape == SQUEEZED[item].shape
+        assert np.all(sliced == SQUEEZED[item])
+
+    def test_index_errors(self, get_backend):
+        array = LazyArray(create_array(get_backend))
+        with pytest.raises(IndexError):
+            array[6]
+        with pytest.raises(IndexError):
+            array[0, 0, 0, 0, 0]
+        with pytest.raises(IndexError):
+            array[..., 0, ...]
+
+    def test_cache(self, get_backend):
+        cache = ChunkCache(max_size=1024 ** 2)
+        array = LazyArray(create_array(get_backend), cache)
+        array[0, 0]
+        assert cache.misses == 3  # chunks along the last axis
+        assert cache.hits == 0
+        array[1, 1]
+        assert cache.misses == 3
+        assert cache.hits == 3
+        array[3, 1, :, 2:6]
+        assert cache.misses == 5  # two chunks along the last axis in the next chunk along the first one
+        assert len(cache) == 5
+
+        array_bis = LazyArray(array.node, cache)  # the same node loaded again shares the cached chunks
+        assert np.all(array_bis[1, 1] == SQUEEZED[1, 1])
+        assert cache.misses == 5
+
+    def test_bypass_cache(self, get_backend):
+        cache = ChunkCache(max_size=4096)  # chunks are 1024 bytes
+        array = LazyArray(create_array(get_backend), cache)
+        assert np.all(array[...] == SQUEEZED)
+        assert np.all(array[0, 0, 0] == SQUEEZED[0, 0, 0])
+        assert cache.misses == 0
+        assert np.all(array[0, 0, 0, 1] == SQUEEZED[0, 0, 0, 1])
+        assert cache.misses == 1
+
+    def test_scalar(self, get_backend):
+        array = LazyArray(create_array(get_backend, data=np.array([[2.7]]), chunk_shape=(1, 1)))
+        assert array.shape == (1,)
+        assert np.all(array[...] == np.array([2.7]))
+        assert array[0] == pytest.approx(2.7)
+
+    def test_operators(self, get_backend):
+        array = LazyArray(create_array(get_backend))
+        array_bis = LazyArray(array.node)
+        assert isinstance(array + array_bis, np.ndarray)
+        assert np.allclose(array + array_bis, 2 * SQUEEZED)
+        assert np.allclose(1 - array, 1 - SQUEEZED)
+        assert np.allclose(SQUEEZED * array / 2, SQUEEZED ** 2 / 2)
+        assert np.allclose(-array, -SQUEEZED)
+        assert np.allclose(np.sqrt(array), np.sqrt(SQUEEZED))
+        assert np.all(array == array_bis)
+        assert np.all(array == SQUEEZED)
+        assert not np.any(array != SQUEEZED)
+        assert np.all((array < 5) == (SQUEEZED < 5))
+        with pytest.raises(TypeError):
+            np.add(SQUEEZED, SQUEEZED, out=array)
@@ -9,9 +9,10 @@ import numpy as np
 import pytest
 
 from pymodaq.utils.h5modules import saving
-from pymodaq.utils.h5modules.module_saving import DetectorSaver, ActuatorSaver, ScanSaver
-from pymodaq.utils.h5modules.data_saving import DataManagement, AxisSaverLoader, DataSaverLoader, DataToExportSaver
-from pymodaq.utils.data import Axis, DataWithAxes, DataSource, DataToExport
+from pymodaq.utils.h5modules.module_saving import DetectorSaver, ActuatorSaver, ScanSaver, DetectorExtendedSaver
+from pymodaq.utils.h5modules.data_saving import DataManagement, AxisSaverLoader, DataSaverLoader, DataToExportSaver, \
+    DataLoader
+from pymodaq.utils.data import Axis, DataWithAxes, DataSource, DataToExport, DataRunningMean
 from pymodaq.utils.parameter import Parameter
 from pymodaq.control_modules.mocks import MockScan, MockDAQMove, MockDAQViewer
 
@@ -47,6 +48,31 @@ class TestDetectorSaver:
         assert node1 == node0
 
 
+class TestDetectorExtendedSaver:
+    def test_add_averaged_data(self, get_h5saver_module):
+        h5saver = get_h5saver_module
+        mock_det = MockDAQViewer(h5saver)
+        NAVERAGE, NX = 3, 4
+        det_saver = DetectorExtendedSaver(mock_det, (NAVERAGE, NX))
+        det_saver.h5saver = h5saver
+
+        running_mean = DataRunningMean((NX,))
+        for ind_average in range(NAVERAGE):
+            for ind in range(NX):
+                running_mean.add((ind,), DataToExport('det', data=[
+                    DataWithAxes('mydata', source='raw', data=[ind_average + ind * np.ones((5,))],
+                                 origin=mock_det.title, axes=[Axis('sig', data=np.linspace(0, 4, 5), index=0)])]))
+        nav_axis = Axis('nav', data=np.linspace(0, 1, NX), index=0)
+        det_saver.add_averaged_data(h5saver.raw_group, running_mean.mean(), [nav_axis])
+
+        dwa = DataLoader(h5saver).load_data('/RawData/Detector000/Averaged/DataND/CH00/Data00')
+        assert dwa.shape == (NX, 5)
+        assert dwa.nav_indexes == (0,)
+        assert dwa.get_axis_from_index(0)[0] == nav_axis
+        assert dwa.get_axis_from_index(1)[0].label == 'sig'
+        assert np.allclose(dwa[0], np.mean(np.arange(NAVERAGE)) + np.arange(NX)[:, np.newaxis] * np.ones((NX, 5)))
+
+
 class TestScanSaver:
     def test_get_set_node(self, get_h5saver_module):
         h5saver = get_h5saver_module
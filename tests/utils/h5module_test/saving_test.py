@@ -4,6 +4,8 @@ Created the 21/11/2022
 
 @author: Sebastien Weber
 """
+import time
+
 import numpy as np
 import pytest
 from datetime import datetime
@@ -209,3 +211,52 @@ class TestH5Saver:
             assert h5saver.get_node_path(CH_group1) ==\
                    f'/RawData/Scan000/Detector002/{utils.capitalize(data_dim)}/Ch001'
 
+
+
+class TestWriteBehind:
+
+    def test_write_behind(self, get_h5saver_lowlevel):
+        h5saver = get_h5saver_lowlevel
+        array = h5saver.add_array(h5saver.raw_group, 'data', 'data', data_shape=(10,), array_type=float,
+                                  data_dimension='Data1D', enlargeable=True)
+        write_behind = saving.H5WriteBehind(h5saver, queue_size=5, flush_frames=3, flush_interval=50)
+        write_behind.start()
+        assert write_behind.running
+        for ind in range(20):
+            assert write_behind.submit(array.append, ind * np.ones((10,)))
+        write_behind.stop()
+        assert not write_behind.running
+        assert write_behind.written == 20
+        assert write_behind.dropped == 0
+        assert array.attrs['shape'] == (20, 10)
+        assert np.allclose(array[:, 0], np.arange(20))
+
+    def test_drop_if_full(self, get_h5saver_lowlevel):
+        h5saver = get_h5saver_lowlevel
+        logs = []
+
+        def slow_job(ind):
+            time.sleep(0.05)
+            logs.append(ind)
+
+        write_behind = saving.H5WriteBehind(h5saver, queue_size=2, drop_if_full=True)
+        write_behind.start()
+        accepted = [write_behind.submit(slow_job, ind) for ind in range(10)]
+        write_behind.stop()
+        assert write_behind.dropped == accepted.count(False) > 0
+        assert logs == [ind for ind in range(10) if accepted[ind]]
+
+    def test_h5saver_submit(self, get_h5saver, tmp_path):
+        h5saver = get_h5saver
+        h5saver.init_file(update_h5=True, addhoc_file_path=tmp_path.joinpath('h5file.h5'))
+        h5saver.settings.child('write_behind', 'async_write').setValue(True)
+        h5saver.start_write_behind()
+        assert h5saver.write_behind.running
+        LOGS = ['This', 'is', 'a', 'message']
+        for log in LOGS:
+            assert h5saver.submit(h5saver.add_log, log)
+        h5saver.update_write_behind_status()
+        h5saver.stop_write_behind()
+        assert h5saver.write_behind is None
+        assert h5saver.settings['write_behind', 'N_dropped'] == 0
+        assert h5saver.get_set_logger().read() == LOGS
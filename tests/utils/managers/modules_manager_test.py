@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+from pathlib import Path
+import threading
+import time
+
+import numpy as np
+import pytest
+from qtpy.QtCore import QObject, Signal, QTimer
+
+from pymodaq.utils.daq_utils import ThreadCommand
+from pymodaq.utils.data import DataToExport, DataActuator, DataRaw
+import pymodaq
+from pymodaq.utils.exceptions import MasterSlaveError
+from pymodaq.utils.parameter import Parameter, ioxml
+from pymodaq.utils.managers.modules_manager import (ModulesManager, DetectorsDataCollector, ModulesInitializer,
+                                                    get_preset_masters)
+
+
+class FakeDetector(QObject):
+    command_hardware = Signal(ThreadCommand)
+    grab_done_signal = Signal(DataToExport)
+
+    def __init__(self, title, delay_ms=10, respond=True):
+        super().__init__()
+        self.title = title
+        self.Naverage = 1
+        self.delay_ms = delay_ms
+        self.respond = respond
+        self.command_hardware.connect(self.process_command)
+
+    def process_command(self, command: ThreadCommand):
+        if command.command == 'single' and self.respond:
+            QTimer.singleShot(self.delay_ms, self.emit_data)
+
+    def emit_data(self):
+        self.grab_done_signal.emit(DataToExport(self.title, data=[DataRaw(self.title, data=[np.array([0.])])]))
+
+
+class FakeHeadlessDetector(FakeDetector):
+    """Send its data from a thread to the data sink while the displayed data come much later"""
+    def __init__(self, title, delay_ms=10, display_ms=2000):
+        super().__init__(title, delay_ms)
+        self.display_ms = display_ms
+        self.sink = None
+
+    def set_data_sink(self, sink=None):
+        self.sink = sink
+
+    def process_command(self, command: ThreadCommand):
+        if command.command == 'single':
+            threading.Timer(self.delay_ms / 1000, self.post_data).start()
+            QTimer.singleShot(self.display_ms, self.emit_data)
+
+    def post_data(self):
+        if self.sink is not None:
+            self.sink(DataToExport(self.title, data=[DataRaw(self.title, data=[np.array([1.])])]))
+
+
+class FakeActuator(QObject):
+    command_hardware = Signal(ThreadCommand)
+    move_done_signal = Signal(DataActuator)
+    current_value_signal = Signal(DataActuator)
+
+    def __init__(self, title, delay_ms=10):
+        super().__init__()
+        self.title = title
+        self.delay_ms = delay_ms
+        self.command_hardware.connect(self.process_command)
+
+    def process_command(self, command: ThreadCommand):
+        if command.command == 'move_abs':
+            position = command.attribute[0]
+            QTimer.singleShot(self.delay_ms,
+                              lambda: self.move_done_signal.emit(DataActuator(self.title, data=position.value())))
+
+
+class FakeInitModule(QObject):
+    """Module whose initialization completes after delay ms (never if delay is None)"""
+    init_signal = Signal(bool)
+    ui = None
+
+    def __init__(self, title, delay=100, success=True):
+        super().__init__()
+        self.title = title
+        self.delay = delay
+        self.success = success
+        self.controller = None
+        self.init_start = None
+
+    def init_hardware(self, do_init=True):
+        self.init_start = time.perf_counter()
+        if self.delay is not None:
+            QTimer.singleShot(self.delay, self.initialized)
+
+    def initialized(self):
+        if self.success and self.controller is None:
+            self.controller = f'{self.title} controller'
+        self.init_signal.emit(self.success)
+
+
+@pytest.fixture
+def init_qt(qtbot):
+    return qtbot
+
+
+def test_grab_datas(init_qt):
+    detectors = [FakeDetector('det0', 5), FakeDetector('det1', 30)]
+    manager = ModulesManager(detectors=detectors, selected_detectors=detectors)
+    manager.connect_detectors()
+
+    tzero = time.perf_counter()
+    dte = manager.grab_datas()
+    assert time.perf_counter() - tzero < 1
+    assert manager.det_done_flag
+    assert len(dte) == 2
+
+
+def test_grab_datas_timeout(init_qt):
+    detectors = [FakeDetector('det0', respond=False)]
+    manager = ModulesManager(detectors=detectors, selected_detectors=detectors)
+    manager.detector_timeout = 50
+    manager.connect_detectors()
+    with init_qt.waitSignal(manager.timeout_signal, timeout=1000):
+        manager.grab_datas()
+    assert not manager.det_done_flag
+
+
+def test_grab_datas_headless(init_qt):
+    detectors = [FakeHeadlessDetector('det0', 5), FakeHeadlessDetector('det1', 30), FakeDetector('det2', 5)]
+    manager = ModulesManager(detectors=detectors, selected_detectors=detectors)
+    manager.connect_detectors()
+
+    tzero = time.perf_counter()
+    dte = manager.grab_datas(headless=True)
+    assert time.perf_counter() - tzero < 1  # does not wait for the display
+    assert manager.det_done_flag
+    assert len(dte) == 3
+    assert dte.get_data_from_name('det0')[0][0] == pytest.approx(1.)
+    assert dte.get_data_from_name('det2')[0][0] == pytest.approx(0.)
+    assert all(det.sink is None for det in detectors[:2])
+
+    init_qt.wait(2100)  # displayed data coming after the grab are ignored
+    assert len(manager.det_done_datas) == 3
+
+
+def test_detectors_data_collector():
+    collector = DetectorsDataCollector(2)
+    threads = [threading.Thread(target=collector.post, args=(DataToExport(f'det{ind}'),)) for ind in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert collector.done
+    assert len(collector.received) == 2
+
+    collector = DetectorsDataCollector(2)
+    collector.abort()
+    assert collector.done
+    collector.post(DataToExport('det0'))
+    assert len(collector.received) == 0
+
+
+def test_move_actuators(init_qt):
+    actuators = [FakeActuator('act0', 5), FakeActuator('act1', 20)]
+    manager = ModulesManager(actuators=actuators, selected_actuators=actuators)
+    manager.connect_actuators()
+
+    dte = manager.move_actuators(DataToExport('move', data=[DataActuator('act0', data=1.),
+                                                             DataActuator('act1', data=2.)]))
+    assert manager.move_done_flag
+    assert dte.get_data_from_name('act1').value() == pytest.approx(2.)
+
+
+def test_modules_initializer(init_qt):
+    masters = [FakeInitModule(f'master{ind}', 300) for ind in range(4)]
+    slave = FakeInitModule('slave', 100)
+    initializer = ModulesInitializer([(masters[0], [slave])] + [(master, []) for master in masters[1:]])
+    start = time.perf_counter()
+    initializer.start()
+    assert initializer.wait(2000)
+    assert time.perf_counter() - start < 4 * 0.3  # the masters are initialized concurrently
+    assert slave.controller == 'master0 controller'
+    assert slave.init_start >= masters[0].init_start + 0.3  # once its master is initialized
+    assert list(initializer.results.keys())[-1] == 'slave'
+    assert all([duration >= 0.1 for initialized, duration in initializer.results.values()])
+    assert len(initializer.report()) == 5
+
+
+def test_modules_initializer_failure(init_qt):
+    master = FakeInitModule('master', success=False)
+    slave = FakeInitModule('slave')
+    stuck = FakeInitModule('stuck', None)
+    initializer = ModulesInitializer([(master, [slave]), (stuck, [])])
+    initializer.start()
+    assert not initializer.wait(500)
+    assert slave.init_start is None
+    report = initializer.report()
+    assert report[0].startswith('master: initialization failed')
+    assert report[1] == 'slave: not initialized as its Master is not'
+    assert report[2].startswith('stuck: initialization not completed')
+
+
+def test_get_preset_masters():
+    preset = Parameter.create(name='Preset', type='group', children=ioxml.XML_file_to_parameter(
+        Path(pymodaq.__file__).parent.joinpath('resources', 'preset_default.xml')))
+    created = []
+    masters = get_preset_masters(preset, lambda plugin_type, name, settings: created.append(name) or name)
+    assert len(created) == len(preset.child('Moves').children()) + len(preset.child('Detectors').children())
+    assert ('Xaxis', ['Yaxis', 'Theta axis']) in masters
+    assert sum([len(slaves) + 1 for master, slaves in masters]) <= len(created)
+
+    preset.child('Moves', 'move00', 'params', 'move_settings', 'multiaxes', 'multi_status').setValue('Slave')
+    with pytest.raises(MasterSlaveError):
+        get_preset_masters(preset, lambda plugin_type, name, settings: name)
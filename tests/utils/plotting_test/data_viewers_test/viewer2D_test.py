@@ -152,6 +152,32 @@ class TestData0DWithHistory:
         assert data_histo.datas == dict([])
         assert data_histo._data_length == 0
 
+    def test_ring_buffer(self, init_qt):
+        Nsamplesinhisto = 5
+        data_histo = plot_utils.Data0DWithHistory(Nsamplesinhisto)
+        values = np.random.rand(13)
+        for ind, value in enumerate(values):
+            data_histo.add_datas(dict(CH0=value, CH1=np.array([-value])))
+            kept = values[max(0, ind + 1 - Nsamplesinhisto):ind + 1]
+            assert np.all(data_histo.datas['CH0'] == kept)
+            assert np.all(data_histo.datas['CH1'] == -kept)
+            assert np.all(data_histo.xaxis == np.arange(max(0, ind + 1 - Nsamplesinhisto), ind + 1))
+            assert data_histo.mins['CH0'] == np.min(values[:ind + 1])
+            assert data_histo.maxs['CH0'] == np.max(values[:ind + 1])
+            assert data_histo.maxs['CH1'] == -np.min(values[:ind + 1])
+        assert np.shares_memory(data_histo.datas['CH0'], data_histo._buffers['CH0'])  # views, not copies
+
+        data_histo.length = 3
+        assert np.all(data_histo.datas['CH0'] == values[-3:])
+        assert np.all(data_histo.xaxis == np.arange(10, 13))
+        data_histo.add_datas(dict(CH0=values[0], CH1=values[0]))
+        assert np.all(data_histo.datas['CH0'] == np.concatenate((values[-2:], values[:1])))
+        data_histo.length = 10
+        assert np.all(data_histo.datas['CH0'] == np.concatenate((values[-2:], values[:1])))
+        data_histo.add_datas(dict(CH0=values[1], CH1=values[1]))
+        assert np.all(data_histo.datas['CH0'] == np.concatenate((values[-2:], values[:2])))
+        assert np.all(data_histo.xaxis == np.arange(11, 15))
+
 
 class TestLineoutData:
     def test_with_error(self):
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+from scipy.interpolate import LinearNDInterpolator
+
+from pymodaq.utils.plotting.items.image import SpreadImageItem
+
+
+def get_spread_data(npoints=1000):
+    data = np.random.rand(npoints, 3) * [10, 5, 1]
+    data[:4, :2] = [[0, 0], [10, 0], [0, 5], [10, 5]]  # fixed bounding rect
+    data[:, 2] = np.sin(data[:, 0]) + data[:, 1] / 5
+    return data
+
+
+def interpolated_raster(item: SpreadImageItem, data: np.ndarray):
+    raster = item._raster
+    rect = raster['rect']
+    pixels = raster['pixels']
+    rows, cols = np.divmod(pixels, raster['shape'][1])
+    xdata = rect.left() + (cols + 0.5) * rect.width() / raster['shape'][1]
+    ydata = rect.top() + (rows + 0.5) * rect.height() / raster['shape'][0]
+    values = np.sum(data[raster['vertices'][pixels], 2] * raster['weights'][pixels], axis=1)
+    return values, LinearNDInterpolator(data[:, :2], data[:, 2])(xdata, ydata)
+
+
+class TestSpreadImageItem:
+    def test_mesh(self, qtbot):
+        data = get_spread_data(100)
+        item = SpreadImageItem(raster_points=1000)
+        item.setImage(data)
+        item.render()
+        assert 'polygons' in item.qimage
+        assert len(item.qimage['polygons']) == len(item.triangulation.simplices)
+        assert np.allclose(item.tri_data, np.mean(data[item.triangulation.simplices, 2], axis=1))
+
+    def test_cached_triangulation(self, qtbot):
+        data = get_spread_data(100)
+        item = SpreadImageItem(raster_points=1000)
+        item.setImage(data)
+        item.render()
+        triangulation = item.triangulation
+        polygons = item.qimage['polygons']
+
+        data[:, 2] *= 2  # values only
+        item.setImage(data)
+        item.render()
+        assert item.triangulation is triangulation
+        assert item.qimage['polygons'] is polygons
+
+        data = np.concatenate((data, get_spread_data(10)[4:]))  # appended points
+        item.setImage(data)
+        item.render()
+        assert item.triangulation is triangulation
+        assert item.triangulation.npoints == 106
+        assert len(item.qimage['polygons']) == len(item.triangulation.simplices)
+
+        item.setImage(get_spread_data(100))  # new points
+        item.render()
+        assert item.triangulation is not triangulation
+
+    def test_raster(self, qtbot):
+        data = get_spread_data(1000)
+        item = SpreadImageItem(raster_points=100)
+        item.setImage(data)
+        item.render()
+        assert 'image' in item.qimage
+        assert item._raster['shape'] == (SpreadImageItem.raster_size // 2, SpreadImageItem.raster_size)
+        values, expected = interpolated_raster(item, data)
+        assert np.allclose(values, expected)
+        assert np.all(item.qimage['argb'][..., 3].reshape((-1,))[item._raster['pixels']] == 255)
+
+        for npoints in (1001, 1010, 1500):  # incremental update of the raster
+            data_added = np.concatenate((data, get_spread_data(npoints - len(data) + 4)[4:]))
+            item.setImage(data_added)
+            item.render()
+            values, expected = interpolated_raster(item, data_added)
+            assert np.allclose(values, expected)
+            data = data_added
+        assert item.triangulation.npoints == 1500
+
+    def test_get_points_at(self, qtbot):
+        item = SpreadImageItem()
+        item.setImage(get_spread_data(1000))
+        item.render()
+        centroids = item.compute_centroids()
+        for axis, ind_axis in zip(('x', 'y'), (0, 1)):
+            points, values = item.get_points_at(axis, 2.5)
+            points_to_test = centroids.copy()
+            points_to_test[:, ind_axis] = 2.5
+            simplex = item.triangulation.find_simplex(points_to_test)
+            expected = np.where(simplex == np.arange(len(simplex)))[0]
+            assert np.allclose(points, centroids[expected])
+            assert np.allclose(values, item.tri_data[expected])
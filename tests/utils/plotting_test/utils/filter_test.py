@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import gc
+
+import numpy as np
+import pytest
+from pytest import approx
+from qtpy import QtWidgets
+
+from pymodaq.utils import data as data_mod
+from pymodaq.utils.plotting.data_viewers.viewer2D import Viewer2D, IMAGE_TYPES
+from pymodaq.utils.plotting.utils.filter import RoiRegion, Filter2DFromRois
+
+NY, NX = 60, 80
+DATA = np.arange(NY * NX, dtype=float).reshape((NY, NX)) % 17
+
+
+@pytest.fixture
+def init_viewer(qtbot):
+    widget = QtWidgets.QWidget()
+    qtbot.addWidget(widget)
+    viewer = Viewer2D(widget)
+    viewer.show_data(data_mod.DataRaw('raw', data=[DATA]))
+    yield viewer, qtbot
+    widget.close()
+
+
+def add_roi(viewer: Viewer2D, qtbot, roi_type='RectROI', pos=(10, 20), size=(30, 15)):
+    with qtbot.waitSignal(viewer.roi_manager.new_ROI_signal, timeout=10000) as blocker:
+        viewer.roi_manager.add_roi_programmatically(roi_type)
+    roi = viewer.roi_manager.get_roi_from_index(blocker.args[0])
+    roi.setPos(pos)
+    roi.setSize(size)
+    return viewer.roi_manager.roi_format(blocker.args[0]), roi
+
+
+def get_filter(viewer: Viewer2D, in_thread=False) -> Filter2DFromRois:
+    return Filter2DFromRois(viewer.roi_manager, viewer.view.data_displayer.get_image('red'), IMAGE_TYPES,
+                            in_thread=in_thread)
+
+
+class TestRoiRegion:
+    def test_rect(self):
+        region = RoiRegion((slice(20, 35), slice(10, 40)))
+        hor_data, ver_data, int_data = region.get_statistics(DATA)
+        assert region.size == 15 * 30
+        assert np.allclose(hor_data, np.mean(DATA[20:35, 10:40], axis=0))
+        assert np.allclose(ver_data, np.mean(DATA[20:35, 10:40], axis=1))
+        assert int_data == approx(np.mean(DATA[20:35, 10:40]))
+        assert np.all(region.xvals == np.arange(10, 40))
+        assert np.all(region.yvals == np.arange(20, 35))
+
+    def test_mask(self):
+        mask = np.random.rand(15, 30) > 0.3
+        mask[:, 0] = False
+        region = RoiRegion((slice(20, 35), slice(10, 40)), mask)
+        hor_data, ver_data, int_data = region.get_statistics(DATA)
+        masked = np.ma.masked_array(DATA[20:35, 10:40], ~mask)
+        assert region.size == np.count_nonzero(mask)
+        assert int_data == approx(masked.mean())
+        assert np.allclose(ver_data, masked.mean(axis=1).filled(0))
+        assert hor_data[0] == 0.
+        assert np.allclose(hor_data, masked.mean(axis=0).filled(0))
+
+
+class TestFilter2DFromRois:
+    def test_rect(self, init_viewer):
+        viewer, qtbot = init_viewer
+        roi_key, roi = add_roi(viewer, qtbot)
+        roi_filter = get_filter(viewer)
+        lineout = roi_filter._filter_data(viewer._datas)[roi_key]
+        assert np.allclose(lineout.hor_data, np.mean(DATA[20:35, 10:40], axis=0))
+        assert np.allclose(lineout.ver_data, np.mean(DATA[20:35, 10:40], axis=1))
+        assert lineout.int_data[0] == approx(np.mean(DATA[20:35, 10:40]))
+        assert lineout.hor_axis == approx(np.arange(10, 40))
+
+        # same results as from the interpolated region of pyqtgraph
+        xvals, yvals, data_array = roi_filter.get_xydata(DATA, roi)
+        assert np.allclose(lineout.hor_data, np.mean(data_array, axis=0))
+        assert np.allclose(lineout.ver_data, np.mean(data_array, axis=1))
+
+    def test_cache(self, init_viewer):
+        viewer, qtbot = init_viewer
+        roi_key, roi = add_roi(viewer, qtbot)
+        roi_filter = get_filter(viewer)
+        roi_filter._filter_data(viewer._datas)
+        region = roi_filter._regions.get_region(roi_key, roi, roi_filter._graph_item, DATA.shape)
+        roi_filter._filter_data(viewer._datas)
+        assert roi_filter._regions.get_region(roi_key, roi, roi_filter._graph_item, DATA.shape) is region
+
+        roi.setPos((12, 20))
+        lineout = roi_filter._filter_data(viewer._datas)[roi_key]
+        new_region = roi_filter._regions.get_region(roi_key, roi, roi_filter._graph_item, DATA.shape)
+        assert new_region is not region
+        assert new_region.slices == (slice(20, 35), slice(12, 42))
+        assert lineout.int_data[0] == approx(np.mean(DATA[20:35, 12:42]))
+
+        viewer.roi_manager.remove_roi_programmatically(0)
+        QtWidgets.QApplication.processEvents()
+        assert roi_filter._filter_data(viewer._datas) == dict([])
+        assert len(roi_filter._regions) == 0
+
+    def test_channel(self, init_viewer):
+        viewer, qtbot = init_viewer
+        viewer.show_data(data_mod.DataRaw('raw', data=[DATA, 2 * DATA + 1]))
+        roi_key, roi = add_roi(viewer, qtbot)
+        roi_filter = get_filter(viewer)
+        roi_filter._roi_settings.child('ROIs', roi_key, 'use_channel').setValue(IMAGE_TYPES[1])
+        roi_filter._roi_settings.child('ROIs', roi_key, 'math_function').setValue('max')
+        tasks, data_dict = roi_filter._prepare_tasks(viewer._datas)
+        region, sub_data, math_function = tasks[0][2]
+        assert len(sub_data) == 1 and sub_data[0] is viewer._datas[1]  # the array is shared, not copied
+        assert sub_data.labels == [viewer._datas.labels[1]]
+        lineout = roi_filter._filter_data(viewer._datas)[roi_key]
+        assert lineout.int_data[0] == approx(np.mean(2 * DATA[20:35, 10:40] + 1))
+        assert len(lineout.math_data) == 1
+        assert lineout.math_data[0] == approx(np.max(2 * DATA[20:35, 10:40] + 1))
+
+    def test_ellipse(self, init_viewer):
+        viewer, qtbot = init_viewer
+        roi_key, roi = add_roi(viewer, qtbot, 'EllipseROI', pos=(10, 20), size=(20, 10))
+        lineout = get_filter(viewer)._filter_data(viewer._datas)[roi_key]
+        rows, cols = np.mgrid[20:30, 10:30]
+        mask = ((cols + 0.5 - 20) / 10) ** 2 + ((rows + 0.5 - 25) / 5) ** 2 < 1
+        assert lineout.int_data[0] == approx(np.mean(DATA[20:30, 10:30][mask]))
+        assert len(lineout.hor_data) == 20
+
+    def test_rotated(self, init_viewer):
+        viewer, qtbot = init_viewer
+        roi_key, roi = add_roi(viewer, qtbot)
+        roi.setAngle(30)
+        roi_filter = get_filter(viewer)
+        lineout = roi_filter._filter_data(viewer._datas)[roi_key]
+        assert roi_filter._regions.get_region(roi_key, roi, roi_filter._graph_item, DATA.shape) is None
+        xvals, yvals, data_array = roi_filter.get_xydata(DATA, roi)
+        assert lineout.int_data[0] == approx(np.mean(data_array))
+
+    def test_in_thread(self, init_viewer):
+        viewer, qtbot = init_viewer
+        roi_keys = [add_roi(viewer, qtbot, pos=(ind, 2 * ind))[0] for ind in range(3)]
+        results = []
+        roi_filter = get_filter(viewer, in_thread=True)
+        assert roi_filter.in_thread
+        roi_filter.set_active(True)
+        roi_filter.register_target_slot(results.append)
+        for ind in range(5):
+            roi_filter.filter_data(viewer._datas)
+        qtbot.waitUntil(lambda: len(results) == 2)  # the first and the latest ones, the others are skipped
+        QtWidgets.QApplication.processEvents()
+        assert len(results) == 2
+        assert list(results[-1].keys()) == roi_keys
+        for roi_key, lineout in get_filter(viewer)._filter_data(viewer._datas).items():
+            assert np.allclose(results[-1][roi_key].hor_data, lineout.hor_data)
+            assert results[-1][roi_key].int_data == approx(lineout.int_data)
+        roi_filter.close()
+        assert not roi_filter.in_thread
+
+    def test_in_thread_teardown(self, init_viewer):
+        viewer, qtbot = init_viewer
+        roi_filter = get_filter(viewer, in_thread=True)
+        thread = roi_filter._worker_thread
+        assert thread.isRunning()
+        del roi_filter  # destroying the filter stops its thread (and does not abort the process)
+        gc.collect()
+        assert thread.isFinished()
+
+        widget = QtWidgets.QWidget()
+        viewer = Viewer2D(widget)
+        viewer.filter_from_rois._init_thread()
+        thread = viewer.filter_from_rois._worker_thread
+        assert thread.isRunning()
+        with qtbot.waitSignal(widget.destroyed, timeout=10000):
+            widget.deleteLater()  # the viewer's widget being destroyed stops the thread
+        assert thread.isFinished()
+        assert not viewer.filter_from_rois.in_thread
+
+    def test_spread(self, init_viewer):
+        viewer, qtbot = init_viewer
+        rect_key, rect = add_roi(viewer, qtbot, pos=(10, 20), size=(30, 15))
+        ellipse_key, ellipse = add_roi(viewer, qtbot, 'EllipseROI', pos=(10, 20), size=(30, 15))
+        xdata, ydata = np.random.rand(2, 5000) * [[NX], [NY]]
+        values = np.random.rand(5000)
+        data = data_mod.DataRaw('raw', distribution='spread', data=[values], nav_indexes=(0,),
+                                axes=[data_mod.Axis('xaxis', data=xdata, index=0, spread_order=0),
+                                      data_mod.Axis('yaxis', data=ydata, index=0, spread_order=1)])
+        roi_filter = get_filter(viewer)
+        lineouts = roi_filter._filter_data(data)
+
+        in_rect = (xdata >= 10) & (xdata <= 40) & (ydata >= 20) & (ydata <= 35)
+        assert lineouts[rect_key].int_data[0] == approx(np.mean(values[in_rect]))
+        assert np.all(lineouts[rect_key].hor_axis == np.sort(xdata[in_rect]))
+        in_ellipse = ((xdata - 25) / 15) ** 2 + ((ydata - 27.5) / 7.5) ** 2 <= 1
+        assert lineouts[ellipse_key].int_data[0] == approx(np.mean(values[in_ellipse]))
+
+        index = roi_filter.get_spread_index(xdata, ydata)
+        assert roi_filter.get_spread_index(xdata.copy(), ydata.copy()) is index
+
+        rect.setAngle(90)  # the ROI now spans x in [-5, 10] and y in [20, 50]
+        in_rotated = (xdata >= -5) & (xdata <= 10) & (ydata >= 20) & (ydata <= 50)
+        assert np.all(np.sort(roi_filter.get_indexes_in_roi(rect, xdata, ydata)) == np.where(in_rotated)[0])
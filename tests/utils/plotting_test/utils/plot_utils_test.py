@@ -6,9 +6,11 @@ Created the 03/11/2022
 """
 import pytest
 import numpy as np
+from qtpy import QtCore
 
 from pymodaq.utils import data as data_mod
-from pymodaq.utils.plotting.utils.plot_utils import Point, Vector, get_sub_segmented_positions
+from pymodaq.utils.plotting.utils.plot_utils import Point, Vector, get_sub_segmented_positions, SpreadIndex, \
+    points_in_polygon, Triangulation, rasterizeTriangles
 from pymodaq.utils.math_utils import linspace_step
 
 
@@ -77,4 +79,48 @@ def test_get_sub_segmented_positions():
 
     points = [Point(0, 0), Point(1, 0), Point(1, -1), Point(0, 0)]
     positions = np.array(get_sub_segmented_positions(step, points))
-    pass
\ No newline at end of file
+    pass
+
+class TestSpreadIndex:
+    def test_points(self):
+        xdata, ydata = np.random.rand(2, 1000)
+        index = SpreadIndex.from_points(xdata, ydata)
+        assert len(index) == 1000
+        indexes = index.in_box(0.2, 0.5, 0.3, 0.4)
+        expected = np.where((xdata >= 0.2) & (xdata <= 0.5) & (ydata >= 0.3) & (ydata <= 0.4))[0]
+        assert np.all(indexes == expected)
+        assert len(index.in_box(2, 3)) == 0
+
+    def test_triangles(self):
+        triangulation = Triangulation(np.random.rand(200, 2))
+        vertices = triangulation.points[triangulation.simplices]
+        index = SpreadIndex.from_triangulation(triangulation)
+        for axis, ind_axis in zip(('x', 'y'), (0, 1)):
+            expected = np.where((np.min(vertices[..., ind_axis], axis=1) <= 0.3) &
+                                (np.max(vertices[..., ind_axis], axis=1) >= 0.3))[0]
+            assert np.all(index.at(axis, 0.3) == expected)
+
+
+def test_points_in_polygon():
+    xdata, ydata = np.random.rand(2, 1000) * 2
+    square = np.array([[0.5, 0.5], [1.5, 0.5], [1.5, 1.5], [0.5, 1.5]])
+    inside = points_in_polygon(xdata, ydata, square)
+    assert np.all(inside == ((xdata > 0.5) & (xdata < 1.5) & (ydata > 0.5) & (ydata < 1.5)))
+
+    triangle = np.array([[0, 0], [2, 0], [0, 2]])
+    assert np.all(points_in_polygon(xdata, ydata, triangle) == (xdata + ydata < 2))
+
+
+def test_rasterize_triangles():
+    points = np.array([[0., 0.], [4., 0.], [0., 2.], [4., 2.]])
+    triangulation = Triangulation(points)
+    pixels, vertices, weights = rasterizeTriangles(points, triangulation.simplices, (2, 4), QtCore.QRectF(0, 0, 4, 2))
+    assert np.all(pixels == np.arange(8))
+    assert np.allclose(np.sum(weights, axis=1), 1)
+    assert np.all(weights >= 0)
+    centers = np.sum(points[vertices] * weights[..., np.newaxis], axis=1)
+    assert np.allclose(centers, [[col + 0.5, row + 0.5] for row in range(2) for col in range(4)])
+
+    pixels, vertices, weights = rasterizeTriangles(points, triangulation.simplices[:1], (2, 4),
+                                                   QtCore.QRectF(0, 0, 4, 2))
+    assert 0 < len(pixels) < 8
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 18/10/2026
+
+@author: Sebastien Weber
+"""
+import numpy as np
+import pytest
+
+from pymodaq.utils.tcp_ip.compression import (available_codecs, downcast, encode_array, decode_payload, shuffle,
+                                              unshuffle, NO_COMPRESSION, PAYLOAD_DESCRIPTOR)
+
+
+def test_downcast():
+    counts = np.random.poisson(100, (20, 30)).astype(float)
+    assert downcast(counts).dtype == np.uint8
+    assert np.array_equal(downcast(counts), counts)
+    assert downcast(np.array([-1., 1000.])).dtype == np.int16
+    assert downcast(np.array([0, 70000], dtype=np.int64)).dtype == np.uint32
+    assert downcast(np.array([0.5, 1.5])).dtype == np.float32  # exact in float32
+    assert downcast(np.array([0.1, 1.5])).dtype == np.float64  # not exact in float32
+    assert downcast(np.array([1., np.nan])).dtype == np.float32
+    assert downcast(np.array([1e10, 1e-10])).dtype == np.float64
+    assert downcast(np.array([1, 2], dtype=np.uint8)).dtype == np.uint8
+    assert downcast(np.array([True])).dtype == bool
+    negative_zero = downcast(np.array([-0., 1., 2.]))  # -0. == 0. but would come back as +0. from an integer
+    assert negative_zero.dtype == np.float32
+    assert np.signbit(negative_zero[0])
+
+
+def test_shuffle():
+    buffer = np.arange(12, dtype=np.uint16).view(np.uint8)
+    assert np.array_equal(unshuffle(shuffle(buffer, 2), 2), buffer)
+    assert np.all(shuffle(buffer, 2)[12:] == 0)  # all the most significant bytes grouped
+
+
+@pytest.mark.parametrize('codec', available_codecs())
+@pytest.mark.parametrize('cast', [False, True])
+def test_encode_decode(codec, cast):
+    for array in [np.random.poisson(10, (50, 40)).astype(float), np.zeros((100,), dtype=np.int32),
+                  np.random.rand(100), np.array([], dtype=float), np.arange(10, dtype=np.uint8)]:
+        descriptor, stored = encode_array(array, codec, cast)
+        payload = memoryview(descriptor + bytes(stored) + b'next payload')
+        view, length = decode_payload(payload)
+        assert length == PAYLOAD_DESCRIPTOR.size + len(stored)
+        assert np.array_equal(np.frombuffer(view, dtype=array.dtype), array.reshape(-1))
+        if codec == NO_COMPRESSION and not cast:
+            assert len(stored) == array.nbytes
+
+    array = np.zeros((1000,))
+    if codec != NO_COMPRESSION:
+        assert len(encode_array(array, codec)[1]) < array.nbytes / 10
+    noise = np.random.bytes(1000)
+    assert bytes(encode_array(np.frombuffer(noise, dtype=np.uint8), codec)[1]) == noise  # stored if not compressible
+
+
+def test_decode_errors():
+    descriptor, stored = encode_array(np.arange(10.), 'zlib')
+    with pytest.raises(ValueError):
+        decode_payload(memoryview(descriptor + bytes(stored)[:-1]))
+    with pytest.raises(ValueError):
+        encode_array(np.arange(10.), 'not_a_codec')
@@ -11,7 +11,10 @@ import pytest
 
 from pymodaq.utils import data as data_mod
 from pymodaq.utils.data import Axis, DataToExport, DataWithAxes, DwaType
-from pymodaq.utils.tcp_ip.serializer import Serializer, DeSerializer
+from pymodaq.utils.tcp_ip.serializer import (Serializer, DeSerializer, SocketString, FrameSerializer, FrameString,
+                                             FRAME_MAGIC, FRAME_HEADER, FRAME_ALIGNMENT, FRAME_COMPRESSED,
+                                             read_frame_header)
+from pymodaq.utils.tcp_ip.compression import available_codecs
 
 LABEL = 'A Label'
 UNITS = 'units'
@@ -211,3 +214,93 @@ def test_dte_serialization(get_data):
     assert dte_back.timestamp == dte.timestamp
     for dwa in dte_back:
         assert dwa == dte.get_data_from_full_name(dwa.get_full_name())
+
+
+def test_segments(get_data):
+    dte = get_data
+    ser = Serializer(dte)
+    segments = ser.to_segments()
+    assert b''.join(segments) == ser.to_bytes()
+    for ind, segment in enumerate(segments):  # headers are coalesced between array buffers
+        if not isinstance(segment, memoryview):
+            assert ind == 0 or isinstance(segments[ind - 1], memoryview)
+
+    array = np.linspace(0, 1, 100).reshape((10, 10))
+    segments = Serializer(array).to_segments()
+    assert len(segments) == 2
+    assert np.shares_memory(np.frombuffer(segments[1], dtype=array.dtype), array)
+
+    array_t = array.T  # non contiguous arrays are copied
+    assert np.allclose(DeSerializer(Serializer(array_t).to_bytes()).ndarray_deserialization(), array_t)
+
+
+def test_socket_string():
+    socket_string = SocketString(b'test\x00\x01\x00\x02')
+    assert socket_string.get_first_nbytes(2) == b'te'
+    assert socket_string.bytes_left == 6
+    buffer = bytearray(2)
+    socket_string.get_first_nbytes_into(buffer)
+    assert buffer == b'st'
+    with pytest.raises(ValueError):
+        socket_string.get_first_nbytes_into(bytearray(6))
+    assert socket_string.get_first_nbytes(10) == b''
+
+
+def test_deserialize_buffer(get_data):
+    dte = get_data
+    bytes_string = bytearray(Serializer(dte).to_bytes())
+    dte_back = DeSerializer(bytes_string).dte_deserialization()
+    for dwa in dte_back:
+        assert dwa == dte.get_data_from_full_name(dwa.get_full_name())
+        assert dwa.data[0].flags.writeable
+
+
+def test_frame(get_data):
+    dte = get_data
+    frame = bytearray(FrameSerializer(dte).to_bytes())
+    assert frame.startswith(FRAME_MAGIC)
+    frame_string = FrameString.from_frame(frame)
+    dte_back = DeSerializer(frame_string).dte_deserialization()
+    assert frame_string.bytes_left == 0
+    for dwa in dte_back:
+        assert dwa == dte.get_data_from_full_name(dwa.get_full_name())
+        assert dwa.data[0].flags.writeable
+
+    array = np.linspace(0, 1, 100).reshape((10, 10))
+    segments = FrameSerializer(array).to_segments()
+    assert len(segments) == 2  # header, metadata and padding then the array buffer
+    assert (len(segments[0]) - FRAME_HEADER.size) % FRAME_ALIGNMENT == 0
+    frame = bytearray(b''.join(segments))
+    array_back = DeSerializer(FrameString.from_frame(frame)).ndarray_deserialization()
+    assert np.allclose(array_back, array)
+    assert np.shares_memory(array_back, np.frombuffer(frame, dtype=np.uint8))  # no copy
+
+    assert DeSerializer(FrameString.from_frame(FrameSerializer('a string').to_bytes())).string_deserialization() \
+        == 'a string'
+
+    with pytest.raises(ValueError):
+        FrameString.from_frame(b'not a frame' + bytes(FRAME_HEADER.size))
+    with pytest.raises(ValueError):
+        FrameString.from_frame(frame[:-1])
+
+
+@pytest.mark.parametrize('codec', available_codecs())
+def test_compressed_frame(codec):
+    counts = np.random.poisson(100, (100, 200)).astype(float)
+    dte = DataToExport('dte', data=[
+        DataWithAxes('counts', data_mod.DataSource['raw'], data=[counts, np.zeros_like(counts)]),
+        DataWithAxes('small', data_mod.DataSource['raw'], data=[np.array([0.1, 2.])]),
+        DataWithAxes('empty', data_mod.DataSource['raw'], data=[np.array([])])])
+    uncompressed = FrameSerializer(dte).to_bytes()
+    frame = bytearray(FrameSerializer(dte, codec, threshold=1000, cast=True).to_bytes())
+    assert read_frame_header(frame[:FRAME_HEADER.size])[0] == FRAME_COMPRESSED
+    assert len(frame) < len(uncompressed) / 4
+
+    frame_string = FrameString.from_frame(frame)
+    dte_back = DeSerializer(frame_string).dte_deserialization()
+    assert frame_string.bytes_left == 0
+    for dwa in dte_back:
+        dwa_sent = dte.get_data_from_full_name(dwa.get_full_name())
+        assert dwa == dwa_sent
+        assert dwa.data[0].dtype == dwa_sent.data[0].dtype  # original dtype restored
+        assert np.array_equal(dwa.data[0], dwa_sent.data[0])
@@ -1,12 +1,17 @@
 import pytest
 import numpy as np
+import select
 import socket
+import threading
 
 from unittest import mock
 from pymodaq.utils.daq_utils import ThreadCommand
-from pymodaq.utils.tcp_ip.tcp_server_client import MockServer, TCPClient, TCPServer
+from pymodaq.utils.tcp_ip import tcp_server_client
+from pymodaq.utils.tcp_ip.tcp_server_client import (MockServer, TCPClient, TCPServer, PROTOCOL_COMMAND,
+                                                    COMPRESSION_COMMAND, configure_compression)
+from pymodaq.utils.tcp_ip.compression import available_codecs
 from pymodaq.utils.tcp_ip.mysocket import Socket
-from pymodaq.utils.tcp_ip.serializer import Serializer, DeSerializer
+from pymodaq.utils.tcp_ip.serializer import Serializer, DeSerializer, FRAME_MAGIC
 from pyqtgraph.parametertree import Parameter
 from pyqtgraph import SRTTransform
 from collections import OrderedDict
@@ -126,6 +131,67 @@ class TestSocket:
         test_Socket.check_received_length(4100)
         assert not test_Socket.socket._send
 
+    def test_check_received_length_socketpair(self):
+        sock_a, sock_b = socket.socketpair()
+        sender, receiver = Socket(sock_a), Socket(sock_b)
+        data = np.random.bytes(3_000_000)
+        try:
+            thread = threading.Thread(target=sender.check_sended, args=(data,))
+            thread.start()
+            assert receiver.check_received_length(len(data)) == data
+            thread.join()
+            sender.check_sended(b'test')
+            sender.close()
+            with pytest.raises(ConnectionError):
+                receiver.check_received_length(8)
+        finally:
+            receiver.close()
+
+    def test_frames_through_socketpair(self):
+        sock_a, sock_b = socket.socketpair()
+        sender, receiver = Socket(sock_a), Socket(sock_b)
+        sender.sending_protocol = 2
+        receiver.receiving_protocol = 2
+        data = DataToExport('dte', data=[DataActuator(data=[np.linspace(0, 10, 5000)])])
+        try:
+            sender.check_sended_with_serializer('Done')
+            sender.check_sended_with_serializer(data)
+            sender.check_sended_with_serializer(np.arange(10))
+            sender.check_sended(b'corrupted bytes')
+            sender.check_sended_with_serializer([1, 'two'])
+
+            assert DeSerializer(receiver).string_deserialization() == 'Done'
+            data_back = DeSerializer(receiver).dte_deserialization()
+            assert np.all(DeSerializer(receiver).ndarray_deserialization() == np.arange(10))
+            assert DeSerializer(receiver).list_deserialization() == [1, 'two']  # resynchronized on the next frame
+        finally:
+            sender.close()
+            receiver.close()
+        assert data_back[0] == data[0]
+        assert data_back[0].data[0].flags.writeable
+
+    def test_check_sended_segments(self):
+        test_Socket = Socket(MockPythonSocket())
+        test_Socket.check_sended_segments([b'test', memoryview(np.array([1, 2], dtype='>u2').view(np.uint8))])
+        assert test_Socket.socket._send == b'test\x00\x01\x00\x02'
+
+        buffer = bytearray(6)
+        test_Socket.get_first_nbytes_into(buffer)
+        assert buffer == b'test\x00\x01'
+
+    def test_segments_through_socketpair(self):
+        sock_a, sock_b = socket.socketpair()
+        sender, receiver = Socket(sock_a), Socket(sock_b)
+        data = DataToExport('dte', data=[DataActuator(data=[np.linspace(0, 10, 5000)])])
+        try:
+            sender.check_sended_with_serializer(data)
+            data_back = DeSerializer(receiver).dte_deserialization()
+        finally:
+            sender.close()
+            receiver.close()
+        assert data_back[0] == data[0]
+        assert data_back[0].data[0].flags.writeable
+
 
 class TestTCPClient:
     def test_init(self):
@@ -235,6 +301,19 @@ class TestTCPClient:
         assert not test_TCP_Client.socket.socket._send
 
 
+    def test_acknowledge_protocol(self):
+        test_TCP_Client = TCPClient()
+        test_TCP_Client.socket = Socket(MockPythonSocket())
+        test_TCP_Client.get_data(PROTOCOL_COMMAND)
+        assert test_TCP_Client.socket.sending_protocol == 2
+        assert test_TCP_Client.socket.receiving_protocol == 2
+        test_TCP_Client.socket.receiving_protocol = 1
+        assert DeSerializer(test_TCP_Client.socket).string_deserialization() == PROTOCOL_COMMAND  # sent with v1
+        test_TCP_Client.socket.receiving_protocol = 2
+        assert DeSerializer(test_TCP_Client.socket).string_deserialization() == COMPRESSION_COMMAND
+        assert DeSerializer(test_TCP_Client.socket).list_deserialization() == available_codecs()
+
+
 class TestTCPServer:
     def test_init(self):
         test_TCP_Server = TCPServer()
@@ -266,6 +345,137 @@ class TestTCPServer:
 
 
 
+class LoopbackServer(MockServer):
+    socket_types = ['GRABBER']
+    message_list = ['Quit', 'Info', 'ping', 'pong']
+
+    def __init__(self):
+        super().__init__()
+        self.settings.child('socket_ip').setValue('127.0.0.1')
+        self.settings.child('port_id').setValue(0)  # any free port
+
+    def process_cmds(self, command, command_sock=None):
+        if command == 'ping':
+            self.send_command(command_sock, 'pong')
+        else:
+            super().process_cmds(command, command_sock)
+
+    def emit_status(self, status):
+        pass
+
+
+def connect_client(port, client_type='GRABBER') -> Socket:
+    client = Socket(socket.create_connection(('127.0.0.1', port)))
+    client.check_sended_with_serializer(client_type)
+    return client
+
+
+def wait_readable(qtbot, sock: Socket):
+    """let the server (in the same thread) process the events until there is something to read"""
+    qtbot.waitUntil(lambda: len(select.select([sock.socket], [], [], 0)[0]) == 1, timeout=2000)
+
+
+class TestTCPServerLoopback:
+    def test_event_driven(self, qtbot):
+        server = LoopbackServer()
+        server.init_server()
+        port = server.serversocket.getsockname()[1]
+        clients = [connect_client(port) for ind in range(2)]
+        try:
+            qtbot.waitUntil(lambda: len(server.connected_clients) == 3, timeout=2000)
+
+            for client in clients:  # messages of each client are processed as soon as received
+                client.check_sended_with_serializer('ping')
+            for client in clients:
+                wait_readable(qtbot, client)
+                assert DeSerializer(client).string_deserialization() == 'pong'
+
+            clients[1].check_sended_with_serializer('Info')  # read from the last connected client of client_type
+            clients[1].check_sended_with_serializer('an_info')
+            clients[1].check_sended_with_serializer('a value')
+            qtbot.waitUntil(lambda: len(server.settings.child('infos').children()) == 1, timeout=2000)
+            assert server.settings['infos', 'an_info'] == 'a value'
+
+            clients[0].close()
+            qtbot.waitUntil(lambda: len(server.connected_clients) == 2, timeout=2000)
+            assert [client['type'] for client in server.connected_clients] == ['server', 'GRABBER']
+
+            invalid = connect_client(port, 'NOT_A_TYPE')
+            qtbot.wait(100)
+            assert len(server.connected_clients) == 2
+            invalid.close()
+        finally:
+            for client in clients:
+                client.close()
+            server.close_server()
+        qtbot.waitUntil(lambda: len(server.connected_clients) == 0, timeout=2000)
+        assert len(server._notifiers) == 0
+
+
+    def test_negotiate_protocol(self, qtbot):
+        server = LoopbackServer()
+        server.init_server()
+        client = connect_client(server.serversocket.getsockname()[1])
+        try:
+            client.check_sended_with_serializer(PROTOCOL_COMMAND)
+            wait_readable(qtbot, client)
+            assert DeSerializer(client).string_deserialization() == PROTOCOL_COMMAND  # acknowledgment
+            client.receiving_protocol = 2
+            client.check_sended_with_serializer(PROTOCOL_COMMAND)  # confirmation
+            client.sending_protocol = 2
+            qtbot.waitUntil(lambda: server.connected_clients[1]['socket'].receiving_protocol == 2, timeout=2000)
+            wait_readable(qtbot, client)
+            assert DeSerializer(client).string_deserialization() == COMPRESSION_COMMAND
+            assert DeSerializer(client).list_deserialization() == available_codecs()
+
+            client.check_sended_with_serializer('ping')
+            wait_readable(qtbot, client)
+            assert client.socket.recv(4, socket.MSG_PEEK) == FRAME_MAGIC  # the answer is a frame
+            assert DeSerializer(client).string_deserialization() == 'pong'
+
+            v1_client = connect_client(server.serversocket.getsockname()[1])  # not proposing the protocol
+            v1_client.check_sended_with_serializer('ping')
+            wait_readable(qtbot, v1_client)
+            assert DeSerializer(v1_client).string_deserialization() == 'pong'
+            v1_client.close()
+        finally:
+            client.close()
+            server.close_server()
+
+    def test_negotiate_compression(self, qtbot, monkeypatch):
+        settings = {'compression': 'zlib', 'compression_threshold': 100, 'downcast': True}
+        monkeypatch.setattr(tcp_server_client, 'config', lambda *path: settings[path[-1]])
+        server = LoopbackServer()
+        server.init_server()
+        client = connect_client(server.serversocket.getsockname()[1])
+        try:
+            client.check_sended_with_serializer(PROTOCOL_COMMAND)
+            wait_readable(qtbot, client)
+            DeSerializer(client).string_deserialization()
+            client.receiving_protocol = 2
+            client.check_sended_with_serializer(PROTOCOL_COMMAND)
+            client.sending_protocol = 2
+            wait_readable(qtbot, client)
+            assert DeSerializer(client).string_deserialization() == COMPRESSION_COMMAND
+            configure_compression(client, DeSerializer(client).list_deserialization())
+            assert client.compression == 'zlib'
+            assert client.compression_threshold == 100
+            assert client.downcast
+
+            server_socket = server.connected_clients[1]['socket']
+            client.check_sended_with_serializer(COMPRESSION_COMMAND)
+            client.check_sended_with_serializer(['none', 'not_a_codec'])  # the peer cannot decode zlib
+            qtbot.waitUntil(lambda: server_socket.downcast, timeout=2000)
+            assert server_socket.compression == 'none'
+
+            client.check_sended_with_serializer('ping')
+            wait_readable(qtbot, client)
+            assert DeSerializer(client).string_deserialization() == 'pong'
+        finally:
+            client.close()
+            server.close_server()
+
+
 class TestMockServer:
     def test_init(self):
         test_MockServer = MockServer()